@@ -20,6 +20,7 @@ from app.schemas.api_key import (
     ApiKeyAuditLogResponse
 )
 from app.services.encryption_service import get_encryption_service
+from app.integrations.broker_pool import get_broker_pool
 from app.dependencies import get_current_active_user
 
 router = APIRouter()
@@ -113,6 +114,7 @@ async def create_api_key(
         
         await db.commit()
         await db.refresh(api_key)
+        get_broker_pool().invalidate(current_user.id)
         
         # Return response with plaintext credentials (only time they're exposed)
         return ApiKeyWithSecret(
@@ -257,6 +259,7 @@ async def update_api_key(
     
     await db.commit()
     await db.refresh(api_key)
+    get_broker_pool().invalidate(current_user.id)
     
     return api_key
 
@@ -302,6 +305,7 @@ async def revoke_api_key(
     db.add(audit_log)
     
     await db.commit()
+    get_broker_pool().invalidate(current_user.id)
 
 
 @router.post("/{key_id}/rotate", response_model=ApiKeyWithSecret)
@@ -356,6 +360,7 @@ async def rotate_api_key(
         
         await db.commit()
         await db.refresh(api_key)
+        get_broker_pool().invalidate(current_user.id)
         
         # Return with new plaintext credentials
         return ApiKeyWithSecret(
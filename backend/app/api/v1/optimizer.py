@@ -44,8 +44,7 @@ async def get_optimizer_service(
     alpaca = get_alpaca_client()
     risk_manager = RiskManager(db, alpaca)
     notification_service = NotificationService(db)
-    order_execution = AlpacaOrderExecutor()
-    order_execution.set_db_session(db)
+    order_execution = AlpacaOrderExecutor(db=db)
     
     return StrategyOptimizer(
         db=db,
@@ -75,8 +74,7 @@ async def run_optimization_job(
             alpaca = get_alpaca_client()
             risk_manager = RiskManager(db, alpaca)
             notification_service = NotificationService(db)
-            order_execution = AlpacaOrderExecutor()
-            order_execution.set_db_session(db)
+            order_execution = AlpacaOrderExecutor(db=db)
 
             optimizer = StrategyOptimizer(
                 db=db,
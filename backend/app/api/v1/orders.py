@@ -16,6 +16,7 @@ from app.schemas.order import (
     OrderUpdateRequest,
     OrderResponse,
     BracketOrderRequest,
+    BasketOrderRequest,
     PositionCloseRequest,
 )
 
@@ -24,6 +25,10 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
+def _to_float(value) -> Optional[float]:
+    return float(value) if value is not None else None
+
+
 @router.post("/", response_model=Dict[str, Any], status_code=status.HTTP_201_CREATED)
 async def place_order(
     order_request: OrderRequest,
@@ -53,8 +58,7 @@ async def place_order(
     **Risk rules will be evaluated unless skip_risk_check=true.**
     """
     try:
-        executor = get_order_executor()
-        executor.set_db_session(db)  # Enable risk checks
+        executor = get_order_executor(db=db, user_id=current_user.id)  # Enable risk checks
         
         order_data = await executor.place_order(
             symbol=order_request.symbol,
@@ -168,6 +172,79 @@ async def place_bracket_order(
         )
 
 
+@router.post("/basket", response_model=Dict[str, Any], status_code=status.HTTP_201_CREATED)
+async def place_basket_order(
+    basket_request: BasketOrderRequest,
+    current_user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Place a basket of orders in one request.
+    
+    The basket is validated and risk-checked as a whole, then the orders are
+    submitted concurrently. Each leg is reported separately; one failing leg
+    does not cancel the others.
+    
+    **Request Body:**
+    ```json
+    {
+      "orders": [
+        {"symbol": "AAPL", "qty": 10, "side": "buy"},
+        {"symbol": "MSFT", "notional": 2500, "side": "buy"},
+        {"symbol": "NVDA", "qty": 5, "side": "buy", "type": "limit", "limit_price": 120.00}
+      ],
+      "strategy_id": "optional-strategy-id"
+    }
+    ```
+    
+    **Authentication required.**
+    **Risk rules will be evaluated unless skip_risk_check=true.**
+    """
+    try:
+        executor = get_order_executor(db=db, user_id=current_user.id)  # Enable risk checks
+        
+        basket = await executor.place_basket(
+            legs=[
+                {
+                    "symbol": leg.symbol,
+                    "qty": _to_float(leg.qty),
+                    "notional": _to_float(leg.notional),
+                    "side": leg.side,
+                    "order_type": leg.type,
+                    "time_in_force": leg.time_in_force,
+                    "limit_price": _to_float(leg.limit_price),
+                    "stop_price": _to_float(leg.stop_price),
+                    "client_order_id": leg.client_order_id,
+                }
+                for leg in basket_request.orders
+            ],
+            user_id=current_user.id,
+            strategy_id=basket_request.strategy_id,
+            skip_risk_check=basket_request.skip_risk_check,
+        )
+        
+        logger.info(
+            f"Basket placed by user {current_user.id}: "
+            f"{basket['submitted']}/{basket['total']} submitted"
+        )
+        
+        return {
+            "success": basket["submitted"] > 0,
+            "message": f"Submitted {basket['submitted']} of {basket['total']} orders",
+            "data": basket,
+        }
+        
+    except Exception as e:
+        logger.error(f"Unexpected error placing basket for user {current_user.id}: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail={
+                "error": "internal_error",
+                "message": "Failed to place basket",
+            }
+        )
+
+
 @router.delete("/{order_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def cancel_order(
     order_id: str,
@@ -15,6 +15,10 @@ from app.schemas.paper_trading import (
     PaperPositionResponse,
     PaperTradeResponse,
     PaperAccountResetRequest,
+    PaperRestingOrder,
+    PaperRestingOrderRequest,
+    PaperRestingOrderResponse,
+    UpdateStopLossRequest,
 )
 from app.services.paper_trading import PaperTradingService
 
@@ -73,6 +77,8 @@ async def place_paper_order(
         side=order.side.value,
         order_type=order.order_type.value,
         limit_price=order.limit_price,
+        stop_loss_price=order.stop_loss_price,
+        take_profit_price=order.take_profit_price,
     )
     return result
 
@@ -95,6 +101,66 @@ async def get_paper_orders(
     return trades
 
 
+@router.post("/resting-orders", response_model=PaperRestingOrderResponse)
+async def place_resting_order(
+    order: PaperRestingOrderRequest,
+    service: PaperTradingService = Depends(get_paper_trading_service),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Place a resting paper order.
+
+    Limit, stop and stop-limit orders rest until streaming prices reach
+    them and may fill partially. Bracket orders attach a take-profit and a
+    stop-loss exit once the entry fills; OCO orders sell a position at
+    whichever of the two levels is reached first.
+    """
+    result = await service.place_resting_order(
+        user_id=str(current_user.id),
+        symbol=order.symbol.upper(),
+        qty=order.qty,
+        side=order.side.value,
+        order_type=order.order_type.value,
+        limit_price=order.limit_price,
+        stop_price=order.stop_price,
+        order_class=order.order_class.value,
+        take_profit_price=order.take_profit_price,
+        stop_loss_price=order.stop_loss_price,
+    )
+    return result
+
+
+@router.get("/resting-orders", response_model=List[PaperRestingOrder])
+async def get_resting_orders(
+    service: PaperTradingService = Depends(get_paper_trading_service),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Get open resting paper orders.
+    """
+    return await service.get_resting_orders(str(current_user.id))
+
+
+@router.delete("/resting-orders/{order_id}", response_model=PaperRestingOrderResponse)
+async def cancel_resting_order(
+    order_id: str,
+    service: PaperTradingService = Depends(get_paper_trading_service),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Cancel an open resting paper order.
+
+    Canceling one leg of an OCO pair cancels the other leg too.
+    """
+    result = await service.cancel_resting_order(str(current_user.id), order_id)
+    if not result["success"]:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=result["error"]
+        )
+    return result
+
+
 @router.get("/positions", response_model=List[PaperPositionResponse])
 async def get_paper_positions(
     service: PaperTradingService = Depends(get_paper_trading_service),
@@ -112,6 +178,33 @@ async def get_paper_positions(
     return positions
 
 
+@router.put("/positions/stop-loss")
+async def update_position_stop_loss(
+    update: UpdateStopLossRequest,
+    service: PaperTradingService = Depends(get_paper_trading_service),
+    current_user: User = Depends(get_current_user),
+):
+    """
+    Set or clear the stop-loss and take-profit of a position.
+
+    Prices that are omitted are left unchanged; prices sent as null are removed.
+    """
+    result = await service.update_position_stop_loss_take_profit(
+        user_id=str(current_user.id),
+        symbol=update.symbol.upper(),
+        stop_loss_price=update.stop_loss_price,
+        take_profit_price=update.take_profit_price,
+        clear_stop_loss="stop_loss_price" in update.model_fields_set and update.stop_loss_price is None,
+        clear_take_profit="take_profit_price" in update.model_fields_set and update.take_profit_price is None,
+    )
+    if not result["success"]:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND if "found" in result["error"] else status.HTTP_400_BAD_REQUEST,
+            detail=result["error"]
+        )
+    return result
+
+
 @router.get("/trades", response_model=List[PaperTradeResponse])
 async def get_paper_trades(
     limit: int = Query(default=100, ge=1, le=1000, description="Maximum number of trades to return"),
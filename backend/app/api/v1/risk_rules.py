@@ -2,7 +2,7 @@
 Risk Rules API endpoints
 """
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_
 
@@ -17,10 +17,16 @@ from app.schemas.risk_rule import (
     RiskRuleTestRequest,
     PositionSizeRequest,
     PositionSizeResponse,
-    PortfolioRiskMetrics
+    PortfolioRiskMetrics,
+    PortfolioVaRResponse,
+    StressTestRequest,
+    StressTestResult,
 )
 from app.services.risk_manager import RiskManager
+from app.services.risk_snapshot import get_risk_snapshot_service
 from app.integrations.alpaca_client import get_alpaca_client
+from app.integrations.broker_pool import get_broker_pool
+from app.integrations.market_data import MarketDataError
 from app.dependencies import get_current_active_user
 
 router = APIRouter()
@@ -59,6 +65,7 @@ async def create_risk_rule(
     
     db.add(risk_rule)
     await db.commit()
+    get_risk_snapshot_service().invalidate_rules(current_user.id)
     await db.refresh(risk_rule)
     
     return risk_rule
@@ -120,6 +127,50 @@ async def get_portfolio_risk(
         )
 
 
+async def _user_risk_manager(user: User, db: AsyncSession) -> RiskManager:
+    broker = await get_broker_pool().get(user.id, db)
+    return RiskManager(db, broker.trading if broker else get_alpaca_client())
+
+
+@router.get("/portfolio-var", response_model=PortfolioVaRResponse)
+async def get_portfolio_var(
+    confidence: float = Query(0.95, gt=0.5, lt=1, description="VaR confidence level"),
+    horizon_days: int = Query(1, ge=1, le=30, description="Holding period in days"),
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get historical, parametric and Monte Carlo VaR/CVaR of the current positions"""
+
+    risk_manager = await _user_risk_manager(current_user, db)
+    try:
+        return await risk_manager.get_portfolio_var(confidence=confidence, horizon_days=horizon_days)
+    except MarketDataError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
+@router.post("/stress-test", response_model=List[StressTestResult])
+async def stress_test_portfolio(
+    request: StressTestRequest = StressTestRequest(),
+    current_user: User = Depends(get_current_active_user),
+    db: AsyncSession = Depends(get_db)
+):
+    """Apply historical or custom shock scenarios to the current positions"""
+
+    risk_manager = await _user_risk_manager(current_user, db)
+    scenarios = (
+        {name: scenario.model_dump() for name, scenario in request.scenarios.items()}
+        if request.scenarios else None
+    )
+    try:
+        return await risk_manager.stress_test_portfolio(scenarios)
+    except MarketDataError as e:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+
 @router.get("/{rule_id}", response_model=RiskRuleResponse)
 async def get_risk_rule(
     rule_id: str,
@@ -178,6 +229,7 @@ async def update_risk_rule(
         setattr(risk_rule, field, value)
     
     await db.commit()
+    get_risk_snapshot_service().invalidate_rules(current_user.id)
     await db.refresh(risk_rule)
     
     return risk_rule
@@ -209,6 +261,7 @@ async def delete_risk_rule(
     
     await db.delete(risk_rule)
     await db.commit()
+    get_risk_snapshot_service().invalidate_rules(current_user.id)
 
 
 @router.post("/test")
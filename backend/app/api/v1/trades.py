@@ -93,8 +93,7 @@ async def create_trade(
     
     # Execute order via Alpaca
     try:
-        executor = get_order_executor()
-        executor.set_db_session(db)
+        executor = get_order_executor(db=db, user_id=current_user.id)
 
         # Determine order type and side
         side = "buy" if trade_data.trade_type == TradeType.BUY else "sell"
@@ -22,10 +22,50 @@ from app.schemas.watchlist import (
     PriceAlertResponse,
     WatchlistSummaryResponse
 )
+from app.services.watchlist_quotes import get_alert_index, get_price_alert_evaluator, get_watchlist_quote_service
 
 router = APIRouter()
 
 
+async def _with_quotes(watchlists: List[Watchlist]) -> List[WatchlistResponse]:
+    """Watchlist responses with market data, quoting all symbols together."""
+    responses = [WatchlistResponse.model_validate(w) for w in watchlists]
+    quotes = await get_watchlist_quote_service().get_quotes(
+        item.symbol for response in responses for item in response.items
+    )
+    for response in responses:
+        for item in response.items:
+            quote = quotes.get(item.symbol)
+            if quote is None:
+                continue
+            item.current_price = quote["price"]
+            item.change = quote["change"]
+            item.change_percent = quote["change_percent"]
+            item.volume = quote["volume"]
+    return responses
+
+
+async def _alerts_with_quotes(alerts: List[PriceAlert]) -> List[PriceAlertResponse]:
+    """Price alert responses with the distance from the current price to the target."""
+    responses = [PriceAlertResponse.model_validate(a) for a in alerts]
+    quotes = await get_watchlist_quote_service().get_quotes(r.symbol for r in responses)
+    for response in responses:
+        price = quotes.get(response.symbol, {}).get("price")
+        if not price:
+            continue
+        response.current_price = price
+        response.distance_to_target = response.target_price - price
+        response.distance_percent = response.distance_to_target / price * 100
+    return responses
+
+
+async def _track_alert(alert: PriceAlert):
+    """Keep the alert evaluator's index in sync with an alert."""
+    get_alert_index().track(alert)
+    if alert.is_active:
+        await get_price_alert_evaluator().watch([alert.symbol])
+
+
 # Price Alerts (Must be before dynamic watchlist_id routes)
 
 
@@ -47,7 +87,7 @@ async def list_price_alerts(
         query = query.where(PriceAlert.is_active == True)
 
     result = await db.execute(query)
-    return result.scalars().all()
+    return await _alerts_with_quotes(result.scalars().all())
 
 
 @router.post("/alerts", response_model=PriceAlertResponse, status_code=status.HTTP_201_CREATED)
@@ -75,6 +115,7 @@ async def create_price_alert(
     db.add(new_alert)
     await db.commit()
     await db.refresh(new_alert)
+    await _track_alert(new_alert)
     return new_alert
 
 
@@ -121,6 +162,7 @@ async def update_price_alert(
 
     await db.commit()
     await db.refresh(alert)
+    await _track_alert(alert)
     return alert
 
 
@@ -148,6 +190,7 @@ async def delete_price_alert(
 
     await db.delete(alert)
     await db.commit()
+    get_alert_index().remove(alert_id)
 
 
 # Watchlist CRUD
@@ -171,7 +214,7 @@ async def list_watchlists(
     return {
         "total_watchlists": len(watchlists),
         "total_symbols": total_symbols,
-        "watchlists": watchlists
+        "watchlists": await _with_quotes(watchlists)
     }
 
 
@@ -217,7 +260,7 @@ async def get_watchlist(
             detail="Watchlist not found"
         )
 
-    return watchlist
+    return (await _with_quotes([watchlist]))[0]
 
 
 @router.put("/{watchlist_id}", response_model=WatchlistResponse)
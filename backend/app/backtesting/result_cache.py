@@ -0,0 +1,152 @@
+"""
+Content-addressed backtest result cache.
+
+A backtest is identified by a fingerprint of its full specification
+(strategy type and parameters, symbol, date range, capital, commission and
+slippage) combined with a hash of the market data it runs on. Identical
+re-runs on unchanged data return the stored result instead of simulating
+again; new bars or corrected data produce a different data hash and
+therefore a cache miss.
+"""
+import hashlib
+import json
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+import pandas as pd
+
+from app.integrations.cache import get_cache_manager
+
+logger = logging.getLogger(__name__)
+
+# Bump when BacktestEngine output changes so stale results are not served
+RESULT_CACHE_VERSION = 1
+
+OHLCV_COLUMNS = ["open", "high", "low", "close", "volume"]
+
+
+class BacktestResultCache:
+    """
+    Two-tier cache of backtest results keyed by content fingerprint.
+
+    Results are kept in a bounded in-process LRU and in Redis, so repeat
+    runs are served locally and results are shared between workers.
+    """
+
+    KEY_PREFIX = "backtest:result"
+
+    def __init__(self, ttl: int = 7 * 24 * 3600, max_local_entries: int = 256):
+        self.ttl = ttl
+        self.max_local_entries = max_local_entries
+        self._local: "OrderedDict[str, str]" = OrderedDict()
+
+    @staticmethod
+    def data_version(data: pd.DataFrame) -> str:
+        """Hash the OHLCV bars (including timestamps) a backtest runs on."""
+        columns = [c for c in OHLCV_COLUMNS if c in data.columns]
+        row_hashes = pd.util.hash_pandas_object(data[columns], index=True).to_numpy()
+        return hashlib.sha256(row_hashes.tobytes()).hexdigest()
+
+    @staticmethod
+    def fingerprint(spec: Dict[str, Any], data_version: str) -> str:
+        """Build the cache key for a backtest specification and data version."""
+        payload = json.dumps(
+            {
+                "spec": spec,
+                "data_version": data_version,
+                "version": RESULT_CACHE_VERSION,
+            },
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    async def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return stored results for a fingerprint, or None."""
+        payload = self._local.get(key)
+        if payload is not None:
+            self._local.move_to_end(key)
+        else:
+            payload = await get_cache_manager().get(f"{self.KEY_PREFIX}:{key}")
+            if payload is None:
+                return None
+            self._remember(key, payload)
+
+        logger.info(f"Backtest result cache hit: {key[:12]}")
+        return self._deserialize(payload)
+
+    async def set(self, key: str, results: Dict[str, Any]):
+        """Store results under a fingerprint."""
+        if not results:
+            return
+        payload = self._serialize(results)
+        self._remember(key, payload)
+        await get_cache_manager().set(f"{self.KEY_PREFIX}:{key}", payload, ttl=self.ttl)
+
+    def clear(self):
+        """Drop the in-process tier."""
+        self._local.clear()
+
+    def _remember(self, key: str, payload: str):
+        self._local[key] = payload
+        self._local.move_to_end(key)
+        while len(self._local) > self.max_local_entries:
+            self._local.popitem(last=False)
+
+    @staticmethod
+    def _serialize(results: Dict[str, Any]) -> str:
+        """Serialize BacktestEngine results to JSON."""
+        equity_curve = results.get("equity_curve")
+        curve = None
+        if isinstance(equity_curve, pd.Series):
+            curve = {
+                "index": [pd.Timestamp(k).isoformat() for k in equity_curve.index],
+                "values": [float(v) for v in equity_curve.values],
+            }
+
+        trades = []
+        for trade in results.get("trades", []):
+            trades.append({
+                k: (pd.Timestamp(v).isoformat() if k in ("entry_date", "exit_date") and v is not None else v)
+                for k, v in trade.items()
+            })
+
+        return json.dumps(
+            {
+                "metrics": results.get("metrics", {}),
+                "trades": trades,
+                "equity_curve": curve,
+                "strategy": results.get("strategy"),
+                "symbol": results.get("symbol"),
+                "period": results.get("period"),
+            },
+            default=float,
+        )
+
+    @staticmethod
+    def _deserialize(payload: str) -> Dict[str, Any]:
+        """Rebuild BacktestEngine results from JSON."""
+        data = json.loads(payload)
+
+        curve = data.get("equity_curve")
+        if curve is not None:
+            data["equity_curve"] = pd.Series(
+                curve["values"], index=pd.to_datetime(curve["index"])
+            )
+
+        for trade in data.get("trades", []):
+            for field in ("entry_date", "exit_date"):
+                if trade.get(field) is not None:
+                    trade[field] = pd.Timestamp(trade[field])
+
+        return data
+
+
+# Global result cache instance
+_result_cache = BacktestResultCache()
+
+
+def get_backtest_result_cache() -> BacktestResultCache:
+    """Get global backtest result cache instance."""
+    return _result_cache
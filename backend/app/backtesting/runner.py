@@ -15,6 +15,7 @@ from sqlalchemy import select
 from app.models.backtest import Backtest, BacktestResult, BacktestTrade, BacktestStatus
 from app.models.strategy import Strategy
 from app.services.market_data_cache_service import MarketDataCacheService
+from app.backtesting.result_cache import get_backtest_result_cache
 
 # Import BacktestEngine and Strategies
 import sys
@@ -25,37 +26,14 @@ project_root = Path(__file__).resolve().parent.parent.parent.parent
 if str(project_root) not in sys.path:
     sys.path.insert(0, str(project_root))
 
+# Strategy modules are imported on first use through the registry
 try:
     from src.backtesting.backtest_engine import BacktestEngine
-    from src.strategies.sma_crossover import SMACrossoverStrategy
-    from src.strategies.rsi_strategy import RSIStrategy
-    from src.strategies.keltner_channel import KeltnerChannelStrategy
-    from src.strategies.donchian_channel import DonchianChannelStrategy
-    from src.strategies.ichimoku_cloud import IchimokuCloudStrategy
-    from src.strategies.macd_strategy import MACDStrategy
-    from src.strategies.bollinger_bands import BollingerBandsStrategy
-    from src.strategies.vwap_strategy import VWAPStrategy
-    from src.strategies.momentum_strategy import MomentumStrategy
-    from src.strategies.mean_reversion import MeanReversionStrategy
-    from src.strategies.breakout_strategy import BreakoutStrategy
-    from src.strategies.atr_trailing_stop import ATRTrailingStopStrategy
-    from src.strategies.stochastic_strategy import StochasticStrategy
+    from src.strategies.registry import get_strategy_class
 except ImportError as e:
     logging.error(f"Could not import src.backtesting: {e}")
     BacktestEngine = None
-    SMACrossoverStrategy = None
-    RSIStrategy = None
-    KeltnerChannelStrategy = None
-    DonchianChannelStrategy = None
-    IchimokuCloudStrategy = None
-    MACDStrategy = None
-    BollingerBandsStrategy = None
-    VWAPStrategy = None
-    MomentumStrategy = None
-    MeanReversionStrategy = None
-    BreakoutStrategy = None
-    ATRTrailingStopStrategy = None
-    StochasticStrategy = None
+    get_strategy_class = None
 
 logger = logging.getLogger(__name__)
 
@@ -63,9 +41,11 @@ logger = logging.getLogger(__name__)
 class BacktestRunner:
     """Orchestrates backtest execution and result storage."""
     
-    def __init__(self, session: AsyncSession):
+    def __init__(self, session: AsyncSession, use_result_cache: bool = True):
         self.session = session
         self.cache_service = MarketDataCacheService(session)
+        self.use_result_cache = use_result_cache
+        self.result_cache = get_backtest_result_cache()
         
     async def run_backtest(self, backtest_id: UUID) -> Dict[str, Any]:
         """
@@ -196,14 +176,57 @@ class BacktestRunner:
             slippage=backtest.slippage
         )
         
-        # 4. Run Engine (it's synchronous, so we might want to run it in a thread pool if it's slow)
-        # For now, running directly is fine as it's CPU bound but pandas is fast
-        # To be safe for async FastAPI, we can use run_in_executor
+        # 4. Load data and look up a stored result for this exact spec + data
+        # The engine is synchronous, so run it in a thread pool
         loop = asyncio.get_running_loop()
-        results = await loop.run_in_executor(None, engine.run)
+        data = await loop.run_in_executor(None, engine.load_data)
+        
+        cache_key = None
+        if self.use_result_cache and data is not None and not data.empty:
+            spec = self._backtest_spec(backtest, strategy_model, symbol)
+            cache_key = self.result_cache.fingerprint(
+                spec, self.result_cache.data_version(data)
+            )
+            cached = await self.result_cache.get(cache_key)
+            if cached is not None:
+                logger.info(f"Reusing stored result for backtest {backtest.id}")
+                return cached
+        
+        # 5. Run Engine
+        results = await loop.run_in_executor(None, engine.run, data)
+        
+        if cache_key is not None:
+            await self.result_cache.set(cache_key, results)
         
         return results
 
+    @staticmethod
+    def _backtest_spec(
+        backtest: Backtest,
+        strategy_model: Strategy,
+        symbol: str
+    ) -> Dict[str, Any]:
+        """Everything besides market data that determines a backtest result."""
+        params = dict(strategy_model.parameters or {})
+        params.pop("symbol", None)
+        return {
+            "strategy_type": strategy_model.strategy_type.lower().replace("_", ""),
+            "parameters": params,
+            "symbol": symbol,
+            "start_date": backtest.start_date.strftime("%Y-%m-%d"),
+            "end_date": backtest.end_date.strftime("%Y-%m-%d"),
+            "initial_capital": float(backtest.initial_capital),
+            "commission": float(backtest.commission),
+            "slippage": float(backtest.slippage),
+        }
+
+    @staticmethod
+    def _strategy_class(strategy_type: str):
+        """Strategy class for a type, imported on first use."""
+        if get_strategy_class is None:
+            raise ImportError("Strategy registry not available")
+        return get_strategy_class(strategy_type)
+
     def _create_strategy_instance(self, strategy_model: Strategy):
         """Factory method to create strategy instance from model."""
         strategy_type = strategy_model.strategy_type.lower().replace("_", "")
@@ -216,101 +239,75 @@ class BacktestRunner:
             del init_params["symbol"]
 
         if strategy_type == "smacrossover":
-            if SMACrossoverStrategy is None:
-                raise ImportError("SMACrossoverStrategy not available")
-            return SMACrossoverStrategy(
+            return self._strategy_class("sma_crossover")(
                 short_window=int(init_params.get("short_window", 50)),
                 long_window=int(init_params.get("long_window", 200))
             )
         elif strategy_type == "rsi":
-            if RSIStrategy is None:
-                raise ImportError("RSIStrategy not available")
-            return RSIStrategy(
+            return self._strategy_class("rsi")(
                 period=int(init_params.get("period", 14)),
                 overbought=int(init_params.get("overbought", 70)),
                 oversold=int(init_params.get("oversold", 30))
             )
         elif strategy_type == "keltnerchannel":
-            if KeltnerChannelStrategy is None:
-                raise ImportError("KeltnerChannelStrategy not available")
-            return KeltnerChannelStrategy(
+            return self._strategy_class("keltner_channel")(
                 ema_period=int(init_params.get("ema_period", 20)),
                 atr_period=int(init_params.get("atr_period", 10)),
                 multiplier=float(init_params.get("multiplier", 2.0)),
                 use_breakout=init_params.get("use_breakout", True)
             )
         elif strategy_type == "donchianchannel":
-            if DonchianChannelStrategy is None:
-                raise ImportError("DonchianChannelStrategy not available")
-            return DonchianChannelStrategy(
+            return self._strategy_class("donchian_channel")(
                 entry_period=int(init_params.get("entry_period", 20)),
                 exit_period=int(init_params.get("exit_period", 10)),
                 atr_period=int(init_params.get("atr_period", 20)),
                 use_system_2=init_params.get("use_system_2", False)
             )
         elif strategy_type == "ichimokucloud":
-            if IchimokuCloudStrategy is None:
-                raise ImportError("IchimokuCloudStrategy not available")
-            return IchimokuCloudStrategy(
+            return self._strategy_class("ichimoku_cloud")(
                 tenkan_period=int(init_params.get("tenkan_period", 9)),
                 kijun_period=int(init_params.get("kijun_period", 26)),
                 senkou_b_period=int(init_params.get("senkou_b_period", 52)),
                 displacement=int(init_params.get("displacement", 26))
             )
         elif strategy_type == "macd":
-            if MACDStrategy is None:
-                raise ImportError("MACDStrategy not available")
-            return MACDStrategy(
+            return self._strategy_class("macd")(
                 fast_period=int(init_params.get("fast_period", 12)),
                 slow_period=int(init_params.get("slow_period", 26)),
                 signal_period=int(init_params.get("signal_period", 9))
             )
         elif strategy_type == "bollingerbands":
-            if BollingerBandsStrategy is None:
-                raise ImportError("BollingerBandsStrategy not available")
-            return BollingerBandsStrategy(
+            return self._strategy_class("bollinger_bands")(
                 period=int(init_params.get("period", 20)),
                 std_dev=float(init_params.get("std_dev", 2.0))
             )
         elif strategy_type == "vwap":
-            if VWAPStrategy is None:
-                raise ImportError("VWAPStrategy not available")
-            return VWAPStrategy(
+            return self._strategy_class("vwap")(
                 period=int(init_params.get("period", 20))
             )
         elif strategy_type == "momentum":
-            if MomentumStrategy is None:
-                raise ImportError("MomentumStrategy not available")
-            return MomentumStrategy(
+            return self._strategy_class("momentum")(
                 period=int(init_params.get("period", 20)),
                 threshold=float(init_params.get("threshold", 0.0))
             )
         elif strategy_type == "meanreversion":
-            if MeanReversionStrategy is None:
-                raise ImportError("MeanReversionStrategy not available")
-            return MeanReversionStrategy(
+            return self._strategy_class("mean_reversion")(
                 period=int(init_params.get("period", 20)),
                 entry_threshold=float(init_params.get("entry_threshold", 2.0)),
                 exit_threshold=float(init_params.get("exit_threshold", 0.5))
             )
         elif strategy_type == "breakout":
-            if BreakoutStrategy is None:
-                raise ImportError("BreakoutStrategy not available")
-            return BreakoutStrategy(
+            return self._strategy_class("breakout")(
                 lookback_period=int(init_params.get("lookback_period", 20)),
                 breakout_threshold=float(init_params.get("breakout_threshold", 0.02))
             )
         elif strategy_type == "attrailingstop":
-            if ATRTrailingStopStrategy is None:
-                raise ImportError("ATRTrailingStopStrategy not available")
-            return ATRTrailingStopStrategy(
+            return self._strategy_class("atr_trailing_stop")(
                 atr_period=int(init_params.get("atr_period", 14)),
                 atr_multiplier=float(init_params.get("atr_multiplier", 2.0))
             )
         elif strategy_type == "stochastic":
-            if StochasticStrategy is None:
-                raise ImportError("StochasticStrategy not available")
-            return StochasticStrategy(
+            return self._strategy_class("stochastic")(
                 k_period=int(init_params.get("k_period", 14)),
                 d_period=int(init_params.get("d_period", 3)),
                 overbought=int(init_params.get("overbought", 80)),
@@ -73,6 +73,76 @@ class Settings(BaseSettings):
         default="https://paper-api.alpaca.markets",
         description="Alpaca API base URL"
     )
+    ALPACA_DATA_URL: Optional[str] = Field(
+        default=None,
+        description="Override for the market data REST URL (e.g. a local stand-in)"
+    )
+    ALPACA_STREAM_URL: Optional[str] = Field(
+        default=None,
+        description="Override for the market data stream URL (e.g. ws://127.0.0.1:8765/v2/iex)"
+    )
+    ALPACA_TRADING_STREAM_URL: Optional[str] = Field(
+        default=None,
+        description="Override for the trade updates stream URL (e.g. ws://127.0.0.1:8765/stream)"
+    )
+    TRADE_STREAM_ENABLED: bool = Field(
+        default=False,
+        description="Consume the trade updates stream to keep orders and strategy state current"
+    )
+    TRADE_STREAM_USER_ID: Optional[str] = Field(
+        default=None,
+        description="User that owns the Alpaca account; orders placed outside the app are recorded for them"
+    )
+    STOP_TRIGGER_ENGINE_ENABLED: bool = Field(
+        default=False,
+        description="Execute paper stop-loss/take-profit exits from the trade stream as prices cross them"
+    )
+    PAPER_MATCHING_ENGINE_ENABLED: bool = Field(
+        default=False,
+        description="Accept resting paper limit, stop, bracket and OCO orders and fill them from the trade stream (single worker only)"
+    )
+    PAPER_FILL_PARTICIPATION: float = Field(
+        default=1.0,
+        description="Share of each streamed trade's size that resting paper orders may fill"
+    )
+    PORTFOLIO_RISK_WINDOW: int = Field(
+        default=252,
+        description="Number of daily returns used for portfolio VaR and the covariance matrix"
+    )
+    PORTFOLIO_RISK_SIMULATIONS: int = Field(
+        default=5000,
+        description="Number of Monte Carlo scenarios for portfolio VaR"
+    )
+    PRICE_ALERT_ENGINE_ENABLED: bool = Field(
+        default=False,
+        description="Trigger watchlist price alerts from the trade stream as prices cross their targets"
+    )
+    WATCHLIST_QUOTE_STREAM_ENABLED: bool = Field(
+        default=False,
+        description="Keep cached watchlist quotes current from the trade stream between snapshot requests"
+    )
+    SCREENER_SNAPSHOT_ENABLED: bool = Field(
+        default=False,
+        description="Refresh the screener's universe snapshot in the background and merge streamed bars into it"
+    )
+    SCREENER_REFRESH_SECONDS: float = Field(
+        default=300.0,
+        description="Seconds between incremental refreshes of the screener's universe snapshot from the bar cache"
+    )
+    BROKER_POOL_MAX_CLIENTS: int = Field(
+        default=64,
+        description="Maximum number of users whose own Alpaca clients are kept open"
+    )
+    BROKER_CREDENTIAL_TTL_SECONDS: int = Field(
+        default=900,
+        description="Seconds a user's decrypted Alpaca key is reused before it is checked again"
+    )
+    
+    # Market data
+    MARKET_DATA_PROVIDER: str = Field(
+        default="alpaca",
+        description="Market data provider: 'alpaca' or 'synthetic' (offline generated data)"
+    )
     
     # Email (Optional)
     SMTP_HOST: Optional[str] = Field(default=None)
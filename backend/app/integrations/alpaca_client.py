@@ -2,16 +2,19 @@
 Alpaca API client wrapper with caching and rate limiting.
 Provides thread-safe singleton access to Alpaca paper trading API.
 """
+import asyncio
 import logging
 import time
 from typing import Optional, List, Dict, Any
 from datetime import datetime, timedelta
 from threading import Lock
+from urllib.parse import urlparse
 
 from alpaca.trading.client import TradingClient
 from alpaca.trading.requests import GetOrdersRequest
 from alpaca.trading.enums import OrderSide, QueryOrderStatus
 from alpaca.common.exceptions import APIError
+from requests.adapters import HTTPAdapter
 from tenacity import (
     retry,
     stop_after_attempt,
@@ -24,6 +27,13 @@ from app.integrations.cache import get_cache_manager
 
 logger = logging.getLogger(__name__)
 
+# Hosts a local Alpaca stand-in may run on (see loadtest.alpaca_standin)
+LOCAL_HOSTS = {"localhost", "127.0.0.1", "::1"}
+
+# Pooled HTTP connections kept per host; order executors share one client
+# and call it from worker threads concurrently
+HTTP_POOL_SIZE = 32
+
 
 class AlpacaAPIError(Exception):
     """Custom exception for Alpaca API errors."""
@@ -65,6 +75,11 @@ class RateLimiter:
             self.requests.append(now)
             return True
     
+    async def acquire_async(self):
+        """Wait until a request is allowed within the rate limit, then record it."""
+        while not self.acquire():
+            await asyncio.sleep(max(self.wait_time(), 0.01))
+    
     def wait_time(self) -> float:
         """
         Get wait time in seconds before next request is allowed.
@@ -91,6 +106,7 @@ class AlpacaClient:
     _lock: Lock = Lock()
     _client: Optional[TradingClient] = None
     _rate_limiter: Optional[RateLimiter] = None
+    _cache_prefix: str = "alpaca"
     
     def __new__(cls):
         """Thread-safe singleton implementation."""
@@ -106,22 +122,65 @@ class AlpacaClient:
             self._initialize_client()
             self._rate_limiter = RateLimiter(max_requests=200, window_seconds=60)
     
-    def _initialize_client(self):
+    @classmethod
+    def for_account(
+        cls,
+        api_key: str,
+        secret_key: str,
+        base_url: Optional[str] = None,
+        cache_namespace: Optional[str] = None,
+    ) -> 'AlpacaClient':
+        """
+        Create a client for another account's credentials.
+        
+        Unlike ``AlpacaClient()`` the instance is not the shared singleton
+        and has its own rate limiter.
+        
+        Args:
+            api_key: Account API key
+            secret_key: Account secret key
+            base_url: API base URL (default: settings.ALPACA_BASE_URL)
+            cache_namespace: Prefix keeping this account's cached account,
+                positions and orders apart from other accounts
+            
+        Returns:
+            AlpacaClient instance
+        """
+        client = super().__new__(cls)
+        client._initialize_client(api_key, secret_key, base_url)
+        client._rate_limiter = RateLimiter(max_requests=200, window_seconds=60)
+        if cache_namespace:
+            client._cache_prefix = f"alpaca:{cache_namespace}"
+        return client
+    
+    def _initialize_client(
+        self,
+        api_key: Optional[str] = None,
+        secret_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+    ):
         """Initialize Alpaca Trading Client with paper trading validation."""
+        base_url = base_url or settings.ALPACA_BASE_URL
         try:
-            # Validate paper trading mode
-            if "paper-api.alpaca.markets" not in settings.ALPACA_BASE_URL:
+            # Validate paper trading mode (a local stand-in is also allowed)
+            if (
+                "paper-api.alpaca.markets" not in base_url
+                and urlparse(base_url).hostname not in LOCAL_HOSTS
+            ):
                 raise AlpacaAPIError(
                     "SECURITY: Only paper trading API is allowed. "
-                    f"Current URL: {settings.ALPACA_BASE_URL}"
+                    f"Current URL: {base_url}"
                 )
             
             self._client = TradingClient(
-                api_key=settings.ALPACA_API_KEY,
-                secret_key=settings.ALPACA_SECRET_KEY,
+                api_key=api_key or settings.ALPACA_API_KEY,
+                secret_key=secret_key or settings.ALPACA_SECRET_KEY,
                 paper=True,  # Enforce paper trading
-                url_override=settings.ALPACA_BASE_URL,
+                url_override=base_url,
             )
+            adapter = HTTPAdapter(pool_connections=HTTP_POOL_SIZE, pool_maxsize=HTTP_POOL_SIZE)
+            self._client._session.mount("http://", adapter)
+            self._client._session.mount("https://", adapter)
             
             logger.info("Alpaca client initialized in PAPER TRADING mode")
             
@@ -138,6 +197,10 @@ class AlpacaClient:
                 status_code=429
             )
     
+    async def throttle(self):
+        """Wait for a slot under the shared rate limit (instead of failing with 429)."""
+        await self._rate_limiter.acquire_async()
+    
     def _handle_api_error(self, error: Exception, operation: str) -> None:
         """
         Centralized error handling for Alpaca API calls.
@@ -228,7 +291,7 @@ class AlpacaClient:
             AlpacaAPIError: If API call fails
         """
         cache = get_cache_manager()
-        cache_key = "alpaca:account"
+        cache_key = f"{self._cache_prefix}:account"
         
         # Try cache first
         if use_cache:
@@ -296,7 +359,7 @@ class AlpacaClient:
             AlpacaAPIError: If API call fails
         """
         cache = get_cache_manager()
-        cache_key = "alpaca:positions"
+        cache_key = f"{self._cache_prefix}:positions"
         
         # Try cache first
         if use_cache:
@@ -368,7 +431,7 @@ class AlpacaClient:
             AlpacaAPIError: If API call fails
         """
         cache = get_cache_manager()
-        cache_key = f"alpaca:orders:{status or 'all'}:{limit}"
+        cache_key = f"{self._cache_prefix}:orders:{status or 'all'}:{limit}"
         
         # Try cache first (usually disabled for orders to ensure freshness)
         if use_cache:
@@ -408,13 +471,15 @@ class AlpacaClient:
         except Exception as e:
             self._handle_api_error(e, "get_orders")
     
-    async def invalidate_cache(self, pattern: str = "alpaca:*"):
+    async def invalidate_cache(self, pattern: Optional[str] = None):
         """
         Invalidate cached data.
         
         Args:
-            pattern: Cache key pattern to invalidate (default: all alpaca data)
+            pattern: Cache key pattern to invalidate (default: all of this
+                client's data, i.e. all alpaca data for the shared client)
         """
+        pattern = pattern or f"{self._cache_prefix}:*"
         cache = get_cache_manager()
         await cache.clear_pattern(pattern)
         logger.info(f"Cache invalidated for pattern: {pattern}")
@@ -0,0 +1,253 @@
+"""
+Per-user broker client pool.
+
+Users can store their own encrypted Alpaca keys (see the api_keys API). The
+pool keeps one trading client (and, on first use, one market data client)
+per user, built from the user's default active paper trading key, so that
+repeated calls reuse the decrypted credentials and the clients' HTTP
+connection pools instead of decrypting and reconnecting every time.
+
+The pool is bounded: the least recently used user's clients are closed when
+it is full. Decrypted credentials are kept for a limited time, after which
+the key row is read again; the clients are only rebuilt if the key changed.
+"""
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.integrations.alpaca_client import AlpacaClient
+from app.integrations.market_data import AlpacaMarketData
+from app.models.api_key import ApiKey
+from app.models.enums import ApiKeyStatus, BrokerType
+from app.services.encryption_service import get_encryption_service
+
+logger = logging.getLogger(__name__)
+
+
+def api_key_query(user_id: str):
+    """Select the key a user's broker clients are built from."""
+    return (
+        select(ApiKey)
+        .where(
+            ApiKey.user_id == user_id,
+            ApiKey.broker == BrokerType.ALPACA,
+            ApiKey.status == ApiKeyStatus.ACTIVE,
+            ApiKey.is_paper_trading.is_(True),
+        )
+        .order_by(ApiKey.is_default.desc(), ApiKey.created_at.desc())
+        .limit(1)
+    )
+
+
+def _fingerprint(api_key: ApiKey) -> Tuple:
+    return (api_key.id, api_key.encrypted_api_key, api_key.encrypted_api_secret, api_key.base_url)
+
+
+@dataclass
+class BrokerCredentials:
+    """Decrypted credentials of one API key."""
+    api_key_id: str
+    api_key: str
+    secret_key: str
+    base_url: Optional[str]
+    fingerprint: Tuple
+    expires_at: float
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+
+@dataclass
+class PooledBroker:
+    """A user's broker clients."""
+    user_id: str
+    credentials: BrokerCredentials
+    trading: AlpacaClient
+    _market_data: Optional[AlpacaMarketData] = field(default=None, repr=False)
+
+    @property
+    def market_data(self) -> AlpacaMarketData:
+        """Market data client for the user's key (created on first use)."""
+        if self._market_data is None:
+            self._market_data = AlpacaMarketData.for_account(
+                self.credentials.api_key, self.credentials.secret_key
+            )
+        return self._market_data
+
+    def close(self):
+        """Close the clients' HTTP connections."""
+        for client in (self.trading, self._market_data):
+            session = getattr(getattr(client, "_client", None), "_session", None)
+            if session is not None:
+                session.close()
+
+
+class BrokerClientPool:
+    """
+    LRU-bounded pool of per-user broker clients.
+    """
+
+    def __init__(self, max_clients: int = 64, credential_ttl: float = 900.0):
+        """
+        Initialize broker client pool.
+
+        Args:
+            max_clients: Maximum number of users with pooled clients
+            credential_ttl: Seconds decrypted credentials are trusted before
+                the key row is checked again
+        """
+        self.max_clients = max_clients
+        self.credential_ttl = credential_ttl
+        self._entries: "OrderedDict[str, PooledBroker]" = OrderedDict()
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def peek(self, user_id: str) -> Optional[PooledBroker]:
+        """
+        Pooled clients of a user whose credentials have not expired.
+
+        Args:
+            user_id: User ID
+
+        Returns:
+            PooledBroker, or None if the key row has to be (re)loaded
+        """
+        entry = self._entries.get(user_id)
+        if entry is None or entry.credentials.expired:
+            return None
+        self._entries.move_to_end(user_id)
+        self.hits += 1
+        return entry
+
+    async def get(self, user_id: str, db: AsyncSession) -> Optional[PooledBroker]:
+        """
+        Get a user's pooled clients, loading their key if needed.
+
+        Args:
+            user_id: User ID
+            db: Database session used to load the key
+
+        Returns:
+            PooledBroker, or None if the user has no usable Alpaca key
+        """
+        entry = self.peek(user_id)
+        if entry is not None:
+            return entry
+
+        lock = self._locks.setdefault(user_id, asyncio.Lock())
+        async with lock:
+            # Another request may have loaded the key while we waited
+            entry = self.peek(user_id)
+            if entry is not None:
+                return entry
+            result = await db.execute(api_key_query(user_id))
+            return self.acquire(user_id, result.scalars().first())
+
+    def acquire(self, user_id: str, api_key: Optional[ApiKey]) -> Optional[PooledBroker]:
+        """
+        Get a user's pooled clients for a loaded key row.
+
+        Callers with a synchronous session load the row with
+        ``api_key_query`` themselves. The existing clients are kept if the
+        key has not changed.
+
+        Args:
+            user_id: User ID
+            api_key: The user's key row, or None if they have none
+
+        Returns:
+            PooledBroker, or None if api_key is None
+        """
+        if api_key is None:
+            self.invalidate(user_id)
+            return None
+
+        fingerprint = _fingerprint(api_key)
+        entry = self._entries.get(user_id)
+        if entry is not None and entry.credentials.fingerprint == fingerprint:
+            entry.credentials.expires_at = time.monotonic() + self.credential_ttl
+            self._entries.move_to_end(user_id)
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        encryption_service = get_encryption_service()
+        credentials = BrokerCredentials(
+            api_key_id=api_key.id,
+            api_key=encryption_service.decrypt_api_key(api_key.encrypted_api_key),
+            secret_key=encryption_service.decrypt_api_key(api_key.encrypted_api_secret),
+            base_url=api_key.base_url,
+            fingerprint=fingerprint,
+            expires_at=time.monotonic() + self.credential_ttl,
+        )
+        trading = AlpacaClient.for_account(
+            credentials.api_key,
+            credentials.secret_key,
+            base_url=credentials.base_url,
+            cache_namespace=f"user:{user_id}",
+        )
+
+        self.invalidate(user_id)
+        entry = PooledBroker(user_id=user_id, credentials=credentials, trading=trading)
+        self._entries[user_id] = entry
+        while len(self._entries) > self.max_clients:
+            evicted_user, evicted = self._entries.popitem(last=False)
+            self._locks.pop(evicted_user, None)
+            evicted.close()
+            logger.debug(f"Evicted broker clients for user {evicted_user}")
+
+        logger.info(f"Created broker clients for user {user_id} (key {api_key.id})")
+        return entry
+
+    def invalidate(self, user_id: str):
+        """Drop a user's clients, e.g. after their keys changed."""
+        entry = self._entries.pop(user_id, None)
+        if entry is not None:
+            entry.close()
+
+    def clear(self):
+        """Drop all pooled clients."""
+        for user_id in list(self._entries):
+            self.invalidate(user_id)
+        self._locks.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool size and hit counters."""
+        return {
+            "clients": len(self._entries),
+            "max_clients": self.max_clients,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+# Global pool instance
+_broker_pool: Optional[BrokerClientPool] = None
+
+
+def get_broker_pool() -> BrokerClientPool:
+    """
+    Get or create singleton broker client pool.
+
+    Returns:
+        BrokerClientPool instance
+    """
+    global _broker_pool
+    if _broker_pool is None:
+        _broker_pool = BrokerClientPool(
+            max_clients=settings.BROKER_POOL_MAX_CLIENTS,
+            credential_ttl=settings.BROKER_CREDENTIAL_TTL_SECONDS,
+        )
+    return _broker_pool
@@ -66,6 +66,10 @@ class MarketDataProvider(ABC):
     async def get_snapshot(self, symbol: str) -> Dict[str, Any]:
         """Get market snapshot for a symbol."""
         pass
+    
+    async def get_snapshots(self, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get market snapshots for many symbols (one request per symbol unless overridden)."""
+        return {symbol: await self.get_snapshot(symbol) for symbol in dict.fromkeys(symbols)}
 
 
 class AlpacaMarketData(MarketDataProvider):
@@ -73,6 +77,8 @@ class AlpacaMarketData(MarketDataProvider):
     Alpaca market data implementation with caching.
     """
     
+    source_name = "alpaca"
+    
     _instance: Optional['AlpacaMarketData'] = None
     _client: Optional[StockHistoricalDataClient] = None
     
@@ -89,12 +95,40 @@ class AlpacaMarketData(MarketDataProvider):
                 self._client = StockHistoricalDataClient(
                     api_key=settings.ALPACA_API_KEY,
                     secret_key=settings.ALPACA_SECRET_KEY,
+                    url_override=settings.ALPACA_DATA_URL,
                 )
                 logger.info("Alpaca market data client initialized")
             except Exception as e:
                 logger.error(f"Failed to initialize market data client: {e}")
                 raise MarketDataError(f"Client initialization failed: {str(e)}", original_error=e)
     
+    @classmethod
+    def for_account(cls, api_key: str, secret_key: str) -> 'AlpacaMarketData':
+        """
+        Create a market data client for another account's credentials.
+        
+        The instance is not the shared singleton; cached quotes and bars are
+        still shared since they do not depend on the account.
+        
+        Args:
+            api_key: Account API key
+            secret_key: Account secret key
+            
+        Returns:
+            AlpacaMarketData instance
+        """
+        client = super().__new__(cls)
+        try:
+            client._client = StockHistoricalDataClient(
+                api_key=api_key,
+                secret_key=secret_key,
+                url_override=settings.ALPACA_DATA_URL,
+            )
+        except Exception as e:
+            logger.error(f"Failed to initialize market data client: {e}")
+            raise MarketDataError(f"Client initialization failed: {str(e)}", original_error=e)
+        return client
+    
     def _handle_error(self, error: Exception, operation: str) -> None:
         """Centralized error handling."""
         if isinstance(error, APIError):
@@ -290,47 +324,7 @@ class AlpacaMarketData(MarketDataProvider):
             request = StockSnapshotRequest(symbol_or_symbols=symbol)
             snapshots = self._client.get_stock_snapshot(request)
             
-            snapshot = snapshots[symbol]
-            
-            snapshot_data = {
-                "symbol": symbol,
-                "latest_trade": {
-                    "price": float(snapshot.latest_trade.price),
-                    "size": int(snapshot.latest_trade.size),
-                    "timestamp": snapshot.latest_trade.timestamp.isoformat(),
-                } if snapshot.latest_trade else None,
-                "latest_quote": {
-                    "bid_price": float(snapshot.latest_quote.bid_price),
-                    "bid_size": int(snapshot.latest_quote.bid_size),
-                    "ask_price": float(snapshot.latest_quote.ask_price),
-                    "ask_size": int(snapshot.latest_quote.ask_size),
-                    "timestamp": snapshot.latest_quote.timestamp.isoformat(),
-                } if snapshot.latest_quote else None,
-                "minute_bar": {
-                    "open": float(snapshot.minute_bar.open),
-                    "high": float(snapshot.minute_bar.high),
-                    "low": float(snapshot.minute_bar.low),
-                    "close": float(snapshot.minute_bar.close),
-                    "volume": int(snapshot.minute_bar.volume),
-                    "timestamp": snapshot.minute_bar.timestamp.isoformat(),
-                } if snapshot.minute_bar else None,
-                "daily_bar": {
-                    "open": float(snapshot.daily_bar.open),
-                    "high": float(snapshot.daily_bar.high),
-                    "low": float(snapshot.daily_bar.low),
-                    "close": float(snapshot.daily_bar.close),
-                    "volume": int(snapshot.daily_bar.volume),
-                    "timestamp": snapshot.daily_bar.timestamp.isoformat(),
-                } if snapshot.daily_bar else None,
-                "prev_daily_bar": {
-                    "open": float(snapshot.prev_daily_bar.open),
-                    "high": float(snapshot.prev_daily_bar.high),
-                    "low": float(snapshot.prev_daily_bar.low),
-                    "close": float(snapshot.prev_daily_bar.close),
-                    "volume": int(snapshot.prev_daily_bar.volume),
-                    "timestamp": snapshot.prev_daily_bar.timestamp.isoformat(),
-                } if snapshot.prev_daily_bar else None,
-            }
+            snapshot_data = self._snapshot_data(symbol, snapshots[symbol])
             
             await cache.set(cache_key, snapshot_data, ttl=2)
             logger.info(f"Fetched snapshot for {symbol}")
@@ -339,6 +333,89 @@ class AlpacaMarketData(MarketDataProvider):
         except Exception as e:
             self._handle_error(e, "get_snapshot")
     
+    @staticmethod
+    def _snapshot_data(symbol: str, snapshot) -> Dict[str, Any]:
+        """Convert an Alpaca snapshot to a dictionary."""
+        return {
+            "symbol": symbol,
+            "latest_trade": {
+                "price": float(snapshot.latest_trade.price),
+                "size": int(snapshot.latest_trade.size),
+                "timestamp": snapshot.latest_trade.timestamp.isoformat(),
+            } if snapshot.latest_trade else None,
+            "latest_quote": {
+                "bid_price": float(snapshot.latest_quote.bid_price),
+                "bid_size": int(snapshot.latest_quote.bid_size),
+                "ask_price": float(snapshot.latest_quote.ask_price),
+                "ask_size": int(snapshot.latest_quote.ask_size),
+                "timestamp": snapshot.latest_quote.timestamp.isoformat(),
+            } if snapshot.latest_quote else None,
+            "minute_bar": {
+                "open": float(snapshot.minute_bar.open),
+                "high": float(snapshot.minute_bar.high),
+                "low": float(snapshot.minute_bar.low),
+                "close": float(snapshot.minute_bar.close),
+                "volume": int(snapshot.minute_bar.volume),
+                "timestamp": snapshot.minute_bar.timestamp.isoformat(),
+            } if snapshot.minute_bar else None,
+            "daily_bar": {
+                "open": float(snapshot.daily_bar.open),
+                "high": float(snapshot.daily_bar.high),
+                "low": float(snapshot.daily_bar.low),
+                "close": float(snapshot.daily_bar.close),
+                "volume": int(snapshot.daily_bar.volume),
+                "timestamp": snapshot.daily_bar.timestamp.isoformat(),
+            } if snapshot.daily_bar else None,
+            "prev_daily_bar": {
+                "open": float(snapshot.prev_daily_bar.open),
+                "high": float(snapshot.prev_daily_bar.high),
+                "low": float(snapshot.prev_daily_bar.low),
+                "close": float(snapshot.prev_daily_bar.close),
+                "volume": int(snapshot.prev_daily_bar.volume),
+                "timestamp": snapshot.prev_daily_bar.timestamp.isoformat(),
+            } if snapshot.prev_daily_bar else None,
+        }
+    
+    async def get_snapshots(self, symbols: List[str], use_cache: bool = True) -> Dict[str, Dict[str, Any]]:
+        """
+        Get market snapshots for many symbols with one request.
+        
+        Args:
+            symbols: Stock symbols
+            use_cache: Whether to use cached snapshots (default: True, 2s TTL)
+            
+        Returns:
+            Dictionary mapping symbol to snapshot data (symbols without data are omitted)
+        """
+        cache = get_cache_manager()
+        results: Dict[str, Dict[str, Any]] = {}
+        missing = []
+        for symbol in dict.fromkeys(symbols):
+            cached_data = await cache.get(f"alpaca:snapshot:{symbol}") if use_cache else None
+            if cached_data:
+                results[symbol] = cached_data
+            else:
+                missing.append(symbol)
+        
+        if not missing:
+            return results
+        
+        try:
+            request = StockSnapshotRequest(symbol_or_symbols=missing)
+            snapshots = self._client.get_stock_snapshot(request)
+            
+            for symbol, snapshot in snapshots.items():
+                if snapshot is None:
+                    continue
+                results[symbol] = self._snapshot_data(symbol, snapshot)
+                await cache.set(f"alpaca:snapshot:{symbol}", results[symbol], ttl=2)
+            
+            logger.info(f"Fetched snapshots for {len(missing)} symbols")
+            return results
+            
+        except Exception as e:
+            self._handle_error(e, "get_snapshots")
+    
     def _parse_timeframe(self, timeframe: str) -> TimeFrame:
         """
         Parse timeframe string to TimeFrame object.
@@ -434,19 +511,25 @@ class AlpacaMarketData(MarketDataProvider):
 
 
 # Global instance getter
-_market_data_client: Optional[AlpacaMarketData] = None
+_market_data_client: Optional[MarketDataProvider] = None
 
 
-def get_market_data_client() -> AlpacaMarketData:
+def get_market_data_client() -> MarketDataProvider:
     """
     Get or create singleton market data client instance.
     
+    Uses the provider selected by MARKET_DATA_PROVIDER.
+    
     Returns:
-        AlpacaMarketData instance
+        AlpacaMarketData (default) or SyntheticMarketDataProvider instance
     """
     global _market_data_client
     if _market_data_client is None:
-        _market_data_client = AlpacaMarketData()
+        if settings.MARKET_DATA_PROVIDER.lower() == "synthetic":
+            from app.integrations.synthetic_market_data import SyntheticMarketDataProvider
+            _market_data_client = SyntheticMarketDataProvider()
+        else:
+            _market_data_client = AlpacaMarketData()
     return _market_data_client
 
 
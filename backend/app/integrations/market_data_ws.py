@@ -60,14 +60,9 @@ class AlpacaStreamClient:
             self._stream = StockDataStream(
                 api_key=settings.ALPACA_API_KEY,
                 secret_key=settings.ALPACA_SECRET_KEY,
-                url_override=None,  # Use default for data stream
+                url_override=settings.ALPACA_STREAM_URL,
             )
             
-            # Register internal handlers
-            self._stream._handlers["bars"] = self._handle_bar
-            self._stream._handlers["quotes"] = self._handle_quote
-            self._stream._handlers["trades"] = self._handle_trade
-            
             # Start the stream in background
             asyncio.create_task(self._run_stream())
             
@@ -2,8 +2,9 @@
 Order execution service with validation and error handling.
 Provides order placement, modification, and cancellation via Alpaca.
 """
+import asyncio
 import logging
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 from abc import ABC, abstractmethod
 
 from alpaca.trading.client import TradingClient
@@ -22,13 +23,30 @@ from alpaca.common.exceptions import APIError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
-from app.integrations.alpaca_client import get_alpaca_client
-from app.services.risk_manager import RiskManager
+from app.integrations.alpaca_client import AlpacaClient, get_alpaca_client
+from app.integrations.market_data import get_market_data_client
+from app.services.risk_snapshot import get_risk_snapshot_service
 from app.services.notification_service import NotificationService
 from app.models.notification import NotificationType
+from app.models.enums import RiskRuleAction
 
 logger = logging.getLogger(__name__)
 
+# Order arguments a basket leg may set, with place_order's defaults
+BASKET_LEG_DEFAULTS = {
+    "qty": None,
+    "notional": None,
+    "side": "buy",
+    "order_type": "market",
+    "time_in_force": "day",
+    "limit_price": None,
+    "stop_price": None,
+    "trail_price": None,
+    "trail_percent": None,
+    "extended_hours": False,
+    "client_order_id": None,
+}
+
 
 class OrderExecutionError(Exception):
     """Custom exception for order execution errors."""
@@ -151,25 +169,35 @@ class AlpacaOrderExecutor(OrderExecutor):
     """
     Alpaca order execution implementation with validation and error handling.
     Includes risk management integration.
-    """
-    
-    _instance: Optional['AlpacaOrderExecutor'] = None
-    
-    def __new__(cls):
-        """Singleton pattern implementation."""
-        if cls._instance is None:
-            cls._instance = super().__new__(cls)
-        return cls._instance
     
-    def __init__(self):
-        """Initialize Alpaca order executor."""
-        self._alpaca_client = get_alpaca_client()
-        self._db_session: Optional[AsyncSession] = None
-        logger.info("AlpacaOrderExecutor initialized")
+    An executor is the execution context of one request or background task:
+    it carries that caller's database session, user and broker client, so
+    concurrent callers never share a session. Executors are cheap to create;
+    unless one is passed in, the broker client (and its HTTP connection
+    pool) is the shared AlpacaClient.
+    """
     
-    def set_db_session(self, db: AsyncSession):
-        """Set database session for risk checks."""
+    def __init__(
+        self,
+        db: Optional[AsyncSession] = None,
+        alpaca_client: Optional[AlpacaClient] = None,
+        user_id: Optional[str] = None,
+    ):
+        """
+        Initialize Alpaca order executor.
+        
+        Args:
+            db: Database session for risk checks and notifications
+            alpaca_client: Broker client (defaults to the shared client)
+            user_id: User that orders are placed for unless given per call
+        """
+        self._alpaca_client = alpaca_client or get_alpaca_client()
         self._db_session = db
+        self.user_id = user_id
+    
+    async def _broker_call(self, method, *args, **kwargs):
+        """Run a blocking broker client call in a worker thread."""
+        return await asyncio.to_thread(method, *args, **kwargs)
     
     def _handle_error(self, error: Exception, operation: str) -> None:
         """Centralized error handling for order operations."""
@@ -216,13 +244,15 @@ class AlpacaOrderExecutor(OrderExecutor):
             trail_percent: Trail percentage for trailing stop
             extended_hours: Allow extended hours trading
             client_order_id: Client-specified order ID
-            user_id: User ID for risk checks
+            user_id: User ID for risk checks (defaults to the executor's user)
             strategy_id: Strategy ID for risk checks
             skip_risk_check: Skip risk evaluation (use with caution)
             
         Returns:
             Order details dictionary
         """
+        if user_id is None:
+            user_id = self.user_id
         try:
             # Risk check integration
             if not skip_risk_check and user_id and self._db_session:
@@ -235,56 +265,23 @@ class AlpacaOrderExecutor(OrderExecutor):
                     side=side,
                     limit_price=limit_price
                 )
-            # Validate inputs
-            if qty is None and notional is None:
-                raise OrderExecutionError("Either qty or notional must be provided")
-            
-            # Convert string enums
-            alpaca_side = OrderSide.BUY if side.lower() == "buy" else OrderSide.SELL
-            alpaca_tif = TimeInForce[time_in_force.upper()]
-            
-            # Build order request based on type
-            order_data = {
-                "symbol": symbol,
-                "side": alpaca_side,
-                "time_in_force": alpaca_tif,
-                "extended_hours": extended_hours,
-            }
-            
-            if qty is not None:
-                order_data["qty"] = qty
-            if notional is not None:
-                order_data["notional"] = notional
-            if client_order_id:
-                order_data["client_order_id"] = client_order_id
-            
-            # Create appropriate order request
-            if order_type.lower() == "market":
-                order_request = MarketOrderRequest(**order_data)
-            elif order_type.lower() == "limit":
-                if limit_price is None:
-                    raise OrderExecutionError("limit_price required for limit orders")
-                order_request = LimitOrderRequest(**order_data, limit_price=limit_price)
-            elif order_type.lower() == "stop":
-                if stop_price is None:
-                    raise OrderExecutionError("stop_price required for stop orders")
-                order_request = StopOrderRequest(**order_data, stop_price=stop_price)
-            elif order_type.lower() == "stop_limit":
-                if limit_price is None or stop_price is None:
-                    raise OrderExecutionError("limit_price and stop_price required for stop_limit orders")
-                order_request = StopLimitOrderRequest(**order_data, limit_price=limit_price, stop_price=stop_price)
-            elif order_type.lower() == "trailing_stop":
-                trail_data = order_data.copy()
-                if trail_price:
-                    trail_data["trail_price"] = trail_price
-                if trail_percent:
-                    trail_data["trail_percent"] = trail_percent
-                order_request = TrailingStopOrderRequest(**trail_data)
-            else:
-                raise OrderExecutionError(f"Invalid order type: {order_type}")
+            order_request = self._build_order_request(
+                symbol=symbol,
+                qty=qty,
+                notional=notional,
+                side=side,
+                order_type=order_type,
+                time_in_force=time_in_force,
+                limit_price=limit_price,
+                stop_price=stop_price,
+                trail_price=trail_price,
+                trail_percent=trail_percent,
+                extended_hours=extended_hours,
+                client_order_id=client_order_id,
+            )
             
             # Submit order via Alpaca client
-            order = self._alpaca_client._client.submit_order(order_request)
+            order = await self._broker_call(self._alpaca_client._client.submit_order, order_request)
             
             # Convert to dict
             order_dict = self._order_to_dict(order)
@@ -302,6 +299,161 @@ class AlpacaOrderExecutor(OrderExecutor):
         except Exception as e:
             self._handle_error(e, "place_order")
     
+    async def place_basket(
+        self,
+        legs: List[Dict[str, Any]],
+        user_id: Optional[int] = None,
+        strategy_id: Optional[int] = None,
+        skip_risk_check: bool = False,
+        max_concurrency: int = 10,
+    ) -> Dict[str, Any]:
+        """
+        Place a basket of orders.
+        
+        The whole basket is validated and risk-checked before anything is
+        submitted. Valid, unblocked legs are then submitted concurrently under
+        the client's shared rate limit; a leg that fails does not affect the
+        others.
+        
+        Args:
+            legs: Orders, each with place_order's order arguments (symbol,
+                qty or notional, side, order_type, ...) and optionally its
+                own strategy_id
+            user_id: User ID for risk checks and notifications (defaults to
+                the executor's user)
+            strategy_id: Strategy ID for risk checks of legs without their own
+            skip_risk_check: Skip risk evaluation (use with caution)
+            max_concurrency: Maximum number of orders in flight
+            
+        Returns:
+            Basket summary with per-leg results in request order. Each leg's
+            status is "submitted", "rejected" (invalid), "blocked" (risk
+            rule) or "failed" (broker error).
+        """
+        if user_id is None:
+            user_id = self.user_id
+        params = {}
+        requests = {}
+        results = []
+        for i, leg in enumerate(legs):
+            leg_params = {**BASKET_LEG_DEFAULTS, **{k: v for k, v in leg.items() if k in BASKET_LEG_DEFAULTS}}
+            leg_params["symbol"] = leg.get("symbol")
+            leg_params["strategy_id"] = leg.get("strategy_id", strategy_id)
+            params[i] = leg_params
+            results.append({"index": i, "symbol": leg_params["symbol"], "status": None})
+            try:
+                requests[i] = self._build_order_request(
+                    **{k: v for k, v in leg_params.items() if k != "strategy_id"}
+                )
+            except Exception as e:
+                results[i].update(status="rejected", error=getattr(e, "message", str(e)))
+        
+        # Risk check the valid legs together
+        if not skip_risk_check and user_id and self._db_session and requests:
+            blocked = await self._evaluate_basket_risk(user_id, {i: params[i] for i in requests})
+            for i, breaches in blocked.items():
+                results[i].update(status="blocked", error="; ".join(b.message for b in breaches))
+                del requests[i]
+        
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def submit(i: int, order_request: AlpacaOrderRequest):
+            async with semaphore:
+                await self._alpaca_client.throttle()
+                try:
+                    order = await self._broker_call(self._alpaca_client._client.submit_order, order_request)
+                    results[i].update(status="submitted", order=self._order_to_dict(order))
+                except Exception as e:
+                    logger.error(f"Basket leg {i} ({params[i]['symbol']}) failed: {e}")
+                    results[i].update(status="failed", error=str(e))
+        
+        await asyncio.gather(*(submit(i, r) for i, r in requests.items()))
+        
+        summary = {
+            "total": len(legs),
+            **{key: sum(1 for r in results if r["status"] == key)
+               for key in ("submitted", "rejected", "blocked", "failed")},
+            "legs": results,
+        }
+        logger.info(
+            f"Basket placed: {summary['submitted']}/{summary['total']} submitted, "
+            f"{summary['blocked']} blocked, {summary['rejected']} rejected, {summary['failed']} failed"
+        )
+        
+        if user_id and self._db_session and summary["submitted"]:
+            await self._send_basket_notification(user_id, summary)
+        
+        return summary
+    
+    def _build_order_request(
+        self,
+        symbol: str,
+        qty: Optional[float],
+        notional: Optional[float],
+        side: str,
+        order_type: str,
+        time_in_force: str,
+        limit_price: Optional[float] = None,
+        stop_price: Optional[float] = None,
+        trail_price: Optional[float] = None,
+        trail_percent: Optional[float] = None,
+        extended_hours: bool = False,
+        client_order_id: Optional[str] = None,
+    ) -> AlpacaOrderRequest:
+        """
+        Validate order parameters and build the Alpaca order request.
+        Raises OrderExecutionError if the parameters are invalid.
+        """
+        # Validate inputs
+        if qty is None and notional is None:
+            raise OrderExecutionError("Either qty or notional must be provided")
+        
+        # Convert string enums
+        alpaca_side = OrderSide.BUY if side.lower() == "buy" else OrderSide.SELL
+        alpaca_tif = TimeInForce[time_in_force.upper()]
+        
+        # Build order request based on type
+        order_data = {
+            "symbol": symbol,
+            "side": alpaca_side,
+            "time_in_force": alpaca_tif,
+            "extended_hours": extended_hours,
+        }
+        
+        if qty is not None:
+            order_data["qty"] = qty
+        if notional is not None:
+            order_data["notional"] = notional
+        if client_order_id:
+            order_data["client_order_id"] = client_order_id
+        
+        # Create appropriate order request
+        if order_type.lower() == "market":
+            order_request = MarketOrderRequest(**order_data)
+        elif order_type.lower() == "limit":
+            if limit_price is None:
+                raise OrderExecutionError("limit_price required for limit orders")
+            order_request = LimitOrderRequest(**order_data, limit_price=limit_price)
+        elif order_type.lower() == "stop":
+            if stop_price is None:
+                raise OrderExecutionError("stop_price required for stop orders")
+            order_request = StopOrderRequest(**order_data, stop_price=stop_price)
+        elif order_type.lower() == "stop_limit":
+            if limit_price is None or stop_price is None:
+                raise OrderExecutionError("limit_price and stop_price required for stop_limit orders")
+            order_request = StopLimitOrderRequest(**order_data, limit_price=limit_price, stop_price=stop_price)
+        elif order_type.lower() == "trailing_stop":
+            trail_data = order_data.copy()
+            if trail_price:
+                trail_data["trail_price"] = trail_price
+            if trail_percent:
+                trail_data["trail_percent"] = trail_percent
+            order_request = TrailingStopOrderRequest(**trail_data)
+        else:
+            raise OrderExecutionError(f"Invalid order type: {order_type}")
+        
+        return order_request
+    
     async def _evaluate_risk_rules(
         self,
         user_id: int,
@@ -317,7 +469,7 @@ class AlpacaOrderExecutor(OrderExecutor):
         Raises OrderExecutionError if any blocking rules are breached.
         """
         try:
-            risk_manager = RiskManager(self._db_session, self._alpaca_client)
+            risk_snapshots = get_risk_snapshot_service()
             
             # Calculate order value
             order_value = notional
@@ -326,25 +478,28 @@ class AlpacaOrderExecutor(OrderExecutor):
                 if limit_price:
                     order_value = qty * limit_price
                 else:
-                    # Get latest trade price
-                    try:
-                        latest_trade = self._alpaca_client.get_latest_trade(symbol)
-                        order_value = qty * float(latest_trade.price)
-                    except Exception:
-                        logger.warning(f"Could not get price for {symbol}, skipping value-based risk checks")
-                        order_value = None
-            
-            # Evaluate rules
-            breaches = await risk_manager.evaluate_rules(
+                    # Held symbols are priced from the snapshot, others from the latest quote
+                    price = risk_snapshots.last_price(user_id, symbol)
+                    if price is None:
+                        try:
+                            quote = await get_market_data_client().get_latest_quote(symbol)
+                            price = quote["ask_price"] if side.lower() == "buy" else quote["bid_price"]
+                        except Exception:
+                            logger.warning(f"Could not get price for {symbol}, skipping value-based risk checks")
+                    order_value = qty * price if price else None
+            
+            # Evaluate rules in memory against the cached account snapshot
+            breaches = await risk_snapshots.evaluate(
                 user_id=user_id,
+                db=self._db_session,
+                alpaca_client=self._alpaca_client,
                 strategy_id=strategy_id,
-                symbol=symbol,
-                order_qty=qty,
                 order_value=order_value
             )
+            await risk_snapshots.record_breaches(self._db_session, breaches)
             
             # Check for blocking breaches
-            blocking_breaches = [b for b in breaches if b.action == "BLOCK"]
+            blocking_breaches = [b for b in breaches if b.action == RiskRuleAction.BLOCK]
             if blocking_breaches:
                 breach_messages = [b.message for b in blocking_breaches]
                 error_msg = f"Order blocked by risk rules: {'; '.join(breach_messages)}"
@@ -360,7 +515,7 @@ class AlpacaOrderExecutor(OrderExecutor):
                             {
                                 "rule_name": b.rule_name,
                                 "message": b.message,
-                                "threshold": float(b.threshold),
+                                "threshold": float(b.threshold_value),
                                 "current_value": float(b.current_value)
                             }
                             for b in blocking_breaches
@@ -371,7 +526,7 @@ class AlpacaOrderExecutor(OrderExecutor):
                 raise OrderExecutionError(error_msg, status_code=403)
             
             # Log warnings for non-blocking breaches
-            warning_breaches = [b for b in breaches if b.action == "WARN"]
+            warning_breaches = [b for b in breaches if b.action == RiskRuleAction.ALERT]
             if warning_breaches:
                 for breach in warning_breaches:
                     logger.warning(f"Risk warning: {breach.message}")
@@ -386,7 +541,7 @@ class AlpacaOrderExecutor(OrderExecutor):
                             {
                                 "rule_name": b.rule_name,
                                 "message": b.message,
-                                "threshold": float(b.threshold),
+                                "threshold": float(b.threshold_value),
                                 "current_value": float(b.current_value)
                             }
                             for b in warning_breaches
@@ -401,6 +556,107 @@ class AlpacaOrderExecutor(OrderExecutor):
             logger.error(f"Error evaluating risk rules: {str(e)}")
             # Don't block order on risk check errors, just log
     
+    async def _evaluate_basket_risk(
+        self,
+        user_id: int,
+        legs: Dict[int, Dict[str, Any]]
+    ) -> Dict[int, List[Any]]:
+        """
+        Evaluate risk rules for every leg of a basket.
+        
+        Rules and the account snapshot are loaded once and the legs priced
+        with one multi-symbol quote request; each leg is then checked in
+        memory against the snapshot plus the legs accepted before it, so
+        legs that fit separately cannot breach a limit together. Returns the
+        blocking breaches of each blocked leg.
+        """
+        blocked = {}
+        try:
+            risk_snapshots = get_risk_snapshot_service()
+            await risk_snapshots.load_rules(user_id, self._db_session)
+            await risk_snapshots.ensure_snapshot(user_id, self._alpaca_client)
+            prices = await self._basket_prices(user_id, legs)
+            
+            basket = []
+            for i, leg in legs.items():
+                order_value = leg["notional"]
+                if order_value is None and leg["qty"]:
+                    price = leg["limit_price"] or prices.get(i)
+                    order_value = leg["qty"] * price if price else None
+                if order_value is not None and leg["side"].lower() != "buy":
+                    order_value = -order_value
+                basket.append((leg["strategy_id"], leg["symbol"], order_value))
+            
+            # Legs are checked in order against the exposure of the legs accepted before them
+            all_breaches = []
+            warning_breaches = []
+            for i, breaches in zip(legs, risk_snapshots.check_basket(user_id, basket)):
+                all_breaches.extend(breaches)
+                blocking = [b for b in breaches if b.action == RiskRuleAction.BLOCK]
+                if blocking:
+                    blocked[i] = blocking
+                warning_breaches.extend(b for b in breaches if b.action == RiskRuleAction.ALERT)
+            
+            await risk_snapshots.record_breaches(self._db_session, all_breaches)
+            
+            for breach in {b.rule_id: b for b in warning_breaches}.values():
+                logger.warning(f"Risk warning: {breach.message}")
+            
+            if blocked:
+                logger.warning(f"{len(blocked)} basket legs blocked by risk rules")
+                notification_service = NotificationService(self._db_session)
+                await notification_service.notify_risk_breach(
+                    user_id=user_id,
+                    breach_data={
+                        "symbols": [legs[i]["symbol"] for i in blocked],
+                        "rule_breaches": [
+                            {
+                                "symbol": legs[i]["symbol"],
+                                "rule_name": b.rule_name,
+                                "message": b.message,
+                                "threshold": float(b.threshold_value),
+                                "current_value": float(b.current_value)
+                            }
+                            for i, breaches in blocked.items() for b in breaches
+                        ]
+                    }
+                )
+        
+        except Exception as e:
+            logger.error(f"Error evaluating basket risk rules: {e}")
+            # Don't block the basket on risk evaluation errors, just log
+        
+        return blocked
+    
+    async def _basket_prices(self, user_id: int, legs: Dict[int, Dict[str, Any]]) -> Dict[int, float]:
+        """Price legs without a notional or limit price: snapshot first, then one quote request."""
+        risk_snapshots = get_risk_snapshot_service()
+        prices = {}
+        unpriced = {}
+        for i, leg in legs.items():
+            if leg["notional"] is not None or leg["limit_price"]:
+                continue
+            price = risk_snapshots.last_price(user_id, leg["symbol"])
+            if price is None:
+                unpriced[i] = leg
+            else:
+                prices[i] = price
+        
+        if unpriced:
+            try:
+                quotes = await get_market_data_client().get_multi_quotes(
+                    sorted({leg["symbol"] for leg in unpriced.values()})
+                )
+                quotes = {q["symbol"]: q for q in quotes}
+                for i, leg in unpriced.items():
+                    quote = quotes.get(leg["symbol"])
+                    if quote:
+                        prices[i] = quote["ask_price"] if leg["side"].lower() == "buy" else quote["bid_price"]
+            except Exception:
+                logger.warning("Could not get basket quotes, skipping value-based risk checks")
+        
+        return prices
+    
     async def _send_order_notification(self, user_id: int, order_dict: Dict[str, Any], action: str):
         """Send notification about order action."""
         try:
@@ -421,7 +677,7 @@ class AlpacaOrderExecutor(OrderExecutor):
     async def cancel_order(self, order_id: str) -> bool:
         """Cancel an open order."""
         try:
-            self._alpaca_client._client.cancel_order_by_id(order_id)
+            await self._broker_call(self._alpaca_client._client.cancel_order_by_id, order_id)
             logger.info(f"Order canceled: {order_id}")
             return True
         except Exception as e:
@@ -454,7 +710,7 @@ class AlpacaOrderExecutor(OrderExecutor):
                 replace_data["client_order_id"] = client_order_id
             
             request = ReplaceOrderRequest(**replace_data)
-            order = self._alpaca_client._client.replace_order_by_id(order_id, request)
+            order = await self._broker_call(self._alpaca_client._client.replace_order_by_id, order_id, request)
             
             logger.info(f"Order replaced: {order_id}")
             return self._order_to_dict(order)
@@ -465,7 +721,7 @@ class AlpacaOrderExecutor(OrderExecutor):
     async def cancel_all_orders(self) -> int:
         """Cancel all open orders."""
         try:
-            result = self._alpaca_client._client.cancel_orders()
+            result = await self._broker_call(self._alpaca_client._client.cancel_orders)
             count = len(result) if result else 0
             logger.info(f"Canceled {count} orders")
             return count
@@ -487,7 +743,7 @@ class AlpacaOrderExecutor(OrderExecutor):
                 close_data["percentage"] = str(percentage)
             
             request = ClosePositionRequest(**close_data) if close_data else None
-            order = self._alpaca_client._client.close_position(symbol, close_options=request)
+            order = await self._broker_call(self._alpaca_client._client.close_position, symbol, close_options=request)
             
             logger.info(f"Position closed for {symbol}")
             return self._order_to_dict(order)
@@ -498,7 +754,7 @@ class AlpacaOrderExecutor(OrderExecutor):
     async def close_all_positions(self, cancel_orders: bool = True) -> int:
         """Close all open positions."""
         try:
-            result = self._alpaca_client._client.close_all_positions(cancel_orders=cancel_orders)
+            result = await self._broker_call(self._alpaca_client._client.close_all_positions, cancel_orders=cancel_orders)
             count = len(result) if result else 0
             logger.info(f"Closed {count} positions")
             return count
@@ -552,7 +808,7 @@ class AlpacaOrderExecutor(OrderExecutor):
             else:
                 order_request = MarketOrderRequest(**order_data)
             
-            order = self._alpaca_client._client.submit_order(order_request)
+            order = await self._broker_call(self._alpaca_client._client.submit_order, order_request)
             
             logger.info(f"Bracket order placed for {symbol}")
             return self._order_to_dict(order)
@@ -560,6 +816,27 @@ class AlpacaOrderExecutor(OrderExecutor):
         except Exception as e:
             self._handle_error(e, "place_bracket_order")
     
+    async def _send_basket_notification(self, user_id: int, summary: Dict[str, Any]):
+        """Send one notification summarizing a basket."""
+        try:
+            notification_service = NotificationService(self._db_session)
+            submitted = [leg["order"] for leg in summary["legs"] if leg["status"] == "submitted"]
+            not_submitted = summary["total"] - summary["submitted"]
+            await notification_service.create_notification(
+                user_id=user_id,
+                notification_type=NotificationType.ORDER_FILLED,
+                title=f"Basket Placed: {summary['submitted']} orders",
+                message=(
+                    f"Submitted {summary['submitted']} of {summary['total']} orders"
+                    + (f" ({not_submitted} not submitted)" if not_submitted else "")
+                    + f": {', '.join(o['symbol'] for o in submitted)}"
+                ),
+                priority="MEDIUM",
+                data={k: v for k, v in summary.items() if k != "legs"}
+            )
+        except Exception as e:
+            logger.error(f"Failed to send basket notification: {e}")
+    
     def _order_to_dict(self, order) -> Dict[str, Any]:
         """Convert Alpaca order object to dictionary."""
         return {
@@ -596,17 +873,33 @@ class AlpacaOrderExecutor(OrderExecutor):
         }
 
 
-# Global instance getter
+# Shared executor without a session or user
 _order_executor: Optional[AlpacaOrderExecutor] = None
 
 
-def get_order_executor() -> AlpacaOrderExecutor:
+def get_order_executor(
+    db: Optional[AsyncSession] = None,
+    user_id: Optional[str] = None,
+    alpaca_client: Optional[AlpacaClient] = None,
+) -> AlpacaOrderExecutor:
     """
-    Get or create singleton order executor instance.
+    Get an order executor for the caller's execution context.
+    
+    With a session, user or broker client, returns a new executor bound to
+    them; otherwise returns the shared executor, which holds no per-caller
+    state.
+    
+    Args:
+        db: Database session of the request or task
+        user_id: User the orders are placed for
+        alpaca_client: Broker client (defaults to the shared client)
     
     Returns:
         AlpacaOrderExecutor instance
     """
+    if db is not None or user_id is not None or alpaca_client is not None:
+        return AlpacaOrderExecutor(db=db, alpaca_client=alpaca_client, user_id=user_id)
+    
     global _order_executor
     if _order_executor is None:
         _order_executor = AlpacaOrderExecutor()
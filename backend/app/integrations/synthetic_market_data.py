@@ -0,0 +1,202 @@
+"""
+Synthetic market data provider.
+Serves generated OHLCV data through the MarketDataProvider interface so the
+backend can run backtests, scheduler checks and load tests without network
+access. Enable with MARKET_DATA_PROVIDER=synthetic.
+"""
+import logging
+import sys
+from pathlib import Path
+from typing import Optional, List, Dict, Any
+from datetime import datetime, timedelta, timezone
+
+import pandas as pd
+
+from app.integrations.market_data import MarketDataProvider, MarketDataError
+
+# Add project root to path for src imports
+project_root = Path(__file__).resolve().parent.parent.parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from src.data.synthetic_data import SyntheticMarketData
+
+logger = logging.getLogger(__name__)
+
+# Backend timeframe names -> generator timeframes
+TIMEFRAME_MAP = {
+    "1Min": "1Min",
+    "5Min": "5Min",
+    "15Min": "15Min",
+    "1Hour": "1H",
+    "1Day": "1D",
+}
+
+
+class SyntheticMarketDataProvider(MarketDataProvider):
+    """
+    Market data provider backed by SyntheticMarketData.
+
+    Responses have the same shape as AlpacaMarketData. Latest trades and
+    quotes come from the most recent generated daily close.
+    """
+
+    source_name = "synthetic"
+
+    def __init__(
+        self,
+        generator: Optional[SyntheticMarketData] = None,
+        spread_bps: float = 2.0
+    ):
+        """
+        Initialize synthetic provider.
+
+        Args:
+            generator: Data generator (defaults to SyntheticMarketData())
+            spread_bps: Bid/ask spread in basis points for quotes
+        """
+        self.generator = generator or SyntheticMarketData()
+        self.spread_bps = spread_bps
+
+    def _frame(
+        self,
+        symbol: str,
+        timeframe: str,
+        start: datetime,
+        end: datetime
+    ) -> pd.DataFrame:
+        if timeframe not in TIMEFRAME_MAP:
+            raise MarketDataError(
+                f"Invalid timeframe: {timeframe}. Must be one of {list(TIMEFRAME_MAP.keys())}"
+            )
+        df = self.generator.get_bars(symbol, start, end, TIMEFRAME_MAP[timeframe])
+        # Intraday bars are generated per session; trim to the exact range
+        return df[(df.index >= pd.Timestamp(start)) & (df.index <= pd.Timestamp(end))]
+
+    async def get_bars(
+        self,
+        symbol: str,
+        timeframe: str = "1Day",
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+        limit: int = 100,
+        use_cache: bool = True
+    ) -> List[Dict[str, Any]]:
+        """
+        Get generated bars for a symbol.
+
+        Args:
+            symbol: Stock symbol
+            timeframe: Bar timeframe (1Min, 5Min, 15Min, 1Hour, 1Day)
+            start: Start time for bars
+            end: End time for bars
+            limit: Maximum number of bars to return
+            use_cache: Ignored; generated data needs no caching
+
+        Returns:
+            List of bar data dictionaries
+        """
+        if end is None:
+            end = datetime.now(timezone.utc)
+        if start is None:
+            start = end - timedelta(days=30)
+        if start.tzinfo is None:
+            start = start.replace(tzinfo=timezone.utc)
+        if end.tzinfo is None:
+            end = end.replace(tzinfo=timezone.utc)
+
+        df = self._frame(symbol, timeframe, start, end)
+        if limit:
+            df = df.iloc[:limit]
+
+        vwap = (df["high"] + df["low"] + df["close"]) / 3
+        return [
+            {
+                "symbol": symbol,
+                "timestamp": row.Index.isoformat(),
+                "open": float(row.open),
+                "high": float(row.high),
+                "low": float(row.low),
+                "close": float(row.close),
+                "volume": int(row.volume),
+                "trade_count": None,
+                "vwap": float(row.vwap),
+            }
+            for row in df.assign(vwap=vwap).itertuples()
+        ]
+
+    def _recent_daily(self, symbol: str) -> pd.DataFrame:
+        end = datetime.now(timezone.utc)
+        return self._frame(symbol, "1Day", end - timedelta(days=10), end)
+
+    def _quote(self, symbol: str, price: float, timestamp: pd.Timestamp) -> Dict[str, Any]:
+        half_spread = price * self.spread_bps / 20000
+        return {
+            "symbol": symbol,
+            "bid_price": round(price - half_spread, 4),
+            "bid_size": 100,
+            "ask_price": round(price + half_spread, 4),
+            "ask_size": 100,
+            "timestamp": timestamp.isoformat(),
+            "conditions": None,
+            "tape": None,
+        }
+
+    async def get_latest_quote(self, symbol: str, use_cache: bool = True) -> Dict[str, Any]:
+        """Get a quote around the latest generated close."""
+        daily = self._recent_daily(symbol)
+        return self._quote(symbol, float(daily["close"].iloc[-1]), daily.index[-1])
+
+    async def get_latest_trade(self, symbol: str, use_cache: bool = True) -> Dict[str, Any]:
+        """Get the latest generated close as a trade."""
+        daily = self._recent_daily(symbol)
+        return {
+            "symbol": symbol,
+            "price": float(daily["close"].iloc[-1]),
+            "size": 100,
+            "timestamp": daily.index[-1].isoformat(),
+            "exchange": None,
+            "conditions": None,
+            "id": None,
+            "tape": None,
+        }
+
+    async def get_snapshot(self, symbol: str, use_cache: bool = True) -> Dict[str, Any]:
+        """Get a snapshot built from the last two generated daily bars."""
+        daily = self._recent_daily(symbol)
+
+        def bar(i: int) -> Dict[str, Any]:
+            row = daily.iloc[i]
+            return {
+                "open": float(row["open"]),
+                "high": float(row["high"]),
+                "low": float(row["low"]),
+                "close": float(row["close"]),
+                "volume": int(row["volume"]),
+                "timestamp": daily.index[i].isoformat(),
+            }
+
+        price = float(daily["close"].iloc[-1])
+        return {
+            "symbol": symbol,
+            "latest_trade": {
+                "price": price,
+                "size": 100,
+                "timestamp": daily.index[-1].isoformat(),
+            },
+            "latest_quote": {
+                k: v for k, v in self._quote(symbol, price, daily.index[-1]).items()
+                if k in ("bid_price", "bid_size", "ask_price", "ask_size", "timestamp")
+            },
+            "minute_bar": None,
+            "daily_bar": bar(-1),
+            "prev_daily_bar": bar(-2) if len(daily) > 1 else None,
+        }
+
+    async def get_multi_quotes(self, symbols: List[str]) -> List[Dict[str, Any]]:
+        """Get quotes for multiple symbols."""
+        return [await self.get_latest_quote(symbol) for symbol in symbols]
+
+    async def get_multi_trades(self, symbols: List[str]) -> List[Dict[str, Any]]:
+        """Get latest trades for multiple symbols."""
+        return [await self.get_latest_trade(symbol) for symbol in symbols]
@@ -0,0 +1,430 @@
+"""
+Trade updates stream consumer.
+
+Consumes Alpaca's trade_updates stream and applies order events as they
+happen instead of polling for order status. Events are queued by the stream
+handler and applied in batches: one upsert for the orders in a batch, one
+query and commit for the strategy executions they touch. Each applied event
+is then published to in-process subscribers (e.g. the risk snapshot).
+
+Strategy fills are recorded in the same transaction under their Alpaca
+execution id, so a replayed event is not applied twice. A batch that fails
+to apply is put back at the front of the queue and retried.
+
+Orders placed by strategies carry a client order id made by
+``strategy_client_order_id`` so their fills can be attributed back to the
+strategy's execution state.
+"""
+import asyncio
+import logging
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from alpaca.trading.stream import TradingStream
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.database import get_db_context
+from app.models.order import Order
+from app.models.strategy_execution import StrategyExecution, StrategyFill, ExecutionState
+from app.services.order_sync import OrderSyncService
+from app.services.notification_service import NotificationService
+from app.services.risk_snapshot import get_risk_snapshot_service
+
+logger = logging.getLogger(__name__)
+
+STRATEGY_ORDER_PREFIX = "strat-"
+FILL_EVENTS = {"fill", "partial_fill"}
+
+TradeUpdateCallback = Callable[[Optional[str], Dict[str, Any]], Awaitable[None]]
+
+
+def strategy_client_order_id(strategy_id: str) -> str:
+    """Client order id tagging an order as placed by a strategy."""
+    return f"{STRATEGY_ORDER_PREFIX}{strategy_id}-{uuid.uuid4().hex[:12]}"
+
+
+def parse_strategy_id(client_order_id: Optional[str]) -> Optional[str]:
+    """Strategy id from a client order id made by ``strategy_client_order_id``."""
+    if not client_order_id or not client_order_id.startswith(STRATEGY_ORDER_PREFIX):
+        return None
+    return client_order_id[len(STRATEGY_ORDER_PREFIX):].rsplit("-", 1)[0]
+
+
+def fill_key_for(event: Dict[str, Any]) -> str:
+    """
+    Key identifying a fill event across replays.
+
+    The Alpaca execution id when the event has one, otherwise the order id
+    and the order's cumulative filled quantity after the fill.
+    """
+    if event.get("execution_id"):
+        return str(event["execution_id"])
+    return f"{event['order']['id']}:{float(event['order'].get('filled_qty') or 0.0)}"
+
+
+def apply_strategy_fill(
+    execution: StrategyExecution,
+    side: str,
+    qty: float,
+    price: float,
+    order_done: bool,
+    realized: float,
+) -> float:
+    """
+    Apply one fill to a strategy's position and daily loss counters.
+
+    Args:
+        execution: Strategy execution state
+        side: Order side ("buy" or "sell")
+        qty: Filled quantity of this event
+        price: Fill price of this event
+        order_done: Whether this fill completes the order
+        realized: P&L realized by earlier fills of the same order
+
+    Returns:
+        P&L realized by the order so far, including this fill
+    """
+    position_qty = execution.current_position_qty or 0.0
+
+    if side == "buy":
+        new_qty = position_qty + qty
+        entry = execution.current_position_entry_price or price
+        execution.current_position_entry_price = (position_qty * entry + qty * price) / new_qty
+        execution.current_position_qty = new_qty
+        execution.has_open_position = True
+        return realized
+
+    closed = min(qty, position_qty)
+    if closed > 0 and execution.current_position_entry_price:
+        pnl = (price - execution.current_position_entry_price) * closed
+        realized += pnl
+        if pnl < 0:
+            execution.loss_today += abs(pnl)
+
+    remaining = position_qty - closed
+    if remaining > 1e-9:
+        execution.current_position_qty = remaining
+    else:
+        execution.has_open_position = False
+        execution.current_position_qty = None
+        execution.current_position_entry_price = None
+
+    if order_done and closed > 0:
+        if realized < 0:
+            execution.consecutive_losses += 1
+        else:
+            execution.consecutive_losses = 0  # Reset on profit
+
+    # Check circuit breakers
+    if execution.loss_today >= execution.max_loss_per_day:
+        execution.state = ExecutionState.CIRCUIT_BREAKER
+        logger.warning("Circuit breaker triggered: max loss per day reached")
+    if execution.consecutive_losses >= execution.max_consecutive_losses:
+        execution.state = ExecutionState.CIRCUIT_BREAKER
+        logger.warning("Circuit breaker triggered: max consecutive losses reached")
+
+    return realized
+
+
+class TradeUpdateConsumer:
+    """
+    Persistent trade_updates stream consumer.
+
+    Events queued while a batch is being applied form the next batch, so
+    batches grow with the event rate.
+    """
+
+    def __init__(
+        self,
+        default_user_id: Optional[str] = None,
+        max_batch: int = 500,
+        retry_delay: float = 1.0,
+        session_factory: Callable = get_db_context,
+    ):
+        """
+        Initialize trade update consumer.
+
+        Args:
+            default_user_id: User that orders not yet in the database
+                (placed outside the app) are recorded for
+            max_batch: Maximum number of events applied per batch
+            retry_delay: Seconds to wait before retrying a failed batch
+            session_factory: Async context manager yielding a database session
+        """
+        self.default_user_id = default_user_id
+        self.max_batch = max_batch
+        self.retry_delay = retry_delay
+        self._session_factory = session_factory
+        self._stream: Optional[TradingStream] = None
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._subscribers: List[TradeUpdateCallback] = []
+        self._tasks: List[asyncio.Task] = []
+        self._running = False
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the consumer is applying events."""
+        return self._running
+
+    def subscribe(self, callback: TradeUpdateCallback):
+        """
+        Register an async callback for applied events.
+
+        Args:
+            callback: Called with (user_id, event) for every event
+        """
+        if callback not in self._subscribers:
+            self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: TradeUpdateCallback):
+        """Unregister a callback."""
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    async def start(self, connect: bool = True):
+        """
+        Start applying events.
+
+        Args:
+            connect: Connect to the trade_updates stream; without it events
+                only arrive through ``enqueue``
+        """
+        if self._running:
+            return
+        self._running = True
+        self._tasks.append(asyncio.create_task(self._apply_loop()))
+
+        if connect:
+            self._stream = TradingStream(
+                api_key=settings.ALPACA_API_KEY,
+                secret_key=settings.ALPACA_SECRET_KEY,
+                paper=True,
+                url_override=settings.ALPACA_TRADING_STREAM_URL,
+            )
+            self._stream.subscribe_trade_updates(self._handle_trade_update)
+            self._tasks.append(asyncio.create_task(self._run_stream()))
+        logger.info("Trade update consumer started")
+
+    async def stop(self):
+        """Stop the stream and apply any queued events."""
+        if not self._running:
+            return
+        if self._stream is not None:
+            try:
+                await self._stream.stop_ws()
+            except Exception as e:
+                logger.error(f"Error stopping trade update stream: {e}")
+        self._running = False
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._stream = None
+        await self.flush()
+        logger.info("Trade update consumer stopped")
+
+    async def _run_stream(self):
+        """Run the stream (internal method)."""
+        try:
+            await self._stream._run_forever()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Trade update stream error: {e}")
+
+    async def _handle_trade_update(self, update):
+        """Internal handler for TradeUpdate messages."""
+        try:
+            from app.integrations.order_execution import get_order_executor
+
+            self.enqueue({
+                "event": getattr(update.event, "value", update.event),
+                "order": get_order_executor()._order_to_dict(update.order),
+                "execution_id": str(update.execution_id) if update.execution_id else None,
+                "price": float(update.price) if update.price is not None else None,
+                "qty": float(update.qty) if update.qty is not None else None,
+                "position_qty": float(update.position_qty) if update.position_qty is not None else None,
+                "timestamp": update.timestamp.isoformat(),
+            })
+        except Exception as e:
+            logger.error(f"Error handling trade update: {e}")
+
+    def enqueue(self, event: Dict[str, Any]):
+        """
+        Queue an event for the next batch.
+
+        Args:
+            event: Trade update with ``event``, ``order`` (order dict as
+                returned by the order executor), ``price``, ``qty``,
+                ``position_qty`` and optionally ``execution_id``
+        """
+        self._queue.put_nowait(event)
+
+    async def flush(self) -> int:
+        """Apply all queued events now; returns the number applied."""
+        applied = 0
+        while not self._queue.empty():
+            batch = self._drain()
+            try:
+                await self.apply(batch)
+            except Exception:
+                self._requeue(batch)
+                raise
+            applied += len(batch)
+        return applied
+
+    def _drain(self) -> List[Dict[str, Any]]:
+        batch = []
+        while len(batch) < self.max_batch and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        return batch
+
+    def _requeue(self, batch: List[Dict[str, Any]]):
+        """Put a failed batch back ahead of the events queued since."""
+        pending = []
+        while not self._queue.empty():
+            pending.append(self._queue.get_nowait())
+        for event in batch + pending:
+            self._queue.put_nowait(event)
+
+    async def _apply_loop(self):
+        while True:
+            batch = [await self._queue.get()]
+            batch.extend(self._drain())
+            try:
+                await self.apply(batch)
+            except Exception as e:
+                logger.error(f"Error applying {len(batch)} trade updates, retrying: {e}", exc_info=True)
+                self._requeue(batch)
+                await asyncio.sleep(self.retry_delay)
+
+    async def apply(self, events: List[Dict[str, Any]]):
+        """
+        Apply a batch of events and publish them to subscribers.
+
+        Args:
+            events: Trade update events in stream order
+        """
+        if not events:
+            return
+
+        # Latest state of each order in the batch
+        orders = {e["order"]["id"]: e["order"] for e in events}
+        fills = [e for e in events if e["event"] in FILL_EVENTS and e.get("qty")]
+
+        async with self._session_factory() as db:
+            result = await db.execute(
+                select(Order.alpaca_order_id, Order.user_id)
+                .where(Order.alpaca_order_id.in_(list(orders)))
+            )
+            users = {order_id: user_id for order_id, user_id in result.all()}
+            if self.default_user_id:
+                for order_id in orders:
+                    users.setdefault(order_id, self.default_user_id)
+
+            sync = OrderSyncService(db)
+            await sync.upsert_orders([
+                sync._order_values(users[order_id], order)
+                for order_id, order in orders.items() if order_id in users
+            ])
+
+            await self._apply_strategy_fills(db, fills)
+            await db.commit()
+
+            for event in events:
+                if event["event"] == "fill" and event["order"]["id"] in users:
+                    try:
+                        await NotificationService(db).notify_order_filled(
+                            users[event["order"]["id"]], event["order"]
+                        )
+                    except Exception as e:
+                        logger.error(f"Error sending fill notification: {e}")
+
+        for event in events:
+            user_id = users.get(event["order"]["id"])
+            for callback in self._subscribers:
+                try:
+                    await callback(user_id, event)
+                except Exception as e:
+                    logger.error(f"Error in trade update subscriber: {e}")
+
+        logger.debug(f"Applied {len(events)} trade updates for {len(orders)} orders")
+
+    async def _apply_strategy_fills(self, db, fills: List[Dict[str, Any]]):
+        """Apply fills of strategy orders to their executions, once per fill."""
+        strategy_fills = [
+            (parse_strategy_id(e["order"].get("client_order_id")), e) for e in fills
+        ]
+        strategy_fills = [(s, e) for s, e in strategy_fills if s]
+        if not strategy_fills:
+            return
+
+        result = await db.execute(
+            select(StrategyExecution)
+            .where(StrategyExecution.strategy_id.in_({s for s, _ in strategy_fills}))
+        )
+        executions = {e.strategy_id: e for e in result.scalars().all()}
+
+        # Fills already applied, and the P&L each order has realized so far
+        result = await db.execute(
+            select(StrategyFill.fill_key, StrategyFill.alpaca_order_id, StrategyFill.realized_pnl)
+            .where(StrategyFill.alpaca_order_id.in_({e["order"]["id"] for _, e in strategy_fills}))
+            .order_by(StrategyFill.filled_qty)
+        )
+        applied = set()
+        realized_by_order: Dict[str, float] = {}
+        for fill_key, order_id, realized in result.all():
+            applied.add(fill_key)
+            realized_by_order[order_id] = realized
+
+        for strategy_id, event in strategy_fills:
+            execution = executions.get(strategy_id)
+            order_id = event["order"]["id"]
+            fill_key = fill_key_for(event)
+            if execution is None or fill_key in applied:
+                continue
+            applied.add(fill_key)
+            realized = apply_strategy_fill(
+                execution,
+                event["order"]["side"],
+                float(event["qty"]),
+                float(event["price"]),
+                event["event"] == "fill",
+                realized_by_order.get(order_id, 0.0),
+            )
+            realized_by_order[order_id] = realized
+            db.add(StrategyFill(
+                strategy_id=strategy_id,
+                alpaca_order_id=order_id,
+                fill_key=fill_key,
+                qty=float(event["qty"]),
+                price=float(event["price"]),
+                filled_qty=float(event["order"].get("filled_qty") or 0.0),
+                realized_pnl=realized,
+            ))
+
+
+async def _update_risk_snapshot(user_id: Optional[str], event: Dict[str, Any]):
+    if user_id is not None:
+        get_risk_snapshot_service().apply_trade_update(user_id, event)
+
+
+# Global consumer instance
+_trade_update_consumer: Optional[TradeUpdateConsumer] = None
+
+
+def get_trade_update_consumer() -> TradeUpdateConsumer:
+    """
+    Get or create singleton trade update consumer.
+
+    The risk snapshot service is subscribed by default.
+
+    Returns:
+        TradeUpdateConsumer instance
+    """
+    global _trade_update_consumer
+    if _trade_update_consumer is None:
+        _trade_update_consumer = TradeUpdateConsumer(default_user_id=settings.TRADE_STREAM_USER_ID)
+        _trade_update_consumer.subscribe(_update_risk_snapshot)
+    return _trade_update_consumer
@@ -1,6 +1,7 @@
 """
 FastAPI application entry point.
 """
+import os
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
@@ -67,8 +68,76 @@ async def lifespan(app: FastAPI):
 
     logger.info("Live trading scheduler initialized successfully")
 
+    # Apply order events from the trade updates stream
+    trade_updates = None
+    if settings.TRADE_STREAM_ENABLED:
+        # Every worker would consume the same stream and apply each fill again
+        workers = int(os.environ.get("WEB_CONCURRENCY") or 1)
+        if workers > 1:
+            raise RuntimeError(f"TRADE_STREAM_ENABLED requires a single worker (WEB_CONCURRENCY={workers})")
+        from app.integrations.trade_stream import get_trade_update_consumer
+        trade_updates = get_trade_update_consumer()
+        await trade_updates.start()
+
+    # Execute paper stop-loss/take-profit exits as trades cross them
+    stop_triggers = None
+    if settings.STOP_TRIGGER_ENGINE_ENABLED:
+        from app.integrations.market_data_ws import get_stream_client
+        from app.services.stop_loss_monitor import get_stop_trigger_engine
+        stop_triggers = get_stop_trigger_engine()
+        await stop_triggers.start(get_stream_client())
+
+    # Fill resting paper orders as trades reach their prices
+    paper_matching = None
+    if settings.PAPER_MATCHING_ENGINE_ENABLED:
+        # Resting orders live in process memory; more workers would fill each one per worker
+        workers = int(os.environ.get("WEB_CONCURRENCY") or 1)
+        if workers > 1:
+            raise RuntimeError(f"PAPER_MATCHING_ENGINE_ENABLED requires a single worker (WEB_CONCURRENCY={workers})")
+        from app.integrations.market_data_ws import get_stream_client
+        from app.services.paper_matching import get_paper_matching_engine
+        paper_matching = get_paper_matching_engine()
+        await paper_matching.start(get_stream_client())
+
+    # Trigger price alerts as trades cross their targets
+    price_alerts = None
+    if settings.PRICE_ALERT_ENGINE_ENABLED:
+        from app.integrations.market_data_ws import get_stream_client
+        from app.services.watchlist_quotes import get_price_alert_evaluator
+        price_alerts = get_price_alert_evaluator()
+        await price_alerts.start(get_stream_client())
+
+    # Keep quoted watchlist symbols current between snapshots
+    watchlist_quotes = None
+    if settings.WATCHLIST_QUOTE_STREAM_ENABLED:
+        from app.integrations.market_data_ws import get_stream_client
+        from app.services.watchlist_quotes import get_watchlist_quote_service
+        watchlist_quotes = get_watchlist_quote_service()
+        await watchlist_quotes.start(get_stream_client())
+
+    # Keep the screener's universe snapshot current
+    universe_snapshot = None
+    if settings.SCREENER_SNAPSHOT_ENABLED:
+        from app.integrations.market_data_ws import get_stream_client
+        from app.services.universe_snapshot import get_universe_snapshot
+        universe_snapshot = get_universe_snapshot()
+        await universe_snapshot.start(get_stream_client())
+
     yield
 
+    if universe_snapshot is not None:
+        await universe_snapshot.stop()
+    if watchlist_quotes is not None:
+        await watchlist_quotes.stop()
+    if price_alerts is not None:
+        await price_alerts.stop()
+    if paper_matching is not None:
+        await paper_matching.stop()
+    if stop_triggers is not None:
+        await stop_triggers.stop()
+    if trade_updates is not None:
+        await trade_updates.stop()
+
     # Shutdown
     from app.strategies.scheduler import stop_scheduler
     stop_scheduler()
@@ -51,9 +51,9 @@ from app.models.api_key import ApiKey, ApiKeyAuditLog
 from app.models.market_data_cache import MarketDataCache
 from app.models.live_strategy import LiveStrategy, SignalHistory
 from app.models.backtest import Backtest, BacktestResult, BacktestTrade
-from app.models.strategy_execution import StrategyExecution, StrategySignal, StrategyPerformance
+from app.models.strategy_execution import StrategyExecution, StrategySignal, StrategyFill, StrategyPerformance
 from app.models.portfolio import PortfolioSnapshot, PerformanceMetrics, TaxLot
-from app.models.paper_trading import PaperAccount, PaperPosition, PaperTrade
+from app.models.paper_trading import PaperAccount, PaperPosition, PaperTrade, PaperOrder
 from app.models.watchlist import Watchlist, WatchlistItem, PriceAlert
 from app.models.audit_log import AuditLog
 
@@ -116,6 +116,7 @@ __all__ = [
     # Models - Strategy Execution
     "StrategyExecution",
     "StrategySignal",
+    "StrategyFill",
     "StrategyPerformance",
     # Models - Portfolio Analytics
     "PortfolioSnapshot",
@@ -125,6 +126,7 @@ __all__ = [
     "PaperAccount",
     "PaperPosition",
     "PaperTrade",
+    "PaperOrder",
     # Models - Watchlist
     "Watchlist",
     "WatchlistItem",
@@ -11,7 +11,7 @@ from app.models.base import Base
 class MarketDataCache(Base):
     """
     Stores historical market data (OHLCV) to reduce API calls.
-    Data is stored per symbol per day.
+    Data is stored per symbol per day per source.
     """
     __tablename__ = "market_data_cache"
     
@@ -27,13 +27,13 @@ class MarketDataCache(Base):
     volume = Column(Integer, nullable=False)
     
     # Metadata
-    source = Column(String(50), default="alpaca")  # Data source
+    source = Column(String(50), nullable=False, default="alpaca")  # Data source
     created_at = Column(DateTime, default=func.now(), nullable=False)
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
     
-    # Ensure one record per symbol per date
+    # Ensure one record per symbol per date per source
     __table_args__ = (
-        UniqueConstraint('symbol', 'date', name='uix_symbol_date'),
+        UniqueConstraint('symbol', 'date', 'source', name='uix_symbol_date_source'),
         Index('idx_symbol_date_range', 'symbol', 'date'),
     )
     
@@ -68,6 +68,11 @@ class PaperAccount(Base):
         back_populates="account",
         cascade="all, delete-orphan"
     )
+    orders: Mapped[List["PaperOrder"]] = relationship(
+        "PaperOrder",
+        back_populates="account",
+        cascade="all, delete-orphan"
+    )
 
     def __repr__(self) -> str:
         return f"<PaperAccount(id={self.id}, user_id={self.user_id}, balance={self.cash_balance})>"
@@ -165,3 +170,67 @@ class PaperTrade(Base):
 
     def __repr__(self) -> str:
         return f"<PaperTrade(id={self.id}, symbol={self.symbol}, side={self.side}, qty={self.qty})>"
+
+
+class PaperOrder(Base):
+    """
+    Paper trading order resting in the matching engine.
+    """
+
+    __tablename__ = "paper_orders"
+
+    # Primary key
+    id: Mapped[str] = mapped_column(
+        String(36),
+        primary_key=True,
+        default=lambda: str(uuid.uuid4())
+    )
+
+    # Foreign key
+    account_id: Mapped[str] = mapped_column(
+        String(36),
+        ForeignKey("paper_accounts.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True
+    )
+
+    # Order details
+    symbol: Mapped[str] = mapped_column(String(20), nullable=False, index=True)
+    side: Mapped[str] = mapped_column(String(10), nullable=False)  # 'buy' or 'sell'
+    order_type: Mapped[str] = mapped_column(String(20), nullable=False)  # market, limit, stop, stop_limit
+    order_class: Mapped[str] = mapped_column(String(20), nullable=False, default="simple")  # simple, bracket, oco
+    qty: Mapped[float] = mapped_column(Float, nullable=False)
+    limit_price: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    stop_price: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+
+    # Bracket exits, placed when the entry fills
+    take_profit_price: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    stop_loss_price: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    parent_id: Mapped[Optional[str]] = mapped_column(String(36), nullable=True, index=True)
+    oco_group: Mapped[Optional[str]] = mapped_column(String(36), nullable=True)
+
+    # Fill state
+    filled_qty: Mapped[float] = mapped_column(Float, default=0.0, nullable=False)
+    avg_fill_price: Mapped[Optional[float]] = mapped_column(Float, nullable=True)
+    status: Mapped[str] = mapped_column(String(20), nullable=False, default="new", index=True)
+
+    # Timestamps
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False
+    )
+    filled_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    canceled_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    # Relationships
+    account = relationship("PaperAccount", back_populates="orders")
+
+    def __repr__(self) -> str:
+        return f"<PaperOrder(id={self.id}, symbol={self.symbol}, side={self.side}, status={self.status})>"
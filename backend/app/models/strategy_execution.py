@@ -278,6 +278,78 @@ class StrategySignal(Base):
         return f"<StrategySignal(id={self.id}, type={self.signal_type}, symbol={self.symbol})>"
 
 
+class StrategyFill(Base):
+    """
+    Fills applied to strategy executions.
+    One row per fill event, so replayed or duplicated events are applied once.
+    """
+    
+    __tablename__ = "strategy_fills"
+    
+    # Primary key
+    id: Mapped[str] = mapped_column(
+        String(36),
+        primary_key=True,
+        default=lambda: str(uuid.uuid4()),
+        index=True
+    )
+    
+    # Foreign key to strategy
+    strategy_id: Mapped[str] = mapped_column(
+        String(36),
+        ForeignKey("strategies.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True
+    )
+    
+    alpaca_order_id: Mapped[str] = mapped_column(
+        String(100),
+        nullable=False,
+        index=True
+    )
+    
+    fill_key: Mapped[str] = mapped_column(
+        String(150),
+        nullable=False,
+        unique=True,
+        comment="Alpaca execution id, or order id and cumulative filled quantity"
+    )
+    
+    # Fill details
+    qty: Mapped[float] = mapped_column(
+        Float,
+        nullable=False
+    )
+    
+    price: Mapped[float] = mapped_column(
+        Float,
+        nullable=False
+    )
+    
+    filled_qty: Mapped[float] = mapped_column(
+        Float,
+        nullable=False,
+        comment="Cumulative filled quantity of the order after this fill"
+    )
+    
+    realized_pnl: Mapped[float] = mapped_column(
+        Float,
+        default=0.0,
+        nullable=False,
+        comment="P&L realized by the order so far, including this fill"
+    )
+    
+    # Timestamps
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        nullable=False
+    )
+    
+    def __repr__(self) -> str:
+        return f"<StrategyFill(id={self.id}, order={self.alpaca_order_id}, qty={self.qty})>"
+
+
 class StrategyPerformance(Base):
     """
     Strategy performance metrics tracking.
@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import List, Optional
 from uuid import UUID
 from datetime import datetime
 from decimal import Decimal
@@ -26,6 +26,22 @@ class BracketOrderRequest(OrderBase):
     take_profit_price: Decimal
     stop_loss_price: Decimal
 
+class BasketOrderLeg(BaseModel):
+    symbol: str
+    qty: Optional[Decimal] = None
+    notional: Optional[Decimal] = None
+    side: str = "buy"
+    type: str = "market"
+    time_in_force: str = "day"
+    limit_price: Optional[Decimal] = None
+    stop_price: Optional[Decimal] = None
+    client_order_id: Optional[str] = None
+
+class BasketOrderRequest(BaseModel):
+    orders: List[BasketOrderLeg] = Field(..., min_length=1, max_length=100)
+    strategy_id: Optional[str] = None
+    skip_risk_check: bool = False
+
 class PositionCloseRequest(BaseModel):
     qty_percent: Optional[float] = None
 
@@ -73,6 +73,88 @@ class PaperOrderRequest(BaseModel):
         }
 
 
+class RestingOrderType(str, Enum):
+    """Resting order type enum."""
+    MARKET = "market"
+    LIMIT = "limit"
+    STOP = "stop"
+    STOP_LIMIT = "stop_limit"
+
+
+class OrderClass(str, Enum):
+    """Order class enum."""
+    SIMPLE = "simple"
+    BRACKET = "bracket"
+    OCO = "oco"
+
+
+class PaperRestingOrderRequest(BaseModel):
+    """Request schema for placing a resting paper order."""
+    symbol: str = Field(..., description="Stock ticker symbol", min_length=1, max_length=10)
+    qty: float = Field(..., description="Quantity to trade", gt=0)
+    side: OrderSide = Field(..., description="Order side: buy or sell")
+    order_type: RestingOrderType = Field(
+        default=RestingOrderType.LIMIT,
+        description="Order type: market, limit, stop or stop_limit (ignored for OCO orders)"
+    )
+    order_class: OrderClass = Field(default=OrderClass.SIMPLE, description="Order class: simple, bracket or oco")
+    limit_price: Optional[float] = Field(None, description="Limit price for limit and stop_limit orders", gt=0)
+    stop_price: Optional[float] = Field(None, description="Stop price for stop and stop_limit orders", gt=0)
+    take_profit_price: Optional[float] = Field(
+        None,
+        gt=0,
+        description="Take-profit limit price (bracket and OCO orders)"
+    )
+    stop_loss_price: Optional[float] = Field(
+        None,
+        gt=0,
+        description="Stop-loss stop price (bracket and OCO orders)"
+    )
+
+    @model_validator(mode='after')
+    def validate_order(self):
+        """Validate order parameters."""
+        if self.order_class == OrderClass.OCO:
+            if self.side != OrderSide.SELL:
+                raise ValueError("OCO orders must be sell orders")
+            if self.take_profit_price is None or self.stop_loss_price is None:
+                raise ValueError("OCO orders require take_profit_price and stop_loss_price")
+        else:
+            if self.order_type in (RestingOrderType.LIMIT, RestingOrderType.STOP_LIMIT) and self.limit_price is None:
+                raise ValueError(f"limit_price is required for {self.order_type.value} orders")
+            if self.order_type in (RestingOrderType.STOP, RestingOrderType.STOP_LIMIT) and self.stop_price is None:
+                raise ValueError(f"stop_price is required for {self.order_type.value} orders")
+
+        if self.order_class == OrderClass.BRACKET:
+            if self.side != OrderSide.BUY:
+                raise ValueError("Bracket orders must be buy orders")
+            if self.take_profit_price is None and self.stop_loss_price is None:
+                raise ValueError("Bracket orders require take_profit_price or stop_loss_price")
+        elif self.order_class == OrderClass.SIMPLE:
+            if self.take_profit_price is not None or self.stop_loss_price is not None:
+                raise ValueError("take_profit_price and stop_loss_price require a bracket or OCO order")
+
+        if self.stop_loss_price and self.take_profit_price:
+            if self.stop_loss_price >= self.take_profit_price:
+                raise ValueError("stop_loss_price must be less than take_profit_price")
+
+        return self
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "symbol": "AAPL",
+                "qty": 10,
+                "side": "buy",
+                "order_type": "limit",
+                "order_class": "bracket",
+                "limit_price": 150.0,
+                "take_profit_price": 180.0,
+                "stop_loss_price": 140.0
+            }
+        }
+
+
 class PaperAccountResetRequest(BaseModel):
     """Request schema for resetting paper trading account."""
     starting_balance: float = Field(
@@ -155,6 +237,39 @@ class PaperOrderResponse(BaseModel):
     requested: Optional[float] = None
 
 
+class PaperRestingOrder(BaseModel):
+    """Schema for a resting paper order."""
+    id: str
+    symbol: str
+    side: str
+    order_type: str
+    order_class: str
+    qty: float
+    filled_qty: float
+    remaining_qty: float
+    limit_price: Optional[float] = None
+    stop_price: Optional[float] = None
+    take_profit_price: Optional[float] = None
+    stop_loss_price: Optional[float] = None
+    parent_id: Optional[str] = None
+    oco_group: Optional[str] = None
+    avg_fill_price: Optional[float] = None
+    status: str
+    created_at: datetime
+    filled_at: Optional[datetime] = None
+    canceled_at: Optional[datetime] = None
+
+
+class PaperRestingOrderResponse(BaseModel):
+    """Response schema for placing or canceling resting paper orders."""
+    success: bool
+    orders: List[PaperRestingOrder] = []
+    error: Optional[str] = None
+    required: Optional[float] = None
+    available: Optional[float] = None
+    requested: Optional[float] = None
+
+
 class StopLossTriggerResponse(BaseModel):
     """Response schema for a triggered stop-loss or take-profit order."""
     success: bool
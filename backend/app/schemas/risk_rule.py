@@ -1,7 +1,7 @@
 """
 Risk rule schemas for request/response validation.
 """
-from typing import Optional
+from typing import Dict, List, Optional
 from datetime import datetime
 from pydantic import BaseModel, Field
 
@@ -103,3 +103,55 @@ class PortfolioRiskMetrics(BaseModel):
     total_unrealized_pl_percent: float
     leverage: float
     max_drawdown_percent: float
+
+
+class TailRisk(BaseModel):
+    """VaR and CVaR (expected shortfall) in dollars, losses positive."""
+    var: float
+    cvar: float
+
+
+class VaRContribution(BaseModel):
+    """A position's share of parametric VaR."""
+    symbol: str
+    exposure: float
+    component_var: float
+
+
+class PortfolioVaRResponse(BaseModel):
+    """Response schema for portfolio VaR/CVaR."""
+    as_of: Optional[datetime] = None
+    confidence: float
+    horizon_days: int
+    observations: int
+    gross_exposure: float
+    net_exposure: float
+    volatility: float
+    historical: TailRisk
+    parametric: TailRisk
+    monte_carlo: TailRisk
+    contributions: List[VaRContribution]
+    unmodeled_symbols: List[str]
+
+
+class StressScenario(BaseModel):
+    """A custom stress scenario."""
+    market_return: float = Field(0.0, description="Market move applied to every position scaled by beta")
+    shocks: Dict[str, float] = Field(
+        default_factory=dict, description="Return per symbol, overriding the market move"
+    )
+
+
+class StressTestRequest(BaseModel):
+    """Request schema for a portfolio stress test."""
+    scenarios: Optional[Dict[str, StressScenario]] = Field(
+        None, description="Scenarios by name (defaults to the historical scenarios)"
+    )
+
+
+class StressTestResult(BaseModel):
+    """Portfolio P&L under one scenario."""
+    scenario: str
+    date: Optional[str] = None
+    pnl: float
+    pnl_pct: float
@@ -11,7 +11,7 @@ from sqlalchemy import select, and_, delete
 from sqlalchemy.dialects.postgresql import insert
 
 from app.models.market_data_cache import MarketDataCache
-from app.integrations.market_data import get_market_data_service
+from app.integrations.market_data import MarketDataProvider, get_market_data_service
 
 logger = logging.getLogger(__name__)
 
@@ -22,9 +22,12 @@ class MarketDataCacheService:
     Implements intelligent fetching that only downloads missing data.
     """
     
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, market_data: Optional[MarketDataProvider] = None):
         self.db = db
-        self.market_data = get_market_data_service()
+        self.market_data = market_data or get_market_data_service()
+        # Cached rows are tagged with their provider so generated data is
+        # never served in place of real data (and vice versa)
+        self.source = getattr(self.market_data, "source_name", "alpaca")
     
     async def get_historical_data(
         self,
@@ -115,6 +118,7 @@ class MarketDataCacheService:
             .where(
                 and_(
                     MarketDataCache.symbol == symbol,
+                    MarketDataCache.source == self.source,
                     MarketDataCache.date >= start_date.date(),
                     MarketDataCache.date <= end_date.date()
                 )
@@ -227,21 +231,25 @@ class MarketDataCacheService:
     ) -> pd.DataFrame:
         """Fetch a single chunk from API."""
         try:
+            # A 180-day chunk holds at most ~130 daily bars; the provider
+            # default limit of 100 would truncate it
             bars = await self.market_data.get_bars(
                 symbol=symbol,
                 start=start_date,
                 end=end_date,
-                timeframe="1Day"
+                timeframe="1Day",
+                limit=1000
             )
             
+            # Providers return bars as dicts with ISO timestamps
             df = pd.DataFrame([
                 {
-                    "timestamp": bar.timestamp,
-                    "open": float(bar.open),
-                    "high": float(bar.high),
-                    "low": float(bar.low),
-                    "close": float(bar.close),
-                    "volume": int(bar.volume),
+                    "timestamp": pd.Timestamp(bar["timestamp"]),
+                    "open": float(bar["open"]),
+                    "high": float(bar["high"]),
+                    "low": float(bar["low"]),
+                    "close": float(bar["close"]),
+                    "volume": int(bar["volume"]),
                 }
                 for bar in bars
             ])
@@ -270,12 +278,12 @@ class MarketDataCacheService:
                 "low": float(row["low"]),
                 "close": float(row["close"]),
                 "volume": int(row["volume"]),
-                "source": "alpaca"
+                "source": self.source
             })
         
         # Use INSERT ... ON CONFLICT DO NOTHING for PostgreSQL
         stmt = insert(MarketDataCache).values(records)
-        stmt = stmt.on_conflict_do_nothing(index_elements=['symbol', 'date'])
+        stmt = stmt.on_conflict_do_nothing(index_elements=['symbol', 'date', 'source'])
         
         await self.db.execute(stmt)
         await self.db.commit()
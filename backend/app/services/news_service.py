@@ -1,31 +1,99 @@
 """
 News service for aggregating market news from various sources.
+
+Requests share one HTTP session, and articles are cached per symbol for
+``cache_ttl`` seconds. A watchlist is refreshed with a single market-wide
+feed request whose articles are fanned out to the symbols they mention.
+Article sentiment that the provider does not label is scored with TextBlob
+in batches on a worker pool and memoized by article URL.
 """
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
+import hashlib
+import logging
+import time
 import aiohttp
 import asyncio
 import os
 from textblob import TextBlob
 
+logger = logging.getLogger(__name__)
+
+ALPHA_VANTAGE_URL = "https://www.alphavantage.co/query"
+
+
+def _polarity_to_sentiment(polarity: float) -> str:
+    if polarity > 0.1:
+        return "positive"
+    elif polarity < -0.1:
+        return "negative"
+    return "neutral"
+
+
+def _score_texts(texts: List[str]) -> List[str]:
+    """Score a batch of texts (runs in a worker process)."""
+    return [_polarity_to_sentiment(TextBlob(text).sentiment.polarity) for text in texts]
+
+
+def _label_to_sentiment(label: Optional[str]) -> Optional[str]:
+    """Map an Alpha Vantage sentiment label (None if unlabeled)."""
+    if not label:
+        return None
+    if "Bullish" in label:
+        return "positive"
+    if "Bearish" in label:
+        return "negative"
+    return "neutral"
+
 
 class NewsService:
     """
     Service for fetching and aggregating financial news.
     Supports multiple news sources.
     """
-    
-    def __init__(self):
+
+    def __init__(
+        self,
+        cache_ttl: float = 300.0,
+        feed_limit: int = 1000,
+        score_batch_size: int = 64,
+        max_workers: int = 2,
+        memo_size: int = 10000,
+        executor: Optional[Executor] = None,
+    ):
+        """
+        Args:
+            cache_ttl: Seconds a symbol's articles are served from cache
+            feed_limit: Articles requested by a watchlist refresh
+            score_batch_size: Texts per sentiment scoring task
+            max_workers: Sentiment scoring processes
+            memo_size: Article sentiments remembered
+            executor: Executor for sentiment scoring instead of a process pool
+        """
         self.alpha_vantage_key = os.getenv("ALPHA_VANTAGE_API_KEY")
         self.news_api_key = os.getenv("NEWS_API_KEY")
-    
+        self.cache_ttl = cache_ttl
+        self.feed_limit = feed_limit
+        self.score_batch_size = score_batch_size
+        self.max_workers = max_workers
+        self.memo_size = memo_size
+
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._executor = executor
+        # symbol -> (fetched at, articles requested, articles)
+        self._cache: Dict[str, Tuple[float, int, List[Dict]]] = {}
+        self._sentiments: "OrderedDict[str, str]" = OrderedDict()
+        self.requests_made = 0
+
     async def get_market_news(self, limit: int = 20) -> List[Dict]:
         """
         Get general market news.
-        
+
         Args:
             limit: Number of news articles to return
-        
+
         Returns:
             List of news articles
         """
@@ -54,105 +122,262 @@ class NewsService:
             }
         ]
         return mock_news[:limit]
-    
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Get the shared HTTP session, creating it on first use."""
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=15))
+        return self._session
+
+    async def close(self):
+        """Close the HTTP session and the scoring workers."""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        if isinstance(self._executor, ProcessPoolExecutor):
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def _cached(self, symbol: str, limit: int) -> Optional[List[Dict]]:
+        entry = self._cache.get(symbol)
+        if entry is None:
+            return None
+        fetched_at, requested, articles = entry
+        if time.monotonic() - fetched_at > self.cache_ttl or requested < limit:
+            return None
+        return articles[:limit]
+
+    async def _fetch_feed(self, tickers: Optional[str], limit: int) -> Optional[List[Dict]]:
+        """Request the Alpha Vantage news feed (None on failure)."""
+        params = {
+            "function": "NEWS_SENTIMENT",
+            "apikey": self.alpha_vantage_key,
+            "limit": str(limit)
+        }
+        if tickers:
+            params["tickers"] = tickers
+        else:
+            params["sort"] = "LATEST"
+
+        try:
+            session = await self._get_session()
+            self.requests_made += 1
+            async with session.get(ALPHA_VANTAGE_URL, params=params) as response:
+                if response.status != 200:
+                    return None
+                data = await response.json()
+                return data.get("feed", [])
+        except Exception as e:
+            logger.warning(f"News request failed: {e}")
+            return None
+
+    def _parse_item(self, item: Dict, symbol: str, index: int) -> Dict:
+        """Convert a feed item into an article for a symbol."""
+        # Parse published_at
+        published_at = datetime.utcnow()
+        if "time_published" in item:
+            try:
+                # Format: YYYYMMDDTHHMMSS
+                published_at = datetime.strptime(item["time_published"], "%Y%m%dT%H%M%S")
+            except ValueError:
+                pass
+
+        # Prefer the symbol's own sentiment label over the article's
+        ticker_sentiment = item.get("ticker_sentiment", [])
+        label = next(
+            (t.get("ticker_sentiment_label") for t in ticker_sentiment if t.get("ticker") == symbol),
+            None
+        ) or item.get("overall_sentiment_label")
+
+        return {
+            "id": f"{symbol}_{index}",
+            "title": item.get("title", ""),
+            "summary": item.get("summary", ""),
+            "source": item.get("source", ""),
+            "url": item.get("url", ""),
+            "published_at": published_at,
+            "sentiment": _label_to_sentiment(label),
+            "tickers": [t.get("ticker") for t in ticker_sentiment]
+        }
+
     async def get_symbol_news(self, symbol: str, limit: int = 10) -> List[Dict]:
         """
         Get news for a specific stock symbol.
-        
+
         Args:
             symbol: Stock symbol
             limit: Number of articles
-        
+
         Returns:
             List of news articles related to the symbol
         """
         if not self.alpha_vantage_key:
             return []
 
-        url = "https://www.alphavantage.co/query"
-        params = {
-            "function": "NEWS_SENTIMENT",
-            "tickers": symbol,
-            "apikey": self.alpha_vantage_key,
-            "limit": str(limit)
-        }
+        cached = self._cached(symbol, limit)
+        if cached is not None:
+            return cached
 
-        try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url, params=params) as response:
-                    if response.status != 200:
-                        return []
-
-                    data = await response.json()
-                    feed = data.get("feed", [])
-
-                    news_items = []
-                    for item in feed:
-                        # Parse published_at
-                        published_at = datetime.utcnow()
-                        if "time_published" in item:
-                            try:
-                                # Format: YYYYMMDDTHHMMSS
-                                published_at = datetime.strptime(item["time_published"], "%Y%m%dT%H%M%S")
-                            except ValueError:
-                                pass
-
-                        # Map sentiment
-                        sentiment_label = item.get("overall_sentiment_label", "Neutral")
-                        sentiment = "neutral"
-                        if "Bullish" in sentiment_label:
-                            sentiment = "positive"
-                        elif "Bearish" in sentiment_label:
-                            sentiment = "negative"
-
-                        # Extract tickers mentioned
-                        tickers = []
-                        if "ticker_sentiment" in item:
-                            tickers = [t.get("ticker") for t in item["ticker_sentiment"]]
-
-                        news_items.append({
-                            "id": f"{symbol}_{len(news_items)}",
-                            "title": item.get("title", ""),
-                            "summary": item.get("summary", ""),
-                            "source": item.get("source", ""),
-                            "url": item.get("url", ""),
-                            "published_at": published_at,
-                            "sentiment": sentiment,
-                            "tickers": tickers
-                        })
-
-                    return news_items[:limit]
-        except Exception as e:
-            # Log error if logging was available, for now just return empty
+        feed = await self._fetch_feed(symbol, limit)
+        if feed is None:
             return []
-    
+
+        news_items = [self._parse_item(item, symbol, i) for i, item in enumerate(feed)]
+        await self._score_unlabeled(news_items)
+        self._cache[symbol] = (time.monotonic(), limit, news_items)
+        return news_items[:limit]
+
+    async def get_watchlist_news(self, symbols: List[str], limit: int = 10) -> Dict[str, List[Dict]]:
+        """
+        Get news for many symbols.
+
+        Symbols not cached are refreshed together with one market-wide
+        feed request, whose articles are assigned to every watchlist symbol
+        they mention. Symbols a full feed holds too few articles for are
+        requested on their own. (A multi-ticker Alpha Vantage request only
+        returns articles mentioning all of the tickers, so it cannot batch
+        symbols.)
+
+        Args:
+            symbols: Stock symbols
+            limit: Articles per symbol
+
+        Returns:
+            Dictionary mapping symbol to its articles
+        """
+        if not self.alpha_vantage_key:
+            return {symbol: [] for symbol in symbols}
+
+        results = {}
+        stale = []
+        for symbol in symbols:
+            cached = self._cached(symbol, limit)
+            if cached is None:
+                stale.append(symbol)
+            else:
+                results[symbol] = cached
+
+        if stale:
+            feed = await self._fetch_feed(None, self.feed_limit)
+            if feed is None:
+                for symbol in stale:
+                    results[symbol] = []
+            else:
+                wanted = set(stale)
+                by_symbol: Dict[str, List[Dict]] = {symbol: [] for symbol in stale}
+                for item in feed:
+                    for ticker in {t.get("ticker") for t in item.get("ticker_sentiment", [])} & wanted:
+                        by_symbol[ticker].append(self._parse_item(item, ticker, len(by_symbol[ticker])))
+
+                # A full feed stops at some point in time: a symbol with fewer
+                # articles than requested may have older ones it cut off
+                truncated = len(feed) >= self.feed_limit
+                uncovered = [symbol for symbol in stale if truncated and len(by_symbol[symbol]) < limit]
+                for symbol in uncovered:
+                    del by_symbol[symbol]
+
+                await self._score_unlabeled([a for articles in by_symbol.values() for a in articles])
+                now = time.monotonic()
+                for symbol, articles in by_symbol.items():
+                    # The feed holds all of the symbol's articles since its
+                    # oldest one, so the entry serves any limit up to their count
+                    self._cache[symbol] = (now, len(articles) if truncated else self.feed_limit, articles)
+                    results[symbol] = articles[:limit]
+
+                fetched = await asyncio.gather(*(self.get_symbol_news(symbol, limit) for symbol in uncovered))
+                results.update(zip(uncovered, fetched))
+
+        return {symbol: results[symbol] for symbol in symbols}
+
+    async def _score_unlabeled(self, articles: List[Dict]):
+        """Fill in sentiment for articles the provider did not label."""
+        unlabeled = [article for article in articles if article["sentiment"] is None]
+        if not unlabeled:
+            return
+        sentiments = await self._score(
+            [f"{article['title']}. {article['summary']}" for article in unlabeled],
+            [article["url"] or None for article in unlabeled],
+        )
+        for article, sentiment in zip(unlabeled, sentiments):
+            article["sentiment"] = sentiment
+
+    async def _score(self, texts: List[str], urls: Optional[List[Optional[str]]] = None) -> List[str]:
+        """
+        Score texts, reusing memoized results.
+
+        Args:
+            texts: Texts to score
+            urls: Article URL of each text (its memo key), if any
+
+        Returns:
+            Sentiment of each text
+        """
+        urls = urls or [None] * len(texts)
+        keys = [
+            hashlib.sha1((url or f"text:{text}").encode()).hexdigest()
+            for text, url in zip(texts, urls)
+        ]
+
+        results: Dict[str, str] = {}
+        pending: Dict[str, str] = {}
+        for key, text in zip(keys, texts):
+            if key in self._sentiments:
+                self._sentiments.move_to_end(key)
+                results[key] = self._sentiments[key]
+            else:
+                pending.setdefault(key, text)
+
+        if pending:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            loop = asyncio.get_running_loop()
+            pending_keys = list(pending)
+            batches = [
+                pending_keys[i:i + self.score_batch_size]
+                for i in range(0, len(pending_keys), self.score_batch_size)
+            ]
+            scored = await asyncio.gather(*[
+                loop.run_in_executor(self._executor, _score_texts, [pending[key] for key in batch])
+                for batch in batches
+            ])
+            for batch, sentiments in zip(batches, scored):
+                for key, sentiment in zip(batch, sentiments):
+                    results[key] = self._sentiments[key] = sentiment
+            while len(self._sentiments) > self.memo_size:
+                self._sentiments.popitem(last=False)
+
+        return [results[key] for key in keys]
+
     async def analyze_sentiment(self, text: str) -> str:
         """
         Analyze sentiment of news text.
-        
+
         Args:
             text: News article text
-        
+
         Returns:
             Sentiment: 'positive', 'negative', or 'neutral'
         """
-        loop = asyncio.get_running_loop()
-        return await loop.run_in_executor(None, self._analyze_sentiment_sync, text)
+        return (await self._score([text]))[0]
+
+    async def analyze_sentiments(self, texts: List[str]) -> List[str]:
+        """
+        Analyze sentiment of many texts in batches.
+
+        Args:
+            texts: News article texts
+
+        Returns:
+            Sentiment of each text
+        """
+        return await self._score(texts)
 
     def _analyze_sentiment_sync(self, text: str) -> str:
         """Synchronous helper for sentiment analysis."""
-        blob = TextBlob(text)
-        polarity = blob.sentiment.polarity
-
-        if polarity > 0.1:
-            return "positive"
-        elif polarity < -0.1:
-            return "negative"
-        else:
-            return "neutral"
+        return _score_texts([text])[0]
 
 
-# Singleton instance  
+# Singleton instance
 _news_service = None
 
 
@@ -3,11 +3,13 @@ Order synchronization service.
 Syncs orders from Alpaca to local database for tracking and analytics.
 """
 import logging
+import uuid
 from datetime import datetime, timezone, timezone
 from typing import List, Dict, Any, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 
 from app.models.order import Order, OrderSideEnum, OrderTypeEnum, OrderStatusEnum
 from app.integrations.alpaca_client import get_alpaca_client
@@ -37,57 +39,7 @@ class OrderSyncService:
             Order model instance
         """
         try:
-            # Parse order data
-            order_data = {
-                "user_id": user_id,
-                "alpaca_order_id": alpaca_order_data["id"],
-                "client_order_id": alpaca_order_data.get("client_order_id"),
-                "symbol": alpaca_order_data["symbol"],
-                "side": OrderSideEnum(alpaca_order_data["side"]),
-                "order_type": self._map_order_type(alpaca_order_data["order_type"]),
-                "time_in_force": alpaca_order_data["time_in_force"],
-                "qty": alpaca_order_data.get("qty"),
-                "notional": alpaca_order_data.get("notional"),
-                "filled_qty": alpaca_order_data.get("filled_qty", 0.0),
-                "limit_price": alpaca_order_data.get("limit_price"),
-                "stop_price": alpaca_order_data.get("stop_price"),
-                "filled_avg_price": alpaca_order_data.get("filled_avg_price"),
-                "trail_price": alpaca_order_data.get("trail_price"),
-                "trail_percent": alpaca_order_data.get("trail_percent"),
-                "hwm": alpaca_order_data.get("hwm"),
-                "status": OrderStatusEnum(alpaca_order_data["status"]),
-                "submitted_at": self._parse_datetime(alpaca_order_data.get("submitted_at")),
-                "filled_at": self._parse_datetime(alpaca_order_data.get("filled_at")),
-                "canceled_at": self._parse_datetime(alpaca_order_data.get("canceled_at")),
-                "expired_at": self._parse_datetime(alpaca_order_data.get("expired_at")),
-                "failed_at": self._parse_datetime(alpaca_order_data.get("failed_at")),
-                "replaced_at": self._parse_datetime(alpaca_order_data.get("replaced_at")),
-                "replaced_by": alpaca_order_data.get("replaced_by"),
-                "replaces": alpaca_order_data.get("replaces"),
-                "extended_hours": alpaca_order_data.get("extended_hours", False),
-                "asset_class": alpaca_order_data.get("asset_class", "us_equity"),
-                "asset_id": alpaca_order_data.get("asset_id"),
-            }
-            
-            # Upsert order (insert or update if exists)
-            stmt = insert(Order).values(**order_data)
-            stmt = stmt.on_conflict_do_update(
-                index_elements=['alpaca_order_id'],
-                set_={
-                    "filled_qty": stmt.excluded.filled_qty,
-                    "filled_avg_price": stmt.excluded.filled_avg_price,
-                    "status": stmt.excluded.status,
-                    "filled_at": stmt.excluded.filled_at,
-                    "canceled_at": stmt.excluded.canceled_at,
-                    "expired_at": stmt.excluded.expired_at,
-                    "failed_at": stmt.excluded.failed_at,
-                    "replaced_at": stmt.excluded.replaced_at,
-                    "replaced_by": stmt.excluded.replaced_by,
-                    "updated_at": datetime.now(timezone.utc),
-                }
-            )
-            
-            await self.session.execute(stmt)
+            await self.upsert_orders([self._order_values(user_id, alpaca_order_data)])
             await self.session.commit()
             
             # Fetch and return the order
@@ -104,6 +56,73 @@ class OrderSyncService:
             await self.session.rollback()
             raise
     
+    async def upsert_orders(self, rows: List[Dict[str, Any]]) -> None:
+        """
+        Insert or update many orders in one statement.
+        
+        Rows are built with ``_order_values``; the caller commits. Existing
+        orders only have their fill and lifecycle columns updated.
+        
+        Args:
+            rows: Order column values keyed by column name
+        """
+        if not rows:
+            return
+        
+        dialect = self.session.get_bind().dialect.name
+        insert = sqlite_insert if dialect == "sqlite" else pg_insert
+        stmt = insert(Order).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=['alpaca_order_id'],
+            set_={
+                "filled_qty": stmt.excluded.filled_qty,
+                "filled_avg_price": stmt.excluded.filled_avg_price,
+                "status": stmt.excluded.status,
+                "filled_at": stmt.excluded.filled_at,
+                "canceled_at": stmt.excluded.canceled_at,
+                "expired_at": stmt.excluded.expired_at,
+                "failed_at": stmt.excluded.failed_at,
+                "replaced_at": stmt.excluded.replaced_at,
+                "replaced_by": stmt.excluded.replaced_by,
+                "updated_at": datetime.now(timezone.utc),
+            }
+        )
+        await self.session.execute(stmt)
+    
+    def _order_values(self, user_id: str, alpaca_order_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Map Alpaca order data to Order column values."""
+        return {
+            "id": str(uuid.uuid4()),
+            "user_id": user_id,
+            "alpaca_order_id": alpaca_order_data["id"],
+            "client_order_id": alpaca_order_data.get("client_order_id"),
+            "symbol": alpaca_order_data["symbol"],
+            "side": OrderSideEnum(alpaca_order_data["side"]),
+            "order_type": self._map_order_type(alpaca_order_data["order_type"]),
+            "time_in_force": alpaca_order_data["time_in_force"],
+            "qty": alpaca_order_data.get("qty"),
+            "notional": alpaca_order_data.get("notional"),
+            "filled_qty": alpaca_order_data.get("filled_qty") or 0.0,
+            "limit_price": alpaca_order_data.get("limit_price"),
+            "stop_price": alpaca_order_data.get("stop_price"),
+            "filled_avg_price": alpaca_order_data.get("filled_avg_price"),
+            "trail_price": alpaca_order_data.get("trail_price"),
+            "trail_percent": alpaca_order_data.get("trail_percent"),
+            "hwm": alpaca_order_data.get("hwm"),
+            "status": OrderStatusEnum(alpaca_order_data["status"]),
+            "submitted_at": self._parse_datetime(alpaca_order_data.get("submitted_at")),
+            "filled_at": self._parse_datetime(alpaca_order_data.get("filled_at")),
+            "canceled_at": self._parse_datetime(alpaca_order_data.get("canceled_at")),
+            "expired_at": self._parse_datetime(alpaca_order_data.get("expired_at")),
+            "failed_at": self._parse_datetime(alpaca_order_data.get("failed_at")),
+            "replaced_at": self._parse_datetime(alpaca_order_data.get("replaced_at")),
+            "replaced_by": alpaca_order_data.get("replaced_by"),
+            "replaces": alpaca_order_data.get("replaces"),
+            "extended_hours": alpaca_order_data.get("extended_hours", False),
+            "asset_class": alpaca_order_data.get("asset_class", "us_equity"),
+            "asset_id": alpaca_order_data.get("asset_id"),
+        }
+    
     async def sync_user_orders(
         self,
         user_id: str,
@@ -129,17 +148,21 @@ class OrderSyncService:
                 use_cache=False  # Always fetch fresh data for sync
             )
             
-            # Sync each order
-            synced_orders = []
-            for alpaca_order in alpaca_orders:
-                order = await self.sync_order(user_id, alpaca_order)
-                synced_orders.append(order)
+            # Upsert all orders in one statement
+            await self.upsert_orders([self._order_values(user_id, o) for o in alpaca_orders])
+            await self.session.commit()
+            
+            result = await self.session.execute(
+                select(Order).where(Order.alpaca_order_id.in_([o["id"] for o in alpaca_orders]))
+            )
+            synced_orders = list(result.scalars().all())
             
             logger.info(f"Synced {len(synced_orders)} orders for user {user_id}")
             return synced_orders
             
         except Exception as e:
             logger.error(f"Error syncing user orders: {e}")
+            await self.session.rollback()
             raise
     
     async def get_user_orders(
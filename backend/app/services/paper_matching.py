@@ -0,0 +1,819 @@
+"""
+Paper trading matching engine.
+
+Holds resting paper orders (limit, stop, stop-limit, and market orders that
+wait for the next trade) in per-symbol order books and fills them against
+streaming trades or bars. A trade only provides as much liquidity as its
+size, so large orders fill partially over several trades. Bracket orders
+place a take-profit and a stop-loss exit once their entry fills; the two
+exits form an OCO pair, as do standalone OCO orders.
+
+Matching runs in memory. Fills and order state changes are written to the
+database in batches by a background flush rather than in one transaction
+per fill.
+"""
+import asyncio
+import heapq
+import itertools
+import logging
+import math
+import uuid
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import select, and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.database import get_db_context
+from app.models.paper_trading import PaperAccount, PaperOrder, PaperPosition, PaperTrade
+from app.services.stop_loss_monitor import get_trigger_index
+
+logger = logging.getLogger(__name__)
+
+ORDER_TYPES = ("market", "limit", "stop", "stop_limit")
+ORDER_CLASSES = ("simple", "bracket", "oco")
+OPEN_STATUSES = ("new", "partially_filled")
+
+# Quantities below this are treated as zero
+EPSILON = 1e-9
+
+
+@dataclass
+class RestingOrder:
+    """In-memory state of a paper order."""
+    id: str
+    account_id: str
+    symbol: str
+    side: str
+    order_type: str
+    qty: float
+    limit_price: Optional[float] = None
+    stop_price: Optional[float] = None
+    order_class: str = "simple"
+    take_profit_price: Optional[float] = None
+    stop_loss_price: Optional[float] = None
+    parent_id: Optional[str] = None
+    oco_group: Optional[str] = None
+    filled_qty: float = 0.0
+    avg_fill_price: Optional[float] = None
+    status: str = "new"
+    created_at: datetime = field(default_factory=datetime.utcnow)
+    filled_at: Optional[datetime] = None
+    canceled_at: Optional[datetime] = None
+    # Stop condition met; stop orders then rest as market or limit orders
+    triggered: bool = False
+    children: List[str] = field(default_factory=list)
+
+    @property
+    def remaining(self) -> float:
+        return max(self.qty - self.filled_qty, 0.0)
+
+    @property
+    def is_open(self) -> bool:
+        return self.status in OPEN_STATUSES
+
+    @classmethod
+    def from_model(cls, row: PaperOrder) -> "RestingOrder":
+        return cls(**{name: getattr(row, name) for name in _MODEL_FIELDS})
+
+    def model_values(self) -> Dict[str, Any]:
+        """Column values for the PaperOrder row."""
+        return {name: getattr(self, name) for name in _MODEL_FIELDS}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            **self.model_values(),
+            "remaining_qty": self.remaining,
+        }
+
+
+_MODEL_FIELDS = (
+    "id", "account_id", "symbol", "side", "order_type", "qty", "limit_price",
+    "stop_price", "order_class", "take_profit_price", "stop_loss_price",
+    "parent_id", "oco_group", "filled_qty", "avg_fill_price", "status",
+    "created_at", "filled_at", "canceled_at",
+)
+
+
+@dataclass
+class PaperFill:
+    """A fill waiting to be written to the account."""
+    order_id: str
+    account_id: str
+    symbol: str
+    side: str
+    qty: float
+    price: float
+    timestamp: datetime
+
+
+class OrderBook:
+    """
+    Resting orders of one symbol.
+
+    Limit orders are kept in price-time priority heaps (best bid and best
+    ask first), untriggered stops in heaps ordered by how close they are to
+    triggering. Canceled and filled orders are dropped from the heaps lazily.
+    """
+
+    def __init__(self):
+        self.bids: List[Tuple[float, int, str]] = []        # (-limit, seq, id)
+        self.asks: List[Tuple[float, int, str]] = []        # (limit, seq, id)
+        self.buy_stops: List[Tuple[float, int, str]] = []   # (stop, seq, id)
+        self.sell_stops: List[Tuple[float, int, str]] = []  # (-stop, seq, id)
+        self.market: Deque[str] = deque()
+
+    def add(self, order: RestingOrder, seq: int):
+        if order.order_type in ("stop", "stop_limit") and not order.triggered:
+            if order.side == "buy":
+                heapq.heappush(self.buy_stops, (order.stop_price, seq, order.id))
+            else:
+                heapq.heappush(self.sell_stops, (-order.stop_price, seq, order.id))
+        elif order.order_type in ("limit", "stop_limit"):
+            if order.side == "buy":
+                heapq.heappush(self.bids, (-order.limit_price, seq, order.id))
+            else:
+                heapq.heappush(self.asks, (order.limit_price, seq, order.id))
+        else:
+            self.market.append(order.id)
+
+
+class PaperMatchingEngine:
+    """
+    In-memory matching of resting paper orders with write-behind persistence.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable = get_db_context,
+        participation: float = 1.0,
+        flush_interval: float = 0.5,
+        max_batch: int = 500,
+    ):
+        """
+        Initialize matching engine.
+
+        Args:
+            session_factory: Async context manager yielding a database session
+            participation: Share of each trade's size resting orders may fill
+            flush_interval: Seconds between background flushes
+            max_batch: Number of pending fills that triggers an early flush
+        """
+        self._session_factory = session_factory
+        self.participation = participation
+        self.flush_interval = flush_interval
+        self.max_batch = max_batch
+        self._orders: Dict[str, RestingOrder] = {}
+        self._books: Dict[str, OrderBook] = {}
+        self._by_account: Dict[str, Set[str]] = {}
+        self._oco_groups: Dict[str, List[str]] = {}
+        self._last_price: Dict[str, float] = {}
+        self._seq = itertools.count()
+        self._fills: List[PaperFill] = []
+        self._dirty: Dict[str, RestingOrder] = {}
+        self._flush_lock = asyncio.Lock()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._stream_client = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    async def load(self):
+        """Rebuild the order books from open orders in the database."""
+        async with self._session_factory() as db:
+            result = await db.execute(
+                select(PaperOrder)
+                .where(PaperOrder.status.in_(OPEN_STATUSES))
+                .order_by(PaperOrder.created_at)
+            )
+            rows = result.scalars().all()
+
+        self._orders.clear()
+        self._books.clear()
+        self._by_account.clear()
+        self._oco_groups.clear()
+        for row in rows:
+            self._add(RestingOrder.from_model(row))
+        for order in self._orders.values():
+            parent = self._orders.get(order.parent_id) if order.parent_id else None
+            if parent is not None:
+                parent.children.append(order.id)
+        logger.info(f"Loaded {len(self._orders)} resting paper orders")
+
+    async def start(self, stream_client=None):
+        """
+        Load open orders and start the background flush.
+
+        Args:
+            stream_client: AlpacaStreamClient to take trade ticks from;
+                without it prices only arrive through ``on_trade``/``on_bar``
+        """
+        if self._task is not None:
+            return
+        await self.load()
+        self._task = asyncio.create_task(self._flush_loop())
+
+        if stream_client is not None:
+            from app.integrations.market_data_ws import StreamType
+
+            self._stream_client = stream_client
+            stream_client.register_callback(StreamType.TRADES, self.on_trade)
+            if not stream_client.is_connected:
+                await stream_client.connect()
+            await self.watch(list(self._books))
+
+    async def stop(self):
+        """Stop the engine and write any pending fills."""
+        if self._task is None:
+            return
+        if self._stream_client is not None:
+            from app.integrations.market_data_ws import StreamType
+
+            self._stream_client.unregister_callback(StreamType.TRADES, self.on_trade)
+            self._stream_client = None
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        await self.flush()
+
+    async def watch(self, symbols: List[str]):
+        """Subscribe to trades of symbols that have resting orders."""
+        if self._stream_client is None:
+            return
+        subscribed = set(self._stream_client.get_subscriptions().get("trades", []))
+        new_symbols = [s for s in symbols if s not in subscribed]
+        if new_symbols:
+            await self._stream_client.subscribe_trades(new_symbols)
+
+    # ------------------------------------------------------------------
+    # Orders
+    # ------------------------------------------------------------------
+
+    async def submit(
+        self,
+        db: AsyncSession,
+        user_id: str,
+        symbol: str,
+        qty: float,
+        side: str,
+        order_type: str = "limit",
+        limit_price: Optional[float] = None,
+        stop_price: Optional[float] = None,
+        order_class: str = "simple",
+        take_profit_price: Optional[float] = None,
+        stop_loss_price: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Place a resting paper order.
+
+        Buying power and shares already committed to open orders are not
+        available to new ones. OCO orders sell an existing position with a
+        take-profit limit and a stop-loss stop; bracket orders buy and
+        attach those exits once the entry fills.
+
+        Args:
+            db: Database session
+            user_id: User ID
+            symbol: Stock symbol
+            qty: Quantity
+            side: "buy" or "sell"
+            order_type: "market", "limit", "stop" or "stop_limit"
+                (ignored for OCO orders)
+            limit_price: Limit price (limit and stop_limit orders)
+            stop_price: Stop price (stop and stop_limit orders)
+            order_class: "simple", "bracket" or "oco"
+            take_profit_price: Take-profit limit (bracket and OCO orders)
+            stop_loss_price: Stop-loss stop (bracket and OCO orders)
+
+        Returns:
+            {"success": True, "orders": [...]} or {"success": False, "error": ...}
+        """
+        error = self._validate(
+            qty, side, order_type, limit_price, stop_price,
+            order_class, take_profit_price, stop_loss_price,
+        )
+        if error:
+            return {"success": False, "error": error}
+
+        # Apply earlier fills so cash and positions are current
+        await self.flush()
+
+        result = await db.execute(select(PaperAccount).where(PaperAccount.user_id == user_id))
+        account = result.scalar_one_or_none()
+        if not account:
+            return {"success": False, "error": "Paper trading account not found"}
+
+        if side == "buy":
+            price = limit_price or stop_price or self._last_price.get(symbol)
+            if price is None:
+                price = await self._latest_price(symbol)
+                if price is None:
+                    return {"success": False, "error": f"Failed to fetch market price for {symbol}"}
+            required = qty * price
+            available = account.cash_balance - self.reserved_cash(account.id)
+            if required > available:
+                return {
+                    "success": False,
+                    "error": "Insufficient buying power",
+                    "required": required,
+                    "available": available,
+                }
+        else:
+            pos_result = await db.execute(
+                select(PaperPosition.qty)
+                .where(and_(PaperPosition.account_id == account.id, PaperPosition.symbol == symbol))
+            )
+            held = pos_result.scalar_one_or_none() or 0.0
+            available = held - self.reserved_qty(account.id, symbol)
+            if qty > available + EPSILON:
+                return {
+                    "success": False,
+                    "error": "Insufficient shares to sell",
+                    "requested": qty,
+                    "available": available,
+                }
+
+        if order_class == "oco":
+            group = str(uuid.uuid4())
+            orders = [
+                RestingOrder(
+                    id=str(uuid.uuid4()), account_id=account.id, symbol=symbol, side="sell",
+                    order_type="limit", qty=qty, limit_price=take_profit_price,
+                    order_class="oco", oco_group=group,
+                ),
+                RestingOrder(
+                    id=str(uuid.uuid4()), account_id=account.id, symbol=symbol, side="sell",
+                    order_type="stop", qty=qty, stop_price=stop_loss_price,
+                    order_class="oco", oco_group=group,
+                ),
+            ]
+        else:
+            orders = [RestingOrder(
+                id=str(uuid.uuid4()), account_id=account.id, symbol=symbol, side=side,
+                order_type=order_type, qty=qty, limit_price=limit_price, stop_price=stop_price,
+                order_class=order_class, take_profit_price=take_profit_price,
+                stop_loss_price=stop_loss_price,
+            )]
+
+        for order in orders:
+            db.add(PaperOrder(**order.model_values()))
+        await db.commit()
+
+        for order in orders:
+            self._add(order)
+        await self.watch([symbol])
+        return {"success": True, "orders": [order.to_dict() for order in orders]}
+
+    @staticmethod
+    def _validate(
+        qty: float,
+        side: str,
+        order_type: str,
+        limit_price: Optional[float],
+        stop_price: Optional[float],
+        order_class: str,
+        take_profit_price: Optional[float],
+        stop_loss_price: Optional[float],
+    ) -> Optional[str]:
+        if qty <= 0:
+            return "qty must be positive"
+        if side not in ("buy", "sell"):
+            return f"Invalid side: {side}"
+        if order_class not in ORDER_CLASSES:
+            return f"Invalid order class: {order_class}"
+        if order_class == "oco":
+            if side != "sell":
+                return "OCO orders must be sell orders"
+            if take_profit_price is None or stop_loss_price is None:
+                return "OCO orders require take_profit_price and stop_loss_price"
+            if stop_loss_price >= take_profit_price:
+                return "stop_loss_price must be less than take_profit_price"
+            return None
+        if order_type not in ORDER_TYPES:
+            return f"Invalid order type: {order_type}"
+        if order_type in ("limit", "stop_limit") and limit_price is None:
+            return f"limit_price required for {order_type} orders"
+        if order_type in ("stop", "stop_limit") and stop_price is None:
+            return f"stop_price required for {order_type} orders"
+        if order_class == "bracket":
+            if side != "buy":
+                return "Bracket orders must be buy orders"
+            if take_profit_price is None and stop_loss_price is None:
+                return "Bracket orders require take_profit_price or stop_loss_price"
+            if take_profit_price and stop_loss_price and stop_loss_price >= take_profit_price:
+                return "stop_loss_price must be less than take_profit_price"
+        elif take_profit_price is not None or stop_loss_price is not None:
+            return "take_profit_price and stop_loss_price require a bracket or OCO order"
+        return None
+
+    async def _latest_price(self, symbol: str) -> Optional[float]:
+        from app.integrations.market_data import get_market_data_service
+
+        try:
+            trade = await get_market_data_service().get_latest_trade(symbol)
+            return trade["price"]
+        except Exception as e:
+            logger.error(f"Error fetching price for {symbol}: {e}")
+            return None
+
+    def cancel(self, account_id: str, order_id: str) -> Dict[str, Any]:
+        """
+        Cancel an open order (and the other leg of its OCO pair).
+
+        Args:
+            account_id: Paper account ID owning the order
+            order_id: Order ID
+
+        Returns:
+            {"success": True, "orders": [...canceled]} or {"success": False, "error": ...}
+        """
+        order = self._orders.get(order_id)
+        if order is None or order.account_id != account_id or not order.is_open:
+            return {"success": False, "error": f"No open order found with id {order_id}"}
+
+        canceled = [order]
+        if order.oco_group:
+            canceled += [
+                self._orders[i] for i in self._oco_groups.get(order.oco_group, [])
+                if i != order.id and self._orders[i].is_open
+            ]
+        for o in canceled:
+            self._cancel(o)
+        return {"success": True, "orders": [o.to_dict() for o in canceled]}
+
+    def drop_account(self, account_id: str):
+        """Forget an account's orders (their rows are deleted by the caller)."""
+        for order_id in list(self._by_account.get(account_id, ())):
+            order = self._orders.pop(order_id, None)
+            if order is not None:
+                order.status = "canceled"
+            self._dirty.pop(order_id, None)
+        self._by_account.pop(account_id, None)
+        self._fills = [f for f in self._fills if f.account_id != account_id]
+
+    def get_orders(self, account_id: str) -> List[Dict[str, Any]]:
+        """Open orders of an account, oldest first."""
+        orders = [self._orders[i] for i in self._by_account.get(account_id, ())]
+        return [o.to_dict() for o in sorted(orders, key=lambda o: o.created_at)]
+
+    def reserved_cash(self, account_id: str) -> float:
+        """Cash committed to open buy orders."""
+        total = 0.0
+        for order_id in self._by_account.get(account_id, ()):
+            order = self._orders[order_id]
+            if order.side == "buy":
+                price = order.limit_price or order.stop_price or self._last_price.get(order.symbol, 0.0)
+                total += order.remaining * price
+        return total
+
+    def reserved_qty(self, account_id: str, symbol: str) -> float:
+        """Shares committed to open sell orders (an OCO pair counts once)."""
+        groups: Dict[str, float] = {}
+        total = 0.0
+        for order_id in self._by_account.get(account_id, ()):
+            order = self._orders[order_id]
+            if order.side != "sell" or order.symbol != symbol:
+                continue
+            if order.oco_group:
+                groups[order.oco_group] = max(groups.get(order.oco_group, 0.0), order.remaining)
+            else:
+                total += order.remaining
+        return total + sum(groups.values())
+
+    def _add(self, order: RestingOrder):
+        self._orders[order.id] = order
+        self._by_account.setdefault(order.account_id, set()).add(order.id)
+        if order.oco_group:
+            self._oco_groups.setdefault(order.oco_group, []).append(order.id)
+        self._books.setdefault(order.symbol, OrderBook()).add(order, next(self._seq))
+
+    def _close(self, order: RestingOrder):
+        """Drop a filled or canceled order from the in-memory state."""
+        self._orders.pop(order.id, None)
+        account_orders = self._by_account.get(order.account_id)
+        if account_orders is not None:
+            account_orders.discard(order.id)
+        if order.oco_group:
+            group = self._oco_groups.get(order.oco_group, [])
+            if not any(self._orders.get(i) for i in group):
+                self._oco_groups.pop(order.oco_group, None)
+        self._dirty[order.id] = order
+
+    def _cancel(self, order: RestingOrder):
+        order.status = "canceled"
+        order.canceled_at = datetime.utcnow()
+        self._close(order)
+
+    def _open(self, order_id: str) -> Optional[RestingOrder]:
+        order = self._orders.get(order_id)
+        return order if order is not None and order.is_open else None
+
+    # ------------------------------------------------------------------
+    # Matching
+    # ------------------------------------------------------------------
+
+    async def on_trade(self, trade: Dict[str, Any]):
+        """Stream callback for trade ticks."""
+        self.match(trade["symbol"], trade["price"], trade.get("size"))
+
+    async def on_bar(self, bar: Dict[str, Any]):
+        """
+        Match resting orders against a bar.
+
+        The bar is replayed as four trades along the path open, low, high,
+        close (open, high, low, close for down bars), each carrying a quarter
+        of the volume.
+        """
+        if bar["close"] >= bar["open"]:
+            path = (bar["open"], bar["low"], bar["high"], bar["close"])
+        else:
+            path = (bar["open"], bar["high"], bar["low"], bar["close"])
+        volume = bar.get("volume")
+        size = volume / len(path) if volume else None
+        for price in path:
+            self.match(bar["symbol"], price, size)
+
+    def match(self, symbol: str, price: float, size: Optional[float] = None) -> List[PaperFill]:
+        """
+        Match a symbol's resting orders against one trade.
+
+        Stops at or through the price trigger first; then market orders,
+        bids at or above the price and asks at or below it fill at the trade
+        price, in priority order, until the trade's size is used up.
+
+        Args:
+            symbol: Stock symbol
+            price: Trade price
+            size: Trade size (None for unlimited liquidity)
+
+        Returns:
+            Fills made by this trade
+        """
+        self._last_price[symbol] = price
+        book = self._books.get(symbol)
+        if book is None:
+            return []
+
+        fills: List[PaperFill] = []
+        liquidity = size * self.participation if size else math.inf
+
+        while book.buy_stops and book.buy_stops[0][0] <= price:
+            self._trigger(book, heapq.heappop(book.buy_stops)[2])
+        while book.sell_stops and -book.sell_stops[0][0] >= price:
+            self._trigger(book, heapq.heappop(book.sell_stops)[2])
+
+        while book.market and liquidity > EPSILON:
+            order = self._open(book.market[0])
+            if order is not None:
+                liquidity -= self._fill(order, min(order.remaining, liquidity), price, fills)
+            if order is None or not order.is_open:
+                book.market.popleft()
+
+        while book.bids and liquidity > EPSILON:
+            neg_limit, _, order_id = book.bids[0]
+            order = self._open(order_id)
+            if order is not None:
+                if -neg_limit < price:
+                    break
+                liquidity -= self._fill(order, min(order.remaining, liquidity), price, fills)
+            if order is None or not order.is_open:
+                heapq.heappop(book.bids)
+
+        while book.asks and liquidity > EPSILON:
+            limit, _, order_id = book.asks[0]
+            order = self._open(order_id)
+            if order is not None:
+                if limit > price:
+                    break
+                liquidity -= self._fill(order, min(order.remaining, liquidity), price, fills)
+            if order is None or not order.is_open:
+                heapq.heappop(book.asks)
+
+        if not (book.bids or book.asks or book.buy_stops or book.sell_stops or book.market):
+            del self._books[symbol]
+        if len(self._fills) >= self.max_batch:
+            self._wakeup.set()
+        return fills
+
+    def _trigger(self, book: OrderBook, order_id: str):
+        order = self._open(order_id)
+        if order is None:
+            return
+        order.triggered = True
+        book.add(order, next(self._seq))
+
+    def _fill(self, order: RestingOrder, qty: float, price: float, fills: List[PaperFill]) -> float:
+        """Fill part of an order; returns the quantity filled."""
+        if qty <= EPSILON:
+            return 0.0
+        now = datetime.utcnow()
+        filled = order.filled_qty + qty
+        order.avg_fill_price = ((order.avg_fill_price or 0.0) * order.filled_qty + price * qty) / filled
+        order.filled_qty = filled
+        if order.remaining <= EPSILON:
+            order.status = "filled"
+            order.filled_at = now
+            self._close(order)
+        else:
+            order.status = "partially_filled"
+            self._dirty[order.id] = order
+
+        fill = PaperFill(order.id, order.account_id, order.symbol, order.side, qty, price, now)
+        fills.append(fill)
+        self._fills.append(fill)
+
+        if order.order_class == "bracket" and order.parent_id is None:
+            self._on_entry_fill(order, qty)
+        if order.oco_group:
+            self._on_oco_fill(order)
+        return qty
+
+    def _on_entry_fill(self, entry: RestingOrder, qty: float):
+        """Place or grow a bracket entry's exits by the filled quantity."""
+        open_children = [self._orders[i] for i in entry.children if i in self._orders]
+        if open_children:
+            for child in open_children:
+                child.qty += qty
+                self._dirty[child.id] = child
+            return
+
+        group = str(uuid.uuid4()) if entry.take_profit_price and entry.stop_loss_price else None
+        exits = []
+        if entry.take_profit_price:
+            exits.append(("limit", entry.take_profit_price, None))
+        if entry.stop_loss_price:
+            exits.append(("stop", None, entry.stop_loss_price))
+        for order_type, limit_price, stop_price in exits:
+            child = RestingOrder(
+                id=str(uuid.uuid4()), account_id=entry.account_id, symbol=entry.symbol,
+                side="sell", order_type=order_type, qty=qty, limit_price=limit_price,
+                stop_price=stop_price, order_class="bracket", parent_id=entry.id, oco_group=group,
+            )
+            entry.children.append(child.id)
+            self._add(child)
+            self._dirty[child.id] = child
+
+    def _on_oco_fill(self, order: RestingOrder):
+        """Shrink the other leg to what is left to sell; cancel it once done."""
+        for sibling_id in self._oco_groups.get(order.oco_group, []):
+            sibling = self._orders.get(sibling_id)
+            if sibling is None or sibling is order or not sibling.is_open:
+                continue
+            if order.remaining <= EPSILON:
+                self._cancel(sibling)
+            else:
+                sibling.qty = sibling.filled_qty + order.remaining
+                self._dirty[sibling.id] = sibling
+
+    # ------------------------------------------------------------------
+    # Write-behind persistence
+    # ------------------------------------------------------------------
+
+    async def flush(self) -> int:
+        """
+        Write pending fills and order changes in one transaction.
+
+        Returns:
+            Number of fills written
+        """
+        async with self._flush_lock:
+            fills, self._fills = self._fills, []
+            dirty, self._dirty = self._dirty, {}
+            self._wakeup.clear()
+            if not fills and not dirty:
+                return 0
+            try:
+                async with self._session_factory() as db:
+                    await self._write(db, fills, dirty)
+            except Exception as e:
+                logger.error(f"Error writing {len(fills)} paper fills: {e}", exc_info=True)
+                self._fills = fills + self._fills
+                self._dirty = {**dirty, **self._dirty}
+                return 0
+        logger.debug(f"Wrote {len(fills)} paper fills and {len(dirty)} order updates")
+        return len(fills)
+
+    async def _write(self, db: AsyncSession, fills: List[PaperFill], dirty: Dict[str, RestingOrder]):
+        accounts: Dict[str, PaperAccount] = {}
+        positions: Dict[Tuple[str, str], PaperPosition] = {}
+        if fills:
+            account_ids = {f.account_id for f in fills}
+            result = await db.execute(select(PaperAccount).where(PaperAccount.id.in_(account_ids)))
+            accounts = {a.id: a for a in result.scalars().all()}
+            keys = {(f.account_id, f.symbol) for f in fills}
+            result = await db.execute(
+                select(PaperPosition).where(or_(*(
+                    and_(PaperPosition.account_id == a, PaperPosition.symbol == s) for a, s in keys
+                )))
+            )
+            positions = {(p.account_id, p.symbol): p for p in result.scalars().all()}
+
+        for fill in fills:
+            account = accounts.get(fill.account_id)
+            if account is None:
+                continue  # Account was deleted
+            await self._apply_fill(db, account, positions, fill)
+
+        if dirty:
+            result = await db.execute(select(PaperOrder).where(PaperOrder.id.in_(list(dirty))))
+            rows = {row.id: row for row in result.scalars().all()}
+            for order_id, order in dirty.items():
+                values = order.model_values()
+                row = rows.get(order_id)
+                if row is None:
+                    db.add(PaperOrder(**values))
+                else:
+                    for name, value in values.items():
+                        setattr(row, name, value)
+
+        await db.commit()
+
+    async def _apply_fill(
+        self,
+        db: AsyncSession,
+        account: PaperAccount,
+        positions: Dict[Tuple[str, str], PaperPosition],
+        fill: PaperFill,
+    ):
+        key = (fill.account_id, fill.symbol)
+        pos = positions.get(key)
+        qty = fill.qty
+
+        if fill.side == "buy":
+            account.cash_balance -= qty * fill.price
+            if pos is not None:
+                total_qty = pos.qty + qty
+                pos.avg_price = (pos.qty * pos.avg_price + qty * fill.price) / total_qty
+                pos.qty = total_qty
+            else:
+                pos = PaperPosition(
+                    id=str(uuid.uuid4()),
+                    account_id=fill.account_id,
+                    symbol=fill.symbol,
+                    qty=qty,
+                    avg_price=fill.price,
+                )
+                db.add(pos)
+                positions[key] = pos
+        else:
+            held = pos.qty if pos is not None else 0.0
+            if qty > held + EPSILON:
+                # Shares were sold outside the engine after the order was placed
+                logger.warning(
+                    f"Paper sell fill of {qty} {fill.symbol} exceeds position of {held}; "
+                    f"filling {held}"
+                )
+                qty = held
+            if qty <= EPSILON:
+                return
+            account.cash_balance += qty * fill.price
+            account.total_pnl += (fill.price - pos.avg_price) * qty
+            pos.qty -= qty
+            if pos.qty <= EPSILON:
+                get_trigger_index().remove(pos.id)
+                positions.pop(key)
+                await db.delete(pos)
+
+        db.add(PaperTrade(
+            account_id=fill.account_id,
+            symbol=fill.symbol,
+            qty=qty,
+            side=fill.side,
+            price=fill.price,
+            value=qty * fill.price,
+            timestamp=fill.timestamp,
+        ))
+
+    async def _flush_loop(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            await self.flush()
+
+
+# Global engine instance
+_paper_matching_engine: Optional[PaperMatchingEngine] = None
+
+
+def get_paper_matching_engine() -> PaperMatchingEngine:
+    """
+    Get or create singleton paper matching engine.
+
+    Returns:
+        PaperMatchingEngine instance
+    """
+    global _paper_matching_engine
+    if _paper_matching_engine is None:
+        _paper_matching_engine = PaperMatchingEngine(participation=settings.PAPER_FILL_PARTICIPATION)
+    return _paper_matching_engine
@@ -1,14 +1,18 @@
 """
 Paper trading service for simulated trading with virtual money.
 """
+import uuid
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_, delete
 from sqlalchemy.orm import selectinload
 
-from app.models.paper_trading import PaperAccount, PaperPosition, PaperTrade
+from app.core.config import settings
+from app.models.paper_trading import PaperAccount, PaperOrder, PaperPosition, PaperTrade
 from app.integrations.market_data import get_market_data_service
+from app.services.stop_loss_monitor import StopTrigger, get_trigger_index, get_stop_trigger_engine
+from app.services.paper_matching import get_paper_matching_engine
 
 
 class PaperTradingService:
@@ -98,7 +102,9 @@ class PaperTradingService:
                 'avg_price': pos.avg_price,
                 'current_price': current_price,
                 'market_value': market_value,
-                'unrealized_pnl': unrealized_pnl
+                'unrealized_pnl': unrealized_pnl,
+                'stop_loss_price': pos.stop_loss_price,
+                'take_profit_price': pos.take_profit_price,
             }
 
         trades_list = [
@@ -149,7 +155,12 @@ class PaperTradingService:
         if account:
             account_id = account.id
 
-            # Delete associated positions and trades
+            # Delete associated positions, trades and resting orders
+            get_trigger_index().remove_account(account_id)
+            get_paper_matching_engine().drop_account(account_id)
+            await self.session.execute(
+                delete(PaperOrder).where(PaperOrder.account_id == account_id)
+            )
             await self.session.execute(
                 delete(PaperPosition).where(PaperPosition.account_id == account_id)
             )
@@ -177,11 +188,22 @@ class PaperTradingService:
         qty: float,
         side: str,  # 'buy' or 'sell'
         order_type: str = 'market',
-        limit_price: Optional[float] = None
+        limit_price: Optional[float] = None,
+        stop_loss_price: Optional[float] = None,
+        take_profit_price: Optional[float] = None
     ) -> Dict[str, Any]:
         """
         Execute a simulated order.
+
+        Buy orders may set a stop-loss and take-profit on the position; the
+        position is sold automatically when a trade crosses either level.
         """
+        if side == 'sell' and (stop_loss_price is not None or take_profit_price is not None):
+            return {
+                "success": False,
+                "error": "Stop-loss and take-profit cannot be set on sell orders"
+            }
+
         # 1. Fetch Account (Single Query)
         result = await self.session.execute(
             select(PaperAccount)
@@ -251,12 +273,19 @@ class PaperTradingService:
                 
                 pos.qty = total_qty
                 pos.avg_price = avg_price
+                if stop_loss_price is not None:
+                    pos.stop_loss_price = stop_loss_price
+                if take_profit_price is not None:
+                    pos.take_profit_price = take_profit_price
             else:
                 pos = PaperPosition(
+                    id=str(uuid.uuid4()),
                     account_id=account.id,
                     symbol=symbol,
                     qty=qty,
-                    avg_price=current_price
+                    avg_price=current_price,
+                    stop_loss_price=stop_loss_price,
+                    take_profit_price=take_profit_price
                 )
                 self.session.add(pos)
         
@@ -283,6 +312,10 @@ class PaperTradingService:
             if pos.qty <= 0:
                 await self.session.delete(pos)
 
+        # Thresholds to keep in the stop trigger index (read before commit expires pos)
+        trigger_levels = (pos.id, symbol, account.id, pos.stop_loss_price, pos.take_profit_price)
+        position_closed = side == 'sell' and pos.qty <= 0
+
         # 3. Create Trade Record
         timestamp = datetime.utcnow()
         trade = PaperTrade(
@@ -299,6 +332,13 @@ class PaperTradingService:
         # 4. Commit Transaction
         await self.session.commit()
 
+        if position_closed:
+            get_trigger_index().remove(trigger_levels[0])
+        else:
+            get_trigger_index().upsert(*trigger_levels)
+            if stop_loss_price is not None or take_profit_price is not None:
+                await get_stop_trigger_engine().watch([symbol])
+
         # 5. Re-query for Final State Calculation
         # We need the fresh list of positions to calculate total equity.
         # Everything is expired now, so we MUST start a new query.
@@ -345,6 +385,193 @@ class PaperTradingService:
             "account": formatted_account
         }
     
+    async def update_position_stop_loss_take_profit(
+        self,
+        user_id: str,
+        symbol: str,
+        stop_loss_price: Optional[float] = None,
+        take_profit_price: Optional[float] = None,
+        clear_stop_loss: bool = False,
+        clear_take_profit: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Set or clear the stop-loss and take-profit of an existing position.
+
+        Prices left as None are unchanged unless the matching clear flag is set.
+        """
+        result = await self.session.execute(
+            select(PaperAccount).where(PaperAccount.user_id == user_id)
+        )
+        account = result.scalar_one_or_none()
+        if not account:
+            return {"success": False, "error": "Paper trading account not found"}
+
+        pos_result = await self.session.execute(
+            select(PaperPosition)
+            .where(and_(PaperPosition.account_id == account.id, PaperPosition.symbol == symbol))
+        )
+        pos = pos_result.scalar_one_or_none()
+        if not pos:
+            return {"success": False, "error": f"No position found for {symbol}"}
+
+        new_stop_loss = None if clear_stop_loss else (
+            stop_loss_price if stop_loss_price is not None else pos.stop_loss_price
+        )
+        new_take_profit = None if clear_take_profit else (
+            take_profit_price if take_profit_price is not None else pos.take_profit_price
+        )
+        if new_stop_loss is not None and new_take_profit is not None and new_stop_loss >= new_take_profit:
+            return {"success": False, "error": "stop_loss_price must be less than take_profit_price"}
+
+        pos.stop_loss_price = new_stop_loss
+        pos.take_profit_price = new_take_profit
+        position_info = {
+            "symbol": symbol,
+            "qty": pos.qty,
+            "avg_price": pos.avg_price,
+            "stop_loss_price": new_stop_loss,
+            "take_profit_price": new_take_profit,
+        }
+        trigger_levels = (pos.id, symbol, account.id, new_stop_loss, new_take_profit)
+
+        await self.session.commit()
+
+        get_trigger_index().upsert(*trigger_levels)
+        if new_stop_loss is not None or new_take_profit is not None:
+            await get_stop_trigger_engine().watch([symbol])
+
+        return {"success": True, "position": position_info}
+
+    async def execute_triggered_exits(self, triggers: List[StopTrigger]) -> List[Dict[str, Any]]:
+        """
+        Sell positions whose stop-loss or take-profit was crossed.
+
+        All positions are loaded with one query and sold in one transaction,
+        each at the price of the trade that triggered it. Positions that are
+        gone or whose thresholds changed since they triggered are skipped,
+        and a position is only sold by the transaction that deletes it, so
+        concurrent workers exit each position once.
+
+        Args:
+            triggers: Triggers from the stop trigger index
+
+        Returns:
+            One result per executed exit
+        """
+        if not triggers:
+            return []
+
+        result = await self.session.execute(
+            select(PaperPosition)
+            .where(PaperPosition.id.in_([t.position_id for t in triggers]))
+            .options(selectinload(PaperPosition.account))
+        )
+        positions = {p.id: p for p in result.scalars().all()}
+
+        timestamp = datetime.utcnow()
+        results = []
+        for trigger in triggers:
+            position = positions.pop(trigger.position_id, None)
+            if position is None:
+                continue
+            if trigger.trigger_type == "stop_loss":
+                level = position.stop_loss_price
+                still_triggered = level is not None and trigger.price <= level
+            else:
+                level = position.take_profit_price
+                still_triggered = level is not None and trigger.price >= level
+            if not still_triggered:
+                continue
+
+            # Another worker may have exited the position since it was
+            # loaded; only the transaction that deletes it sells it
+            deleted = await self.session.execute(
+                delete(PaperPosition).where(PaperPosition.id == position.id)
+            )
+            if deleted.rowcount != 1:
+                continue
+
+            account = position.account
+            qty = position.qty
+            price = trigger.price
+            order_value = qty * price
+            realized_pnl = (price - position.avg_price) * qty
+
+            account.cash_balance += order_value
+            account.total_pnl += realized_pnl
+            self.session.add(PaperTrade(
+                account_id=account.id,
+                symbol=position.symbol,
+                qty=qty,
+                side="sell",
+                price=price,
+                value=order_value,
+                timestamp=timestamp
+            ))
+
+            results.append({
+                "success": True,
+                "trigger_type": trigger.trigger_type,
+                "trigger_price": level,
+                "execution_price": price,
+                "position": {
+                    "symbol": position.symbol,
+                    "qty": qty,
+                    "avg_price": position.avg_price,
+                    "stop_loss_price": position.stop_loss_price,
+                    "take_profit_price": position.take_profit_price,
+                },
+                "realized_pnl": realized_pnl,
+                "trade": {
+                    "symbol": position.symbol,
+                    "qty": qty,
+                    "side": "sell",
+                    "price": price,
+                    "value": order_value,
+                    "timestamp": timestamp.isoformat(),
+                },
+                "user_id": account.user_id,
+            })
+
+        if results:
+            await self.session.commit()
+        return results
+
+    async def place_resting_order(self, user_id: str, **order: Any) -> Dict[str, Any]:
+        """
+        Place a limit, stop, bracket or OCO order with the matching engine.
+
+        The order rests until streaming prices fill it; see
+        ``PaperMatchingEngine.submit`` for the order arguments.
+        """
+        if not settings.PAPER_MATCHING_ENGINE_ENABLED:
+            return {"success": False, "error": "Resting paper orders are not enabled"}
+        return await get_paper_matching_engine().submit(self.session, user_id, **order)
+
+    async def get_resting_orders(self, user_id: str) -> List[Dict[str, Any]]:
+        """Get open resting orders."""
+        account_id = await self._get_account_id(user_id)
+        if not account_id:
+            return []
+        return get_paper_matching_engine().get_orders(account_id)
+
+    async def cancel_resting_order(self, user_id: str, order_id: str) -> Dict[str, Any]:
+        """Cancel an open resting order (and the other leg of an OCO pair)."""
+        account_id = await self._get_account_id(user_id)
+        if not account_id:
+            return {"success": False, "error": "Paper trading account not found"}
+        engine = get_paper_matching_engine()
+        result = engine.cancel(account_id, order_id)
+        if result["success"]:
+            await engine.flush()
+        return result
+
+    async def _get_account_id(self, user_id: str) -> Optional[str]:
+        result = await self.session.execute(
+            select(PaperAccount.id).where(PaperAccount.user_id == user_id)
+        )
+        return result.scalar_one_or_none()
+
     async def get_paper_positions(self, user_id: str) -> List[Dict[str, Any]]:
         """Get all paper trading positions."""
         account_dict = await self.get_paper_account(user_id)
@@ -0,0 +1,580 @@
+"""
+Portfolio risk engine.
+
+Computes value at risk (VaR) and expected shortfall (CVaR) of a set of
+positions from the joint daily returns of the symbols held, so that
+correlations between holdings are taken into account:
+
+- historical: losses the current positions would have made on each day of
+  the return window
+- parametric: normal approximation from the covariance matrix
+- Monte Carlo: correlated Student-t draws scaled by the covariance matrix
+
+The return window and covariance matrix are shared by all portfolios and
+updated incrementally as new daily bars arrive, so a risk refresh is a few
+matrix-vector products. Symbols are modeled over the days they have prices
+(pairwise covariance), and symbols with too little history are reported as
+unmodeled instead of shortening everyone's window. Stress tests apply historical market shocks (scaled
+by each symbol's beta) or custom per-symbol shocks to the current positions.
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from statistics import NormalDist
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from app.core.config import settings
+from app.integrations.market_data import MarketDataProvider, get_market_data_service
+
+logger = logging.getLogger(__name__)
+
+# Symbol whose returns define "the market" for beta-scaled shocks
+BENCHMARK_SYMBOL = "SPY"
+
+# One-day S&P 500 moves, applied to positions scaled by beta
+HISTORICAL_SCENARIOS: Dict[str, Dict[str, Any]] = {
+    "black_monday_1987": {"date": "1987-10-19", "market_return": -0.2047},
+    "gfc_2008": {"date": "2008-10-15", "market_return": -0.0903},
+    "flash_crash_2010": {"date": "2010-05-06", "market_return": -0.0324},
+    "us_downgrade_2011": {"date": "2011-08-08", "market_return": -0.0666},
+    "covid_2020": {"date": "2020-03-16", "market_return": -0.1198},
+    "covid_rebound_2020": {"date": "2020-03-24", "market_return": 0.0938},
+}
+
+
+class RollingCovariance:
+    """
+    Covariance of a fixed window of return vectors.
+
+    Keeps the returns in a ring buffer along with running sums of the
+    returns, their outer products and the pairwise observation counts, so
+    adding a day costs O(n^2) instead of recomputing the covariance from the
+    whole window. Missing returns (NaN, e.g. before a symbol listed) are
+    left out pairwise: each covariance uses the days both symbols have. The
+    sums are rebuilt from the buffer once per window length to stop rounding
+    errors from building up.
+    """
+
+    def __init__(self, symbols: Sequence[str], window: int = 252):
+        """
+        Initialize rolling covariance.
+
+        Args:
+            symbols: Symbols in column order
+            window: Number of return observations kept
+        """
+        n = len(symbols)
+        self.symbols = list(symbols)
+        self.index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self.window = window
+        self._buffer = np.zeros((window, n))
+        self._head = 0
+        self._count = 0
+        # _pairs[i, j]: days with returns for both i and j
+        # _sums[i, j]: sum of i's returns on those days
+        self._pairs = np.zeros((n, n))
+        self._sums = np.zeros((n, n))
+        self._cross = np.zeros((n, n))
+        self._pushes_since_rebuild = 0
+        self._covariance: Optional[np.ndarray] = None
+
+    @classmethod
+    def from_returns(cls, symbols: Sequence[str], returns: np.ndarray, window: int = 252) -> "RollingCovariance":
+        """Create from a (days x symbols) return matrix, oldest first (NaN = missing)."""
+        rolling = cls(symbols, window)
+        returns = returns[-window:]
+        rolling._count = len(returns)
+        rolling._buffer[:rolling._count] = returns
+        rolling._head = rolling._count % window
+        rolling._rebuild()
+        return rolling
+
+    def __len__(self) -> int:
+        return self._count
+
+    @staticmethod
+    def _terms(returns: np.ndarray):
+        present = ~np.isnan(returns)
+        return present.astype(float), np.where(present, returns, 0.0)
+
+    def push(self, returns: np.ndarray):
+        """Add one day of returns, dropping the oldest day once the window is full."""
+        if self._count == self.window:
+            mask, values = self._terms(self._buffer[self._head])
+            self._pairs -= np.outer(mask, mask)
+            self._sums -= np.outer(values, mask)
+            self._cross -= np.outer(values, values)
+        else:
+            self._count += 1
+        self._buffer[self._head] = returns
+        mask, values = self._terms(returns)
+        self._pairs += np.outer(mask, mask)
+        self._sums += np.outer(values, mask)
+        self._cross += np.outer(values, values)
+        self._head = (self._head + 1) % self.window
+        self._covariance = None
+
+        self._pushes_since_rebuild += 1
+        if self._pushes_since_rebuild >= self.window:
+            self._rebuild()
+
+    def _rebuild(self):
+        mask, values = self._terms(self.returns)
+        self._pairs = mask.T @ mask
+        self._sums = values.T @ mask
+        self._cross = values.T @ values
+        self._pushes_since_rebuild = 0
+        self._covariance = None
+
+    @property
+    def returns(self) -> np.ndarray:
+        """Returns in the window, oldest first."""
+        if self._count < self.window:
+            return self._buffer[:self._count]
+        return np.concatenate((self._buffer[self._head:], self._buffer[:self._head]))
+
+    @property
+    def observations(self) -> np.ndarray:
+        """Number of returns per symbol."""
+        return np.diag(self._pairs).copy()
+
+    @property
+    def mean(self) -> np.ndarray:
+        """Mean return per symbol over the days it has returns."""
+        counts = np.diag(self._pairs)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(counts > 0, np.diag(self._sums) / counts, 0.0)
+
+    @property
+    def covariance(self) -> np.ndarray:
+        """Pairwise sample covariance matrix (cached until the next push)."""
+        if self._covariance is None:
+            pairs = self._pairs
+            with np.errstate(invalid="ignore", divide="ignore"):
+                covariance = (self._cross - self._sums * self._sums.T / pairs) / (pairs - 1)
+            self._covariance = np.where(pairs > 1, covariance, 0.0)
+        return self._covariance
+
+
+class PortfolioRiskEngine:
+    """
+    VaR, CVaR and stress tests from a shared, incrementally updated
+    covariance matrix.
+
+    The window covers the symbols of every portfolio seen so far. Each
+    portfolio's historical VaR uses the days on which all of its own
+    holdings have returns, and the covariance is pairwise, so a recently
+    listed symbol held by one user does not shorten the history of others.
+    Symbols with fewer than ``min_observations`` returns are not modeled
+    and are reported as unmodeled.
+    """
+
+    def __init__(
+        self,
+        window: int = 252,
+        simulations: int = 5000,
+        dof: Optional[float] = 5.0,
+        seed: Optional[int] = None,
+        min_observations: int = 30,
+    ):
+        """
+        Initialize portfolio risk engine.
+
+        Args:
+            window: Number of daily returns used
+            simulations: Number of Monte Carlo scenarios
+            dof: Degrees of freedom of the Monte Carlo Student-t draws
+                (None for normal draws)
+            seed: Random seed for the Monte Carlo draws
+            min_observations: Daily returns a symbol needs to be modeled
+        """
+        self.window = window
+        self.simulations = simulations
+        self.dof = dof
+        self.min_observations = max(min_observations, 2)
+        self._rng = np.random.default_rng(seed)
+        self._rolling: Optional[RollingCovariance] = None
+        self._last_close: Optional[np.ndarray] = None
+        self._last_timestamp: Optional[pd.Timestamp] = None
+        self._draws: Optional[np.ndarray] = None
+        self._factors: Dict[tuple, np.ndarray] = {}
+        # Symbols left out for lack of history, retried on the next day's load
+        self._short_history: set = set()
+        self._seeded_on = None
+        self._lock = asyncio.Lock()
+
+    @property
+    def symbols(self) -> List[str]:
+        return self._rolling.symbols if self._rolling is not None else []
+
+    @property
+    def as_of(self) -> Optional[datetime]:
+        return self._last_timestamp.to_pydatetime() if self._last_timestamp is not None else None
+
+    # ------------------------------------------------------------------
+    # Return history
+    # ------------------------------------------------------------------
+
+    def seed(self, closes: pd.DataFrame):
+        """
+        Rebuild the return window from daily closes.
+
+        Args:
+            closes: Closes indexed by timestamp, one column per symbol (NaN
+                where a symbol has no close); symbols with fewer than
+                min_observations returns in the window are left out
+        """
+        closes = closes.sort_index().dropna(how="all").tail(self.window + 1)
+        returns = np.diff(np.log(closes.to_numpy(dtype=float)), axis=0)
+        observations = (~np.isnan(returns)).sum(axis=0)
+        modeled = observations >= self.min_observations
+
+        self._short_history = {symbol for symbol, ok in zip(closes.columns, modeled) if not ok}
+        self._seeded_on = datetime.now(timezone.utc).date()
+        self._draws = None
+        self._factors = {}
+        if not modeled.any():
+            self._rolling = None
+            self._last_close = None
+            self._last_timestamp = None
+            logger.info(f"No symbol has {self.min_observations} days of history; risk engine is empty")
+            return
+
+        symbols = [symbol for symbol, ok in zip(closes.columns, modeled) if ok]
+        self._rolling = RollingCovariance.from_returns(symbols, returns[:, modeled], self.window)
+        self._last_close = closes[symbols].ffill().iloc[-1].to_numpy(dtype=float)
+        self._last_timestamp = closes.index[-1]
+        logger.info(
+            f"Seeded risk engine with {len(returns)} days of {len(symbols)} symbols"
+            + (f" ({len(self._short_history)} with too little history)" if self._short_history else "")
+        )
+
+    def update(self, timestamp: Any, closes: Dict[str, float]) -> bool:
+        """
+        Add one day of closes for the tracked symbols.
+
+        Args:
+            timestamp: Bar timestamp
+            closes: Close per symbol; must cover every tracked symbol
+
+        Returns:
+            True if the day was added, False if it was stale or incomplete
+        """
+        if self._rolling is None:
+            return False
+        timestamp = pd.Timestamp(timestamp)
+        if timestamp <= self._last_timestamp:
+            return False
+        try:
+            close = np.fromiter((closes[s] for s in self.symbols), dtype=float, count=len(self.symbols))
+        except KeyError:
+            return False
+        self._rolling.push(np.log(close / self._last_close))
+        self._last_close = close
+        self._last_timestamp = timestamp
+        self._factors = {}
+        return True
+
+    async def load(self, symbols: Sequence[str], market_data: Optional[MarketDataProvider] = None):
+        """
+        Make sure the return window covers symbols and is up to date.
+
+        Fetches the full history only when new symbols appear (symbols that
+        had too little history are retried once a day); otherwise only bars
+        after the last one seen are fetched and added.
+
+        Args:
+            symbols: Symbols that must be covered
+            market_data: Market data provider (defaults to the configured one)
+        """
+        if not symbols and self._rolling is None:
+            return
+        market_data = market_data or get_market_data_service()
+        async with self._lock:
+            missing = set(symbols) - set(self.symbols)
+            if self._seeded_on == datetime.now(timezone.utc).date():
+                missing -= self._short_history
+            if missing:
+                tracked = sorted(set(self.symbols) | set(symbols))
+                end = datetime.now(timezone.utc)
+                # Calendar days spanning window trading days, plus margin
+                start = end - timedelta(days=int(self.window * 1.5) + 10)
+                self.seed(await self._fetch_closes(market_data, tracked, start, end))
+            elif self._rolling is not None:
+                start = self._last_timestamp.to_pydatetime() + timedelta(seconds=1)
+                closes = await self._fetch_closes(market_data, self.symbols, start, None)
+                for timestamp, row in closes.dropna().iterrows():
+                    self.update(timestamp, row.to_dict())
+
+    async def _fetch_closes(
+        self,
+        market_data: MarketDataProvider,
+        symbols: Sequence[str],
+        start: datetime,
+        end: Optional[datetime],
+    ) -> pd.DataFrame:
+        bar_lists = await asyncio.gather(*(
+            market_data.get_bars(symbol, timeframe="1Day", start=start, end=end, limit=10_000)
+            for symbol in symbols
+        ))
+        return pd.DataFrame({
+            symbol: pd.Series(
+                [bar["close"] for bar in bars],
+                index=pd.to_datetime([bar["timestamp"] for bar in bars]),
+                dtype=float,
+            )
+            for symbol, bars in zip(symbols, bar_lists)
+        })
+
+    # ------------------------------------------------------------------
+    # Risk
+    # ------------------------------------------------------------------
+
+    def exposures(self, positions: Dict[str, float]) -> np.ndarray:
+        """Vector of signed market values in the engine's symbol order."""
+        vector = np.zeros(len(self.symbols))
+        index = self._rolling.index if self._rolling is not None else {}
+        for symbol, value in positions.items():
+            i = index.get(symbol)
+            if i is not None:
+                vector[i] += value
+        return vector
+
+    def _common_returns(self, held: np.ndarray) -> np.ndarray:
+        """Returns of the held symbols on the days all of them have one."""
+        returns = self._rolling.returns[:, held]
+        return returns[~np.isnan(returns).any(axis=1)]
+
+    def risk(
+        self,
+        positions: Dict[str, float],
+        confidence: float = 0.95,
+        horizon_days: int = 1,
+    ) -> Dict[str, Any]:
+        """
+        Compute VaR and CVaR of a set of positions.
+
+        Losses are reported as positive dollar amounts. Multi-day horizons
+        are scaled by the square root of time. Positions without modeled
+        history add nothing; with none modeled the risk is zero.
+
+        Args:
+            positions: Signed market value per symbol
+            confidence: Confidence level, e.g. 0.95
+            horizon_days: Holding period in days
+
+        Returns:
+            Dictionary with historical, parametric and Monte Carlo VaR/CVaR,
+            per-symbol contributions to parametric VaR, and the symbols
+            without enough price history (left out of the calculation)
+        """
+        if not 0.5 < confidence < 1:
+            raise ValueError("confidence must be between 0.5 and 1")
+
+        exposures = self.exposures(positions)
+        held = np.flatnonzero(exposures)
+        unmodeled = sorted(set(positions) - set(self.symbols))
+        if len(held) == 0:
+            zero = {"var": 0.0, "cvar": 0.0}
+            return {
+                "as_of": self.as_of,
+                "confidence": confidence,
+                "horizon_days": horizon_days,
+                "observations": 0,
+                "gross_exposure": 0.0,
+                "net_exposure": 0.0,
+                "volatility": 0.0,
+                "historical": dict(zero),
+                "parametric": dict(zero),
+                "monte_carlo": dict(zero),
+                "contributions": [],
+                "unmodeled_symbols": unmodeled,
+            }
+
+        w = exposures[held]
+        scale = np.sqrt(horizon_days)
+        returns = self._common_returns(held)
+        if len(returns) < 2:
+            raise ValueError("Held symbols have fewer than 2 days of common price history")
+        mean = self._rolling.mean[held]
+        cov = self._rolling.covariance[np.ix_(held, held)]
+
+        # Historical: replay each day of the window on today's positions
+        historical = self._tail(np.expm1(returns) @ w * scale, confidence)
+
+        # Parametric: P&L ~ N(w.mu, w'Σw)
+        sigma_w = cov @ w
+        sigma = float(np.sqrt(max(w @ sigma_w, 0.0)))
+        mu = float(mean @ w)
+        z = NormalDist().inv_cdf(confidence)
+        tail_density = NormalDist().pdf(z) / (1 - confidence)
+        parametric = {
+            "var": (z * sigma - mu) * scale,
+            "cvar": (tail_density * sigma - mu) * scale,
+        }
+
+        # Monte Carlo: fixed standardized draws, correlated through the factor
+        draws = self._standard_draws()[:, held]
+        loadings = self._factor(held) @ w
+        monte_carlo = self._tail((mu + draws @ loadings) * scale, confidence)
+
+        # Component VaR: sums to the parametric VaR (before the mean term)
+        components = w * sigma_w / sigma * z * scale if sigma > 0 else np.zeros_like(w)
+        return {
+            "as_of": self.as_of,
+            "confidence": confidence,
+            "horizon_days": horizon_days,
+            "observations": len(returns),
+            "gross_exposure": float(np.abs(w).sum()),
+            "net_exposure": float(w.sum()),
+            "volatility": sigma * scale,
+            "historical": historical,
+            "parametric": parametric,
+            "monte_carlo": monte_carlo,
+            "contributions": [
+                {"symbol": self.symbols[held[i]], "exposure": float(w[i]), "component_var": float(components[i])}
+                for i in np.argsort(-components)
+            ],
+            "unmodeled_symbols": unmodeled,
+        }
+
+    @staticmethod
+    def _tail(pnl: np.ndarray, confidence: float) -> Dict[str, float]:
+        losses = -pnl
+        var = float(np.quantile(losses, confidence))
+        tail = losses[losses >= var]
+        return {"var": var, "cvar": float(tail.mean()) if len(tail) else var}
+
+    def _factor(self, held: np.ndarray) -> np.ndarray:
+        """
+        Factor U with U'U equal to the held symbols' covariance (cached
+        until the next update).
+        """
+        key = tuple(held)
+        if key not in self._factors:
+            cov = self._rolling.covariance[np.ix_(held, held)]
+            # Jitter keeps the factorization defined for singular matrices
+            jitter = 1e-12 * max(float(np.trace(cov)) / len(cov), 1e-12)
+            try:
+                factor = np.linalg.cholesky(cov + jitter * np.eye(len(cov))).T
+            except np.linalg.LinAlgError:
+                # A pairwise covariance need not be positive semi-definite;
+                # drop its negative eigenvalues
+                values, vectors = np.linalg.eigh(cov)
+                factor = np.sqrt(np.clip(values, 0.0, None))[:, None] * vectors.T
+            self._factors[key] = factor
+        return self._factors[key]
+
+    def _standard_draws(self) -> np.ndarray:
+        """Unit-variance, uncorrelated draws (cached until the symbols change)."""
+        n = len(self.symbols)
+        if self._draws is None or self._draws.shape[1] != n:
+            draws = self._rng.standard_normal((self.simulations, n))
+            if self.dof is not None:
+                mix = np.sqrt(self._rng.chisquare(self.dof, size=(self.simulations, 1)) / self.dof)
+                draws = draws / mix * np.sqrt((self.dof - 2) / self.dof)
+            self._draws = draws
+        return self._draws
+
+    # ------------------------------------------------------------------
+    # Stress tests
+    # ------------------------------------------------------------------
+
+    def betas(self) -> np.ndarray:
+        """
+        Beta of each symbol to the benchmark.
+
+        Uses SPY if it is tracked, otherwise the equally weighted average of
+        the tracked symbols.
+        """
+        cov = self._rolling.covariance
+        i = self._rolling.index.get(BENCHMARK_SYMBOL)
+        if i is not None:
+            market_cov, market_var = cov[:, i], cov[i, i]
+        else:
+            weights = np.full(len(cov), 1 / len(cov))
+            market_cov = cov @ weights
+            market_var = weights @ market_cov
+        return market_cov / market_var if market_var > 0 else np.ones(len(cov))
+
+    def stress(
+        self,
+        positions: Dict[str, float],
+        scenarios: Optional[Dict[str, Dict[str, Any]]] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Apply shock scenarios to a set of positions.
+
+        A scenario has a ``market_return`` applied to every symbol scaled by
+        its beta, and/or ``shocks``, a return per symbol that overrides the
+        market move. Besides the given scenarios (the historical ones by
+        default), the worst day of the return window for these positions is
+        always included. Positions without modeled history are not shocked.
+
+        Args:
+            positions: Signed market value per symbol
+            scenarios: Scenarios by name
+
+        Returns:
+            Scenario P&L, worst first
+        """
+        scenarios = HISTORICAL_SCENARIOS if scenarios is None else scenarios
+        w = self.exposures(positions)
+        held = np.flatnonzero(w)
+        names = list(scenarios)
+        if len(held) == 0:
+            return [
+                {"scenario": name, "date": scenarios[name].get("date"), "pnl": 0.0, "pnl_pct": 0.0}
+                for name in names
+            ]
+
+        market = np.array([scenarios[name].get("market_return", 0.0) for name in names])
+        shocks = np.outer(market, self.betas())
+        for row, name in enumerate(names):
+            for symbol, shock in scenarios[name].get("shocks", {}).items():
+                column = self._rolling.index.get(symbol)
+                if column is not None:
+                    shocks[row, column] = shock
+
+        common = np.expm1(self._common_returns(held))
+        if len(common):
+            worst_day = np.zeros(len(w))
+            worst_day[held] = common[int(np.argmin(common @ w[held]))]
+            shocks = np.vstack([shocks, worst_day])
+            names.append("worst_day_in_window")
+
+        pnl = shocks @ w
+        gross = float(np.abs(w).sum())
+        results = [
+            {
+                "scenario": name,
+                "date": scenarios[name].get("date") if name in scenarios else None,
+                "pnl": float(value),
+                "pnl_pct": float(value / gross * 100) if gross else 0.0,
+            }
+            for name, value in zip(names, pnl)
+        ]
+        return sorted(results, key=lambda r: r["pnl"])
+
+
+# Global engine instance
+_portfolio_risk_engine: Optional[PortfolioRiskEngine] = None
+
+
+def get_portfolio_risk_engine() -> PortfolioRiskEngine:
+    """
+    Get or create singleton portfolio risk engine.
+
+    Returns:
+        PortfolioRiskEngine instance
+    """
+    global _portfolio_risk_engine
+    if _portfolio_risk_engine is None:
+        _portfolio_risk_engine = PortfolioRiskEngine(
+            window=settings.PORTFOLIO_RISK_WINDOW,
+            simulations=settings.PORTFOLIO_RISK_SIMULATIONS,
+        )
+    return _portfolio_risk_engine
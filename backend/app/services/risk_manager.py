@@ -16,6 +16,7 @@ from app.schemas.risk_rule import (
     PositionSizeResponse
 )
 from app.integrations.alpaca_client import AlpacaClient
+from app.services.portfolio_risk import get_portfolio_risk_engine
 
 
 class RiskManager:
@@ -373,3 +374,45 @@ class RiskManager:
             "buying_power": float(account.buying_power),
             "cash": float(account.cash)
         }
+
+    async def _position_exposures(self) -> Dict[str, float]:
+        positions = await self.alpaca.get_positions()
+        return {p["symbol"]: float(p["market_value"]) for p in positions}
+
+    async def get_portfolio_var(
+        self,
+        confidence: float = 0.95,
+        horizon_days: int = 1
+    ) -> Dict[str, Any]:
+        """
+        Get VaR and CVaR of the current positions.
+
+        Args:
+            confidence: Confidence level
+            horizon_days: Holding period in days
+
+        Returns:
+            Historical, parametric and Monte Carlo VaR/CVaR
+        """
+        exposures = await self._position_exposures()
+        engine = get_portfolio_risk_engine()
+        await engine.load(list(exposures))
+        return engine.risk(exposures, confidence=confidence, horizon_days=horizon_days)
+
+    async def stress_test_portfolio(
+        self,
+        scenarios: Optional[Dict[str, Dict[str, Any]]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Get the P&L of the current positions under shock scenarios.
+
+        Args:
+            scenarios: Custom scenarios (defaults to historical market shocks)
+
+        Returns:
+            Scenario P&L, worst first
+        """
+        exposures = await self._position_exposures()
+        engine = get_portfolio_risk_engine()
+        await engine.load(list(exposures))
+        return engine.stress(exposures, scenarios)
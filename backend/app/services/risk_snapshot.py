@@ -0,0 +1,493 @@
+"""
+In-memory account/position snapshots and compiled risk rules for pre-trade checks.
+
+RiskManager.evaluate_rules loads the user's rules and fetches the account and
+positions upstream on every call. This service keeps both in memory instead:
+
+- Account and positions per user, refreshed by periodic reconciliation with
+  the broker and kept current between reconciliations by trade-update events
+  (fills) and price marks.
+- Active risk rules per user, compiled into check functions. They are
+  invalidated when the user's rules change through this process and reloaded
+  after ``rules_ttl`` seconds, which bounds how long a change made through
+  another worker goes unseen.
+
+A pre-trade check is then a pure in-memory evaluation.
+"""
+import asyncio
+import logging
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.risk_rule import RiskRule
+from app.models.enums import RiskRuleType, RiskRuleAction
+from app.schemas.risk_rule import RiskRuleBreachResponse
+
+logger = logging.getLogger(__name__)
+
+FILL_EVENTS = {"fill", "partial_fill"}
+
+
+@dataclass
+class PositionSnapshot:
+    """A held position."""
+
+    symbol: str
+    qty: float
+    avg_entry_price: float
+    current_price: float
+
+    @property
+    def market_value(self) -> float:
+        return self.qty * self.current_price
+
+
+@dataclass
+class AccountSnapshot:
+    """Account state used by pre-trade checks."""
+
+    cash: float
+    last_equity: float
+    buying_power: float
+    positions: Dict[str, PositionSnapshot] = field(default_factory=dict)
+    peak_equity: float = 0.0
+    reconciled_at: float = 0.0
+
+    @property
+    def equity(self) -> float:
+        return self.cash + sum(p.market_value for p in self.positions.values())
+
+    @property
+    def gross_exposure(self) -> float:
+        return sum(abs(p.market_value) for p in self.positions.values())
+
+    @property
+    def daily_pnl(self) -> float:
+        return self.equity - self.last_equity
+
+    def with_orders(self, values: Dict[str, float]) -> 'AccountSnapshot':
+        """Copy of the snapshot as if orders of these signed values (buys positive) had filled."""
+        cash = self.cash
+        positions = dict(self.positions)
+        for symbol, value in values.items():
+            if not value:
+                continue
+            cash -= value
+            position = positions.get(symbol)
+            if position is None or not position.current_price:
+                # No price for a new position: hold it in dollars
+                positions[symbol] = PositionSnapshot(symbol, value, 1.0, 1.0)
+                continue
+            qty = position.qty + value / position.current_price
+            if abs(qty) < 1e-9:
+                del positions[symbol]
+            else:
+                positions[symbol] = replace(position, qty=qty)
+        return replace(self, cash=cash, positions=positions)
+
+    @classmethod
+    def from_broker(cls, account: Dict[str, Any], positions: List[Dict[str, Any]]) -> 'AccountSnapshot':
+        """Build a snapshot from AlpacaClient.get_account()/get_positions() dicts."""
+        snapshot = cls(
+            cash=float(account["cash"]),
+            last_equity=float(account.get("last_equity") or account["equity"]),
+            buying_power=float(account.get("buying_power") or account["cash"]),
+            positions={
+                p["symbol"]: PositionSnapshot(
+                    symbol=p["symbol"],
+                    qty=float(p["qty"]) * (-1 if p.get("side") == "short" and float(p["qty"]) > 0 else 1),
+                    avg_entry_price=float(p["avg_entry_price"]),
+                    current_price=float(p.get("current_price") or p["avg_entry_price"]),
+                )
+                for p in positions
+            },
+            reconciled_at=time.monotonic(),
+        )
+        snapshot.peak_equity = max(snapshot.equity, snapshot.last_equity)
+        return snapshot
+
+
+@dataclass
+class CompiledRule:
+    """A risk rule reduced to a check function over a snapshot."""
+
+    id: str
+    name: str
+    rule_type: RiskRuleType
+    threshold_value: float
+    threshold_unit: str
+    action: RiskRuleAction
+    strategy_id: Optional[str]
+    # (snapshot, order_value) -> (current_value, message) when breached, else None
+    check: Callable[[AccountSnapshot, Optional[float]], Optional[tuple]]
+
+    def applies_to(self, strategy_id: Optional[str]) -> bool:
+        return self.strategy_id is None or (strategy_id is not None and str(self.strategy_id) == str(strategy_id))
+
+
+def _limit(rule: RiskRule, equity: float) -> float:
+    if rule.threshold_unit == "percent":
+        return equity * (rule.threshold_value / 100)
+    return rule.threshold_value
+
+
+def compile_rule(rule: RiskRule) -> Optional[CompiledRule]:
+    """
+    Compile a rule into a check function.
+
+    Checks mirror RiskManager; rule types it does not evaluate compile to None.
+    """
+    threshold = rule.threshold_value
+    rule_type = rule.rule_type
+    unit = rule.threshold_unit
+
+    if rule_type == RiskRuleType.MAX_POSITION_SIZE:
+        def check(snapshot, order_value):
+            if not order_value:
+                return None
+            max_value = _limit(rule, snapshot.equity)
+            if order_value > max_value:
+                return order_value, f"Position size ${order_value:,.2f} exceeds maximum ${max_value:,.2f}"
+            return None
+
+    elif rule_type == RiskRuleType.MAX_DAILY_LOSS:
+        def check(snapshot, order_value):
+            daily_pnl = snapshot.daily_pnl
+            max_loss = _limit(rule, snapshot.equity)
+            if daily_pnl < 0 and abs(daily_pnl) > max_loss:
+                return abs(daily_pnl), f"Daily loss ${abs(daily_pnl):,.2f} exceeds maximum ${max_loss:,.2f}"
+            return None
+
+    elif rule_type == RiskRuleType.MAX_DRAWDOWN:
+        def check(snapshot, order_value):
+            peak = snapshot.peak_equity
+            if peak <= 0:
+                return None
+            drawdown = (peak - snapshot.equity) / peak * 100
+            if drawdown > threshold:
+                return drawdown, f"Drawdown {drawdown:.2f}% exceeds maximum {threshold:.2f}%"
+            return None
+
+    elif rule_type == RiskRuleType.POSITION_LIMIT:
+        unit = "count"
+
+        def check(snapshot, order_value):
+            count = len(snapshot.positions)
+            if count >= threshold:
+                return count, f"Position count {count} exceeds maximum {int(threshold)}"
+            return None
+
+    elif rule_type == RiskRuleType.MAX_LEVERAGE:
+        unit = "ratio"
+
+        def check(snapshot, order_value):
+            equity = snapshot.equity
+            leverage = snapshot.gross_exposure / equity if equity > 0 else 0
+            if leverage > threshold:
+                return leverage, f"Leverage {leverage:.2f}x exceeds maximum {threshold:.2f}x"
+            return None
+
+    else:
+        return None
+
+    return CompiledRule(
+        id=rule.id,
+        name=rule.name,
+        rule_type=rule_type,
+        threshold_value=threshold,
+        threshold_unit=unit,
+        action=rule.action,
+        strategy_id=rule.strategy_id,
+        check=check,
+    )
+
+
+class RiskSnapshotService:
+    """
+    Per-user account snapshots and compiled risk rules.
+
+    Snapshots older than ``reconcile_interval`` seconds are reconciled with
+    the broker on the next check; ``run_reconciliation`` does the same in the
+    background so checks never wait on the broker in steady state.
+    """
+
+    def __init__(self, reconcile_interval: float = 30.0, rules_ttl: float = 5.0):
+        """
+        Initialize snapshot service.
+
+        Args:
+            reconcile_interval: Maximum snapshot age in seconds before it is
+                reconciled with the broker
+            rules_ttl: Maximum age in seconds of compiled rules before they
+                are reloaded from the database
+        """
+        self.reconcile_interval = reconcile_interval
+        self.rules_ttl = rules_ttl
+        self._accounts: Dict[str, AccountSnapshot] = {}
+        self._rules: Dict[str, List[CompiledRule]] = {}
+        self._rules_loaded_at: Dict[str, float] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+
+    def _lock(self, user_id: str) -> asyncio.Lock:
+        if user_id not in self._locks:
+            self._locks[user_id] = asyncio.Lock()
+        return self._locks[user_id]
+
+    # ------------------------------------------------------------------
+    # Account snapshots
+
+    def get_snapshot(self, user_id: str) -> Optional[AccountSnapshot]:
+        """Current snapshot for a user, if one has been loaded."""
+        return self._accounts.get(str(user_id))
+
+    def is_stale(self, user_id: str) -> bool:
+        snapshot = self._accounts.get(str(user_id))
+        return snapshot is None or time.monotonic() - snapshot.reconciled_at > self.reconcile_interval
+
+    async def reconcile(self, user_id: str, alpaca_client) -> AccountSnapshot:
+        """Replace a user's snapshot with the broker's account and positions."""
+        user_id = str(user_id)
+        account = await alpaca_client.get_account(use_cache=False)
+        positions = await alpaca_client.get_positions(use_cache=False)
+        snapshot = AccountSnapshot.from_broker(account, positions)
+
+        previous = self._accounts.get(user_id)
+        if previous is not None:
+            snapshot.peak_equity = max(snapshot.peak_equity, previous.peak_equity)
+        self._accounts[user_id] = snapshot
+        logger.debug(f"Reconciled risk snapshot for user {user_id}: equity={snapshot.equity:,.2f}")
+        return snapshot
+
+    async def ensure_snapshot(self, user_id: str, alpaca_client) -> AccountSnapshot:
+        """Return a fresh snapshot, reconciling first if it is missing or stale."""
+        user_id = str(user_id)
+        if not self.is_stale(user_id):
+            return self._accounts[user_id]
+        async with self._lock(user_id):
+            # Another task may have reconciled while we waited
+            if not self.is_stale(user_id):
+                return self._accounts[user_id]
+            return await self.reconcile(user_id, alpaca_client)
+
+    def apply_trade_update(self, user_id: str, update: Dict[str, Any]) -> None:
+        """
+        Apply a trade_updates event to a user's snapshot.
+
+        Only fills change the snapshot; ``price`` and ``qty`` are the
+        execution price and quantity, ``position_qty`` (if present) is the
+        broker's position after the fill.
+        """
+        snapshot = self._accounts.get(str(user_id))
+        if snapshot is None or update.get("event") not in FILL_EVENTS:
+            return
+
+        order = update["order"]
+        symbol = order["symbol"]
+        price = float(update["price"])
+        qty = float(update["qty"])
+        signed = qty if order["side"] == "buy" else -qty
+
+        snapshot.cash -= signed * price
+        position = snapshot.positions.get(symbol)
+        old_qty = position.qty if position else 0.0
+        new_qty = float(update["position_qty"]) if update.get("position_qty") is not None else old_qty + signed
+
+        if abs(new_qty) < 1e-9:
+            snapshot.positions.pop(symbol, None)
+        elif position is None or old_qty == 0 or (old_qty > 0) != (new_qty > 0):
+            snapshot.positions[symbol] = PositionSnapshot(symbol, new_qty, price, price)
+        else:
+            if abs(new_qty) > abs(old_qty):
+                position.avg_entry_price = (
+                    old_qty * position.avg_entry_price + (new_qty - old_qty) * price
+                ) / new_qty
+            position.qty = new_qty
+            position.current_price = price
+        snapshot.peak_equity = max(snapshot.peak_equity, snapshot.equity)
+
+    def mark_price(self, symbol: str, price: float) -> None:
+        """Mark a symbol to market in every snapshot holding it."""
+        for snapshot in self._accounts.values():
+            position = snapshot.positions.get(symbol)
+            if position is not None:
+                position.current_price = price
+                snapshot.peak_equity = max(snapshot.peak_equity, snapshot.equity)
+
+    def last_price(self, user_id: str, symbol: str) -> Optional[float]:
+        """Last known price of a held symbol."""
+        snapshot = self._accounts.get(str(user_id))
+        position = snapshot.positions.get(symbol) if snapshot else None
+        return position.current_price if position else None
+
+    async def run_reconciliation(self, alpaca_client, interval: Optional[float] = None):
+        """Reconcile every known snapshot periodically (run as a background task)."""
+        interval = interval or self.reconcile_interval
+        while True:
+            await asyncio.sleep(interval)
+            for user_id in list(self._accounts):
+                try:
+                    async with self._lock(user_id):
+                        await self.reconcile(user_id, alpaca_client)
+                except Exception as e:
+                    logger.error(f"Risk snapshot reconciliation failed for user {user_id}: {e}")
+
+    # ------------------------------------------------------------------
+    # Rules
+
+    async def load_rules(self, user_id: str, db: AsyncSession) -> List[CompiledRule]:
+        """Compiled active rules for a user, loading them on first use or once expired."""
+        user_id = str(user_id)
+        loaded_at = self._rules_loaded_at.get(user_id)
+        if loaded_at is not None and time.monotonic() - loaded_at <= self.rules_ttl:
+            return self._rules[user_id]
+
+        result = await db.execute(
+            select(RiskRule).where(RiskRule.user_id == user_id, RiskRule.is_active == True)
+        )
+        compiled = [c for c in (compile_rule(r) for r in result.scalars().all()) if c is not None]
+        self._rules[user_id] = compiled
+        self._rules_loaded_at[user_id] = time.monotonic()
+        return compiled
+
+    def invalidate_rules(self, user_id: str) -> None:
+        """Drop a user's compiled rules; call whenever their rules change."""
+        self._rules.pop(str(user_id), None)
+        self._rules_loaded_at.pop(str(user_id), None)
+
+    # ------------------------------------------------------------------
+    # Checks
+
+    def check(
+        self,
+        user_id: str,
+        strategy_id: Optional[str] = None,
+        order_value: Optional[float] = None
+    ) -> List[RiskRuleBreachResponse]:
+        """
+        Evaluate loaded rules against the in-memory snapshot.
+
+        Rules and snapshot must already be loaded (see ``evaluate``).
+        """
+        user_id = str(user_id)
+        snapshot = self._accounts[user_id]
+        breaches = []
+        for rule in self._rules.get(user_id, ()):
+            if not rule.applies_to(strategy_id):
+                continue
+            result = rule.check(snapshot, order_value)
+            if result is not None:
+                breaches.append(self._breach(rule, result))
+        return breaches
+
+    def check_basket(
+        self,
+        user_id: str,
+        legs: List[Tuple[Optional[str], str, Optional[float]]]
+    ) -> List[List[RiskRuleBreachResponse]]:
+        """
+        Evaluate loaded rules for the legs of a basket, in order.
+
+        Legs are (strategy_id, symbol, signed order value; buys positive).
+        Each leg is checked as if the legs accepted before it had filled:
+        the order value of every leg no rule blocks is added to a running
+        exposure, account-wide for account rules and per strategy for
+        strategy rules, and position size is checked against the running
+        order value of the leg's symbol.
+
+        Returns:
+            Breaches of each leg, in leg order
+        """
+        user_id = str(user_id)
+        snapshot = self._accounts[user_id]
+        rules = self._rules.get(user_id, ())
+        # Rule scope (None = account) -> symbol -> accepted signed order value
+        accepted: Dict[Optional[str], Dict[str, float]] = defaultdict(dict)
+        results = []
+        for strategy_id, symbol, order_value in legs:
+            adjusted = {}
+            breaches = []
+            for rule in rules:
+                if not rule.applies_to(strategy_id):
+                    continue
+                scope = None if rule.strategy_id is None else str(rule.strategy_id)
+                pending = accepted[scope]
+                if scope not in adjusted:
+                    adjusted[scope] = snapshot.with_orders(pending)
+                value = order_value
+                if order_value is not None:
+                    value = abs(pending.get(symbol, 0.0) + order_value)
+                result = rule.check(adjusted[scope], value)
+                if result is not None:
+                    breaches.append(self._breach(rule, result))
+            results.append(breaches)
+
+            if order_value and not any(b.action == RiskRuleAction.BLOCK for b in breaches):
+                scopes = [None] if strategy_id is None else [None, str(strategy_id)]
+                for scope in scopes:
+                    accepted[scope][symbol] = accepted[scope].get(symbol, 0.0) + order_value
+        return results
+
+    @staticmethod
+    def _breach(rule: CompiledRule, result: tuple) -> RiskRuleBreachResponse:
+        current_value, message = result
+        return RiskRuleBreachResponse(
+            rule_id=rule.id,
+            rule_name=rule.name,
+            rule_type=rule.rule_type,
+            threshold_value=rule.threshold_value,
+            threshold_unit=rule.threshold_unit,
+            current_value=current_value,
+            action=rule.action,
+            message=message,
+            timestamp=datetime.now(timezone.utc),
+        )
+
+    async def evaluate(
+        self,
+        user_id: str,
+        db: AsyncSession,
+        alpaca_client,
+        strategy_id: Optional[str] = None,
+        order_value: Optional[float] = None
+    ) -> List[RiskRuleBreachResponse]:
+        """Load rules and snapshot if needed, then run the in-memory check."""
+        await self.load_rules(user_id, db)
+        await self.ensure_snapshot(user_id, alpaca_client)
+        return self.check(user_id, strategy_id, order_value)
+
+    async def record_breaches(self, db: AsyncSession, breaches: List[RiskRuleBreachResponse]) -> None:
+        """Increment breach counters for breached rules."""
+        if not breaches:
+            return
+        await db.execute(
+            update(RiskRule)
+            .where(RiskRule.id.in_([b.rule_id for b in breaches]))
+            .values(
+                breach_count=RiskRule.breach_count + 1,
+                last_breach_at=datetime.now(timezone.utc),
+            )
+        )
+        await db.commit()
+
+
+# Global service instance
+_risk_snapshot_service: Optional[RiskSnapshotService] = None
+
+
+def get_risk_snapshot_service() -> RiskSnapshotService:
+    """
+    Get or create singleton risk snapshot service.
+
+    Returns:
+        RiskSnapshotService instance
+    """
+    global _risk_snapshot_service
+    if _risk_snapshot_service is None:
+        _risk_snapshot_service = RiskSnapshotService()
+    return _risk_snapshot_service
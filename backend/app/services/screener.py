@@ -1,11 +1,15 @@
 """
 Stock screener service for finding stocks based on criteria.
+
+Screens run against the columnar universe snapshot built from the bar cache
+(see universe_snapshot).
 """
 import asyncio
 from typing import List, Dict, Optional
-import yfinance as yf
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.services.universe_snapshot import NUMERIC_COLUMNS, UniverseSnapshot, get_universe_snapshot
+
 
 class ScreenerService:
     """
@@ -32,10 +36,15 @@ class ScreenerService:
         # Other filters
         sectors: Optional[List[str]] = None,
         exchanges: Optional[List[str]] = None,
-        limit: int = 50
+        limit: int = 50,
+        sort_by: str = "volume",
+        ascending: bool = False
     ) -> List[Dict]:
         """
         Screen stocks based on criteria.
+
+        Filters are evaluated as masks over the universe snapshot, and only
+        the matching rows that make the result are sorted.
         
         Args:
             min_market_cap: Minimum market capitalization
@@ -51,91 +60,79 @@ class ScreenerService:
             sectors: List of sectors to include
             exchanges: List of exchanges (NYSE, NASDAQ, etc.)
             limit: Maximum number of results
+            sort_by: Numeric snapshot column to rank results by
+            ascending: Rank smallest values first
         
         Returns:
-            List of stock symbols matching criteria
+            List of stocks matching criteria
+
+        Raises:
+            ValueError: If sort_by is not a numeric column, or a filter or
+                sort_by needs fundamentals that have not been loaded
         """
-        # TODO: Implement actual screening logic
-        # This would typically:
-        # 1. Fetch stock universe from data provider
-        # 2. Apply filters
-        # 3. Calculate technical indicators
-        # 4. Return filtered results
-        
-        # Mock results for now
-        mock_results = [
-            {
-                "symbol": "AAPL",
-                "name": "Apple Inc.",
-                "price": 180.50,
-                "market_cap": 2800000000000,
-                "pe_ratio": 28.5,
-                "dividend_yield": 0.5,
-                "volume": 50000000,
-                "rsi": 65,
-                "sector": "Technology",
-                "exchange": "NASDAQ"
-            },
-            {
-                "symbol": "MSFT",
-                "name": "Microsoft Corporation",
-                "price": 380.00,
-                "market_cap": 2850000000000,
-                "pe_ratio": 32.0,
-                "dividend_yield": 0.8,
-                "volume": 25000000,
-                "rsi": 58,
-                "sector": "Technology",
-                "exchange": "NASDAQ"
-            },
-            {
-                "symbol": "JPM",
-                "name": "JPMorgan Chase & Co.",
-                "price": 150.00,
-                "market_cap": 430000000000,
-                "pe_ratio": 10.5,
-                "dividend_yield": 2.5,
-                "volume": 12000000,
-                "rsi": 52,
-                "sector": "Financials",
-                "exchange": "NYSE"
-            }
-        ]
-        
-        # Apply filters to mock data
-        results = mock_results
-        
-        if min_market_cap:
-            results = [r for r in results if r["market_cap"] >= min_market_cap]
-        if max_market_cap:
-            results = [r for r in results if r["market_cap"] <= max_market_cap]
-        if min_pe_ratio:
-            results = [r for r in results if r["pe_ratio"] >= min_pe_ratio]
-        if max_pe_ratio:
-            results = [r for r in results if r["pe_ratio"] <= max_pe_ratio]
-        if min_price:
-            results = [r for r in results if r["price"] >= min_price]
-        if max_price:
-            results = [r for r in results if r["price"] <= max_price]
+        if sort_by not in NUMERIC_COLUMNS:
+            raise ValueError(f"Cannot sort by '{sort_by}'; choose one of: {', '.join(NUMERIC_COLUMNS)}")
+
+        snapshot = await self._get_snapshot()
+        if not len(snapshot):
+            return []
+
+        # Fundamentals only exist once set_fundamentals supplied them; a
+        # filter on an empty column would silently match nothing
+        requested = {
+            "market_cap": min_market_cap is not None or max_market_cap is not None,
+            "pe_ratio": min_pe_ratio is not None or max_pe_ratio is not None,
+            "dividend_yield": min_dividend_yield is not None,
+            "sector": bool(sectors),
+            "exchange": bool(exchanges),
+            sort_by: True,
+        }
+        unavailable = [column for column, used in requested.items() if used and not snapshot.has_values(column)]
+        if unavailable:
+            raise ValueError(f"No {', '.join(unavailable)} data is available for screening")
+
+        mask = snapshot.between("price", min_price, max_price)
+        if min_market_cap is not None or max_market_cap is not None:
+            mask &= snapshot.between("market_cap", min_market_cap, max_market_cap)
+        if min_pe_ratio is not None or max_pe_ratio is not None:
+            mask &= snapshot.between("pe_ratio", min_pe_ratio, max_pe_ratio)
+        if min_dividend_yield is not None:
+            mask &= snapshot.between("dividend_yield", min_dividend_yield)
+        if min_volume is not None:
+            mask &= snapshot.between("volume", min_volume)
+        if min_rsi is not None or max_rsi is not None:
+            mask &= snapshot.between("rsi", min_rsi, max_rsi)
         if sectors:
-            results = [r for r in results if r["sector"] in sectors]
+            mask &= snapshot.isin("sector", sectors)
         if exchanges:
-            results = [r for r in results if r["exchange"] in exchanges]
-        
-        return results[:limit]
+            mask &= snapshot.isin("exchange", exchanges)
+
+        return snapshot.records(snapshot.top(sort_by, limit, mask, ascending=ascending))
     
     async def get_top_gainers(self, limit: int = 10) -> List[Dict]:
         """Get top gaining stocks for the day."""
-        # TODO: Implement with real market data
-        return []
+        snapshot = await self._get_snapshot()
+        return snapshot.records(snapshot.top("change_pct", limit, snapshot.columns["change_pct"] > 0))
     
     async def get_top_losers(self, limit: int = 10) -> List[Dict]:
         """Get top losing stocks for the day."""
-        # TODO: Implement with real market data
-        return []
+        snapshot = await self._get_snapshot()
+        return snapshot.records(
+            snapshot.top("change_pct", limit, snapshot.columns["change_pct"] < 0, ascending=True)
+        )
+
+    async def _get_snapshot(self) -> UniverseSnapshot:
+        """Get the universe snapshot, refreshing it from the bar cache when stale."""
+        snapshot = get_universe_snapshot()
+        if snapshot.needs_refresh():
+            await snapshot.refresh(self.session)
+        return snapshot
     
     async def get_most_active(self, limit: int = 10) -> List[Dict]:
         """Get most actively traded stocks by volume."""
+        # yfinance is slow to import and only needed here
+        import yfinance as yf
+
         try:
             # Run blocking yfinance call in a separate thread
             data = await asyncio.to_thread(yf.screen, "most_actives")
@@ -1,20 +1,173 @@
 """
 Stop-loss and take-profit position monitor.
 Monitors paper trading positions and auto-executes sell orders when price thresholds are hit.
+
+``StopLossTakeProfitMonitor`` polls every position with a stop each cycle.
+``StopTriggerEngine`` instead keeps the thresholds in a per-symbol
+``TriggerIndex`` and checks them on every trade tick from the market data
+stream; a tick only touches the thresholds it crossed, and triggered exits
+are executed in batches by ``PaperTradingService``.
 """
+import asyncio
 import logging
-from typing import Dict, List, Optional, Any
+from bisect import bisect_left, bisect_right, insort
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Any, Tuple
 from datetime import datetime
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 
+from app.database import get_db_context
 from app.models.paper_trading import PaperAccount, PaperPosition, PaperTrade
 from app.integrations.market_data import get_market_data_service
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass
+class StopTrigger:
+    """A position whose stop-loss or take-profit was crossed by a trade."""
+    position_id: str
+    account_id: str
+    symbol: str
+    trigger_type: str  # "stop_loss" or "take_profit"
+    trigger_price: float
+    price: float
+    stop_loss_price: Optional[float]
+    take_profit_price: Optional[float]
+
+
+class TriggerIndex:
+    """
+    Stop-loss and take-profit thresholds of open positions, by symbol.
+
+    Stops and targets are kept sorted by price. A position is removed as
+    soon as it triggers, so every stop left for a symbol is below and every
+    target above the last traded price, and a new price only has to look at
+    the thresholds between the two.
+    """
+
+    def __init__(self):
+        self._stops: Dict[str, List[Tuple[float, str]]] = {}
+        self._targets: Dict[str, List[Tuple[float, str]]] = {}
+        # position_id -> (symbol, account_id, stop_loss_price, take_profit_price)
+        self._levels: Dict[str, Tuple[str, str, Optional[float], Optional[float]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._levels)
+
+    def __contains__(self, position_id: str) -> bool:
+        return position_id in self._levels
+
+    def symbols(self) -> List[str]:
+        """Symbols with at least one threshold."""
+        return list({symbol for symbol, _, _, _ in self._levels.values()})
+
+    def upsert(
+        self,
+        position_id: str,
+        symbol: str,
+        account_id: str,
+        stop_loss_price: Optional[float],
+        take_profit_price: Optional[float],
+    ):
+        """Add or replace a position's thresholds (both None removes it)."""
+        self.remove(position_id)
+        if stop_loss_price is None and take_profit_price is None:
+            return
+        self._levels[position_id] = (symbol, account_id, stop_loss_price, take_profit_price)
+        if stop_loss_price is not None:
+            insort(self._stops.setdefault(symbol, []), (stop_loss_price, position_id))
+        if take_profit_price is not None:
+            insort(self._targets.setdefault(symbol, []), (take_profit_price, position_id))
+
+    def track(self, position: PaperPosition):
+        """Add or replace a position's thresholds from the model."""
+        self.upsert(
+            position.id, position.symbol, position.account_id,
+            position.stop_loss_price, position.take_profit_price,
+        )
+
+    def remove(self, position_id: str):
+        """Remove a position's thresholds."""
+        levels = self._levels.pop(position_id, None)
+        if levels is None:
+            return
+        symbol, _, stop_loss_price, take_profit_price = levels
+        if stop_loss_price is not None:
+            self._discard(self._stops, symbol, (stop_loss_price, position_id))
+        if take_profit_price is not None:
+            self._discard(self._targets, symbol, (take_profit_price, position_id))
+
+    def remove_account(self, account_id: str):
+        """Remove the thresholds of all positions of an account."""
+        for position_id, (_, owner, _, _) in list(self._levels.items()):
+            if owner == account_id:
+                self.remove(position_id)
+
+    def clear(self):
+        self._stops.clear()
+        self._targets.clear()
+        self._levels.clear()
+
+    @staticmethod
+    def _discard(book: Dict[str, List[Tuple[float, str]]], symbol: str, entry: Tuple[float, str]):
+        entries = book.get(symbol)
+        if not entries:
+            return
+        i = bisect_left(entries, entry)
+        if i < len(entries) and entries[i] == entry:
+            del entries[i]
+        if not entries:
+            del book[symbol]
+
+    def on_price(self, symbol: str, price: float) -> List[StopTrigger]:
+        """
+        Apply a traded price.
+
+        Positions whose stop is at or above the price, or whose target is
+        at or below it, are removed from the index and returned.
+
+        Args:
+            symbol: Stock symbol
+            price: Traded price
+
+        Returns:
+            Triggered positions (empty for untouched symbols)
+        """
+        crossed: List[Tuple[str, str, float]] = []
+
+        stops = self._stops.get(symbol)
+        if stops and stops[-1][0] >= price:
+            i = bisect_left(stops, (price, ""))
+            crossed.extend(("stop_loss", position_id, level) for level, position_id in stops[i:])
+        targets = self._targets.get(symbol)
+        if targets and targets[0][0] <= price:
+            # Upper bound of all entries at or below price, whatever their id
+            i = bisect_right(targets, (price, "\uffff"))
+            crossed.extend(("take_profit", position_id, level) for level, position_id in targets[:i])
+
+        triggers = []
+        for trigger_type, position_id, level in crossed:
+            levels = self._levels.get(position_id)
+            if levels is None:
+                continue  # Already triggered by its other threshold
+            _, account_id, stop_loss_price, take_profit_price = levels
+            self.remove(position_id)
+            triggers.append(StopTrigger(
+                position_id=position_id,
+                account_id=account_id,
+                symbol=symbol,
+                trigger_type=trigger_type,
+                trigger_price=level,
+                price=price,
+                stop_loss_price=stop_loss_price,
+                take_profit_price=take_profit_price,
+            ))
+        return triggers
+
+
 class StopLossTakeProfitMonitor:
     """
     Monitors positions with stop-loss or take-profit levels.
@@ -203,6 +356,7 @@ class StopLossTakeProfitMonitor:
         }
 
         # Delete the position (fully closed)
+        get_trigger_index().remove(position.id)
         await self.session.delete(position)
 
         # Commit the transaction
@@ -237,3 +391,159 @@ class StopLossTakeProfitMonitor:
 async def get_stop_loss_monitor(session: AsyncSession) -> StopLossTakeProfitMonitor:
     """Get stop-loss/take-profit monitor instance."""
     return StopLossTakeProfitMonitor(session)
+
+
+class StopTriggerEngine:
+    """
+    Event-driven stop-loss and take-profit execution.
+
+    Trade ticks are checked against the trigger index as they arrive;
+    triggered positions are queued and sold together in one transaction.
+    """
+
+    def __init__(
+        self,
+        index: Optional[TriggerIndex] = None,
+        session_factory: Callable = get_db_context,
+    ):
+        """
+        Initialize stop trigger engine.
+
+        Args:
+            index: Trigger index to check (default: the shared index that
+                PaperTradingService keeps in sync)
+            session_factory: Async context manager yielding a database session
+        """
+        self.index = index if index is not None else get_trigger_index()
+        self._session_factory = session_factory
+        self._pending: List[StopTrigger] = []
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._stream_client = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None
+
+    async def load(self):
+        """Rebuild the index from all positions with a stop or target."""
+        async with self._session_factory() as db:
+            result = await db.execute(
+                select(PaperPosition).where(
+                    (PaperPosition.stop_loss_price.isnot(None)) |
+                    (PaperPosition.take_profit_price.isnot(None))
+                )
+            )
+            positions = result.scalars().all()
+        self.index.clear()
+        for position in positions:
+            self.index.track(position)
+        logger.info(f"Loaded {len(self.index)} stop-loss/take-profit triggers")
+
+    async def start(self, stream_client=None):
+        """
+        Load the index and start executing triggers.
+
+        Args:
+            stream_client: AlpacaStreamClient to take trade ticks from;
+                without it prices only arrive through ``on_trade``
+        """
+        if self._task is not None:
+            return
+        await self.load()
+        self._task = asyncio.create_task(self._exit_loop())
+
+        if stream_client is not None:
+            from app.integrations.market_data_ws import StreamType
+
+            self._stream_client = stream_client
+            stream_client.register_callback(StreamType.TRADES, self.on_trade)
+            if not stream_client.is_connected:
+                await stream_client.connect()
+            await self.watch(self.index.symbols())
+
+    async def stop(self):
+        """Stop the engine and execute any queued triggers."""
+        if self._task is None:
+            return
+        if self._stream_client is not None:
+            from app.integrations.market_data_ws import StreamType
+
+            self._stream_client.unregister_callback(StreamType.TRADES, self.on_trade)
+            self._stream_client = None
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        await self.flush()
+
+    async def watch(self, symbols: List[str]):
+        """Subscribe to trades of symbols that gained a threshold."""
+        if self._stream_client is None:
+            return
+        subscribed = set(self._stream_client.get_subscriptions().get("trades", []))
+        new_symbols = [s for s in symbols if s not in subscribed]
+        if new_symbols:
+            await self._stream_client.subscribe_trades(new_symbols)
+
+    async def on_trade(self, trade: Dict[str, Any]):
+        """Stream callback for trade ticks."""
+        triggers = self.index.on_price(trade["symbol"], trade["price"])
+        if triggers:
+            self._pending.extend(triggers)
+            self._wakeup.set()
+
+    async def flush(self) -> List[Dict[str, Any]]:
+        """Execute queued triggers now; returns the executed exits."""
+        if not self._pending:
+            return []
+        triggers, self._pending = self._pending, []
+        self._wakeup.clear()
+
+        from app.services.paper_trading import PaperTradingService
+
+        try:
+            async with self._session_factory() as db:
+                results = await PaperTradingService(db).execute_triggered_exits(triggers)
+        except Exception as e:
+            logger.error(f"Error executing {len(triggers)} triggered exits: {e}", exc_info=True)
+            # Put the thresholds back so the next crossing retries
+            for t in triggers:
+                self.index.upsert(t.position_id, t.symbol, t.account_id, t.stop_loss_price, t.take_profit_price)
+            return []
+        return results
+
+    async def _exit_loop(self):
+        while True:
+            await self._wakeup.wait()
+            await self.flush()
+
+
+# Global index and engine instances
+_trigger_index: Optional[TriggerIndex] = None
+_stop_trigger_engine: Optional[StopTriggerEngine] = None
+
+
+def get_trigger_index() -> TriggerIndex:
+    """
+    Get or create singleton trigger index.
+
+    Returns:
+        TriggerIndex instance
+    """
+    global _trigger_index
+    if _trigger_index is None:
+        _trigger_index = TriggerIndex()
+    return _trigger_index
+
+
+def get_stop_trigger_engine() -> StopTriggerEngine:
+    """
+    Get or create singleton stop trigger engine.
+
+    Returns:
+        StopTriggerEngine instance
+    """
+    global _stop_trigger_engine
+    if _stop_trigger_engine is None:
+        _stop_trigger_engine = StopTriggerEngine()
+    return _stop_trigger_engine
@@ -14,13 +14,13 @@ from sqlalchemy import select
 
 from app.models.strategy import Strategy
 from app.models.backtest import Backtest, BacktestStatus
-from app.models.order import Order, OrderSideEnum, OrderTypeEnum
-from app.models.enums import NotificationType, NotificationPriority
 from app.backtesting.runner import BacktestRunner
 from app.services.risk_manager import RiskManager
 from app.services.notification_service import NotificationService
 from app.integrations.order_execution import AlpacaOrderExecutor
 from app.integrations.alpaca_client import AlpacaClient
+from app.integrations.market_data import get_market_data_client
+from app.integrations.trade_stream import strategy_client_order_id
 
 logger = logging.getLogger(__name__)
 
@@ -182,6 +182,9 @@ class StrategyOptimizer:
         """
         Execute trades for the best-performing strategies with risk checks.
         
+        Positions are sized from one multi-symbol quote request and submitted
+        as a single basket (see AlpacaOrderExecutor.place_basket).
+        
         Args:
             user_id: User ID
             optimization_results: Results from optimize_strategies
@@ -206,136 +209,85 @@ class StrategyOptimizer:
         
         # Get account info for position sizing
         account = await self.alpaca.get_account()
-        equity = float(account.equity)
+        equity = float(account["equity"])
+        max_position_value = equity * (max_position_pct / 100)
         
+        best = {}
         for symbol, opt_result in optimization_results.items():
             if not opt_result.best_strategy:
                 execution_results["failed"].append({
                     "symbol": symbol,
                     "error": "No valid strategy found"
                 })
+            else:
+                best[symbol] = opt_result.best_strategy
+        
+        if not best:
+            return execution_results
+        
+        # Get current quotes for entry prices in one request
+        try:
+            quotes = await get_market_data_client().get_multi_quotes(list(best))
+            entry_prices = {q["symbol"]: float(q["ask_price"]) for q in quotes}
+        except Exception as e:
+            logger.error(f"Failed to fetch quotes: {e}")
+            entry_prices = {}
+        
+        # Size each position and build the basket
+        legs = []
+        for symbol, strategy in best.items():
+            entry_price = entry_prices.get(symbol)
+            if not entry_price:
+                execution_results["failed"].append({
+                    "symbol": symbol,
+                    "error": "No quote available"
+                })
                 continue
             
-            try:
-                # Calculate position size
-                max_position_value = equity * (max_position_pct / 100)
-                
-                # Get current quote for entry price
-                quote = await self.alpaca.get_latest_quote(symbol)
-                entry_price = float(quote.ask_price)
-                
-                # Calculate shares
-                shares = int(max_position_value / entry_price)
-                if shares < 1:
-                    execution_results["warnings"].append({
-                        "symbol": symbol,
-                        "message": "Insufficient capital for minimum position"
-                    })
-                    continue
-                
-                order_value = shares * entry_price
-                
-                # Check risk rules
-                breaches = await self.risk_manager.evaluate_rules(
-                    user_id=str(user_id),
-                    strategy_id=str(opt_result.best_strategy.strategy_id),
-                    symbol=symbol,
-                    order_qty=float(shares),
-                    order_value=order_value
-                )
-                
-                # Handle blocking breaches
-                blocking_breaches = [
-                    b for b in breaches
-                    if b.action in ["BLOCK", "CLOSE_POSITION"]
-                ]
-                
-                if blocking_breaches:
-                    execution_results["blocked"].append({
-                        "symbol": symbol,
-                        "strategy": opt_result.best_strategy.strategy_name,
-                        "breaches": [
-                            {
-                                "rule": b.rule_name,
-                                "message": b.message,
-                                "action": b.action
-                            }
-                            for b in blocking_breaches
-                        ]
-                    })
-                    
-                    # Send notification
-                    await self.notification_service.create_notification(
-                        user_id=user_id,
-                        notification_type=NotificationType.RISK_BREACH,
-                        title=f"Trade Blocked: {symbol}",
-                        message=f"Risk rule breach prevented trade execution",
-                        priority=NotificationPriority.HIGH.value,
-                        data={
-                            "symbol": symbol,
-                            "breaches": [b.rule_name for b in blocking_breaches]
-                        }
-                    )
-                    continue
-                
-                # Create and submit order
-                order = Order(
-                    user_id=user_id,
-                    strategy_id=opt_result.best_strategy.strategy_id,
-                    symbol=symbol,
-                    side=OrderSideEnum.BUY,
-                    order_type=OrderTypeEnum.MARKET,
-                    time_in_force="day",
-                    quantity=shares,
-                    status="pending_submission",
-                    metadata={
-                        "optimization_score": opt_result.best_strategy.composite_score,
-                        "expected_return": opt_result.best_strategy.total_return,
-                        "auto_executed": True
-                    }
-                )
-                
-                self.db.add(order)
-                await self.db.commit()
-                await self.db.refresh(order)
-                
-                # Submit to broker
-                alpaca_order = await self.order_execution.submit_order(
-                    order_id=order.id
-                )
-                
+            shares = int(max_position_value / entry_price)
+            if shares < 1:
+                execution_results["warnings"].append({
+                    "symbol": symbol,
+                    "message": "Insufficient capital for minimum position"
+                })
+                continue
+            
+            legs.append({
+                "symbol": symbol,
+                "qty": float(shares),
+                "side": "buy",
+                "order_type": "market",
+                "time_in_force": "day",
+                "client_order_id": strategy_client_order_id(strategy.strategy_id),
+                "strategy_id": str(strategy.strategy_id),
+            })
+        
+        # Risk-check and submit all orders together
+        basket = await self.order_execution.place_basket(legs, user_id=str(user_id))
+        
+        for leg, result in zip(legs, basket["legs"]):
+            symbol = leg["symbol"]
+            strategy = best[symbol]
+            if result["status"] == "submitted":
                 execution_results["successful"].append({
                     "symbol": symbol,
-                    "strategy": opt_result.best_strategy.strategy_name,
-                    "order_id": str(order.id),
-                    "alpaca_order_id": alpaca_order.id,
-                    "shares": shares,
-                    "estimated_value": order_value,
-                    "composite_score": opt_result.best_strategy.composite_score
+                    "strategy": strategy.strategy_name,
+                    "alpaca_order_id": result["order"]["id"],
+                    "shares": int(leg["qty"]),
+                    "estimated_value": leg["qty"] * entry_prices[symbol],
+                    "composite_score": strategy.composite_score
                 })
-                
-                # Send success notification
-                await self.notification_service.create_notification(
-                    user_id=user_id,
-                    notification_type=NotificationType.ORDER_FILLED,
-                    title=f"Auto-Trade Executed: {symbol}",
-                    message=(
-                        f"Bought {shares} shares using {opt_result.best_strategy.strategy_name} "
-                        f"(Score: {opt_result.best_strategy.composite_score:.2f})"
-                    ),
-                    priority=NotificationPriority.MEDIUM.value,
-                    data={
-                        "symbol": symbol,
-                        "order_id": str(order.id),
-                        "strategy": opt_result.best_strategy.strategy_name
-                    }
-                )
-                
-            except Exception as e:
-                logger.error(f"Failed to execute trade for {symbol}: {e}")
+            elif result["status"] == "blocked":
+                execution_results["blocked"].append({
+                    "symbol": symbol,
+                    "strategy": strategy.strategy_name,
+                    "message": result["error"]
+                })
+            else:
+                logger.error(f"Failed to execute trade for {symbol}: {result['error']}")
                 execution_results["failed"].append({
                     "symbol": symbol,
-                    "error": str(e)
+                    "error": result["error"]
                 })
         
         logger.info(
@@ -13,13 +13,13 @@ import logging
 
 from app.models import (
     LiveStrategy, LiveStrategyStatus, SignalHistory, SignalType,
-    Order, OrderSideEnum, OrderTypeEnum, ApiKey
+    Order, OrderSideEnum, OrderTypeEnum
 )
 from app.services.signal_monitor import SignalMonitor, TradingSignal
 from app.integrations.order_execution import AlpacaOrderExecutor
 from app.integrations.alpaca_client import AlpacaClient
 from app.services.notification_service import NotificationService
-from app.services.encryption_service import EncryptionService
+from app.integrations.broker_pool import api_key_query, get_broker_pool
 from app.models.notification import NotificationType, NotificationPriority
 
 logger = logging.getLogger(__name__)
@@ -178,12 +178,16 @@ class StrategyScheduler:
         try:
             logger.info(f"Executing trade: {signal.signal_type.value} {signal.symbol}")
             
-            # Get user's API key
-            user_api_key = self.db.query(ApiKey).filter(
-                ApiKey.user_id == live_strategy.user_id
-            ).first()
+            # Get the user's pooled broker clients (loads their key if needed)
+            broker_pool = get_broker_pool()
+            broker = broker_pool.peek(live_strategy.user_id)
+            if broker is None:
+                user_api_key = self.db.execute(
+                    api_key_query(live_strategy.user_id)
+                ).scalars().first()
+                broker = broker_pool.acquire(live_strategy.user_id, user_api_key)
             
-            if not user_api_key:
+            if not broker:
                 logger.error(f"No API key found for user {live_strategy.user_id}")
                 await self._send_notification(
                     live_strategy,
@@ -193,12 +197,10 @@ class StrategyScheduler:
                 )
                 return
             
-            # Decrypt user's API key
-            encryption_service = EncryptionService()
-            decrypted_key = encryption_service.decrypt(user_api_key.secret_key)
-            
             # Create user-specific order executor
-            user_order_executor = AlpacaOrderExecutor(self.db, decrypted_key)
+            user_order_executor = AlpacaOrderExecutor(
+                alpaca_client=broker.trading, user_id=live_strategy.user_id
+            )
             
             # Calculate position size
             quantity = self._calculate_position_size(
@@ -234,9 +236,9 @@ class StrategyScheduler:
                     
                     if signal_history:
                         signal_history.executed = True
-                        signal_history.order_id = order.id
+                        signal_history.order_id = order["id"]
                         signal_history.execution_time = datetime.now(timezone.utc)
-                        signal_history.execution_price = order.filled_avg_price or signal.price
+                        signal_history.execution_price = order.get("filled_avg_price") or signal.price
                     
                     # Update strategy metrics
                     live_strategy.executed_trades += 1
@@ -251,11 +253,11 @@ class StrategyScheduler:
                     await self._send_notification(
                         live_strategy,
                         f"Trade executed: {side.value} {quantity} shares of {signal.symbol}",
-                        f"Order ID: {order.id}, Price: ${signal.price:.2f}",
+                        f"Order ID: {order['id']}, Price: ${signal.price:.2f}",
                         NotificationPriority.HIGH
                     )
                     
-                    logger.info(f"Trade executed successfully: {order.id}")
+                    logger.info(f"Trade executed successfully: {order['id']}")
                 else:
                     logger.error("Order execution failed - no order returned")
                     await self._send_notification(
@@ -0,0 +1,424 @@
+"""
+Columnar snapshot of the tradable universe for the stock screener.
+
+The snapshot keeps the last ``window`` daily closes and volumes of every
+symbol in the bar cache as 2-D NumPy arrays (one row per symbol) and
+derives price, change, volume, RSI and moving-average columns from them
+in bulk. Screens are then boolean masks over whole columns.
+
+It is built once from the ``market_data_cache`` rows of the configured
+market data provider and then refreshed
+incrementally: later refreshes only read bars on or after the last cached
+day, and streamed intraday bars are merged into each symbol's current day
+as they close.
+"""
+import asyncio
+import logging
+import time
+from datetime import date, timedelta
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.database import get_db_context
+from app.integrations.market_data import get_market_data_service
+from app.models.market_data_cache import MarketDataCache
+
+logger = logging.getLogger(__name__)
+
+# Columns derived from bars
+BAR_COLUMNS = (
+    "price", "open", "high", "low", "prev_close", "change", "change_pct",
+    "volume", "avg_volume", "relative_volume", "dollar_volume",
+    "rsi", "sma_20", "sma_50",
+)
+# Columns supplied with set_fundamentals
+FUNDAMENTAL_COLUMNS = ("market_cap", "pe_ratio", "dividend_yield")
+TEXT_COLUMNS = ("name", "sector", "exchange")
+NUMERIC_COLUMNS = BAR_COLUMNS + FUNDAMENTAL_COLUMNS
+
+
+class UniverseSnapshot:
+    """Latest bars and indicators of every symbol, stored by column."""
+
+    def __init__(
+        self,
+        window: int = 64,
+        refresh_interval: float = 300.0,
+        source: Optional[str] = None,
+        session_factory: Callable = get_db_context,
+    ):
+        """
+        Args:
+            window: Daily bars kept per symbol (at least 51 for sma_50)
+            refresh_interval: Seconds before a screen triggers a refresh
+            source: Bar cache source to read (defaults to the configured
+                market data provider's)
+            session_factory: Async context manager yielding a database session
+        """
+        self.window = window
+        self.refresh_interval = refresh_interval
+        self.source = source
+        self._session_factory = session_factory
+
+        self.symbols = np.empty(0, dtype=object)
+        self._rows: Dict[str, int] = {}
+        self._closes = np.empty((0, window))
+        self._volumes = np.empty((0, window))
+        self._last_day = np.empty(0, dtype="datetime64[D]")
+        self.columns: Dict[str, np.ndarray] = {}
+        self._fundamentals: Dict[str, Dict[str, Any]] = {}
+        self._allocate_columns(0)
+
+        # Last day read from the bar cache; refreshes read from there on
+        self._cache_through: Optional[date] = None
+        self.refreshed_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._stream_client = None
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def _allocate_columns(self, n: int):
+        for column in NUMERIC_COLUMNS:
+            self.columns[column] = np.full(n, np.nan)
+        for column in TEXT_COLUMNS:
+            self.columns[column] = np.full(n, None, dtype=object)
+
+    def _add_symbols(self, symbols: Iterable[str]):
+        """Append rows for symbols not in the snapshot."""
+        new = [s for s in dict.fromkeys(symbols) if s not in self._rows]
+        if not new:
+            return
+        n = len(new)
+        for symbol in new:
+            self._rows[symbol] = len(self._rows)
+        self.symbols = np.concatenate([self.symbols, np.array(new, dtype=object)])
+        self._closes = np.vstack([self._closes, np.full((n, self.window), np.nan)])
+        self._volumes = np.vstack([self._volumes, np.full((n, self.window), np.nan)])
+        self._last_day = np.concatenate([self._last_day, np.full(n, np.datetime64("NaT"), dtype="datetime64[D]")])
+        for column, values in self.columns.items():
+            fill = None if values.dtype == object else np.nan
+            self.columns[column] = np.concatenate([values, np.full(n, fill, dtype=values.dtype)])
+        self._apply_fundamentals(new)
+
+    def build(self, bars: pd.DataFrame):
+        """
+        Replace the snapshot with daily bars.
+
+        Args:
+            bars: DataFrame with symbol, date, open, high, low, close, volume
+        """
+        bars = bars.sort_values(["symbol", "date"])
+        position = bars.groupby("symbol").cumcount(ascending=False).to_numpy()
+        keep = position < self.window
+        bars, position = bars[keep], position[keep]
+
+        symbols, codes = np.unique(bars["symbol"].to_numpy(dtype=object), return_inverse=True)
+        n = len(symbols)
+        slot = self.window - 1 - position
+
+        self.symbols = symbols.astype(object)
+        self._rows = {symbol: i for i, symbol in enumerate(symbols)}
+        self._closes = np.full((n, self.window), np.nan)
+        self._volumes = np.full((n, self.window), np.nan)
+        self._closes[codes, slot] = bars["close"].to_numpy(dtype=float)
+        self._volumes[codes, slot] = bars["volume"].to_numpy(dtype=float)
+        self._allocate_columns(n)
+
+        latest = position == 0
+        rows = codes[latest]
+        self._last_day = np.full(n, np.datetime64("NaT"), dtype="datetime64[D]")
+        self._last_day[rows] = pd.to_datetime(bars["date"].to_numpy()[latest]).to_numpy().astype("datetime64[D]")
+        for column in ("open", "high", "low"):
+            self.columns[column][rows] = bars[column].to_numpy(dtype=float)[latest]
+
+        self._compute()
+        self._apply_fundamentals(self.symbols)
+
+    def update_bars(self, bars: List[Dict[str, Any]], intraday: bool = True):
+        """
+        Apply closed bars and recompute the indicators of their symbols.
+
+        A bar on a symbol's current day updates that day; a bar on a later
+        day starts a new day and drops the oldest one.
+
+        Args:
+            bars: Bar dicts with symbol, timestamp (or date), open, high, low,
+                close and volume, in time order per symbol
+            intraday: Bars are parts of a day (merged into it) rather than
+                complete daily bars (which replace it)
+        """
+        if not bars:
+            return
+        self._add_symbols(bar["symbol"] for bar in bars)
+        opens, highs, lows = self.columns["open"], self.columns["high"], self.columns["low"]
+
+        touched = set()
+        for bar in bars:
+            row = self._rows[bar["symbol"]]
+            day = np.datetime64(str(bar.get("date") or bar["timestamp"])[:10], "D")
+            close, volume = float(bar["close"]), float(bar["volume"])
+
+            last_day = self._last_day[row]
+            if not np.isnat(last_day) and day < last_day:
+                continue
+            if not np.isnat(last_day) and day == last_day and intraday:
+                highs[row] = np.fmax(highs[row], float(bar["high"]))
+                lows[row] = np.fmin(lows[row], float(bar["low"]))
+                self._closes[row, -1] = close
+                self._volumes[row, -1] += volume
+            else:
+                if np.isnat(last_day) or day > last_day:
+                    self._closes[row, :-1] = self._closes[row, 1:]
+                    self._volumes[row, :-1] = self._volumes[row, 1:]
+                    self._last_day[row] = day
+                opens[row], highs[row], lows[row] = float(bar["open"]), float(bar["high"]), float(bar["low"])
+                self._closes[row, -1] = close
+                self._volumes[row, -1] = volume
+            touched.add(row)
+
+        self._compute(np.fromiter(touched, dtype=int))
+
+    def _compute(self, rows: Optional[np.ndarray] = None):
+        """Recompute bar-derived columns for rows (all rows by default)."""
+        index = slice(None) if rows is None else rows
+        closes = self._closes[index]
+        volumes = self._volumes[index]
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            price = closes[:, -1]
+            prev_close = closes[:, -2]
+            volume = volumes[:, -1]
+            avg_volume = volumes[:, -20:].mean(axis=1)
+
+            # RSI over 14 changes with simple averages (as TechnicalIndicators)
+            diffs = np.diff(closes[:, -15:], axis=1)
+            gains = np.clip(diffs, 0, None).mean(axis=1)
+            losses = np.clip(-diffs, 0, None).mean(axis=1)
+            rsi = 100 - 100 / (1 + gains / losses)
+
+            values = {
+                "price": price,
+                "prev_close": prev_close,
+                "change": price - prev_close,
+                "change_pct": (price / prev_close - 1) * 100,
+                "volume": volume,
+                "avg_volume": avg_volume,
+                "relative_volume": volume / avg_volume,
+                "dollar_volume": price * volume,
+                "rsi": rsi,
+                "sma_20": closes[:, -20:].mean(axis=1),
+                "sma_50": closes[:, -50:].mean(axis=1),
+            }
+        for column, column_values in values.items():
+            self.columns[column][index] = column_values
+
+    def set_fundamentals(self, records: Dict[str, Dict[str, Any]]):
+        """
+        Set name, sector, exchange, market cap, P/E and dividend yield.
+
+        Args:
+            records: Symbol -> fields (missing fields are left unchanged)
+        """
+        for symbol, record in records.items():
+            self._fundamentals.setdefault(symbol, {}).update(record)
+        self._apply_fundamentals([s for s in records if s in self._rows])
+
+    def _apply_fundamentals(self, symbols: Iterable[str]):
+        for symbol in symbols:
+            record = self._fundamentals.get(symbol)
+            if not record:
+                continue
+            row = self._rows[symbol]
+            for column in FUNDAMENTAL_COLUMNS + TEXT_COLUMNS:
+                if record.get(column) is not None:
+                    self.columns[column][row] = record[column]
+
+    def has_values(self, column: str) -> bool:
+        """Check whether any row has a value in a column."""
+        values = self.columns[column]
+        if values.dtype == object:
+            return any(value is not None for value in values)
+        return bool((~np.isnan(values)).any())
+
+    def between(self, column: str, low: Optional[float] = None, high: Optional[float] = None) -> np.ndarray:
+        """Mask of rows whose column lies in [low, high] (NaN never matches)."""
+        values = self.columns[column]
+        mask = ~np.isnan(values)
+        if low is not None:
+            mask &= values >= low
+        if high is not None:
+            mask &= values <= high
+        return mask
+
+    def isin(self, column: str, choices: Iterable[str]) -> np.ndarray:
+        """Mask of rows whose text column is one of choices."""
+        return np.isin(self.columns[column], list(choices))
+
+    def top(self, column: str, n: int, mask: Optional[np.ndarray] = None, ascending: bool = False) -> np.ndarray:
+        """
+        Rows with the largest (or smallest) values of a column.
+
+        Only the selected rows are sorted (partial sort of the rest).
+
+        Args:
+            column: Column to rank by
+            n: Number of rows
+            mask: Rows to consider
+            ascending: Smallest values first
+
+        Returns:
+            Row indices in rank order
+        """
+        values = self.columns[column]
+        candidates = ~np.isnan(values)
+        if mask is not None:
+            candidates &= mask
+        rows = np.flatnonzero(candidates)
+        if n <= 0 or not len(rows):
+            return rows[:0]
+        keys = values[rows] if ascending else -values[rows]
+        if len(rows) > n:
+            part = np.argpartition(keys, n - 1)[:n]
+            rows, keys = rows[part], keys[part]
+        return rows[np.argsort(keys, kind="stable")]
+
+    def records(self, rows: Iterable[int]) -> List[Dict[str, Any]]:
+        """Rows as result dicts (NaN as None)."""
+        results = []
+        for row in rows:
+            record = {"symbol": self.symbols[row]}
+            for column, values in self.columns.items():
+                value = values[row]
+                if values.dtype != object:
+                    value = None if np.isnan(value) else float(value)
+                record[column] = value
+            results.append(record)
+        return results
+
+    def needs_refresh(self) -> bool:
+        """Check whether the snapshot is empty or older than refresh_interval."""
+        return self.refreshed_at is None or time.monotonic() - self.refreshed_at > self.refresh_interval
+
+    async def refresh(self, db: Optional[AsyncSession] = None):
+        """
+        Load new daily bars from the bar cache.
+
+        The first refresh builds the snapshot from the last ``window``
+        bars of every symbol; later ones only read bars from the last
+        cached day on.
+
+        Args:
+            db: Database session (a new one is opened if omitted)
+        """
+        async with self._lock:
+            if db is None:
+                async with self._session_factory() as session:
+                    await self._refresh(session)
+            else:
+                await self._refresh(db)
+
+    async def _refresh(self, db: AsyncSession):
+        started = time.perf_counter()
+        if self.source is None:
+            self.source = getattr(get_market_data_service(), "source_name", "alpaca")
+        latest = (await db.execute(
+            select(func.max(MarketDataCache.date)).where(MarketDataCache.source == self.source)
+        )).scalar()
+        if latest is None:
+            self.refreshed_at = time.monotonic()
+            return
+
+        if self._cache_through is None:
+            # Calendar days that cover `window` trading days
+            since = latest - timedelta(days=int(self.window * 7 / 5) + 10)
+        else:
+            since = self._cache_through
+
+        result = await db.execute(
+            select(
+                MarketDataCache.symbol, MarketDataCache.date, MarketDataCache.open,
+                MarketDataCache.high, MarketDataCache.low, MarketDataCache.close,
+                MarketDataCache.volume,
+            ).where(MarketDataCache.source == self.source, MarketDataCache.date >= since)
+        )
+        bars = pd.DataFrame(
+            result.all(), columns=["symbol", "date", "open", "high", "low", "close", "volume"]
+        )
+
+        if self._cache_through is None:
+            self.build(bars)
+        elif not bars.empty:
+            bars = bars.sort_values(["date", "symbol"])
+            self.update_bars(bars.to_dict("records"), intraday=False)
+
+        self._cache_through = latest
+        self.refreshed_at = time.monotonic()
+        logger.info(
+            f"Universe snapshot refreshed: {len(bars)} bars, {len(self)} symbols "
+            f"in {(time.perf_counter() - started) * 1000:.0f}ms"
+        )
+
+    async def on_bar(self, bar: Dict[str, Any]):
+        """Merge a streamed intraday bar into its symbol's current day."""
+        self.update_bars([bar])
+
+    async def start(self, stream_client=None):
+        """
+        Refresh from the bar cache periodically and merge streamed bars.
+
+        Args:
+            stream_client: AlpacaStreamClient whose bar stream is merged in
+                (bars of the symbols it is subscribed to)
+        """
+        if self._task is not None:
+            return
+        self._task = asyncio.create_task(self._refresh_loop())
+        if stream_client is not None:
+            from app.integrations.market_data_ws import StreamType
+
+            self._stream_client = stream_client
+            stream_client.register_callback(StreamType.BARS, self.on_bar)
+
+    async def stop(self):
+        """Stop periodic refreshes and streamed bar updates."""
+        if self._stream_client is not None:
+            from app.integrations.market_data_ws import StreamType
+
+            self._stream_client.unregister_callback(StreamType.BARS, self.on_bar)
+            self._stream_client = None
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _refresh_loop(self):
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logger.error(f"Universe snapshot refresh failed: {e}")
+            await asyncio.sleep(self.refresh_interval)
+
+
+# Global snapshot instance
+_universe_snapshot: Optional[UniverseSnapshot] = None
+
+
+def get_universe_snapshot() -> UniverseSnapshot:
+    """
+    Get or create singleton universe snapshot.
+
+    Returns:
+        UniverseSnapshot instance
+    """
+    global _universe_snapshot
+    if _universe_snapshot is None:
+        _universe_snapshot = UniverseSnapshot(refresh_interval=settings.SCREENER_REFRESH_SECONDS)
+    return _universe_snapshot
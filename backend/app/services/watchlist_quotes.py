@@ -0,0 +1,520 @@
+"""
+Watchlist quotes and price alert evaluation.
+
+``WatchlistQuoteService`` resolves the quotes of every symbol on a user's
+watchlists and price alerts at once: symbols missing from its last-value
+cache are fetched with a single multi-symbol snapshot request, and once
+the service is subscribed to the trade stream, ticks keep the cached
+prices current between snapshots.
+
+``PriceAlertEvaluator`` keeps the targets of active price alerts in a
+per-symbol ``AlertIndex`` (sorted by price) and checks them on every trade
+tick; triggered alerts are deactivated and notified in batches.
+"""
+import asyncio
+import logging
+import time
+from bisect import bisect_left, bisect_right, insort
+from dataclasses import dataclass, replace
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select
+
+from app.database import get_db_context
+from app.integrations.market_data import MarketDataProvider, get_market_data_client
+from app.models.enums import NotificationPriority, NotificationType
+from app.models.notification import Notification
+from app.models.watchlist import PriceAlert
+
+logger = logging.getLogger(__name__)
+
+
+class WatchlistQuoteService:
+    """Quotes for many symbols from one snapshot request and the trade stream."""
+
+    def __init__(
+        self,
+        market_data: Optional[MarketDataProvider] = None,
+        ttl: float = 15.0,
+        stream_ttl: float = 300.0,
+    ):
+        """
+        Args:
+            market_data: Market data provider (default: the shared client)
+            ttl: Seconds a snapshot quote is served from cache
+            stream_ttl: Seconds a quote kept current by the trade stream is
+                served before its daily figures are refreshed
+        """
+        self._market_data = market_data
+        self.ttl = ttl
+        self.stream_ttl = stream_ttl
+        # symbol -> quote, with the monotonic time of its snapshot
+        self._quotes: Dict[str, Dict[str, Any]] = {}
+        self._fetched_at: Dict[str, float] = {}
+        self._stream_client = None
+        self.snapshot_requests = 0
+
+    @property
+    def market_data(self) -> MarketDataProvider:
+        if self._market_data is None:
+            self._market_data = get_market_data_client()
+        return self._market_data
+
+    def _is_fresh(self, symbol: str, now: float) -> bool:
+        fetched_at = self._fetched_at.get(symbol)
+        if fetched_at is None:
+            return False
+        ttl = self.stream_ttl if self._is_streamed(symbol) else self.ttl
+        return now - fetched_at <= ttl
+
+    def _is_streamed(self, symbol: str) -> bool:
+        if self._stream_client is None:
+            return False
+        return symbol in self._stream_client.get_subscriptions().get("trades", [])
+
+    @staticmethod
+    def _quote_from_snapshot(symbol: str, snapshot: Dict[str, Any]) -> Dict[str, Any]:
+        latest_trade = snapshot.get("latest_trade") or {}
+        daily_bar = snapshot.get("daily_bar") or {}
+        prev_daily_bar = snapshot.get("prev_daily_bar") or {}
+
+        price = latest_trade.get("price", daily_bar.get("close"))
+        quote = {
+            "symbol": symbol,
+            "price": price,
+            "prev_close": prev_daily_bar.get("close"),
+            "volume": daily_bar.get("volume"),
+            "timestamp": latest_trade.get("timestamp", daily_bar.get("timestamp")),
+        }
+        WatchlistQuoteService._set_change(quote)
+        return quote
+
+    @staticmethod
+    def _set_change(quote: Dict[str, Any]):
+        price, prev_close = quote["price"], quote["prev_close"]
+        if price is None or not prev_close:
+            quote["change"] = quote["change_percent"] = None
+        else:
+            quote["change"] = price - prev_close
+            quote["change_percent"] = (price / prev_close - 1) * 100
+
+    async def get_quotes(self, symbols: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Get quotes for symbols.
+
+        Args:
+            symbols: Stock symbols
+
+        Returns:
+            Dictionary mapping symbol to quote (price, prev_close, change,
+            change_percent, volume, timestamp); symbols without market data
+            are omitted
+        """
+        symbols = list(dict.fromkeys(symbols))
+        now = time.monotonic()
+        missing = [s for s in symbols if not self._is_fresh(s, now)]
+
+        if missing:
+            try:
+                self.snapshot_requests += 1
+                snapshots = await self.market_data.get_snapshots(missing)
+            except Exception as e:
+                logger.warning(f"Snapshot request for {len(missing)} symbols failed: {e}")
+                snapshots = {}
+            fetched_at = time.monotonic()
+            for symbol, snapshot in snapshots.items():
+                self._quotes[symbol] = self._quote_from_snapshot(symbol, snapshot)
+                self._fetched_at[symbol] = fetched_at
+            await self.watch(list(snapshots))
+
+        return {s: dict(self._quotes[s]) for s in symbols if s in self._quotes}
+
+    async def start(self, stream_client):
+        """
+        Keep cached quotes current from the trade stream.
+
+        Args:
+            stream_client: AlpacaStreamClient whose trades update the cache
+        """
+        if self._stream_client is not None:
+            return
+        from app.integrations.market_data_ws import StreamType
+
+        self._stream_client = stream_client
+        stream_client.register_callback(StreamType.TRADES, self.on_trade)
+        if not stream_client.is_connected:
+            await stream_client.connect()
+        await self.watch(list(self._quotes))
+
+    async def stop(self):
+        """Stop taking prices from the trade stream."""
+        if self._stream_client is None:
+            return
+        from app.integrations.market_data_ws import StreamType
+
+        self._stream_client.unregister_callback(StreamType.TRADES, self.on_trade)
+        self._stream_client = None
+
+    async def watch(self, symbols: List[str]):
+        """Subscribe to trades of symbols that were quoted."""
+        if self._stream_client is None:
+            return
+        subscribed = set(self._stream_client.get_subscriptions().get("trades", []))
+        new_symbols = [s for s in symbols if s not in subscribed]
+        if new_symbols:
+            await self._stream_client.subscribe_trades(new_symbols)
+
+    async def on_trade(self, trade: Dict[str, Any]):
+        """Stream callback for trade ticks."""
+        quote = self._quotes.get(trade["symbol"])
+        if quote is None:
+            return
+        quote["price"] = trade["price"]
+        quote["timestamp"] = trade.get("timestamp", quote["timestamp"])
+        if quote["volume"] is not None and trade.get("size"):
+            quote["volume"] += trade["size"]
+        self._set_change(quote)
+
+
+@dataclass
+class AlertTrigger:
+    """A price alert whose target was reached by a trade."""
+    alert_id: str
+    user_id: str
+    symbol: str
+    condition: str  # "above" or "below"
+    target_price: float
+    price: float
+    message: Optional[str]
+
+    def crosses(self, alert: PriceAlert) -> bool:
+        """Whether the triggering price reaches the alert's current target."""
+        if alert.symbol != self.symbol:
+            return False
+        if alert.condition == "above":
+            return self.price >= alert.target_price
+        return self.price <= alert.target_price
+
+
+class AlertIndex:
+    """
+    Targets of active price alerts, by symbol.
+
+    "above" and "below" targets are kept sorted by price. An alert is
+    removed as soon as it triggers, so a new price only has to look at the
+    targets it crossed: the lowest "above" targets and the highest "below"
+    targets.
+    """
+
+    def __init__(self):
+        self._above: Dict[str, List[Tuple[float, str]]] = {}
+        self._below: Dict[str, List[Tuple[float, str]]] = {}
+        # alert_id -> (symbol, user_id, condition, target_price, message)
+        self._alerts: Dict[str, Tuple[str, str, str, float, Optional[str]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._alerts)
+
+    def __contains__(self, alert_id: str) -> bool:
+        return alert_id in self._alerts
+
+    def symbols(self) -> List[str]:
+        """Symbols with at least one alert."""
+        return list({symbol for symbol, _, _, _, _ in self._alerts.values()})
+
+    def upsert(
+        self,
+        alert_id: str,
+        symbol: str,
+        user_id: str,
+        condition: str,
+        target_price: float,
+        message: Optional[str] = None,
+    ):
+        """Add or replace an alert's target."""
+        self.remove(alert_id)
+        self._alerts[alert_id] = (symbol, user_id, condition, target_price, message)
+        book = self._above if condition == "above" else self._below
+        insort(book.setdefault(symbol, []), (target_price, alert_id))
+
+    def track(self, alert: PriceAlert):
+        """Add, replace or remove an alert from the model."""
+        if alert.is_active:
+            self.upsert(
+                alert.id, alert.symbol, alert.user_id,
+                alert.condition, alert.target_price, alert.message,
+            )
+        else:
+            self.remove(alert.id)
+
+    def remove(self, alert_id: str):
+        """Remove an alert's target."""
+        entry = self._alerts.pop(alert_id, None)
+        if entry is None:
+            return
+        symbol, _, condition, target_price, _ = entry
+        book = self._above if condition == "above" else self._below
+        entries = book.get(symbol)
+        if not entries:
+            return
+        i = bisect_left(entries, (target_price, alert_id))
+        if i < len(entries) and entries[i] == (target_price, alert_id):
+            del entries[i]
+        if not entries:
+            del book[symbol]
+
+    def clear(self):
+        self._above.clear()
+        self._below.clear()
+        self._alerts.clear()
+
+    def on_price(self, symbol: str, price: float) -> List[AlertTrigger]:
+        """
+        Apply a traded price.
+
+        "above" alerts with a target at or below the price, and "below"
+        alerts with a target at or above it, are removed and returned.
+
+        Args:
+            symbol: Stock symbol
+            price: Traded price
+
+        Returns:
+            Triggered alerts (empty for untouched symbols)
+        """
+        crossed: List[str] = []
+
+        above = self._above.get(symbol)
+        if above and above[0][0] <= price:
+            i = bisect_right(above, (price, "\uffff"))
+            crossed.extend(alert_id for _, alert_id in above[:i])
+        below = self._below.get(symbol)
+        if below and below[-1][0] >= price:
+            i = bisect_left(below, (price, ""))
+            crossed.extend(alert_id for _, alert_id in below[i:])
+
+        triggers = []
+        for alert_id in crossed:
+            _, user_id, condition, target_price, message = self._alerts[alert_id]
+            self.remove(alert_id)
+            triggers.append(AlertTrigger(
+                alert_id=alert_id,
+                user_id=user_id,
+                symbol=symbol,
+                condition=condition,
+                target_price=target_price,
+                price=price,
+                message=message,
+            ))
+        return triggers
+
+
+class PriceAlertEvaluator:
+    """
+    Event-driven price alerts.
+
+    Trade ticks are checked against the alert index as they arrive;
+    triggered alerts are queued, then deactivated and notified together in
+    one transaction.
+    """
+
+    def __init__(
+        self,
+        index: Optional[AlertIndex] = None,
+        session_factory: Callable = get_db_context,
+    ):
+        """
+        Initialize price alert evaluator.
+
+        Args:
+            index: Alert index to check (default: the shared index that the
+                watchlist API keeps in sync)
+            session_factory: Async context manager yielding a database session
+        """
+        self.index = index if index is not None else get_alert_index()
+        self._session_factory = session_factory
+        self._pending: List[AlertTrigger] = []
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._stream_client = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._task is not None
+
+    async def load(self):
+        """Rebuild the index from all active alerts."""
+        async with self._session_factory() as db:
+            result = await db.execute(select(PriceAlert).where(PriceAlert.is_active == True))
+            alerts = result.scalars().all()
+        self.index.clear()
+        for alert in alerts:
+            self.index.track(alert)
+        logger.info(f"Loaded {len(self.index)} price alerts")
+
+    async def start(self, stream_client=None):
+        """
+        Load the index and start notifying triggered alerts.
+
+        Args:
+            stream_client: AlpacaStreamClient to take trade ticks from;
+                without it prices only arrive through ``on_trade``
+        """
+        if self._task is not None:
+            return
+        await self.load()
+        self._task = asyncio.create_task(self._notify_loop())
+
+        if stream_client is not None:
+            from app.integrations.market_data_ws import StreamType
+
+            self._stream_client = stream_client
+            stream_client.register_callback(StreamType.TRADES, self.on_trade)
+            if not stream_client.is_connected:
+                await stream_client.connect()
+            await self.watch(self.index.symbols())
+
+    async def stop(self):
+        """Stop the evaluator and notify any queued alerts."""
+        if self._task is None:
+            return
+        if self._stream_client is not None:
+            from app.integrations.market_data_ws import StreamType
+
+            self._stream_client.unregister_callback(StreamType.TRADES, self.on_trade)
+            self._stream_client = None
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+        await self.flush()
+
+    async def watch(self, symbols: List[str]):
+        """Subscribe to trades of symbols that gained an alert."""
+        if self._stream_client is None:
+            return
+        subscribed = set(self._stream_client.get_subscriptions().get("trades", []))
+        new_symbols = [s for s in symbols if s not in subscribed]
+        if new_symbols:
+            await self._stream_client.subscribe_trades(new_symbols)
+
+    async def on_trade(self, trade: Dict[str, Any]):
+        """Stream callback for trade ticks."""
+        triggers = self.index.on_price(trade["symbol"], trade["price"])
+        if triggers:
+            self._pending.extend(triggers)
+            self._wakeup.set()
+
+    async def flush(self) -> List[AlertTrigger]:
+        """Deactivate and notify queued alerts now; returns the triggered alerts."""
+        if not self._pending:
+            return []
+        triggers, self._pending = self._pending, []
+        self._wakeup.clear()
+
+        try:
+            async with self._session_factory() as db:
+                # Locked until commit so another worker's flush waits and
+                # then finds the alerts inactive
+                result = await db.execute(
+                    select(PriceAlert)
+                    .where(
+                        PriceAlert.id.in_([t.alert_id for t in triggers]),
+                        PriceAlert.is_active == True,
+                    )
+                    .order_by(PriceAlert.id)
+                    .with_for_update()
+                    .execution_options(populate_existing=True)
+                )
+                alerts = {alert.id: alert for alert in result.scalars().all()}
+                # Alerts deleted, paused or retargeted out of reach since
+                # they were indexed are skipped
+                triggers = [
+                    replace(
+                        t,
+                        condition=alerts[t.alert_id].condition,
+                        target_price=alerts[t.alert_id].target_price,
+                        message=alerts[t.alert_id].message,
+                    )
+                    for t in triggers
+                    if t.alert_id in alerts and t.crosses(alerts[t.alert_id])
+                ]
+
+                now = datetime.now(timezone.utc)
+                for t in triggers:
+                    alerts[t.alert_id].is_active = False
+                    alerts[t.alert_id].triggered_at = now
+                    db.add(Notification(
+                        user_id=t.user_id,
+                        type=NotificationType.SYSTEM_ALERT,
+                        priority=NotificationPriority.HIGH,
+                        title=f"Price alert: {t.symbol} {t.condition} {t.target_price:.2f}",
+                        message=t.message or f"{t.symbol} traded at {t.price:.2f}",
+                        data={
+                            "alert_id": t.alert_id,
+                            "symbol": t.symbol,
+                            "condition": t.condition,
+                            "target_price": t.target_price,
+                            "price": t.price,
+                        },
+                    ))
+                await db.commit()
+        except Exception as e:
+            logger.error(f"Error notifying {len(triggers)} price alerts: {e}", exc_info=True)
+            # Put the targets back so the next crossing retries
+            for t in triggers:
+                self.index.upsert(t.alert_id, t.symbol, t.user_id, t.condition, t.target_price, t.message)
+            return []
+
+        logger.info(f"Triggered {len(triggers)} price alerts")
+        return triggers
+
+    async def _notify_loop(self):
+        while True:
+            await self._wakeup.wait()
+            await self.flush()
+
+
+# Global service instances
+_watchlist_quote_service: Optional[WatchlistQuoteService] = None
+_alert_index: Optional[AlertIndex] = None
+_price_alert_evaluator: Optional[PriceAlertEvaluator] = None
+
+
+def get_watchlist_quote_service() -> WatchlistQuoteService:
+    """
+    Get or create singleton watchlist quote service.
+
+    Returns:
+        WatchlistQuoteService instance
+    """
+    global _watchlist_quote_service
+    if _watchlist_quote_service is None:
+        _watchlist_quote_service = WatchlistQuoteService()
+    return _watchlist_quote_service
+
+
+def get_alert_index() -> AlertIndex:
+    """
+    Get or create singleton alert index.
+
+    Returns:
+        AlertIndex instance
+    """
+    global _alert_index
+    if _alert_index is None:
+        _alert_index = AlertIndex()
+    return _alert_index
+
+
+def get_price_alert_evaluator() -> PriceAlertEvaluator:
+    """
+    Get or create singleton price alert evaluator.
+
+    Returns:
+        PriceAlertEvaluator instance
+    """
+    global _price_alert_evaluator
+    if _price_alert_evaluator is None:
+        _price_alert_evaluator = PriceAlertEvaluator()
+    return _price_alert_evaluator
@@ -20,6 +20,7 @@ from app.models.strategy_execution import (
 from app.strategies.signal_generator import SignalGenerator
 from app.integrations.market_data import get_market_data_client
 from app.integrations.order_execution import get_order_executor
+from app.integrations.trade_stream import get_trade_update_consumer, strategy_client_order_id
 from app.services.order_validation import get_order_validator
 
 logger = logging.getLogger(__name__)
@@ -371,7 +372,8 @@ class StrategyExecutor:
                 notional=notional,
                 side=side,
                 order_type='market',
-                time_in_force='day'
+                time_in_force='day',
+                client_order_id=strategy_client_order_id(strategy.id)
             )
             
             logger.info(f"Order executed successfully: {order['id']}")
@@ -399,6 +401,15 @@ class StrategyExecutor:
         execution.last_trade_at = datetime.now(timezone.utc)
         execution.trades_today += 1
         
+        # Check if max trades per day reached
+        if execution.trades_today >= execution.max_trades_per_day:
+            execution.state = ExecutionState.CIRCUIT_BREAKER
+            logger.warning(f"Circuit breaker triggered: max trades per day reached")
+        
+        if get_trade_update_consumer().is_running:
+            # Position and P&L are applied from fills on the trade updates stream
+            return
+        
         if signal_type == SignalType.BUY:
             execution.has_open_position = True
             execution.current_position_qty = filled_qty
@@ -428,11 +439,6 @@ class StrategyExecutor:
             execution.has_open_position = False
             execution.current_position_qty = None
             execution.current_position_entry_price = None
-        
-        # Check if max trades per day reached
-        if execution.trades_today >= execution.max_trades_per_day:
-            execution.state = ExecutionState.CIRCUIT_BREAKER
-            logger.warning(f"Circuit breaker triggered: max trades per day reached")
     
     async def load_active_strategies(self, db: AsyncSession) -> List[Tuple[Strategy, StrategyExecution]]:
         """
@@ -42,10 +42,10 @@ async def apply_migration():
                 low FLOAT NOT NULL,
                 close FLOAT NOT NULL,
                 volume INTEGER NOT NULL,
-                source VARCHAR(50) DEFAULT 'alpaca',
+                source VARCHAR(50) NOT NULL DEFAULT 'alpaca',
                 created_at TIMESTAMP DEFAULT NOW() NOT NULL,
                 updated_at TIMESTAMP DEFAULT NOW() NOT NULL,
-                CONSTRAINT uix_symbol_date UNIQUE (symbol, date)
+                CONSTRAINT uix_symbol_date_source UNIQUE (symbol, date, source)
             )
         """))
         
@@ -8,6 +8,21 @@ bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
 workers = int(os.environ.get("GUNICORN_WORKERS", "2"))
 worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "uvicorn.workers.UvicornWorker")
 
+# The paper matching engine keeps resting orders in process memory and the
+# trade stream consumer applies every fill it receives; with several workers
+# each one would fill or apply every order again
+if workers > 1:
+    from app.core.config import settings
+
+    if settings.PAPER_MATCHING_ENGINE_ENABLED:
+        raise RuntimeError(
+            f"PAPER_MATCHING_ENGINE_ENABLED requires a single worker (GUNICORN_WORKERS={workers})"
+        )
+    if settings.TRADE_STREAM_ENABLED:
+        raise RuntimeError(
+            f"TRADE_STREAM_ENABLED requires a single worker (GUNICORN_WORKERS={workers})"
+        )
+
 # Logging
 loglevel = os.environ.get("GUNICORN_LOGLEVEL", "info")
 accesslog = os.environ.get("GUNICORN_ACCESSLOG", "-")
@@ -0,0 +1,11 @@
+"""
+Load testing against a local Alpaca stand-in.
+
+``loadtest.alpaca_standin`` serves the subset of the Alpaca trading and
+market data APIs (REST and WebSocket) that alpaca-py calls, backed by
+replayed bars and a simple fill engine. ``loadtest.harness`` drives the
+backend's order and market-data paths at N concurrent strategies and
+reports latency percentiles.
+
+Run with ``python -m loadtest.run_load --help``.
+"""
@@ -0,0 +1,1154 @@
+"""
+Local Alpaca stand-in server.
+
+Implements the REST and WebSocket endpoints the backend reaches through
+alpaca-py (TradingClient, StockHistoricalDataClient, StockDataStream and
+TradingStream) so the full signal-to-order path can be exercised offline:
+
+- Trading: /v2/account, /v2/clock, /v2/orders, /v2/positions
+- Market data: /v2/stocks/bars, /v2/stocks/{quotes,trades,bars}/latest,
+  /v2/stocks/snapshots
+- Streams: /v2/{feed} (market data, msgpack) and /stream (trade updates, JSON)
+
+Bars are replayed from SyntheticMarketData (or caller supplied frames) on a
+replay clock; orders fill against the current replayed bar. Every REST call
+passes through a configurable latency and error model.
+
+Point the backend at a running stand-in with:
+    ALPACA_BASE_URL=http://127.0.0.1:8765
+    ALPACA_DATA_URL=http://127.0.0.1:8765
+    ALPACA_STREAM_URL=ws://127.0.0.1:8765/v2/iex
+
+Run standalone with ``python -m loadtest.alpaca_standin --port 8765``.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import math
+import random
+import socket
+import sys
+import threading
+import time
+import uuid
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import timedelta
+from pathlib import Path
+from typing import Optional, List, Dict, Any
+
+import msgpack
+import pandas as pd
+import uvicorn
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse, Response
+
+# Add project root to path for src imports
+project_root = Path(__file__).resolve().parent.parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from src.data.synthetic_data import SyntheticMarketData
+from app.integrations.synthetic_market_data import TIMEFRAME_MAP
+
+logger = logging.getLogger(__name__)
+
+OPEN_STATUSES = {"new", "accepted", "partially_filled", "pending_new"}
+
+# Alpaca error codes used in responses
+ERROR_CODES = {
+    401: 40110000,
+    403: 40310000,
+    404: 40410000,
+    422: 40010001,
+    429: 42910000,
+    500: 50010000,
+}
+
+
+class StandinError(Exception):
+    """Error returned to the client as an Alpaca-style error response."""
+
+    def __init__(self, status_code: int, message: str):
+        self.status_code = status_code
+        self.message = message
+        super().__init__(message)
+
+
+def _error_response(status_code: int, message: str) -> JSONResponse:
+    return JSONResponse(
+        status_code=status_code,
+        content={"code": ERROR_CODES.get(status_code, status_code * 100000), "message": message}
+    )
+
+
+def _iso(ts: Any) -> Optional[str]:
+    if ts is None:
+        return None
+    return pd.Timestamp(ts).tz_convert("UTC").strftime("%Y-%m-%dT%H:%M:%S.%fZ")
+
+
+def _now() -> str:
+    return _iso(pd.Timestamp.now(tz="UTC"))
+
+
+def _timestamp(value: Any) -> Optional[pd.Timestamp]:
+    if value is None or value == "":
+        return None
+    ts = pd.Timestamp(value)
+    return ts.tz_localize("UTC") if ts.tzinfo is None else ts.tz_convert("UTC")
+
+
+@dataclass
+class LatencyModel:
+    """
+    Per-request latency and fault injection.
+
+    Latency is log-normal around ``median_ms`` (``sigma`` controls the tail).
+    Each request independently fails with ``error_rate`` (returning
+    ``error_status``) or is rate limited with ``rate_limit_rate`` (429).
+
+    Note that alpaca-py retries 429 responses itself (3 attempts, 3s apart by
+    default), so rate limiting shows up as latency rather than errors.
+    """
+
+    median_ms: float = 0.0
+    sigma: float = 0.5
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    error_status: int = 500
+    seed: Optional[int] = None
+
+    def __post_init__(self):
+        self._rng = random.Random(self.seed)
+
+    def delay(self) -> float:
+        """Sample a delay in seconds."""
+        if self.median_ms <= 0:
+            return 0.0
+        return self.median_ms * math.exp(self.sigma * self._rng.gauss(0.0, 1.0)) / 1000
+
+    def fault(self) -> Optional[int]:
+        """Sample an injected HTTP status, or None for a normal response."""
+        if self.error_rate <= 0 and self.rate_limit_rate <= 0:
+            return None
+        roll = self._rng.random()
+        if roll < self.error_rate:
+            return self.error_status
+        if roll < self.error_rate + self.rate_limit_rate:
+            return 429
+        return None
+
+
+class ReplayFeed:
+    """
+    Replays bars on a shared timeline.
+
+    The replay clock starts at ``start`` and releases ``bars_per_second`` bars
+    per wall-clock second. With ``bars_per_second=None`` the clock only moves
+    through ``advance()``, which keeps tests deterministic. Bars after the
+    replay clock are never served.
+    """
+
+    def __init__(
+        self,
+        start: Any = "2024-01-02",
+        end: Any = None,
+        timeframe: str = "1Min",
+        bars_per_second: Optional[float] = None,
+        generator: Optional[SyntheticMarketData] = None,
+        frames: Optional[Dict[str, pd.DataFrame]] = None,
+        warmup_days: int = 30,
+        clock_symbol: str = "SPY",
+    ):
+        """
+        Initialize replay feed.
+
+        Args:
+            start: First replayed timestamp
+            end: Last replayed timestamp (default: 30 days after start)
+            timeframe: Bar timeframe of the replay (1Min, 5Min, 15Min, 1Hour, 1Day)
+            bars_per_second: Replay speed; None for manual advance()
+            generator: Source of bars for symbols not in ``frames``
+            frames: Historical OHLCV frames keyed by symbol (UTC index)
+            warmup_days: History visible before ``start``
+            clock_symbol: Symbol whose bars define the generated timeline
+        """
+        if timeframe not in TIMEFRAME_MAP:
+            raise ValueError(f"Invalid timeframe: {timeframe}. Must be one of {list(TIMEFRAME_MAP.keys())}")
+
+        self.timeframe = timeframe
+        self.start = _timestamp(start)
+        self.end = _timestamp(end) if end is not None else self.start + timedelta(days=30)
+        self.bars_per_second = bars_per_second
+        self.frames = {s: df.sort_index() for s, df in (frames or {}).items()}
+        self.generator = generator if generator is not None or frames else SyntheticMarketData()
+        self.warmup = timedelta(days=warmup_days)
+        self._cache: Dict[str, pd.DataFrame] = {}
+        self._step = 0
+        self._t0 = time.monotonic()
+
+        if self.frames:
+            timeline = pd.DatetimeIndex([])
+            for df in self.frames.values():
+                timeline = timeline.union(df.index)
+        else:
+            timeline = self.frame(clock_symbol).index
+        self.timeline = timeline[(timeline >= self.start) & (timeline <= self.end)]
+        if len(self.timeline) == 0:
+            raise ValueError(f"No bars to replay between {self.start} and {self.end}")
+
+    def frame(self, symbol: str) -> pd.DataFrame:
+        """All bars for a symbol over the replay window, including warmup."""
+        if symbol not in self._cache:
+            if symbol in self.frames:
+                df = self.frames[symbol]
+            elif self.generator is not None:
+                df = self.generator.get_bars(
+                    symbol, self.start - self.warmup, self.end, TIMEFRAME_MAP[self.timeframe]
+                )
+            else:
+                raise StandinError(404, f"symbol not found: {symbol}")
+            self._cache[symbol] = df
+        return self._cache[symbol]
+
+    @property
+    def position(self) -> int:
+        """Index of the current bar in the timeline."""
+        if self.bars_per_second is None:
+            step = self._step
+        else:
+            step = int((time.monotonic() - self._t0) * self.bars_per_second)
+        return min(step, len(self.timeline) - 1)
+
+    def now(self) -> pd.Timestamp:
+        """Current replay time."""
+        return self.timeline[self.position]
+
+    def advance(self, bars: int = 1) -> pd.Timestamp:
+        """Advance a manual clock by a number of bars."""
+        self._step += bars
+        return self.now()
+
+    def visible(self, symbol: str) -> pd.DataFrame:
+        """Bars for a symbol up to and including the replay clock."""
+        df = self.frame(symbol)
+        return df.iloc[:df.index.searchsorted(self.now(), side="right")]
+
+    def last(self, symbol: str) -> pd.Series:
+        """The most recent visible bar for a symbol."""
+        df = self.visible(symbol)
+        if df.empty:
+            raise StandinError(404, f"no data for {symbol}")
+        return df.iloc[-1]
+
+    def price(self, symbol: str) -> float:
+        """Latest traded price for a symbol."""
+        return float(self.last(symbol)["close"])
+
+    def bars(
+        self,
+        symbol: str,
+        timeframe: str,
+        start: Optional[pd.Timestamp],
+        end: Optional[pd.Timestamp]
+    ) -> pd.DataFrame:
+        """Visible bars for a symbol in [start, end] at any supported timeframe."""
+        now = self.now()
+        end = now if end is None else min(end, now)
+        if timeframe == self.timeframe:
+            df = self.visible(symbol)
+        elif timeframe in TIMEFRAME_MAP and self.generator is not None:
+            df = self.generator.get_bars(
+                symbol, start if start is not None else end - timedelta(days=30), end,
+                TIMEFRAME_MAP[timeframe]
+            )
+        else:
+            raise StandinError(422, f"timeframe {timeframe} not available in replay")
+        mask = df.index <= end
+        if start is not None:
+            mask &= df.index >= start
+        return df[mask]
+
+    def daily(self, symbol: str) -> pd.DataFrame:
+        """Daily bars aggregated from the visible replay bars."""
+        df = self.visible(symbol)
+        if self.timeframe == "1Day":
+            return df.iloc[-2:]
+        df = df[df.index >= self.now().normalize() - timedelta(days=7)]
+        return df.groupby(df.index.normalize()).agg(
+            {"open": "first", "high": "max", "low": "min", "close": "last", "volume": "sum"}
+        ).iloc[-2:]
+
+
+class StandinBroker:
+    """
+    Paper broker state: account, orders and positions.
+
+    Market orders fill immediately at the current bar close plus slippage.
+    Limit, stop, stop-limit and trailing-stop orders rest until the replayed
+    price makes them marketable; ``match()`` is called on every request and
+    on every replay tick. Orders are never partially filled and day orders do
+    not expire.
+    """
+
+    def __init__(
+        self,
+        feed: ReplayFeed,
+        cash: float = 100_000.0,
+        slippage_bps: float = 1.0,
+        account_id: Optional[str] = None,
+    ):
+        """
+        Initialize broker.
+
+        Args:
+            feed: Replay feed used for fill prices
+            cash: Starting cash
+            slippage_bps: Slippage applied to marketable fills in basis points
+            account_id: Account ID (random if not given)
+        """
+        self.feed = feed
+        self.cash = cash
+        self.initial_cash = cash
+        self.slippage = slippage_bps / 10000
+        self.account_id = account_id or str(uuid.uuid4())
+        self.orders: Dict[str, Dict[str, Any]] = {}
+        self.positions: Dict[str, Dict[str, float]] = {}
+        self.listeners: List[asyncio.Queue] = []
+
+    # ------------------------------------------------------------------
+    # Events
+
+    def _publish(self, event: str, order: Dict[str, Any], **extra):
+        if not self.listeners:
+            return
+        message = {
+            "stream": "trade_updates",
+            "data": {
+                "event": event,
+                "order": dict(order),
+                "timestamp": _now(),
+                "execution_id": str(uuid.uuid4()) if event == "fill" else None,
+                **extra,
+            },
+        }
+        for queue in self.listeners:
+            queue.put_nowait(message)
+
+    # ------------------------------------------------------------------
+    # Orders
+
+    def submit(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        """Accept a new order and fill it if marketable."""
+        symbol = body.get("symbol")
+        side = body.get("side")
+        order_type = body.get("type", "market")
+        if not symbol or side not in ("buy", "sell"):
+            raise StandinError(422, "symbol and side are required")
+        if order_type not in ("market", "limit", "stop", "stop_limit", "trailing_stop"):
+            raise StandinError(422, f"invalid order type: {order_type}")
+        if body.get("qty") is None and body.get("notional") is None:
+            raise StandinError(422, "qty or notional is required")
+        if order_type in ("limit", "stop_limit") and body.get("limit_price") is None:
+            raise StandinError(422, "limit_price is required")
+        if order_type in ("stop", "stop_limit") and body.get("stop_price") is None:
+            raise StandinError(422, "stop_price is required")
+
+        price = self.feed.price(symbol)
+        client_order_id = body.get("client_order_id") or str(uuid.uuid4())
+        if any(o["client_order_id"] == client_order_id for o in self.orders.values()):
+            raise StandinError(422, "client_order_id must be unique")
+
+        qty = float(body["qty"]) if body.get("qty") is not None else None
+        if side == "buy":
+            cost = float(body["notional"]) if qty is None else qty * float(body.get("limit_price") or price)
+            if cost > self.cash:
+                raise StandinError(403, "insufficient buying power")
+
+        now = _now()
+        order = {
+            "id": str(uuid.uuid4()),
+            "client_order_id": client_order_id,
+            "created_at": now,
+            "updated_at": now,
+            "submitted_at": now,
+            "filled_at": None,
+            "expired_at": None,
+            "canceled_at": None,
+            "failed_at": None,
+            "replaced_at": None,
+            "replaced_by": None,
+            "replaces": None,
+            "asset_id": str(uuid.uuid5(uuid.NAMESPACE_OID, symbol)),
+            "symbol": symbol,
+            "asset_class": "us_equity",
+            "notional": body.get("notional"),
+            "qty": str(qty) if qty is not None else None,
+            "filled_qty": "0",
+            "filled_avg_price": None,
+            "order_class": "simple",
+            "order_type": order_type,
+            "type": order_type,
+            "side": side,
+            "time_in_force": body.get("time_in_force", "day"),
+            "limit_price": body.get("limit_price"),
+            "stop_price": body.get("stop_price"),
+            "trail_percent": body.get("trail_percent"),
+            "trail_price": body.get("trail_price"),
+            "hwm": str(price) if order_type == "trailing_stop" else None,
+            "status": "new",
+            "extended_hours": bool(body.get("extended_hours", False)),
+            "legs": None,
+        }
+        self.orders[order["id"]] = order
+        self._publish("new", order)
+        self._try_fill(order, price)
+
+        if order["status"] == "new" and order["time_in_force"] in ("ioc", "fok"):
+            self._cancel(order)
+        return order
+
+    def _trigger_price(self, order: Dict[str, Any], price: float) -> Optional[float]:
+        """Price an open order fills at, or None if it is not marketable."""
+        side = order["side"]
+        buy = side == "buy"
+        order_type = order["type"]
+        fill = price * (1 + self.slippage if buy else 1 - self.slippage)
+
+        if order_type == "trailing_stop":
+            hwm = float(order["hwm"])
+            hwm = min(hwm, price) if buy else max(hwm, price)
+            order["hwm"] = str(hwm)
+            if order.get("trail_price") is not None:
+                offset = float(order["trail_price"])
+            else:
+                offset = hwm * float(order.get("trail_percent") or 0) / 100
+            stop = hwm + offset if buy else hwm - offset
+            order["stop_price"] = str(stop)
+            triggered = price >= stop if buy else price <= stop
+            return fill if triggered else None
+
+        if order_type in ("stop", "stop_limit"):
+            stop = float(order["stop_price"])
+            if not (price >= stop if buy else price <= stop):
+                return None
+            if order_type == "stop":
+                return fill
+
+        if order_type in ("limit", "stop_limit"):
+            limit = float(order["limit_price"])
+            if buy:
+                return min(limit, fill) if price <= limit else None
+            return max(limit, fill) if price >= limit else None
+
+        return fill
+
+    def _try_fill(self, order: Dict[str, Any], price: float):
+        fill_price = self._trigger_price(order, price)
+        if fill_price is None:
+            return
+
+        qty = float(order["qty"]) if order["qty"] is not None else float(order["notional"]) / fill_price
+        signed = qty if order["side"] == "buy" else -qty
+        self.cash -= signed * fill_price
+
+        position = self.positions.get(order["symbol"], {"qty": 0.0, "avg_entry_price": 0.0})
+        new_qty = position["qty"] + signed
+        if abs(new_qty) < 1e-9:
+            self.positions.pop(order["symbol"], None)
+        else:
+            if position["qty"] == 0 or (position["qty"] > 0) == (signed > 0):
+                # Adding to (or opening) a position moves the average entry
+                position["avg_entry_price"] = (
+                    position["qty"] * position["avg_entry_price"] + signed * fill_price
+                ) / new_qty
+            elif (position["qty"] > 0) != (new_qty > 0):
+                # Flipped through zero: the remainder opens at the fill price
+                position["avg_entry_price"] = fill_price
+            position["qty"] = new_qty
+            self.positions[order["symbol"]] = position
+
+        now = _now()
+        order.update({
+            "status": "filled",
+            "filled_qty": str(qty),
+            "filled_avg_price": str(fill_price),
+            "filled_at": now,
+            "updated_at": now,
+        })
+        self._publish(
+            "fill", order, price=str(fill_price), qty=str(qty), position_qty=str(round(new_qty, 9))
+        )
+
+    def match(self):
+        """Fill resting orders that the current prices make marketable."""
+        for order in list(self.orders.values()):
+            if order["status"] in OPEN_STATUSES:
+                self._try_fill(order, self.feed.price(order["symbol"]))
+
+    def get(self, order_id: str) -> Dict[str, Any]:
+        if order_id not in self.orders:
+            raise StandinError(404, "order not found")
+        return self.orders[order_id]
+
+    def list_orders(
+        self,
+        status: str = "open",
+        limit: int = 50,
+        symbols: Optional[List[str]] = None,
+        direction: str = "desc"
+    ) -> List[Dict[str, Any]]:
+        orders = list(self.orders.values())
+        if status == "open":
+            orders = [o for o in orders if o["status"] in OPEN_STATUSES]
+        elif status == "closed":
+            orders = [o for o in orders if o["status"] not in OPEN_STATUSES]
+        if symbols:
+            orders = [o for o in orders if o["symbol"] in symbols]
+        # Insertion order is submission order
+        if direction == "desc":
+            orders.reverse()
+        return orders[:limit]
+
+    def _cancel(self, order: Dict[str, Any]):
+        now = _now()
+        order.update({"status": "canceled", "canceled_at": now, "updated_at": now})
+        self._publish("canceled", order)
+
+    def cancel(self, order_id: str):
+        order = self.get(order_id)
+        if order["status"] not in OPEN_STATUSES:
+            raise StandinError(422, f"order is already in \"{order['status']}\" state")
+        self._cancel(order)
+
+    def cancel_all(self) -> List[Dict[str, Any]]:
+        canceled = []
+        for order in self.list_orders("open", limit=len(self.orders)):
+            self._cancel(order)
+            canceled.append({"id": order["id"], "status": 200, "body": None})
+        return canceled
+
+    def replace(self, order_id: str, body: Dict[str, Any]) -> Dict[str, Any]:
+        """Replace an open order with a new one carrying the changed fields."""
+        old = self.get(order_id)
+        if old["status"] not in OPEN_STATUSES:
+            raise StandinError(422, f"order is already in \"{old['status']}\" state")
+
+        request = {
+            "symbol": old["symbol"],
+            "side": old["side"],
+            "type": old["type"],
+            "time_in_force": body.get("time_in_force") or old["time_in_force"],
+            "qty": body.get("qty") or old["qty"],
+            "notional": old["notional"],
+            "limit_price": body.get("limit_price") or old["limit_price"],
+            "stop_price": body.get("stop_price") or old["stop_price"],
+            "trail_price": body.get("trail") if old.get("trail_price") is not None else None,
+            "trail_percent": body.get("trail") if old.get("trail_percent") is not None else None,
+            "client_order_id": body.get("client_order_id"),
+            "extended_hours": old["extended_hours"],
+        }
+        if request["trail_price"] is None and request["trail_percent"] is None:
+            request["trail_price"] = old.get("trail_price")
+            request["trail_percent"] = old.get("trail_percent")
+
+        now = _now()
+        old.update({"status": "replaced", "replaced_at": now, "updated_at": now})
+        new = self.submit(request)
+        new["replaces"] = old["id"]
+        old["replaced_by"] = new["id"]
+        self._publish("replaced", old)
+        return new
+
+    # ------------------------------------------------------------------
+    # Positions and account
+
+    def position(self, symbol: str) -> Dict[str, Any]:
+        if symbol not in self.positions:
+            raise StandinError(404, "position does not exist")
+        position = self.positions[symbol]
+        qty = position["qty"]
+        daily = self.feed.daily(symbol)
+        price = self.feed.price(symbol)
+        lastday = float(daily["close"].iloc[-2]) if len(daily) > 1 else price
+        cost_basis = qty * position["avg_entry_price"]
+        market_value = qty * price
+        unrealized = market_value - cost_basis
+        intraday = qty * (price - lastday)
+        return {
+            "asset_id": str(uuid.uuid5(uuid.NAMESPACE_OID, symbol)),
+            "symbol": symbol,
+            "exchange": "NASDAQ",
+            "asset_class": "us_equity",
+            "avg_entry_price": str(position["avg_entry_price"]),
+            "qty": str(qty),
+            "qty_available": str(qty),
+            "side": "long" if qty > 0 else "short",
+            "market_value": str(market_value),
+            "cost_basis": str(cost_basis),
+            "unrealized_pl": str(unrealized),
+            "unrealized_plpc": str(unrealized / abs(cost_basis) if cost_basis else 0.0),
+            "unrealized_intraday_pl": str(intraday),
+            "unrealized_intraday_plpc": str(intraday / abs(qty * lastday) if lastday else 0.0),
+            "current_price": str(price),
+            "lastday_price": str(lastday),
+            "change_today": str(price / lastday - 1 if lastday else 0.0),
+        }
+
+    def list_positions(self) -> List[Dict[str, Any]]:
+        return [self.position(symbol) for symbol in sorted(self.positions)]
+
+    def close_position(
+        self,
+        symbol: str,
+        qty: Optional[float] = None,
+        percentage: Optional[float] = None
+    ) -> Dict[str, Any]:
+        if symbol not in self.positions:
+            raise StandinError(404, "position does not exist")
+        held = self.positions[symbol]["qty"]
+        if qty is None:
+            qty = abs(held) * (percentage / 100 if percentage is not None else 1.0)
+        return self.submit({
+            "symbol": symbol,
+            "qty": qty,
+            "side": "sell" if held > 0 else "buy",
+            "type": "market",
+            "time_in_force": "day",
+        })
+
+    def close_all(self, cancel_orders: bool = False) -> List[Dict[str, Any]]:
+        if cancel_orders:
+            self.cancel_all()
+        return [
+            {"symbol": symbol, "status": 200, "body": self.close_position(symbol)}
+            for symbol in sorted(self.positions)
+        ]
+
+    def account(self) -> Dict[str, Any]:
+        long_value = sum(
+            p["qty"] * self.feed.price(s) for s, p in self.positions.items() if p["qty"] > 0
+        )
+        short_value = sum(
+            p["qty"] * self.feed.price(s) for s, p in self.positions.items() if p["qty"] < 0
+        )
+        equity = self.cash + long_value + short_value
+        return {
+            "id": self.account_id,
+            "account_number": "PA" + self.account_id.replace("-", "")[:10].upper(),
+            "status": "ACTIVE",
+            "crypto_status": "ACTIVE",
+            "currency": "USD",
+            "cash": str(self.cash),
+            "buying_power": str(max(self.cash, 0.0)),
+            "regt_buying_power": str(max(self.cash, 0.0)),
+            "daytrading_buying_power": str(max(self.cash, 0.0)),
+            "non_marginable_buying_power": str(max(self.cash, 0.0)),
+            "equity": str(equity),
+            "portfolio_value": str(equity),
+            "last_equity": str(self.initial_cash),
+            "long_market_value": str(long_value),
+            "short_market_value": str(short_value),
+            "initial_margin": "0",
+            "maintenance_margin": "0",
+            "sma": "0",
+            "daytrade_count": 0,
+            "multiplier": "1",
+            "pattern_day_trader": False,
+            "trading_blocked": False,
+            "transfers_blocked": False,
+            "account_blocked": False,
+            "trade_suspended_by_user": False,
+            "shorting_enabled": True,
+            "created_at": "2020-01-01T00:00:00Z",
+        }
+
+
+# ----------------------------------------------------------------------
+# Market data payloads
+
+
+def _bar_payload(ts: pd.Timestamp, row: pd.Series) -> Dict[str, Any]:
+    return {
+        "t": _iso(ts),
+        "o": float(row["open"]),
+        "h": float(row["high"]),
+        "l": float(row["low"]),
+        "c": float(row["close"]),
+        "v": int(row["volume"]),
+        "n": max(int(row["volume"]) // 100, 1),
+        "vw": float((row["high"] + row["low"] + row["close"]) / 3),
+    }
+
+
+def _trade_payload(ts: pd.Timestamp, price: float, sequence: int) -> Dict[str, Any]:
+    return {"t": _iso(ts), "x": "V", "p": price, "s": 100, "c": ["@"], "i": sequence, "z": "C"}
+
+
+def _quote_payload(ts: pd.Timestamp, price: float, spread_bps: float) -> Dict[str, Any]:
+    half_spread = price * spread_bps / 20000
+    return {
+        "t": _iso(ts),
+        "bx": "V",
+        "bp": round(price - half_spread, 4),
+        "bs": 1,
+        "ax": "V",
+        "ap": round(price + half_spread, 4),
+        "as": 1,
+        "c": ["R"],
+        "z": "C",
+    }
+
+
+def _stream_message(kind: str, symbol: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a REST payload to a msgpack stream message."""
+    message = {"T": kind, "S": symbol, **payload}
+    ts = pd.Timestamp(payload["t"])
+    message["t"] = msgpack.Timestamp.from_unix_nano(ts.as_unit("ns").value)
+    return message
+
+
+def _symbols(request: Request) -> List[str]:
+    symbols = request.query_params.get("symbols", "")
+    return [s for s in symbols.split(",") if s]
+
+
+def create_app(
+    feed: Optional[ReplayFeed] = None,
+    broker: Optional[StandinBroker] = None,
+    trading_latency: Optional[LatencyModel] = None,
+    data_latency: Optional[LatencyModel] = None,
+    spread_bps: float = 2.0,
+    tick_interval: float = 0.05,
+) -> FastAPI:
+    """
+    Build the stand-in application.
+
+    Args:
+        feed: Replay feed (default: synthetic 1-minute bars, manual clock)
+        broker: Broker state (default: StandinBroker over ``feed``)
+        trading_latency: Latency model for trading endpoints
+        data_latency: Latency model for market data endpoints
+        spread_bps: Quoted bid/ask spread in basis points
+        tick_interval: Seconds between replay checks for stream pushes
+
+    Returns:
+        FastAPI application; the feed and broker are on ``app.state``
+    """
+    feed = feed or ReplayFeed()
+    broker = broker or StandinBroker(feed)
+    trading_latency = trading_latency or LatencyModel()
+    data_latency = data_latency or LatencyModel()
+    data_subscribers: List[Dict[str, Any]] = []
+
+    def latest_messages(symbol: str, sequence: int) -> Dict[str, Dict[str, Any]]:
+        last = feed.last(symbol)
+        ts = last.name
+        price = float(last["close"])
+        return {
+            "bars": _stream_message("b", symbol, _bar_payload(ts, last)),
+            "trades": _stream_message("t", symbol, _trade_payload(ts, price, sequence)),
+            "quotes": _stream_message("q", symbol, _quote_payload(ts, price, spread_bps)),
+        }
+
+    async def replay_loop():
+        position = feed.position
+        while True:
+            await asyncio.sleep(tick_interval)
+            if feed.position == position:
+                continue
+            position = feed.position
+            try:
+                broker.match()
+            except StandinError as e:
+                logger.warning(f"Matching failed: {e.message}")
+            for subscriber in list(data_subscribers):
+                symbols = set().union(*subscriber["channels"].values())
+                batch = []
+                for symbol in sorted(symbols):
+                    try:
+                        messages = latest_messages(symbol, position)
+                    except StandinError:
+                        continue
+                    batch.extend(
+                        messages[channel] for channel, subscribed in subscriber["channels"].items()
+                        if symbol in subscribed or "*" in subscribed
+                    )
+                if batch:
+                    subscriber["queue"].put_nowait(msgpack.packb(batch, datetime=False))
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        task = asyncio.create_task(replay_loop())
+        try:
+            yield
+        finally:
+            task.cancel()
+
+    app = FastAPI(title="Alpaca Stand-in", lifespan=lifespan)
+    app.state.feed = feed
+    app.state.broker = broker
+
+    @app.middleware("http")
+    async def latency_and_faults(request: Request, call_next):
+        model = data_latency if request.url.path.startswith("/v2/stocks") else trading_latency
+        delay = model.delay()
+        if delay:
+            await asyncio.sleep(delay)
+        if not request.headers.get("APCA-API-KEY-ID") and not request.headers.get("Authorization"):
+            return _error_response(401, "request is not authorized")
+        status = model.fault()
+        if status is not None:
+            return _error_response(status, "injected fault" if status != 429 else "too many requests.")
+        try:
+            broker.match()
+        except StandinError as e:
+            return _error_response(e.status_code, e.message)
+        return await call_next(request)
+
+    @app.exception_handler(StandinError)
+    async def standin_error(request: Request, exc: StandinError):
+        return _error_response(exc.status_code, exc.message)
+
+    # ------------------------------------------------------------------
+    # Trading REST
+
+    @app.get("/v2/account")
+    async def get_account():
+        return broker.account()
+
+    @app.get("/v2/clock")
+    async def get_clock():
+        now = feed.now()
+        return {
+            "timestamp": _iso(now),
+            "is_open": True,
+            "next_open": _iso(now.normalize() + timedelta(days=1, hours=14, minutes=30)),
+            "next_close": _iso(now.normalize() + timedelta(hours=21)),
+        }
+
+    @app.post("/v2/orders")
+    async def submit_order(request: Request):
+        return broker.submit(await request.json())
+
+    @app.get("/v2/orders")
+    async def get_orders(request: Request):
+        params = request.query_params
+        return broker.list_orders(
+            status=params.get("status", "open"),
+            limit=int(params.get("limit", 50)),
+            symbols=_symbols(request),
+            direction=params.get("direction", "desc"),
+        )
+
+    @app.delete("/v2/orders")
+    async def cancel_orders():
+        return JSONResponse(status_code=207, content=broker.cancel_all())
+
+    @app.get("/v2/orders:by_client_order_id")
+    async def get_order_by_client_id(client_order_id: str):
+        for order in broker.orders.values():
+            if order["client_order_id"] == client_order_id:
+                return order
+        raise StandinError(404, "order not found")
+
+    @app.get("/v2/orders/{order_id}")
+    async def get_order(order_id: str):
+        return broker.get(order_id)
+
+    @app.patch("/v2/orders/{order_id}")
+    async def replace_order(order_id: str, request: Request):
+        return broker.replace(order_id, await request.json())
+
+    @app.delete("/v2/orders/{order_id}")
+    async def cancel_order(order_id: str):
+        broker.cancel(order_id)
+        return Response(status_code=204)
+
+    @app.get("/v2/positions")
+    async def get_positions():
+        return broker.list_positions()
+
+    @app.delete("/v2/positions")
+    async def close_all_positions(cancel_orders: bool = False):
+        return JSONResponse(status_code=207, content=broker.close_all(cancel_orders))
+
+    @app.get("/v2/positions/{symbol}")
+    async def get_position(symbol: str):
+        return broker.position(symbol)
+
+    @app.delete("/v2/positions/{symbol}")
+    async def close_position(symbol: str, qty: Optional[float] = None, percentage: Optional[float] = None):
+        return broker.close_position(symbol, qty=qty, percentage=percentage)
+
+    # ------------------------------------------------------------------
+    # Market data REST
+
+    @app.get("/v2/stocks/bars")
+    async def get_bars(request: Request):
+        params = request.query_params
+        timeframe = params.get("timeframe", "1Day")
+        start = _timestamp(params.get("start"))
+        end = _timestamp(params.get("end"))
+        limit = int(params.get("limit") or 1000)
+        offset = int(params.get("page_token") or 0)
+        descending = params.get("sort") == "desc"
+
+        rows = []
+        for symbol in _symbols(request):
+            df = feed.bars(symbol, timeframe, start, end)
+            if descending:
+                df = df.iloc[::-1]
+            rows.extend((symbol, ts, row) for ts, row in df.iterrows())
+
+        page = rows[offset:offset + limit]
+        bars: Dict[str, List[Dict[str, Any]]] = {}
+        for symbol, ts, row in page:
+            bars.setdefault(symbol, []).append(_bar_payload(ts, row))
+        more = offset + limit < len(rows)
+        return {"bars": bars, "next_page_token": str(offset + limit) if more else None}
+
+    @app.get("/v2/stocks/bars/latest")
+    async def get_latest_bars(request: Request):
+        bars = {}
+        for symbol in _symbols(request):
+            last = feed.last(symbol)
+            bars[symbol] = _bar_payload(last.name, last)
+        return {"bars": bars}
+
+    @app.get("/v2/stocks/trades/latest")
+    async def get_latest_trades(request: Request):
+        return {
+            "trades": {
+                symbol: _trade_payload(feed.now(), feed.price(symbol), feed.position)
+                for symbol in _symbols(request)
+            }
+        }
+
+    @app.get("/v2/stocks/quotes/latest")
+    async def get_latest_quotes(request: Request):
+        return {
+            "quotes": {
+                symbol: _quote_payload(feed.now(), feed.price(symbol), spread_bps)
+                for symbol in _symbols(request)
+            }
+        }
+
+    @app.get("/v2/stocks/snapshots")
+    async def get_snapshots(request: Request):
+        snapshots = {}
+        for symbol in _symbols(request):
+            last = feed.last(symbol)
+            price = float(last["close"])
+            daily = feed.daily(symbol)
+            snapshots[symbol] = {
+                "latestTrade": _trade_payload(feed.now(), price, feed.position),
+                "latestQuote": _quote_payload(feed.now(), price, spread_bps),
+                "minuteBar": _bar_payload(last.name, last),
+                "dailyBar": _bar_payload(daily.index[-1], daily.iloc[-1]),
+                "prevDailyBar": (
+                    _bar_payload(daily.index[-2], daily.iloc[-2]) if len(daily) > 1 else None
+                ),
+            }
+        return snapshots
+
+    # ------------------------------------------------------------------
+    # Streams
+
+    async def _send_queued(websocket: WebSocket, queue: asyncio.Queue, binary: bool):
+        while True:
+            message = await queue.get()
+            if binary:
+                await websocket.send_bytes(message)
+            else:
+                await websocket.send_text(json.dumps(message))
+
+    @app.websocket("/v2/{feed_name}")
+    async def data_stream(websocket: WebSocket, feed_name: str):
+        await websocket.accept()
+        await websocket.send_bytes(msgpack.packb([{"T": "success", "msg": "connected"}]))
+
+        auth = msgpack.unpackb(await websocket.receive_bytes())
+        if auth.get("action") != "auth" or not auth.get("key"):
+            await websocket.send_bytes(msgpack.packb([{"T": "error", "code": 402, "msg": "auth failed"}]))
+            await websocket.close()
+            return
+        await websocket.send_bytes(msgpack.packb([{"T": "success", "msg": "authenticated"}]))
+
+        subscriber = {
+            "queue": asyncio.Queue(),
+            "channels": {"trades": set(), "quotes": set(), "bars": set()},
+        }
+        data_subscribers.append(subscriber)
+        sender = asyncio.create_task(_send_queued(websocket, subscriber["queue"], binary=True))
+        try:
+            while True:
+                message = msgpack.unpackb(await websocket.receive_bytes())
+                action = message.get("action")
+                for channel, symbols in subscriber["channels"].items():
+                    if action == "subscribe":
+                        symbols.update(message.get(channel, []))
+                    elif action == "unsubscribe":
+                        symbols.difference_update(message.get(channel, []))
+                reply = {"T": "subscription"}
+                reply.update({k: sorted(v) for k, v in subscriber["channels"].items()})
+                subscriber["queue"].put_nowait(msgpack.packb([reply]))
+        except WebSocketDisconnect:
+            pass
+        finally:
+            sender.cancel()
+            data_subscribers.remove(subscriber)
+
+    @app.websocket("/stream")
+    async def trading_stream(websocket: WebSocket):
+        await websocket.accept()
+        auth = json.loads(await websocket.receive_text())
+        authorized = auth.get("action") in ("auth", "authenticate") and bool(auth.get("data", {}).get("key_id"))
+        await websocket.send_text(json.dumps({
+            "stream": "authorization",
+            "data": {"action": "authenticate", "status": "authorized" if authorized else "unauthorized"},
+        }))
+        if not authorized:
+            await websocket.close()
+            return
+
+        queue: asyncio.Queue = asyncio.Queue()
+        sender = asyncio.create_task(_send_queued(websocket, queue, binary=False))
+        try:
+            while True:
+                message = json.loads(await websocket.receive_text())
+                if message.get("action") == "listen":
+                    streams = message.get("data", {}).get("streams", [])
+                    if "trade_updates" in streams and queue not in broker.listeners:
+                        broker.listeners.append(queue)
+                    queue.put_nowait({"stream": "listening", "data": {"streams": streams}})
+        except WebSocketDisconnect:
+            pass
+        finally:
+            sender.cancel()
+            if queue in broker.listeners:
+                broker.listeners.remove(queue)
+
+    return app
+
+
+class StandinServer:
+    """
+    Runs a stand-in application with uvicorn in a background thread.
+
+    Usage:
+        with StandinServer(create_app(...)) as server:
+            server.configure(settings)
+            ...
+    """
+
+    def __init__(self, app: Optional[FastAPI] = None, host: str = "127.0.0.1", port: int = 0):
+        self.app = app or create_app()
+        self.host = host
+        self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._socket.bind((host, port))
+        self.port = self._socket.getsockname()[1]
+        self._server = uvicorn.Server(uvicorn.Config(
+            self.app, log_level="warning", lifespan="on"
+        ))
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """Base URL for both the trading and market data REST clients."""
+        return f"http://{self.host}:{self.port}"
+
+    @property
+    def stream_url(self) -> str:
+        """Market data stream URL (IEX feed)."""
+        return f"ws://{self.host}:{self.port}/v2/iex"
+
+    @property
+    def trading_stream_url(self) -> str:
+        """Trade updates stream URL."""
+        return f"ws://{self.host}:{self.port}/stream"
+
+    def configure(self, settings) -> None:
+        """Point backend settings at this server."""
+        settings.ALPACA_BASE_URL = self.url
+        settings.ALPACA_DATA_URL = self.url
+        settings.ALPACA_STREAM_URL = self.stream_url
+
+    def start(self) -> "StandinServer":
+        self._thread = threading.Thread(
+            target=self._server.run, kwargs={"sockets": [self._socket]}, daemon=True
+        )
+        self._thread.start()
+        deadline = time.monotonic() + 10
+        while not self._server.started:
+            if not self._thread.is_alive() or time.monotonic() > deadline:
+                raise RuntimeError("Stand-in server failed to start")
+            time.sleep(0.01)
+        logger.info(f"Alpaca stand-in listening on {self.url}")
+        return self
+
+    def stop(self) -> None:
+        self._server.should_exit = True
+        if self._thread is not None:
+            self._thread.join(timeout=10)
+        self._socket.close()
+
+    def __enter__(self) -> "StandinServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Run a local Alpaca stand-in server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--start", default="2024-01-02", help="First replayed bar")
+    parser.add_argument("--timeframe", default="1Min", choices=list(TIMEFRAME_MAP))
+    parser.add_argument("--bars-per-second", type=float, default=1.0,
+                        help="Replay speed in bars per wall-clock second")
+    parser.add_argument("--seed", type=int, default=42, help="Synthetic data seed")
+    parser.add_argument("--latency-ms", type=float, default=0.0,
+                        help="Median injected latency per request")
+    parser.add_argument("--latency-sigma", type=float, default=0.5,
+                        help="Log-normal sigma of injected latency")
+    parser.add_argument("--error-rate", type=float, default=0.0,
+                        help="Fraction of requests answered with HTTP 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0,
+                        help="Fraction of requests answered with HTTP 429")
+    parser.add_argument("--cash", type=float, default=100_000.0)
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    feed = ReplayFeed(
+        start=args.start,
+        timeframe=args.timeframe,
+        bars_per_second=args.bars_per_second,
+        generator=SyntheticMarketData(seed=args.seed),
+    )
+    latency = dict(
+        median_ms=args.latency_ms,
+        sigma=args.latency_sigma,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+    )
+    app = create_app(
+        feed=feed,
+        broker=StandinBroker(feed, cash=args.cash),
+        trading_latency=LatencyModel(seed=args.seed, **latency),
+        data_latency=LatencyModel(seed=args.seed + 1, **latency),
+    )
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,223 @@
+"""
+Load Harness
+
+Drives the backend's market-data and order paths from N concurrent
+strategies and records per-call latency. Strategies run as tasks on one
+event loop, the way the scheduler runs them. The alpaca-py clients behind
+AlpacaMarketData and AlpacaOrderExecutor block inside their async methods,
+so latency at higher concurrency includes time spent queued behind other
+strategies' calls.
+
+One strategy iteration:
+    market_data.bars   AlpacaMarketData.get_bars (lookback window)
+    market_data.quote  AlpacaMarketData.get_latest_quote
+    order.place        AlpacaOrderExecutor.place_order (market order)
+    pipeline           the three calls above, signal to order
+"""
+import asyncio
+import time
+from dataclasses import dataclass, field
+from datetime import timedelta
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+
+PATHS = ["market_data.bars", "market_data.quote", "order.place", "pipeline"]
+
+
+@dataclass
+class LatencyStats:
+    """Latency summary of one path."""
+
+    path: str
+    count: int
+    errors: int
+    p50_ms: float
+    p99_ms: float
+    mean_ms: float
+    max_ms: float
+
+    @classmethod
+    def from_samples(cls, path: str, samples: Sequence[float], errors: int = 0) -> 'LatencyStats':
+        if len(samples) == 0:
+            return cls(path, 0, errors, float('nan'), float('nan'), float('nan'), float('nan'))
+        ms = np.asarray(samples) * 1000
+        return cls(
+            path=path,
+            count=len(ms),
+            errors=errors,
+            p50_ms=float(np.percentile(ms, 50)),
+            p99_ms=float(np.percentile(ms, 99)),
+            mean_ms=float(ms.mean()),
+            max_ms=float(ms.max()),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'path': self.path,
+            'count': self.count,
+            'errors': self.errors,
+            'p50_ms': round(self.p50_ms, 3),
+            'p99_ms': round(self.p99_ms, 3),
+            'mean_ms': round(self.mean_ms, 3),
+            'max_ms': round(self.max_ms, 3),
+        }
+
+
+@dataclass
+class LoadResult:
+    """Result of one load run at a given concurrency."""
+
+    strategies: int
+    iterations: int
+    seconds: float
+    stats: Dict[str, LatencyStats] = field(default_factory=dict)
+
+    @property
+    def orders_per_second(self) -> float:
+        orders = self.stats.get('order.place')
+        return orders.count / self.seconds if orders and self.seconds else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'strategies': self.strategies,
+            'iterations': self.iterations,
+            'seconds': round(self.seconds, 3),
+            'orders_per_second': round(self.orders_per_second, 2),
+            'stats': {path: s.to_dict() for path, s in self.stats.items()},
+        }
+
+
+class LatencyRecorder:
+    """Latency samples and error counts per path."""
+
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = {path: [] for path in PATHS}
+        self.errors: Dict[str, int] = {path: 0 for path in PATHS}
+
+    def record(self, path: str, seconds: float):
+        self.samples.setdefault(path, []).append(seconds)
+
+    def error(self, path: str):
+        self.errors[path] = self.errors.get(path, 0) + 1
+
+    def stats(self) -> Dict[str, LatencyStats]:
+        return {
+            path: LatencyStats.from_samples(path, samples, self.errors.get(path, 0))
+            for path, samples in self.samples.items()
+        }
+
+
+async def _timed(recorder: LatencyRecorder, path: str, call):
+    start = time.perf_counter()
+    try:
+        result = await call
+    except Exception:
+        recorder.error(path)
+        return None
+    recorder.record(path, time.perf_counter() - start)
+    return result
+
+
+async def run_strategy(
+    strategy_id: int,
+    symbols: Sequence[str],
+    iterations: int,
+    market_data,
+    executor,
+    recorder: LatencyRecorder,
+    end,
+    timeframe: str = '1Min',
+    lookback: timedelta = timedelta(days=1),
+    qty: float = 1,
+    think_time: float = 0.0,
+):
+    """
+    Run one strategy: fetch data, derive a signal, place an order.
+
+    The signal is a toy mean-reversion rule (buy below the lookback mean,
+    sell above it); only its latency matters here.
+    """
+    for i in range(iterations):
+        symbol = symbols[(strategy_id + i) % len(symbols)]
+        pipeline_start = time.perf_counter()
+
+        bars = await _timed(recorder, 'market_data.bars', market_data.get_bars(
+            symbol, timeframe=timeframe, start=end - lookback, end=end, limit=1000, use_cache=False
+        ))
+        quote = await _timed(recorder, 'market_data.quote', market_data.get_latest_quote(
+            symbol, use_cache=False
+        ))
+        if not bars or not quote:
+            recorder.error('pipeline')
+            continue
+
+        mean = sum(bar['close'] for bar in bars) / len(bars)
+        side = 'buy' if quote['ask_price'] < mean else 'sell'
+        order = await _timed(recorder, 'order.place', executor.place_order(
+            symbol=symbol, qty=qty, side=side, order_type='market', skip_risk_check=True
+        ))
+        if order is None:
+            recorder.error('pipeline')
+        else:
+            recorder.record('pipeline', time.perf_counter() - pipeline_start)
+
+        if think_time:
+            await asyncio.sleep(think_time)
+
+
+async def run_load(
+    strategies: int,
+    iterations: int,
+    symbols: Sequence[str],
+    market_data,
+    executor,
+    end,
+    **strategy_kwargs,
+) -> LoadResult:
+    """
+    Run ``strategies`` concurrent strategies for ``iterations`` each.
+
+    Args:
+        strategies: Number of concurrent strategies
+        iterations: Signal-to-order iterations per strategy
+        symbols: Symbols the strategies rotate through
+        market_data: AlpacaMarketData (or compatible provider)
+        executor: AlpacaOrderExecutor (or compatible executor)
+        end: Replay time to request bars up to
+        **strategy_kwargs: Passed to run_strategy
+
+    Returns:
+        LoadResult with per-path latency statistics
+    """
+    recorder = LatencyRecorder()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(
+        run_strategy(
+            strategy_id, symbols, iterations, market_data, executor, recorder, end,
+            **strategy_kwargs
+        )
+        for strategy_id in range(strategies)
+    ))
+    seconds = time.perf_counter() - start
+
+    return LoadResult(strategies, iterations, seconds, recorder.stats())
+
+
+def format_results(results: List[LoadResult]) -> str:
+    """Render load results as a fixed-width table."""
+    lines = [
+        f"{'strategies':>10}  {'path':<18} {'count':>7} {'errors':>6} "
+        f"{'p50 ms':>9} {'p99 ms':>9} {'max ms':>9}"
+    ]
+    for result in results:
+        for path, s in result.stats.items():
+            lines.append(
+                f"{result.strategies:>10}  {path:<18} {s.count:>7} {s.errors:>6} "
+                f"{s.p50_ms:>9.2f} {s.p99_ms:>9.2f} {s.max_ms:>9.2f}"
+            )
+        lines.append(
+            f"{result.strategies:>10}  {'orders/s':<18} {result.orders_per_second:>7.1f}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,55 @@
+"""Add paper orders table
+
+Revision ID: add_paper_orders_table
+Revises: add_paper_trading_tables
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_paper_orders_table'
+down_revision = 'add_paper_trading_tables'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('paper_orders',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('account_id', sa.String(length=36), nullable=False),
+    sa.Column('symbol', sa.String(length=20), nullable=False),
+    sa.Column('side', sa.String(length=10), nullable=False),
+    sa.Column('order_type', sa.String(length=20), nullable=False),
+    sa.Column('order_class', sa.String(length=20), nullable=False),
+    sa.Column('qty', sa.Float(), nullable=False),
+    sa.Column('limit_price', sa.Float(), nullable=True),
+    sa.Column('stop_price', sa.Float(), nullable=True),
+    sa.Column('take_profit_price', sa.Float(), nullable=True),
+    sa.Column('stop_loss_price', sa.Float(), nullable=True),
+    sa.Column('parent_id', sa.String(length=36), nullable=True),
+    sa.Column('oco_group', sa.String(length=36), nullable=True),
+    sa.Column('filled_qty', sa.Float(), nullable=False),
+    sa.Column('avg_fill_price', sa.Float(), nullable=True),
+    sa.Column('status', sa.String(length=20), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('filled_at', sa.DateTime(timezone=True), nullable=True),
+    sa.Column('canceled_at', sa.DateTime(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['account_id'], ['paper_accounts.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_paper_orders_account_id'), 'paper_orders', ['account_id'], unique=False)
+    op.create_index(op.f('ix_paper_orders_symbol'), 'paper_orders', ['symbol'], unique=False)
+    op.create_index(op.f('ix_paper_orders_parent_id'), 'paper_orders', ['parent_id'], unique=False)
+    op.create_index(op.f('ix_paper_orders_status'), 'paper_orders', ['status'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_paper_orders_status'), table_name='paper_orders')
+    op.drop_index(op.f('ix_paper_orders_parent_id'), table_name='paper_orders')
+    op.drop_index(op.f('ix_paper_orders_symbol'), table_name='paper_orders')
+    op.drop_index(op.f('ix_paper_orders_account_id'), table_name='paper_orders')
+    op.drop_table('paper_orders')
@@ -0,0 +1,34 @@
+"""Add source to market data cache unique key
+
+Revision ID: add_source_to_market_data_cache_key
+Revises: add_paper_orders_table
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_source_to_market_data_cache_key'
+down_revision = 'add_paper_orders_table'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("UPDATE market_data_cache SET source = 'alpaca' WHERE source IS NULL")
+    op.alter_column('market_data_cache', 'source', existing_type=sa.String(length=50), nullable=False)
+    op.drop_constraint('uix_symbol_date', 'market_data_cache', type_='unique')
+    op.create_unique_constraint('uix_symbol_date_source', 'market_data_cache', ['symbol', 'date', 'source'])
+
+
+def downgrade() -> None:
+    # Keep one bar per symbol and date before restoring the narrower key
+    op.execute(
+        "DELETE FROM market_data_cache a USING market_data_cache b "
+        "WHERE a.symbol = b.symbol AND a.date = b.date AND a.id > b.id"
+    )
+    op.drop_constraint('uix_symbol_date_source', 'market_data_cache', type_='unique')
+    op.create_unique_constraint('uix_symbol_date', 'market_data_cache', ['symbol', 'date'])
+    op.alter_column('market_data_cache', 'source', existing_type=sa.String(length=50), nullable=True)
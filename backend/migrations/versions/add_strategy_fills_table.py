@@ -0,0 +1,43 @@
+"""Add strategy fills table
+
+Revision ID: add_strategy_fills_table
+Revises: add_source_to_market_data_cache_key
+Create Date: 2026-10-19 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_strategy_fills_table'
+down_revision = 'add_source_to_market_data_cache_key'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('strategy_fills',
+    sa.Column('id', sa.String(length=36), nullable=False),
+    sa.Column('strategy_id', sa.String(length=36), nullable=False),
+    sa.Column('alpaca_order_id', sa.String(length=100), nullable=False),
+    sa.Column('fill_key', sa.String(length=150), nullable=False),
+    sa.Column('qty', sa.Float(), nullable=False),
+    sa.Column('price', sa.Float(), nullable=False),
+    sa.Column('filled_qty', sa.Float(), nullable=False),
+    sa.Column('realized_pnl', sa.Float(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['strategy_id'], ['strategies.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('fill_key')
+    )
+    op.create_index(op.f('ix_strategy_fills_id'), 'strategy_fills', ['id'], unique=False)
+    op.create_index(op.f('ix_strategy_fills_strategy_id'), 'strategy_fills', ['strategy_id'], unique=False)
+    op.create_index(op.f('ix_strategy_fills_alpaca_order_id'), 'strategy_fills', ['alpaca_order_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_strategy_fills_alpaca_order_id'), table_name='strategy_fills')
+    op.drop_index(op.f('ix_strategy_fills_strategy_id'), table_name='strategy_fills')
+    op.drop_index(op.f('ix_strategy_fills_id'), table_name='strategy_fills')
+    op.drop_table('strategy_fills')
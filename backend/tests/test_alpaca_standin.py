@@ -0,0 +1,181 @@
+import asyncio
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from alpaca.common.exceptions import APIError
+from alpaca.data.historical import StockHistoricalDataClient
+from alpaca.data.live import StockDataStream
+from alpaca.data.requests import StockBarsRequest, StockSnapshotRequest
+from alpaca.data.timeframe import TimeFrame
+from alpaca.trading.client import TradingClient
+from alpaca.trading.enums import OrderSide, OrderStatus, TimeInForce
+from alpaca.trading.requests import LimitOrderRequest, MarketOrderRequest
+
+from app.core.config import settings
+from app.integrations import alpaca_client
+from app.integrations.alpaca_client import AlpacaClient
+from app.integrations.market_data import AlpacaMarketData
+from app.integrations.order_execution import AlpacaOrderExecutor
+from loadtest.alpaca_standin import (
+    LatencyModel, ReplayFeed, StandinBroker, StandinError, StandinServer, create_app
+)
+from loadtest.harness import run_load
+
+
+@pytest.fixture(scope="module")
+def feed():
+    return ReplayFeed(start="2024-03-04 15:00", end="2024-03-08")
+
+
+@pytest.fixture
+def broker(feed):
+    return StandinBroker(feed, cash=100_000)
+
+
+@pytest.fixture
+def server(feed):
+    with StandinServer(create_app(feed, StandinBroker(feed))) as server:
+        yield server
+
+
+class TestBroker:
+
+    def test_market_order_fills_at_replay_price(self, broker, feed):
+        order = broker.submit({"symbol": "AAPL", "qty": 10, "side": "buy", "type": "market"})
+
+        assert order["status"] == "filled"
+        assert float(order["filled_avg_price"]) == pytest.approx(feed.price("AAPL"), rel=1e-3)
+        assert broker.positions["AAPL"]["qty"] == 10
+        assert broker.cash == pytest.approx(100_000 - 10 * float(order["filled_avg_price"]))
+
+    def test_limit_order_rests_until_marketable(self, broker, feed):
+        price = feed.price("AAPL")
+        order = broker.submit({
+            "symbol": "AAPL", "qty": 1, "side": "sell", "type": "limit",
+            "limit_price": price * 1.5, "time_in_force": "gtc"
+        })
+        assert order["status"] == "new"
+
+        replaced = broker.replace(order["id"], {"limit_price": price * 0.5})
+
+        assert order["status"] == "replaced"
+        assert replaced["replaces"] == order["id"]
+        assert replaced["status"] == "filled"
+
+    def test_stop_order_triggers_on_cross(self, broker, feed):
+        feed_price = feed.price("MSFT")
+        order = broker.submit({
+            "symbol": "MSFT", "qty": 1, "side": "sell", "type": "stop",
+            "stop_price": feed_price * 1.01
+        })
+        assert order["status"] == "filled"
+
+    def test_ioc_cancels_when_not_marketable(self, broker, feed):
+        order = broker.submit({
+            "symbol": "AAPL", "qty": 1, "side": "buy", "type": "limit",
+            "limit_price": feed.price("AAPL") * 0.5, "time_in_force": "ioc"
+        })
+        assert order["status"] == "canceled"
+
+    def test_insufficient_buying_power(self, broker):
+        with pytest.raises(StandinError) as exc:
+            broker.submit({"symbol": "AAPL", "notional": 1e9, "side": "buy", "type": "market"})
+        assert exc.value.status_code == 403
+
+    def test_replay_never_serves_future_bars(self, feed):
+        feed = ReplayFeed(start="2024-03-04 15:00", end="2024-03-08")
+        before = feed.visible("AAPL")
+        feed.advance(5)
+
+        assert before.index[-1] == feed.timeline[0]
+        assert len(feed.visible("AAPL")) == len(before) + 5
+
+
+class TestServer:
+
+    def test_trading_round_trip(self, server):
+        client = TradingClient("key", "secret", paper=True, url_override=server.url)
+
+        filled = client.submit_order(MarketOrderRequest(
+            symbol="AAPL", qty=5, side=OrderSide.BUY, time_in_force=TimeInForce.DAY
+        ))
+        resting = client.submit_order(LimitOrderRequest(
+            symbol="AAPL", qty=1, side=OrderSide.BUY, time_in_force=TimeInForce.GTC, limit_price=1.0
+        ))
+        client.cancel_order_by_id(resting.id)
+
+        assert filled.status == OrderStatus.FILLED
+        assert client.get_order_by_id(resting.id).status == OrderStatus.CANCELED
+        assert float(client.get_all_positions()[0].qty) == 5
+        assert float(client.get_account().cash) < 100_000
+
+    def test_market_data_round_trip(self, server, feed):
+        client = StockHistoricalDataClient("key", "secret", url_override=server.url)
+
+        bars = client.get_stock_bars(StockBarsRequest(
+            symbol_or_symbols=["AAPL", "MSFT"],
+            timeframe=TimeFrame.Minute,
+            start=feed.now() - (feed.timeline[1] - feed.timeline[0]) * 50,
+            limit=60,
+        ))
+        snapshot = client.get_stock_snapshot(StockSnapshotRequest(symbol_or_symbols="AAPL"))["AAPL"]
+
+        assert sum(len(v) for v in bars.data.values()) == 60
+        assert bars.data["AAPL"][-1].timestamp == feed.now()
+        assert snapshot.latest_trade.price == pytest.approx(feed.price("AAPL"))
+
+    def test_injected_errors(self, feed):
+        app = create_app(feed, trading_latency=LatencyModel(error_rate=1.0))
+        with StandinServer(app) as server:
+            client = TradingClient("key", "secret", paper=True, url_override=server.url)
+            with pytest.raises(APIError) as exc:
+                client.get_account()
+        assert exc.value.status_code == 500
+
+    def test_data_stream_pushes_replayed_bars(self, server, feed):
+        received = []
+
+        async def run():
+            stream = StockDataStream("key", "secret", url_override=server.stream_url)
+
+            async def on_bar(bar):
+                received.append(bar)
+
+            stream.subscribe_bars(on_bar, "AAPL")
+            task = asyncio.create_task(stream._run_forever())
+            for _ in range(50):
+                await asyncio.sleep(0.05)
+                feed.advance()
+                if received:
+                    break
+            await stream.stop_ws()
+            task.cancel()
+
+        asyncio.run(run())
+
+        assert received
+        assert received[0].symbol == "AAPL"
+
+
+def test_load_harness_against_standin(server, feed, monkeypatch):
+    monkeypatch.setattr(settings, "ALPACA_BASE_URL", server.url)
+    monkeypatch.setattr(settings, "ALPACA_DATA_URL", server.url)
+    for owner, name in [
+        (AlpacaClient, "_instance"), (AlpacaClient, "_client"),
+        (AlpacaMarketData, "_instance"), (AlpacaMarketData, "_client"),
+        (alpaca_client, "_alpaca_client"),
+    ]:
+        monkeypatch.setattr(owner, name, None)
+
+    cache = MagicMock()
+    cache.get = MagicMock(side_effect=lambda *a, **k: asyncio.sleep(0))
+    cache.set = MagicMock(side_effect=lambda *a, **k: asyncio.sleep(0))
+    with patch("app.integrations.market_data.get_cache_manager", return_value=cache):
+        result = asyncio.run(run_load(
+            3, 2, ["AAPL", "MSFT"], AlpacaMarketData(), AlpacaOrderExecutor(), feed.now()
+        ))
+
+    assert result.stats["order.place"].count == 6
+    assert result.stats["pipeline"].errors == 0
+    assert result.stats["market_data.bars"].p99_ms >= result.stats["market_data.bars"].p50_ms
@@ -0,0 +1,120 @@
+import pytest
+import numpy as np
+import pandas as pd
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.backtesting.result_cache import BacktestResultCache
+
+
+def _bars(n=50, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 + rng.normal(0, 1, n).cumsum()
+    return pd.DataFrame({
+        'open': close,
+        'high': close + 1,
+        'low': close - 1,
+        'close': close,
+        'volume': np.full(n, 1_000_000.0),
+    }, index=pd.date_range('2023-01-02', periods=n, freq='B'))
+
+
+def _results():
+    index = pd.date_range('2023-01-02', periods=3, freq='B')
+    return {
+        'metrics': {'total_return': 0.05, 'sharpe_ratio': 1.2, 'total_trades': 1},
+        'trades': [{
+            'entry_date': index[0],
+            'exit_date': index[2],
+            'entry_price': 100.0,
+            'exit_price': 105.0,
+            'shares': 10,
+            'profit': 50.0,
+            'profit_pct': 5.0,
+            'duration': 2,
+        }],
+        'equity_curve': pd.Series([100000.0, 100020.0, 100050.0], index=index),
+        'strategy': 'SMA Crossover',
+        'symbol': 'SPY',
+        'period': '2023-01-02 to 2023-01-04',
+    }
+
+
+SPEC = {
+    'strategy_type': 'smacrossover',
+    'parameters': {'fast_period': 10, 'slow_period': 30},
+    'symbol': 'SPY',
+    'start_date': '2023-01-01',
+    'end_date': '2023-12-31',
+    'initial_capital': 100000.0,
+    'commission': 0.001,
+    'slippage': 0.0005,
+}
+
+
+@pytest.fixture
+def redis_cache():
+    manager = MagicMock()
+    manager.get = AsyncMock(return_value=None)
+    manager.set = AsyncMock(return_value=True)
+    with patch('app.backtesting.result_cache.get_cache_manager', return_value=manager):
+        yield manager
+
+
+def test_fingerprint_depends_on_spec_and_data():
+    data = _bars()
+    version = BacktestResultCache.data_version(data)
+
+    key = BacktestResultCache.fingerprint(SPEC, version)
+    assert key == BacktestResultCache.fingerprint(dict(reversed(list(SPEC.items()))), version)
+
+    changed_spec = {**SPEC, 'parameters': {'fast_period': 12, 'slow_period': 30}}
+    assert BacktestResultCache.fingerprint(changed_spec, version) != key
+
+    corrected = data.copy()
+    corrected.iloc[10, corrected.columns.get_loc('close')] += 0.01
+    assert BacktestResultCache.data_version(corrected) != version
+
+    extended = _bars(51)
+    assert BacktestResultCache.data_version(extended) != version
+
+
+def test_serialization_round_trip():
+    results = _results()
+    restored = BacktestResultCache._deserialize(BacktestResultCache._serialize(results))
+
+    assert restored['metrics'] == results['metrics']
+    assert restored['symbol'] == 'SPY'
+    pd.testing.assert_series_equal(
+        restored['equity_curve'], results['equity_curve'], check_freq=False
+    )
+    assert restored['trades'][0]['entry_date'] == results['trades'][0]['entry_date']
+    assert restored['trades'][0]['profit'] == 50.0
+
+
+@pytest.mark.asyncio
+async def test_get_set_uses_local_tier_then_redis(redis_cache):
+    cache = BacktestResultCache()
+
+    assert await cache.get('abc') is None
+    await cache.set('abc', _results())
+    redis_cache.set.assert_awaited_once()
+
+    redis_cache.get.reset_mock()
+    hit = await cache.get('abc')
+    assert hit['metrics']['total_trades'] == 1
+    redis_cache.get.assert_not_awaited()
+
+    # A fresh process falls back to the shared Redis tier
+    payload = redis_cache.set.call_args.args[1]
+    redis_cache.get.return_value = payload
+    other = BacktestResultCache()
+    assert (await other.get('abc'))['symbol'] == 'SPY'
+
+
+@pytest.mark.asyncio
+async def test_local_tier_is_bounded(redis_cache):
+    cache = BacktestResultCache(max_local_entries=2)
+    for key in ('a', 'b', 'c'):
+        await cache.set(key, _results())
+
+    assert list(cache._local) == ['b', 'c']
@@ -0,0 +1,159 @@
+"""
+Tests for basket order submission against the local Alpaca stand-in.
+"""
+import asyncio
+import time
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from app.core.config import settings
+from app.integrations import alpaca_client, market_data
+from app.integrations.alpaca_client import AlpacaClient
+from app.integrations.market_data import AlpacaMarketData
+from app.integrations.order_execution import AlpacaOrderExecutor
+from app.models.risk_rule import RiskRule, RiskRuleType, RiskRuleAction
+from app.services.risk_snapshot import RiskSnapshotService, compile_rule
+from loadtest.alpaca_standin import (
+    LatencyModel, ReplayFeed, StandinBroker, StandinServer, create_app
+)
+
+SYMBOLS = ["AAPL", "MSFT", "GOOGL", "AMZN", "SPY"]
+LATENCY_MS = 50
+
+
+@pytest.fixture(scope="module")
+def server():
+    feed = ReplayFeed(start="2024-03-04 15:00", end="2024-03-08")
+    app = create_app(
+        feed,
+        StandinBroker(feed, cash=1e7),
+        trading_latency=LatencyModel(median_ms=LATENCY_MS, sigma=0.0),
+    )
+    with StandinServer(app) as server:
+        yield server
+
+
+@pytest.fixture
+def executor(server, monkeypatch):
+    monkeypatch.setattr(settings, "ALPACA_BASE_URL", server.url)
+    monkeypatch.setattr(settings, "ALPACA_DATA_URL", server.url)
+    monkeypatch.setattr(settings, "MARKET_DATA_PROVIDER", "alpaca")
+    for owner, name in [
+        (AlpacaClient, "_instance"), (AlpacaClient, "_client"),
+        (AlpacaMarketData, "_instance"), (AlpacaMarketData, "_client"),
+        (alpaca_client, "_alpaca_client"),
+        (market_data, "_market_data_client"),
+    ]:
+        monkeypatch.setattr(owner, name, None)
+    return AlpacaOrderExecutor()
+
+
+@pytest.mark.asyncio
+async def test_basket_submits_concurrently(executor):
+    legs = [{"symbol": SYMBOLS[i % len(SYMBOLS)], "qty": 1} for i in range(20)]
+
+    start = time.perf_counter()
+    basket = await executor.place_basket(legs, max_concurrency=20)
+    elapsed = time.perf_counter() - start
+
+    assert basket["submitted"] == 20
+    assert [leg["symbol"] for leg in basket["legs"]] == [leg["symbol"] for leg in legs]
+    assert all(leg["order"]["status"] == "filled" for leg in basket["legs"])
+    # Sequential submission would take at least 20 round-trips
+    assert elapsed < 20 * LATENCY_MS / 1000 / 2
+
+
+@pytest.mark.asyncio
+async def test_invalid_legs_are_rejected_without_blocking_others(executor):
+    basket = await executor.place_basket([
+        {"symbol": "AAPL", "qty": 1},
+        {"symbol": "MSFT", "qty": 1, "order_type": "limit"},
+        {"symbol": "GOOGL"},
+    ])
+
+    assert [leg["status"] for leg in basket["legs"]] == ["submitted", "rejected", "rejected"]
+    assert basket["legs"][1]["error"] == "limit_price required for limit orders"
+
+
+@pytest.mark.asyncio
+async def test_basket_risk_check_blocks_oversized_legs(executor):
+    rule = MagicMock(spec=RiskRule)
+    rule.id = "rule-1"
+    rule.name = "Max Position Size"
+    rule.rule_type = RiskRuleType.MAX_POSITION_SIZE
+    rule.threshold_value = 10_000.0
+    rule.threshold_unit = "dollars"
+    rule.action = RiskRuleAction.BLOCK
+    rule.strategy_id = None
+
+    service = RiskSnapshotService()
+    await service.reconcile("user-1", executor._alpaca_client)
+    service._rules["user-1"] = [compile_rule(rule)]
+    service._rules_loaded_at["user-1"] = time.monotonic()
+    executor = AlpacaOrderExecutor(db=AsyncMock(), user_id="user-1")
+
+    with patch("app.integrations.order_execution.get_risk_snapshot_service", return_value=service), \
+            patch("app.integrations.order_execution.NotificationService") as notifications:
+        notifications.return_value.notify_risk_breach = AsyncMock()
+        notifications.return_value.create_notification = AsyncMock()
+        basket = await executor.place_basket(
+            [{"symbol": "AAPL", "qty": 1}, {"symbol": "MSFT", "qty": 1000}, {"symbol": "SPY", "notional": 20_000}]
+        )
+
+    assert [leg["status"] for leg in basket["legs"]] == ["submitted", "blocked", "blocked"]
+    assert basket["legs"][2]["error"] == "Position size $20,000.00 exceeds maximum $10,000.00"
+    notifications.return_value.notify_risk_breach.assert_awaited_once()
+    notifications.return_value.create_notification.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_basket_risk_check_counts_accepted_legs(executor):
+    rule = MagicMock(spec=RiskRule)
+    rule.id = "rule-1"
+    rule.name = "Max Position Size"
+    rule.rule_type = RiskRuleType.MAX_POSITION_SIZE
+    rule.threshold_value = 10_000.0
+    rule.threshold_unit = "dollars"
+    rule.action = RiskRuleAction.BLOCK
+    rule.strategy_id = None
+
+    service = RiskSnapshotService()
+    await service.reconcile("user-1", executor._alpaca_client)
+    service._rules["user-1"] = [compile_rule(rule)]
+    service._rules_loaded_at["user-1"] = time.monotonic()
+    executor = AlpacaOrderExecutor(db=AsyncMock(), user_id="user-1")
+
+    with patch("app.integrations.order_execution.get_risk_snapshot_service", return_value=service), \
+            patch("app.integrations.order_execution.NotificationService") as notifications:
+        notifications.return_value.notify_risk_breach = AsyncMock()
+        notifications.return_value.create_notification = AsyncMock()
+        basket = await executor.place_basket(
+            [{"symbol": symbol, "qty": 10, "order_type": "limit", "limit_price": 600.0}
+             for symbol in ("SPY", "SPY", "AAPL")]
+        )
+
+    # Each SPY leg fits on its own; together they exceed the limit
+    assert [leg["status"] for leg in basket["legs"]] == ["submitted", "blocked", "submitted"]
+    assert basket["legs"][1]["error"] == "Position size $12,000.00 exceeds maximum $10,000.00"
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_use_their_own_session(executor):
+    from app.integrations.order_execution import get_order_executor
+
+    sessions = [AsyncMock(), AsyncMock()]
+    executors = [get_order_executor(db=db, user_id=f"user-{i}") for i, db in enumerate(sessions)]
+
+    assert executors[0] is not executors[1]
+    assert executors[0]._alpaca_client is executors[1]._alpaca_client
+    assert get_order_executor() is get_order_executor()
+
+    with patch("app.integrations.order_execution.NotificationService") as notifications:
+        notifications.return_value.create_notification = AsyncMock()
+        orders = await asyncio.gather(*(
+            e.place_order(symbol="AAPL", side="buy", qty=1, skip_risk_check=True) for e in executors
+        ))
+
+    assert [o["status"] for o in orders] == ["filled", "filled"]
+    assert {id(call.args[0]) for call in notifications.call_args_list} == {id(db) for db in sessions}
@@ -0,0 +1,106 @@
+"""
+Tests for the per-user broker client pool.
+"""
+from uuid import uuid4
+
+import pytest
+from unittest.mock import patch
+
+from app.integrations.alpaca_client import get_alpaca_client
+from app.integrations.broker_pool import BrokerClientPool
+from app.models.api_key import ApiKey
+from app.models.enums import ApiKeyStatus, BrokerType
+from app.models.user import User
+from app.services.encryption_service import get_encryption_service
+
+
+async def add_key(db, user_id, api_key="key", secret="secret", **kwargs):
+    encryption_service = get_encryption_service()
+    row = ApiKey(
+        id=str(uuid4()),
+        user_id=user_id,
+        broker=BrokerType.ALPACA,
+        name="Paper",
+        encrypted_api_key=encryption_service.encrypt_api_key(api_key),
+        encrypted_api_secret=encryption_service.encrypt_api_key(secret),
+        **kwargs,
+    )
+    db.add(row)
+    await db.flush()
+    return row
+
+
+async def add_user(db):
+    user = User(id=str(uuid4()), email=f"{uuid4().hex}@example.com", hashed_password="x")
+    db.add(user)
+    await db.flush()
+    return user
+
+
+@pytest.fixture
+def decrypt():
+    encryption_service = get_encryption_service()
+    with patch.object(
+        encryption_service, "decrypt_api_key", wraps=encryption_service.decrypt_api_key
+    ) as decrypt:
+        yield decrypt
+
+
+@pytest.mark.asyncio
+async def test_clients_are_reused_per_user(db, committed_test_user, decrypt):
+    await add_key(db, committed_test_user.id, api_key="user-key", secret="user-secret")
+    pool = BrokerClientPool()
+
+    first = await pool.get(committed_test_user.id, db)
+    second = await pool.get(committed_test_user.id, db)
+
+    assert first is second
+    assert first.credentials.api_key == "user-key"
+    assert first.trading is not get_alpaca_client()
+    assert first.trading._cache_prefix == f"alpaca:user:{committed_test_user.id}"
+    assert decrypt.call_count == 2  # key and secret, once
+    assert pool.stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_user_is_evicted(db, committed_test_user):
+    users = [committed_test_user, await add_user(db), await add_user(db)]
+    for user in users:
+        await add_key(db, user.id)
+    pool = BrokerClientPool(max_clients=2)
+
+    first = await pool.get(users[0].id, db)
+    second = await pool.get(users[1].id, db)
+    await pool.get(users[0].id, db)
+    with patch.object(second.trading._client._session, "close") as close:
+        await pool.get(users[2].id, db)
+        close.assert_called_once()
+
+    assert pool.peek(users[1].id) is None
+    assert pool.peek(users[0].id) is first
+    assert len(pool) == 2
+
+
+@pytest.mark.asyncio
+async def test_expired_credentials_are_checked_against_key(db, committed_test_user, decrypt):
+    row = await add_key(db, committed_test_user.id)
+    pool = BrokerClientPool(credential_ttl=0)
+
+    first = await pool.get(committed_test_user.id, db)
+    assert await pool.get(committed_test_user.id, db) is first
+    assert decrypt.call_count == 2
+
+    row.encrypted_api_key = get_encryption_service().encrypt_api_key("rotated-key")
+    await db.flush()
+    rotated = await pool.get(committed_test_user.id, db)
+
+    assert rotated is not first
+    assert rotated.credentials.api_key == "rotated-key"
+
+
+@pytest.mark.asyncio
+async def test_users_without_usable_key(db, committed_test_user):
+    await add_key(db, committed_test_user.id, status=ApiKeyStatus.REVOKED)
+    pool = BrokerClientPool()
+
+    assert await pool.get(committed_test_user.id, db) is None
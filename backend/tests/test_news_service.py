@@ -101,3 +101,118 @@ async def test_get_symbol_news_api_error(news_service):
 
         news = await news_service.get_symbol_news("AAPL")
         assert news == []
+
+
+class FakeResponse:
+    status = 200
+
+    def __init__(self, payload):
+        self.payload = payload
+
+    async def json(self):
+        return self.payload
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeSession:
+    closed = False
+
+    def __init__(self, feed):
+        self.feed = feed
+        self.calls = []
+
+    def get(self, url, params=None):
+        self.calls.append(params)
+        return FakeResponse({"feed": self.feed})
+
+
+def feed_item(url, tickers, label=None):
+    return {
+        "title": f"Story {url}",
+        "summary": "Shares had a great and excellent quarter",
+        "url": url,
+        "time_published": "20240102T120000",
+        "ticker_sentiment": [
+            {"ticker": ticker, "ticker_sentiment_label": label} for ticker in tickers
+        ],
+    }
+
+
+@pytest.fixture
+def batching_service():
+    from concurrent.futures import ThreadPoolExecutor
+
+    with patch.dict(os.environ, {'ALPHA_VANTAGE_API_KEY': 'test_key'}):
+        service = NewsService(executor=ThreadPoolExecutor(2))
+    watchlist = [f"SYM{i}" for i in range(100)]
+    feed = [feed_item(f"https://example.com/{i}", watchlist[i:i + 3], "Bearish" if i % 2 else None) for i in range(100)]
+    service._session = FakeSession(feed)
+    return service, watchlist
+
+
+@pytest.mark.asyncio
+async def test_watchlist_is_fetched_in_one_request(batching_service):
+    service, watchlist = batching_service
+
+    news = await service.get_watchlist_news(watchlist, limit=5)
+
+    assert len(service._session.calls) == 1
+    assert "tickers" not in service._session.calls[0]
+    assert list(news) == watchlist
+    assert [a["url"] for a in news["SYM2"]] == [f"https://example.com/{i}" for i in range(3)]
+    # Labeled articles keep the provider label, unlabeled ones are scored
+    assert news["SYM2"][1]["sentiment"] == "negative"
+    assert news["SYM2"][0]["sentiment"] == "positive"
+
+    # Served from cache, including single-symbol lookups
+    assert await service.get_watchlist_news(watchlist, limit=5) == news
+    assert await service.get_symbol_news("SYM2", limit=5) == news["SYM2"]
+    assert len(service._session.calls) == 1
+
+
+@pytest.mark.asyncio
+async def test_symbols_missing_from_full_feed_are_fetched_alone(batching_service):
+    service, watchlist = batching_service
+    service.feed_limit = 100
+
+    news = await service.get_watchlist_news(watchlist, limit=3)
+
+    # SYM0 and SYM1 have fewer than 3 articles in the full feed
+    assert [call.get("tickers") for call in service._session.calls] == [None, "SYM0", "SYM1"]
+    assert len(news["SYM0"]) == 3
+    assert [a["url"] for a in news["SYM5"]] == [f"https://example.com/{i}" for i in range(3, 6)]
+
+    # The feed does not cover more articles than it held
+    await service.get_symbol_news("SYM5", limit=4)
+    assert service._session.calls[-1]["tickers"] == "SYM5"
+
+
+@pytest.mark.asyncio
+async def test_expired_symbols_are_refetched(batching_service):
+    service, watchlist = batching_service
+    await service.get_watchlist_news(watchlist)
+
+    service.cache_ttl = 0
+    await service.get_watchlist_news(watchlist[:10])
+    assert len(service._session.calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_sentiment_is_memoized_by_url(batching_service):
+    service, watchlist = batching_service
+    await service.get_watchlist_news(watchlist)
+    scored = len(service._sentiments)
+    assert scored == 50
+
+    with patch('app.services.news_service._score_texts', side_effect=AssertionError("rescored")):
+        service.cache_ttl = 0
+        await service.get_watchlist_news(watchlist)
+    assert len(service._sentiments) == scored
+
+    sentiments = await service.analyze_sentiments(["What a terrible, awful day", "Great results", "The report"])
+    assert sentiments == ["negative", "positive", "neutral"]
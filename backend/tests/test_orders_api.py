@@ -297,6 +297,59 @@ class TestBracketOrder:
             assert response.status_code == status.HTTP_500_INTERNAL_SERVER_ERROR
 
 
+class TestBasketOrder:
+    """Tests for POST /api/v1/orders/basket endpoint."""
+
+    async def test_place_basket(self, client, auth_headers):
+        """Test placing a basket returns per-leg results."""
+        with patch('app.api.v1.orders.get_order_executor') as mock_get_executor:
+            mock_executor = AsyncMock()
+            mock_get_executor.return_value = mock_executor
+            mock_executor.set_db_session = MagicMock()
+            mock_executor.place_basket = AsyncMock(return_value={
+                "total": 2,
+                "submitted": 1,
+                "rejected": 0,
+                "blocked": 1,
+                "failed": 0,
+                "legs": [
+                    {"index": 0, "symbol": "AAPL", "status": "submitted", "order": {"id": "order-1"}},
+                    {"index": 1, "symbol": "TSLA", "status": "blocked", "error": "Position size too large"},
+                ]
+            })
+
+            response = await client.post(
+                "/api/v1/orders/basket",
+                json={
+                    "orders": [
+                        {"symbol": "AAPL", "qty": 10},
+                        {"symbol": "TSLA", "notional": 50000, "side": "buy"},
+                    ]
+                },
+                headers=auth_headers
+            )
+
+            assert response.status_code == status.HTTP_201_CREATED
+            data = response.json()
+            assert data["success"] is True
+            assert data["message"] == "Submitted 1 of 2 orders"
+            assert [leg["status"] for leg in data["data"]["legs"]] == ["submitted", "blocked"]
+
+            legs = mock_executor.place_basket.call_args.kwargs["legs"]
+            assert legs[0]["qty"] == 10.0
+            assert legs[0]["order_type"] == "market"
+            assert legs[1]["notional"] == 50000.0
+
+    async def test_place_empty_basket(self, client, auth_headers):
+        """Test an empty basket is rejected."""
+        response = await client.post(
+            "/api/v1/orders/basket",
+            json={"orders": []},
+            headers=auth_headers
+        )
+        assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+
+
 class TestModifyOrder:
     """Tests for PATCH /api/v1/orders/{order_id} endpoint."""
 
@@ -0,0 +1,183 @@
+"""
+Tests for the paper trading matching engine.
+"""
+from contextlib import asynccontextmanager
+
+import pytest
+from sqlalchemy import select
+
+from app.models.paper_trading import PaperAccount, PaperOrder, PaperPosition, PaperTrade
+from app.services.paper_matching import PaperMatchingEngine, RestingOrder
+
+
+def resting(order_id, side, order_type="limit", qty=10.0, **kwargs):
+    return RestingOrder(
+        id=order_id, account_id="acc", symbol="AAPL", side=side,
+        order_type=order_type, qty=qty, **kwargs,
+    )
+
+
+class TestMatching:
+
+    def test_limits_fill_in_price_priority_at_trade_price(self):
+        engine = PaperMatchingEngine()
+        engine._add(resting("b1", "buy", limit_price=100.0))
+        engine._add(resting("b2", "buy", limit_price=101.0))
+        engine._add(resting("s1", "sell", limit_price=110.0))
+
+        assert engine.match("AAPL", 102.0) == []
+
+        fills = engine.match("AAPL", 100.5, size=15)
+        assert [(f.order_id, f.qty, f.price) for f in fills] == [("b2", 10.0, 100.5)]
+
+        fills = engine.match("AAPL", 99.0, size=15)
+        assert [(f.order_id, f.qty) for f in fills] == [("b1", 10.0)]
+        assert engine.get_orders("acc")[0]["id"] == "s1"
+
+    def test_trade_size_limits_fills(self):
+        engine = PaperMatchingEngine(participation=0.5)
+        engine._add(resting("b1", "buy", limit_price=100.0))
+
+        engine.match("AAPL", 100.0, size=8)
+        order = engine._orders["b1"]
+        assert (order.filled_qty, order.status) == (4.0, "partially_filled")
+
+        engine.match("AAPL", 99.0, size=100)
+        assert order.status == "filled"
+        assert order.avg_fill_price == pytest.approx((4 * 100.0 + 6 * 99.0) / 10)
+        assert engine.get_orders("acc") == []
+
+    def test_stops_trigger_when_price_crosses(self):
+        engine = PaperMatchingEngine()
+        engine._add(resting("stop", "sell", "stop", stop_price=95.0))
+        engine._add(resting("stop-limit", "buy", "stop_limit", stop_price=105.0, limit_price=106.0))
+
+        assert engine.match("AAPL", 100.0) == []
+
+        fills = engine.match("AAPL", 94.0)
+        assert [(f.order_id, f.price) for f in fills] == [("stop", 94.0)]
+
+        # Triggered at 107 but only fills once the price is back at the limit
+        assert engine.match("AAPL", 107.0) == []
+        assert engine._orders["stop-limit"].triggered
+        fills = engine.match("AAPL", 105.5)
+        assert [(f.order_id, f.price) for f in fills] == [("stop-limit", 105.5)]
+
+    @pytest.mark.asyncio
+    async def test_bars_replay_intrabar_path(self):
+        engine = PaperMatchingEngine()
+        engine._add(resting("b1", "buy", limit_price=98.0))
+        engine._add(resting("s1", "sell", limit_price=103.0))
+
+        await engine.on_bar(
+            {"symbol": "AAPL", "open": 100.0, "high": 104.0, "low": 97.0, "close": 101.0, "volume": 80}
+        )
+
+        # Up bar: low (97) before high (104), each step with a quarter of the volume
+        assert [(f.order_id, f.price) for f in engine._fills] == [("b1", 97.0), ("s1", 104.0)]
+
+    def test_bracket_exits_follow_entry_fills_and_cancel_each_other(self):
+        engine = PaperMatchingEngine()
+        engine._add(resting(
+            "entry", "buy", limit_price=100.0, order_class="bracket",
+            take_profit_price=110.0, stop_loss_price=95.0,
+        ))
+
+        engine.match("AAPL", 100.0, size=4)
+        take_profit, stop_loss = (engine._orders[i] for i in engine._orders["entry"].children)
+        assert (take_profit.order_type, take_profit.limit_price, take_profit.qty) == ("limit", 110.0, 4.0)
+        assert (stop_loss.order_type, stop_loss.stop_price, stop_loss.qty) == ("stop", 95.0, 4.0)
+        assert take_profit.oco_group == stop_loss.oco_group
+
+        engine.match("AAPL", 100.0, size=6)
+        assert take_profit.qty == stop_loss.qty == 10.0
+
+        engine.match("AAPL", 111.0, size=3)
+        assert stop_loss.remaining == 7.0
+        engine.match("AAPL", 112.0, size=7)
+        assert take_profit.status == "filled"
+        assert stop_loss.status == "canceled"
+        assert engine.get_orders("acc") == []
+
+    def test_canceling_oco_leg_cancels_sibling(self):
+        engine = PaperMatchingEngine()
+        engine._add(resting("tp", "sell", limit_price=110.0, order_class="oco", oco_group="g"))
+        engine._add(resting("sl", "sell", "stop", stop_price=95.0, order_class="oco", oco_group="g"))
+
+        assert engine.reserved_qty("acc", "AAPL") == 10.0
+        assert not engine.cancel("other-account", "tp")["success"]
+
+        result = engine.cancel("acc", "sl")
+        assert {o["id"] for o in result["orders"]} == {"tp", "sl"}
+        assert engine.match("AAPL", 90.0) == []
+
+
+@pytest.fixture
+def engine(db):
+    @asynccontextmanager
+    async def session_factory():
+        yield db
+
+    return PaperMatchingEngine(session_factory=session_factory)
+
+
+async def create_account(db, user_id, cash=10_000.0):
+    account = PaperAccount(user_id=user_id, cash_balance=cash, initial_balance=cash)
+    db.add(account)
+    await db.commit()
+    return account
+
+
+@pytest.mark.asyncio
+async def test_fills_are_written_in_one_flush(db, committed_test_user, engine):
+    account = await create_account(db, committed_test_user.id)
+
+    result = await engine.submit(
+        db, committed_test_user.id, "AAPL", 10, "buy", "limit", limit_price=100.0,
+        order_class="bracket", take_profit_price=110.0,
+    )
+    assert result["success"]
+    assert engine.reserved_cash(account.id) == 1000.0
+
+    engine.match("AAPL", 99.0, size=6)
+    engine.match("AAPL", 99.5, size=100)
+    engine.match("AAPL", 111.0, size=4)
+    assert await engine.flush() == 3
+
+    await db.refresh(account)
+    assert account.cash_balance == pytest.approx(10_000 - 6 * 99 - 4 * 99.5 + 4 * 111)
+    position = (await db.execute(select(PaperPosition))).scalar_one()
+    assert position.qty == 6.0
+    trades = (await db.execute(select(PaperTrade))).scalars().all()
+    assert [(t.side, t.qty) for t in trades] == [("buy", 6.0), ("buy", 4.0), ("sell", 4.0)]
+
+    statuses = sorted((o.parent_id is None, o.status) for o in (await db.execute(select(PaperOrder))).scalars())
+    assert statuses == [(False, "partially_filled"), (True, "filled")]
+
+    # A restarted engine picks the open exit back up
+    restarted = PaperMatchingEngine(session_factory=engine._session_factory)
+    await restarted.load()
+    assert [(o["side"], o["remaining_qty"]) for o in restarted.get_orders(account.id)] == [("sell", 6.0)]
+
+
+@pytest.mark.asyncio
+async def test_orders_cannot_exceed_buying_power_or_position(db, committed_test_user, engine):
+    await create_account(db, committed_test_user.id, cash=1_000.0)
+
+    assert (await engine.submit(db, committed_test_user.id, "AAPL", 8, "buy", limit_price=100.0))["success"]
+    result = await engine.submit(db, committed_test_user.id, "MSFT", 3, "buy", limit_price=100.0)
+    assert result["error"] == "Insufficient buying power"
+    assert result["available"] == pytest.approx(200.0)
+
+    result = await engine.submit(
+        db, committed_test_user.id, "AAPL", 5, "sell", order_class="oco",
+        take_profit_price=110.0, stop_loss_price=90.0,
+    )
+    assert result["error"] == "Insufficient shares to sell"
+
+    result = await engine.submit(
+        db, committed_test_user.id, "AAPL", 5, "sell", "limit", limit_price=1.0, take_profit_price=2.0
+    )
+    assert result == {
+        "success": False, "error": "take_profit_price and stop_loss_price require a bracket or OCO order"
+    }
@@ -0,0 +1,181 @@
+"""
+Tests for the portfolio VaR/CVaR and stress engine.
+"""
+import time
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+import pytest
+from unittest.mock import AsyncMock
+
+from app.services.portfolio_risk import PortfolioRiskEngine, RollingCovariance
+
+
+def make_closes(n_symbols=4, days=300, seed=0, symbols=None):
+    rng = np.random.default_rng(seed)
+    symbols = symbols or [f"S{i}" for i in range(n_symbols)]
+    market = rng.normal(0.0003, 0.01, size=days)
+    betas = np.linspace(0.5, 1.5, len(symbols))
+    returns = market[:, None] * betas + rng.normal(0, 0.008, size=(days, len(symbols)))
+    index = pd.bdate_range(end=pd.Timestamp.now(tz="UTC").normalize(), periods=days + 1)
+    prices = 100 * np.exp(np.vstack([np.zeros(len(symbols)), np.cumsum(returns, axis=0)]))
+    return pd.DataFrame(prices, index=index, columns=symbols)
+
+
+class TestRollingCovariance:
+
+    def test_matches_full_recomputation_after_window_rolls(self):
+        returns = np.random.default_rng(1).normal(size=(50, 3))
+        rolling = RollingCovariance.from_returns(["A", "B", "C"], returns[:10], window=20)
+        for row in returns[10:]:
+            rolling.push(row)
+
+        assert len(rolling) == 20
+        np.testing.assert_allclose(rolling.returns, returns[-20:])
+        np.testing.assert_allclose(rolling.covariance, np.cov(returns[-20:], rowvar=False))
+
+
+class TestPortfolioRiskEngine:
+
+    def test_var_methods_agree_on_normal_returns(self):
+        closes = make_closes()
+        engine = PortfolioRiskEngine(window=250, simulations=20_000, dof=None, seed=7)
+        engine.seed(closes)
+        positions = {"S0": 50_000.0, "S1": 30_000.0, "S2": -20_000.0, "XYZ": 1_000.0}
+
+        risk = engine.risk(positions, confidence=0.95)
+
+        w = np.array([50_000.0, 30_000.0, -20_000.0, 0.0])
+        returns = np.diff(np.log(closes.to_numpy()), axis=0)[-250:]
+        sigma = np.sqrt(w @ np.cov(returns, rowvar=False) @ w)
+        z = NormalDist().inv_cdf(0.95)
+        assert risk["volatility"] == pytest.approx(sigma)
+        assert risk["parametric"]["var"] == pytest.approx(z * sigma - returns.mean(axis=0) @ w)
+        assert risk["monte_carlo"]["var"] == pytest.approx(risk["parametric"]["var"], rel=0.05)
+        assert risk["historical"]["var"] == pytest.approx(risk["parametric"]["var"], rel=0.25)
+        for method in ("historical", "parametric", "monte_carlo"):
+            assert risk[method]["cvar"] > risk[method]["var"] > 0
+        assert sum(c["component_var"] for c in risk["contributions"]) == pytest.approx(z * sigma)
+        assert risk["unmodeled_symbols"] == ["XYZ"]
+
+        ten_day = engine.risk(positions, confidence=0.95, horizon_days=10)
+        assert ten_day["volatility"] == pytest.approx(sigma * np.sqrt(10))
+
+    def test_updates_roll_the_window(self):
+        closes = make_closes(days=120)
+        engine = PortfolioRiskEngine(window=60)
+        engine.seed(closes.iloc[:100])
+        for timestamp, row in closes.iloc[100:].iterrows():
+            assert engine.update(timestamp, row.to_dict())
+        assert not engine.update(closes.index[-1], closes.iloc[-1].to_dict())
+        assert not engine.update(closes.index[-1] + pd.Timedelta(days=1), {"S0": 1.0})
+
+        expected = np.cov(np.diff(np.log(closes.to_numpy()), axis=0)[-60:], rowvar=False)
+        np.testing.assert_allclose(engine._rolling.covariance, expected)
+        assert engine.as_of == closes.index[-1].to_pydatetime()
+
+    def test_stress_scales_market_shocks_by_beta(self):
+        closes = make_closes(symbols=["SPY", "AAPL", "TLT"])
+        engine = PortfolioRiskEngine()
+        engine.seed(closes)
+        positions = {"SPY": 10_000.0, "AAPL": 10_000.0, "TLT": 10_000.0}
+        betas = engine.betas()
+        assert betas[0] == pytest.approx(1.0)
+
+        results = engine.stress(positions, {
+            "crash": {"market_return": -0.10},
+            "aapl_miss": {"shocks": {"AAPL": -0.2}},
+        })
+        by_name = {r["scenario"]: r for r in results}
+
+        assert by_name["crash"]["pnl"] == pytest.approx(-1_000.0 * betas.sum())
+        assert by_name["aapl_miss"]["pnl"] == pytest.approx(-2_000.0)
+        assert by_name["aapl_miss"]["pnl_pct"] == pytest.approx(-2_000.0 / 30_000 * 100)
+        assert "worst_day_in_window" in by_name
+        assert [r["pnl"] for r in results] == sorted(r["pnl"] for r in results)
+
+    def test_full_refresh_for_500_positions_is_fast(self):
+        closes = make_closes(n_symbols=500, days=252)
+        engine = PortfolioRiskEngine(window=252, simulations=5000, seed=1)
+        engine.seed(closes)
+        positions = {symbol: 10_000.0 for symbol in closes.columns}
+        engine.risk(positions)  # builds cached draws and factor
+
+        engine.update(closes.index[-1] + pd.Timedelta(days=1), closes.iloc[-1].to_dict())
+        start = time.perf_counter()
+        engine.risk(positions)
+        engine.stress(positions)
+        assert time.perf_counter() - start < 0.5
+
+
+@pytest.mark.asyncio
+async def test_load_fetches_history_once_then_only_new_bars():
+    closes = make_closes(symbols=["AAPL", "MSFT"], days=40)
+    seen = {"until": closes.index[30]}
+
+    async def get_bars(symbol, timeframe="1Day", start=None, end=None, limit=100):
+        rows = closes[symbol]
+        rows = rows[(rows.index >= pd.Timestamp(start)) & (rows.index <= seen["until"])]
+        return [{"timestamp": ts.isoformat(), "close": close} for ts, close in rows.items()]
+
+    market_data = AsyncMock()
+    market_data.get_bars.side_effect = get_bars
+    engine = PortfolioRiskEngine(window=60)
+
+    await engine.load(["AAPL", "MSFT"], market_data)
+    assert len(engine._rolling) == 30
+    assert market_data.get_bars.await_count == 2
+
+    seen["until"] = closes.index[-1]
+    await engine.load(["MSFT"], market_data)
+    assert len(engine._rolling) == 40
+    assert market_data.get_bars.await_args.kwargs["start"] > closes.index[30]
+
+
+class TestPartialHistory:
+
+    def test_short_history_symbol_does_not_shrink_other_portfolios(self):
+        closes = make_closes(symbols=["AAPL", "MSFT", "NEW"], days=300)
+        closes.iloc[:-21, 2] = np.nan  # NEW listed 20 trading days ago
+        engine = PortfolioRiskEngine(window=252, seed=3)
+        engine.seed(closes)
+
+        risk = engine.risk({"AAPL": 10_000.0, "MSFT": 5_000.0, "NEW": 2_000.0})
+        assert risk["observations"] == 252
+        assert risk["unmodeled_symbols"] == ["NEW"]
+        assert risk["gross_exposure"] == pytest.approx(15_000.0)
+
+    def test_covariance_uses_pairwise_history(self):
+        closes = make_closes(symbols=["AAPL", "MSFT", "IPO"], days=300)
+        closes.iloc[:-101, 2] = np.nan  # IPO has 100 returns
+        engine = PortfolioRiskEngine(window=252, seed=3)
+        engine.seed(closes)
+
+        returns = np.diff(np.log(closes.to_numpy()), axis=0)[-252:]
+        full = np.cov(returns[:, :2], rowvar=False)
+        recent = np.cov(returns[-100:], rowvar=False)
+        cov = engine._rolling.covariance
+        np.testing.assert_allclose(cov[:2, :2], full)
+        np.testing.assert_allclose(cov[2, :], recent[2, :])
+        np.testing.assert_allclose(engine._rolling.observations, [252, 252, 100])
+
+        assert engine.risk({"AAPL": 1_000.0})["observations"] == 252
+        mixed = engine.risk({"AAPL": 1_000.0, "IPO": 1_000.0})
+        assert mixed["observations"] == 100
+        assert mixed["monte_carlo"]["var"] > 0
+
+    @pytest.mark.asyncio
+    async def test_no_positions_is_zero_risk(self):
+        engine = PortfolioRiskEngine()
+        market_data = AsyncMock()
+        await engine.load([], market_data)
+        market_data.get_bars.assert_not_awaited()
+
+        risk = engine.risk({})
+        assert risk["observations"] == 0
+        assert risk["historical"] == risk["parametric"] == risk["monte_carlo"] == {"var": 0.0, "cvar": 0.0}
+        assert engine.stress({}, {"crash": {"market_return": -0.1}})[0]["pnl"] == 0.0
+
+        engine.seed(make_closes(symbols=["AAPL"]))
+        assert engine.risk({"AAPL": 0.0, "XYZ": 100.0})["unmodeled_symbols"] == ["XYZ"]
@@ -0,0 +1,197 @@
+"""
+Tests for in-memory account snapshots and compiled risk rules.
+"""
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from app.services.risk_snapshot import AccountSnapshot, RiskSnapshotService, compile_rule
+from app.models.risk_rule import RiskRule, RiskRuleType, RiskRuleAction
+
+
+def make_rule(rule_type, threshold, unit="dollars", action=RiskRuleAction.BLOCK, strategy_id=None):
+    rule = MagicMock(spec=RiskRule)
+    rule.id = f"rule-{rule_type.value}"
+    rule.name = rule_type.value
+    rule.rule_type = rule_type
+    rule.threshold_value = threshold
+    rule.threshold_unit = unit
+    rule.action = action
+    rule.strategy_id = strategy_id
+    return rule
+
+
+@pytest.fixture
+def alpaca_client():
+    client = AsyncMock()
+    client.get_account = AsyncMock(return_value={
+        "cash": 90000.0, "equity": 100000.0, "last_equity": 100000.0, "buying_power": 180000.0
+    })
+    client.get_positions = AsyncMock(return_value=[{
+        "symbol": "AAPL", "qty": 100.0, "side": "long",
+        "avg_entry_price": 95.0, "current_price": 100.0
+    }])
+    return client
+
+
+@pytest.fixture
+def mock_db():
+    db = AsyncMock()
+    result = MagicMock()
+    result.scalars.return_value.all.return_value = [
+        make_rule(RiskRuleType.MAX_POSITION_SIZE, 10000.0),
+        make_rule(RiskRuleType.MAX_DAILY_LOSS, 2.0, unit="percent", action=RiskRuleAction.ALERT),
+        make_rule(RiskRuleType.STOP_LOSS, 5.0),
+    ]
+    db.execute = AsyncMock(return_value=result)
+    return db
+
+
+@pytest.fixture
+def service():
+    return RiskSnapshotService(reconcile_interval=60)
+
+
+class TestAccountSnapshot:
+
+    def test_from_broker(self):
+        snapshot = AccountSnapshot.from_broker(
+            {"cash": 1000.0, "equity": 500.0, "last_equity": 600.0, "buying_power": 1000.0},
+            [{"symbol": "TSLA", "qty": 5.0, "side": "short", "avg_entry_price": 110.0, "current_price": 100.0}],
+        )
+
+        assert snapshot.positions["TSLA"].qty == -5.0
+        assert snapshot.equity == 500.0
+        assert snapshot.gross_exposure == 500.0
+        assert snapshot.daily_pnl == -100.0
+        assert snapshot.peak_equity == 600.0
+
+    def test_unsupported_rule_types_are_skipped(self):
+        assert compile_rule(make_rule(RiskRuleType.SECTOR_LIMIT, 1.0)) is None
+
+
+class TestRiskSnapshotService:
+
+    @pytest.mark.asyncio
+    async def test_evaluate_loads_once_and_checks_in_memory(self, service, mock_db, alpaca_client):
+        breaches = await service.evaluate("user-1", mock_db, alpaca_client, order_value=15000.0)
+        await service.evaluate("user-1", mock_db, alpaca_client, order_value=500.0)
+
+        assert [b.rule_type for b in breaches] == [RiskRuleType.MAX_POSITION_SIZE]
+        assert breaches[0].message == "Position size $15,000.00 exceeds maximum $10,000.00"
+        assert mock_db.execute.await_count == 1
+        assert alpaca_client.get_account.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_invalidate_rules_reloads(self, service, mock_db, alpaca_client):
+        await service.evaluate("user-1", mock_db, alpaca_client)
+        service.invalidate_rules("user-1")
+        await service.evaluate("user-1", mock_db, alpaca_client)
+
+        assert mock_db.execute.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_rules_changed_by_another_worker_reload_after_ttl(self, mock_db, alpaca_client):
+        api_worker = RiskSnapshotService(reconcile_interval=60, rules_ttl=5)
+        other_worker = RiskSnapshotService(reconcile_interval=60, rules_ttl=5)
+        await other_worker.evaluate("user-1", mock_db, alpaca_client)
+
+        # The rule is raised through the API on the other worker
+        mock_db.execute.return_value.scalars.return_value.all.return_value = [
+            make_rule(RiskRuleType.MAX_POSITION_SIZE, 20000.0),
+        ]
+        api_worker.invalidate_rules("user-1")
+
+        breaches = await other_worker.evaluate("user-1", mock_db, alpaca_client, order_value=15000.0)
+        assert [b.rule_type for b in breaches] == [RiskRuleType.MAX_POSITION_SIZE]
+
+        other_worker._rules_loaded_at["user-1"] -= 10
+        breaches = await other_worker.evaluate("user-1", mock_db, alpaca_client, order_value=15000.0)
+        assert breaches == []
+        assert mock_db.execute.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_stale_snapshot_is_reconciled(self, service, mock_db, alpaca_client):
+        await service.evaluate("user-1", mock_db, alpaca_client)
+        service.get_snapshot("user-1").reconciled_at -= 120
+        await service.evaluate("user-1", mock_db, alpaca_client)
+
+        assert alpaca_client.get_account.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_fills_update_snapshot(self, service, alpaca_client):
+        await service.reconcile("user-1", alpaca_client)
+
+        service.apply_trade_update("user-1", {
+            "event": "fill", "price": 110.0, "qty": 100.0, "position_qty": 200.0,
+            "order": {"symbol": "AAPL", "side": "buy"},
+        })
+        service.apply_trade_update("user-1", {
+            "event": "new", "order": {"symbol": "MSFT", "side": "buy"},
+        })
+        snapshot = service.get_snapshot("user-1")
+
+        assert snapshot.cash == 79000.0
+        assert snapshot.positions["AAPL"].qty == 200.0
+        assert snapshot.positions["AAPL"].avg_entry_price == pytest.approx(102.5)
+        assert snapshot.equity == 101000.0
+        assert "MSFT" not in snapshot.positions
+
+        service.apply_trade_update("user-1", {
+            "event": "fill", "price": 110.0, "qty": 200.0,
+            "order": {"symbol": "AAPL", "side": "sell"},
+        })
+        assert snapshot.positions == {}
+        assert snapshot.cash == 101000.0
+
+    @pytest.mark.asyncio
+    async def test_marked_loss_breaches_daily_loss(self, service, mock_db, alpaca_client):
+        await service.evaluate("user-1", mock_db, alpaca_client)
+        service.mark_price("AAPL", 70.0)
+
+        breaches = service.check("user-1")
+
+        assert len(breaches) == 1
+        assert breaches[0].rule_type == RiskRuleType.MAX_DAILY_LOSS
+        assert breaches[0].action == RiskRuleAction.ALERT
+        assert breaches[0].current_value == pytest.approx(3000.0)
+
+    @pytest.mark.asyncio
+    async def test_strategy_scoped_rules(self, service, alpaca_client):
+        db = AsyncMock()
+        result = MagicMock()
+        result.scalars.return_value.all.return_value = [
+            make_rule(RiskRuleType.POSITION_LIMIT, 1, unit="count", strategy_id="strat-1")
+        ]
+        db.execute = AsyncMock(return_value=result)
+
+        assert await service.evaluate("user-1", db, alpaca_client, strategy_id="strat-1")
+        assert not await service.evaluate("user-1", db, alpaca_client, strategy_id="strat-2")
+        assert not await service.evaluate("user-1", db, alpaca_client)
+
+    @pytest.mark.asyncio
+    async def test_basket_legs_count_accepted_exposure(self, service, alpaca_client):
+        await service.reconcile("user-1", alpaca_client)
+        service._rules["user-1"] = [
+            compile_rule(make_rule(RiskRuleType.POSITION_LIMIT, 3, unit="count")),
+            compile_rule(make_rule(RiskRuleType.MAX_LEVERAGE, 0.15, unit="ratio", strategy_id="strat-1")),
+        ]
+
+        results = service.check_basket("user-1", [
+            ("strat-1", "MSFT", 8000.0),
+            ("strat-1", "GOOGL", 8000.0),
+            ("strat-2", "TSLA", 8000.0),
+            (None, "AMZN", 8000.0),
+        ])
+
+        # Separately every leg passes: 1 position held, 10% leverage
+        assert all(not service.check("user-1", strategy_id, value) for strategy_id, _, value in [
+            ("strat-1", "MSFT", 8000.0), ("strat-2", "TSLA", 8000.0)
+        ])
+        assert [[b.rule_type for b in breaches] for breaches in results] == [
+            [],
+            [RiskRuleType.MAX_LEVERAGE],
+            [],
+            [RiskRuleType.POSITION_LIMIT],
+        ]
+        assert results[1][0].current_value == pytest.approx(0.18)
+        assert results[3][0].current_value == 3
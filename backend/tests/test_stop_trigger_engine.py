@@ -0,0 +1,145 @@
+"""
+Tests for the event-driven stop-loss/take-profit engine.
+"""
+from contextlib import asynccontextmanager
+
+import pytest
+from unittest.mock import AsyncMock, patch
+from sqlalchemy import delete, select
+
+from app.models.paper_trading import PaperAccount, PaperPosition, PaperTrade
+from app.services.paper_trading import PaperTradingService
+from app.services.stop_loss_monitor import StopTriggerEngine, TriggerIndex
+
+
+class TestTriggerIndex:
+
+    def test_only_crossed_thresholds_trigger(self):
+        index = TriggerIndex()
+        index.upsert("p1", "AAPL", "acc", 140.0, 180.0)
+        index.upsert("p2", "AAPL", "acc", 145.0, None)
+        index.upsert("p3", "AAPL", "acc", None, 170.0)
+        index.upsert("p4", "MSFT", "acc", 300.0, None)
+
+        assert index.on_price("AAPL", 160.0) == []
+        assert index.on_price("TSLA", 1.0) == []
+
+        triggers = index.on_price("AAPL", 144.0)
+        assert [(t.position_id, t.trigger_type, t.trigger_price) for t in triggers] == [
+            ("p2", "stop_loss", 145.0)
+        ]
+
+        triggers = index.on_price("AAPL", 185.0)
+        assert [(t.position_id, t.trigger_type) for t in triggers] == [
+            ("p3", "take_profit"), ("p1", "take_profit")
+        ]
+        assert triggers[0].price == 185.0
+        assert len(index) == 1
+
+    def test_updates_replace_thresholds(self):
+        index = TriggerIndex()
+        index.upsert("p1", "AAPL", "acc-1", 140.0, None)
+        index.upsert("p1", "AAPL", "acc-1", 130.0, None)
+        index.upsert("p2", "AAPL", "acc-2", 139.0, None)
+
+        assert [t.position_id for t in index.on_price("AAPL", 135.0)] == ["p2"]
+
+        index.remove_account("acc-1")
+        assert index.on_price("AAPL", 100.0) == []
+        assert len(index) == 0
+
+
+@pytest.fixture
+def market_data():
+    with patch("app.services.paper_trading.get_market_data_service") as get_md:
+        get_md.return_value.get_multi_trades = AsyncMock(return_value=[])
+        yield get_md.return_value
+
+
+@pytest.fixture
+def index():
+    index = TriggerIndex()
+    with patch("app.services.paper_trading.get_trigger_index", return_value=index):
+        yield index
+
+
+@pytest.fixture
+def engine(db, index):
+    @asynccontextmanager
+    async def session_factory():
+        yield db
+
+    return StopTriggerEngine(index=index, session_factory=session_factory)
+
+
+@pytest.mark.asyncio
+async def test_ticks_execute_triggered_exits_in_one_batch(db, committed_test_user, market_data, index, engine):
+    service = PaperTradingService(db)
+    user_id = committed_test_user.id
+    for symbol, stop, target in [("AAPL", 140.0, 180.0), ("MSFT", 290.0, None), ("GOOGL", None, 150.0)]:
+        result = await service.execute_paper_order(
+            user_id, symbol, 10, "buy", limit_price=stop + 10 if stop else 140.0,
+            stop_loss_price=stop, take_profit_price=target,
+        )
+        assert result["success"] is True
+    assert len(index) == 3
+
+    await engine.on_trade({"symbol": "AAPL", "price": 160.0})
+    await engine.on_trade({"symbol": "AAPL", "price": 139.5})
+    await engine.on_trade({"symbol": "GOOGL", "price": 151.0})
+    results = await engine.flush()
+
+    assert [(r["position"]["symbol"], r["trigger_type"]) for r in results] == [
+        ("AAPL", "stop_loss"), ("GOOGL", "take_profit")
+    ]
+    assert results[0]["realized_pnl"] == pytest.approx((139.5 - 150.0) * 10)
+
+    positions = (await db.execute(select(PaperPosition))).scalars().all()
+    assert [p.symbol for p in positions] == ["MSFT"]
+    account = (await db.execute(select(PaperAccount))).scalar_one()
+    assert account.cash_balance == pytest.approx(100000.0 - 1500.0 - 3000.0 - 1400.0 + 1395.0 + 1510.0)
+    sells = (await db.execute(select(PaperTrade).where(PaperTrade.side == "sell"))).scalars().all()
+    assert len(sells) == 2
+
+
+@pytest.mark.asyncio
+async def test_position_exited_elsewhere_is_not_sold_again(db, committed_test_user, market_data, index, engine):
+    service = PaperTradingService(db)
+    await service.execute_paper_order(
+        committed_test_user.id, "AAPL", 10, "buy", limit_price=150.0, stop_loss_price=140.0
+    )
+    await engine.on_trade({"symbol": "AAPL", "price": 139.5})
+
+    execute = db.execute
+
+    async def exited_by_other_worker(statement, *args, **kwargs):
+        if getattr(statement, "is_delete", False):
+            await execute(delete(PaperPosition), execution_options={"synchronize_session": False})
+        return await execute(statement, *args, **kwargs)
+
+    with patch.object(db, "execute", side_effect=exited_by_other_worker):
+        assert await engine.flush() == []
+
+    account = (await db.execute(select(PaperAccount))).scalar_one()
+    assert account.cash_balance == pytest.approx(100000.0 - 1500.0)
+    sells = (await db.execute(select(PaperTrade).where(PaperTrade.side == "sell"))).scalars().all()
+    assert sells == []
+
+
+@pytest.mark.asyncio
+async def test_index_follows_position_changes(db, committed_test_user, market_data, index, engine):
+    service = PaperTradingService(db)
+    user_id = committed_test_user.id
+    await service.execute_paper_order(user_id, "AAPL", 10, "buy", limit_price=150.0, stop_loss_price=140.0)
+
+    result = await service.update_position_stop_loss_take_profit(user_id, "AAPL", clear_stop_loss=True)
+    assert result["success"] is True
+    await engine.on_trade({"symbol": "AAPL", "price": 130.0})
+    assert await engine.flush() == []
+
+    await service.update_position_stop_loss_take_profit(user_id, "AAPL", stop_loss_price=135.0)
+    await service.execute_paper_order(user_id, "AAPL", 10, "sell", limit_price=150.0)
+    assert len(index) == 0
+
+    await engine.load()
+    assert len(index) == 0
@@ -0,0 +1,76 @@
+import pytest
+from datetime import datetime, timezone
+from unittest.mock import MagicMock
+
+from app.integrations.market_data import MarketDataError
+from app.integrations.synthetic_market_data import SyntheticMarketDataProvider
+from app.services.market_data_cache_service import MarketDataCacheService
+
+
+@pytest.fixture
+def provider():
+    return SyntheticMarketDataProvider()
+
+
+@pytest.mark.asyncio
+async def test_get_bars_matches_alpaca_shape(provider):
+    bars = await provider.get_bars(
+        "AAPL",
+        timeframe="1Day",
+        start=datetime(2023, 1, 1, tzinfo=timezone.utc),
+        end=datetime(2023, 12, 31, tzinfo=timezone.utc),
+        limit=50
+    )
+
+    assert len(bars) == 50
+    assert set(bars[0]) == {
+        "symbol", "timestamp", "open", "high", "low", "close",
+        "volume", "trade_count", "vwap"
+    }
+    assert bars[0]["timestamp"].startswith("2023-01-02")
+    assert all(b["low"] <= b["close"] <= b["high"] for b in bars)
+
+
+@pytest.mark.asyncio
+async def test_intraday_bars_are_trimmed_to_range(provider):
+    bars = await provider.get_bars(
+        "SPY",
+        timeframe="15Min",
+        start=datetime(2024, 3, 4, 15, 0, tzinfo=timezone.utc),
+        end=datetime(2024, 3, 4, 16, 0, tzinfo=timezone.utc),
+        limit=None
+    )
+
+    assert [b["timestamp"][11:16] for b in bars] == ["15:00", "15:15", "15:30", "15:45", "16:00"]
+
+
+@pytest.mark.asyncio
+async def test_quotes_and_snapshot(provider):
+    quote = await provider.get_latest_quote("MSFT")
+    trade = await provider.get_latest_trade("MSFT")
+    snapshot = await provider.get_snapshot("MSFT")
+
+    assert quote["bid_price"] < trade["price"] < quote["ask_price"]
+    assert snapshot["daily_bar"]["close"] == trade["price"]
+    assert snapshot["prev_daily_bar"] is not None
+
+
+@pytest.mark.asyncio
+async def test_invalid_timeframe(provider):
+    with pytest.raises(MarketDataError):
+        await provider.get_bars("AAPL", timeframe="2Day")
+
+
+@pytest.mark.asyncio
+async def test_cache_service_uses_injected_provider(provider):
+    service = MarketDataCacheService(MagicMock(), market_data=provider)
+
+    df = await service._fetch_single_chunk(
+        "AAPL",
+        datetime(2023, 1, 1, tzinfo=timezone.utc),
+        datetime(2023, 6, 30, tzinfo=timezone.utc)
+    )
+
+    assert service.source == "synthetic"
+    assert len(df) == 130
+    assert list(df.columns) == ["open", "high", "low", "close", "volume"]
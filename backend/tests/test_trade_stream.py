@@ -0,0 +1,263 @@
+"""
+Tests for the trade updates stream consumer.
+"""
+import asyncio
+from contextlib import asynccontextmanager
+from uuid import uuid4
+
+import pytest
+from unittest.mock import AsyncMock, patch
+from sqlalchemy import select
+
+from alpaca.trading.client import TradingClient
+from alpaca.trading.enums import OrderSide, TimeInForce
+from alpaca.trading.requests import MarketOrderRequest
+
+from app.core.config import settings
+from app.integrations.trade_stream import (
+    TradeUpdateConsumer, parse_strategy_id, strategy_client_order_id
+)
+from app.models.order import Order
+from app.models.enums import OrderStatusEnum, ExecutionState
+from app.models.strategy import Strategy
+from app.models.strategy_execution import StrategyExecution, StrategyFill
+from loadtest.alpaca_standin import ReplayFeed, StandinBroker, StandinServer, create_app
+
+
+def make_event(event, order_id, side="buy", qty=10.0, filled_qty=0.0, price=None, client_order_id=None,
+               fill_qty=None, execution_id=None):
+    status = {"new": "new", "partial_fill": "partially_filled", "fill": "filled"}[event]
+    return {
+        "event": event,
+        "order": {
+            "id": order_id,
+            "client_order_id": client_order_id,
+            "symbol": "AAPL",
+            "side": side,
+            "order_type": "market",
+            "time_in_force": "day",
+            "qty": qty,
+            "filled_qty": filled_qty,
+            "filled_avg_price": price,
+            "status": status,
+        },
+        "price": price,
+        "qty": (fill_qty or filled_qty) if event != "new" else None,
+        "position_qty": None,
+        "execution_id": execution_id,
+    }
+
+
+@pytest.fixture
+async def execution(db, committed_test_user):
+    strategy = Strategy(
+        id=str(uuid4()),
+        user_id=committed_test_user.id,
+        name="Stream Strategy",
+        strategy_type="sma_crossover",
+        parameters={},
+    )
+    db.add(strategy)
+    await db.flush()
+    execution = StrategyExecution(
+        id=str(uuid4()),
+        strategy_id=strategy.id,
+        state=ExecutionState.ACTIVE,
+        max_loss_per_day=100.0,
+    )
+    db.add(execution)
+    await db.flush()
+    return execution
+
+
+@pytest.fixture
+def consumer(db, committed_test_user):
+    @asynccontextmanager
+    async def session_factory():
+        yield db
+
+    consumer = TradeUpdateConsumer(default_user_id=committed_test_user.id, session_factory=session_factory)
+    with patch("app.integrations.trade_stream.NotificationService") as notifications:
+        notifications.return_value.notify_order_filled = AsyncMock()
+        consumer.notifications = notifications
+        yield consumer
+
+
+def test_strategy_client_order_id_round_trip():
+    strategy_id = str(uuid4())
+
+    assert parse_strategy_id(strategy_client_order_id(strategy_id)) == strategy_id
+    assert parse_strategy_id("manual-order") is None
+    assert parse_strategy_id(None) is None
+
+
+@pytest.mark.asyncio
+async def test_batch_upserts_orders_and_applies_fills(db, consumer, execution, committed_test_user):
+    received = []
+
+    async def subscriber(user_id, event):
+        received.append((user_id, event["event"]))
+
+    consumer.subscribe(subscriber)
+    client_order_id = strategy_client_order_id(execution.strategy_id)
+    for event in [
+        make_event("new", "order-1", client_order_id=client_order_id),
+        make_event("partial_fill", "order-1", filled_qty=4.0, price=100.0, client_order_id=client_order_id),
+        make_event("fill", "order-1", filled_qty=6.0, price=110.0, client_order_id=client_order_id),
+    ]:
+        consumer.enqueue(event)
+
+    assert await consumer.flush() == 3
+
+    order = (await db.execute(select(Order).where(Order.alpaca_order_id == "order-1"))).scalar_one()
+    assert order.status == OrderStatusEnum.FILLED
+    assert order.user_id == committed_test_user.id
+    assert execution.current_position_qty == 10.0
+    assert execution.current_position_entry_price == pytest.approx(106.0)
+    assert received == [(committed_test_user.id, "new"), (committed_test_user.id, "partial_fill"),
+                        (committed_test_user.id, "fill")]
+    consumer.notifications.return_value.notify_order_filled.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_losing_exit_trips_circuit_breaker(consumer, execution):
+    execution.has_open_position = True
+    execution.current_position_qty = 10.0
+    execution.current_position_entry_price = 100.0
+    client_order_id = strategy_client_order_id(execution.strategy_id)
+
+    await consumer.apply([
+        make_event("partial_fill", "order-2", side="sell", filled_qty=5.0, price=80.0, client_order_id=client_order_id),
+    ])
+    assert execution.loss_today == 100.0
+    assert execution.consecutive_losses == 0
+    assert execution.current_position_qty == 5.0
+
+    await consumer.apply([
+        make_event("fill", "order-2", side="sell", filled_qty=10.0, fill_qty=5.0, price=101.0,
+                   client_order_id=client_order_id),
+    ])
+    assert execution.consecutive_losses == 1
+    assert execution.has_open_position is False
+    assert execution.state == ExecutionState.CIRCUIT_BREAKER
+
+
+@pytest.mark.asyncio
+async def test_replayed_fill_is_applied_once(db, consumer, execution, committed_test_user):
+    client_order_id = strategy_client_order_id(execution.strategy_id)
+    fill = make_event("fill", "order-4", filled_qty=10.0, price=100.0, client_order_id=client_order_id,
+                      execution_id=str(uuid4()))
+
+    await consumer.apply([fill, fill])
+    # A second consumer (e.g. after a restart) receiving the same event
+    other = TradeUpdateConsumer(default_user_id=committed_test_user.id,
+                                session_factory=consumer._session_factory)
+    await other.apply([fill])
+
+    assert execution.current_position_qty == 10.0
+    fills = (await db.execute(select(StrategyFill))).scalars().all()
+    assert [f.fill_key for f in fills] == [fill["execution_id"]]
+
+
+@pytest.mark.asyncio
+async def test_partial_fill_pnl_survives_restart(consumer, execution, committed_test_user):
+    execution.has_open_position = True
+    execution.current_position_qty = 10.0
+    execution.current_position_entry_price = 100.0
+    client_order_id = strategy_client_order_id(execution.strategy_id)
+
+    await consumer.apply([
+        make_event("partial_fill", "order-5", side="sell", filled_qty=5.0, price=80.0, client_order_id=client_order_id),
+    ])
+    restarted = TradeUpdateConsumer(default_user_id=committed_test_user.id,
+                                    session_factory=consumer._session_factory)
+    await restarted.apply([
+        make_event("fill", "order-5", side="sell", filled_qty=10.0, fill_qty=5.0, price=101.0,
+                   client_order_id=client_order_id),
+    ])
+
+    # -100 on the first half and +5 on the second: the order lost money
+    assert execution.consecutive_losses == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_batch_is_retried_in_order(consumer):
+    applied = []
+
+    async def apply(batch):
+        if not applied:
+            applied.append(None)
+            raise RuntimeError("database unavailable")
+        applied.append([e["order"]["id"] for e in batch])
+
+    consumer.apply = apply
+    consumer.retry_delay = 0
+    consumer.enqueue(make_event("new", "order-6"))
+    consumer.enqueue(make_event("new", "order-7"))
+
+    with pytest.raises(RuntimeError):
+        await consumer.flush()
+    consumer.enqueue(make_event("new", "order-8"))
+    assert await consumer.flush() == 3
+    assert applied == [None, ["order-6", "order-7", "order-8"]]
+
+    applied.clear()
+    await consumer.start(connect=False)
+    try:
+        consumer.enqueue(make_event("new", "order-9"))
+        for _ in range(50):
+            await asyncio.sleep(0.01)
+            if len(applied) > 1:
+                break
+    finally:
+        await consumer.stop()
+    assert applied == [None, ["order-9"]]
+
+
+@pytest.mark.asyncio
+async def test_unknown_orders_without_default_user_are_not_persisted(db, consumer):
+    consumer.default_user_id = None
+    received = []
+
+    async def subscriber(user_id, event):
+        received.append(user_id)
+
+    consumer.subscribe(subscriber)
+    await consumer.apply([make_event("fill", "order-3", filled_qty=10.0, price=100.0)])
+
+    assert (await db.execute(select(Order))).scalars().all() == []
+    assert received == [None]
+
+
+@pytest.mark.asyncio
+async def test_consumes_standin_trade_updates(consumer, monkeypatch):
+    feed = ReplayFeed(start="2024-03-04 15:00", end="2024-03-08")
+    with StandinServer(create_app(feed, StandinBroker(feed))) as server:
+        monkeypatch.setattr(settings, "ALPACA_TRADING_STREAM_URL", server.trading_stream_url)
+        received = []
+
+        async def subscriber(user_id, event):
+            received.append(event)
+
+        consumer.subscribe(subscriber)
+        await consumer.start()
+        try:
+            client = TradingClient("key", "secret", paper=True, url_override=server.url)
+            for _ in range(50):
+                await asyncio.sleep(0.1)
+                if consumer._stream._running:
+                    break
+            await asyncio.to_thread(client.submit_order, MarketOrderRequest(
+                symbol="AAPL", qty=3, side=OrderSide.BUY, time_in_force=TimeInForce.DAY
+            ))
+            for _ in range(50):
+                await asyncio.sleep(0.1)
+                if any(e["event"] == "fill" for e in received):
+                    break
+        finally:
+            await consumer.stop()
+
+    fill = next(e for e in received if e["event"] == "fill")
+    assert fill["order"]["symbol"] == "AAPL"
+    assert fill["qty"] == 3
+    assert fill["position_qty"] == 3
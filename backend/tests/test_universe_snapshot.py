@@ -0,0 +1,220 @@
+"""Tests for the columnar universe snapshot behind the stock screener."""
+import time
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.models.market_data_cache import MarketDataCache
+from app.services.screener import ScreenerService
+from app.services.universe_snapshot import UniverseSnapshot
+
+
+def make_bars(symbols, days=70, seed=0, end=date(2024, 3, 29)):
+    """Daily bars for symbols over the last `days` business days up to end."""
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(end=end, periods=days).date
+    frames = []
+    for symbol in symbols:
+        closes = 50 + np.cumsum(rng.normal(0, 1, days))
+        frames.append(pd.DataFrame({
+            "symbol": symbol,
+            "date": dates,
+            "open": closes - 0.5,
+            "high": closes + 1.0,
+            "low": closes - 1.0,
+            "close": closes,
+            "volume": rng.integers(1_000, 1_000_000, days),
+        }))
+    return pd.concat(frames, ignore_index=True)
+
+
+def reference_rsi(closes: pd.Series) -> float:
+    delta = closes.diff()
+    gain = delta.where(delta > 0, 0).rolling(14).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(14).mean()
+    return float((100 - 100 / (1 + gain / loss)).iloc[-1])
+
+
+@pytest.fixture
+def bars():
+    return make_bars(["AAPL", "MSFT", "JPM", "XOM"])
+
+
+@pytest.fixture
+def snapshot(bars):
+    snapshot = UniverseSnapshot()
+    snapshot.build(bars)
+    snapshot.refreshed_at = time.monotonic()
+    snapshot.set_fundamentals({
+        "AAPL": {"name": "Apple Inc.", "sector": "Technology", "exchange": "NASDAQ", "market_cap": 2.8e12},
+        "MSFT": {"name": "Microsoft Corporation", "sector": "Technology", "exchange": "NASDAQ", "market_cap": 2.9e12},
+        "JPM": {"sector": "Financials", "exchange": "NYSE", "market_cap": 4.3e11},
+    })
+    return snapshot
+
+
+@pytest.fixture
+def screener(snapshot, monkeypatch):
+    monkeypatch.setattr("app.services.screener.get_universe_snapshot", lambda: snapshot)
+    return ScreenerService(session=None)
+
+
+class TestSnapshotColumns:
+    def test_indicators_match_pandas(self, snapshot, bars):
+        for symbol, group in bars.groupby("symbol"):
+            record = snapshot.records([snapshot._rows[symbol]])[0]
+            closes = group["close"].reset_index(drop=True)
+            assert record["price"] == pytest.approx(closes.iloc[-1])
+            assert record["change_pct"] == pytest.approx((closes.iloc[-1] / closes.iloc[-2] - 1) * 100)
+            assert record["sma_20"] == pytest.approx(closes.tail(20).mean())
+            assert record["sma_50"] == pytest.approx(closes.tail(50).mean())
+            assert record["rsi"] == pytest.approx(reference_rsi(closes))
+            assert record["avg_volume"] == pytest.approx(group["volume"].tail(20).mean())
+
+    def test_intraday_bars_merge_and_new_day_shifts(self, snapshot, bars):
+        row = snapshot._rows["AAPL"]
+        volume = snapshot.columns["volume"][row]
+        last_day = bars["date"].max()
+
+        snapshot.update_bars([{
+            "symbol": "AAPL", "timestamp": f"{last_day}T19:59:00Z",
+            "open": 1, "high": 1000, "low": 1, "close": 60, "volume": 500,
+        }])
+        assert snapshot.columns["price"][row] == 60
+        assert snapshot.columns["volume"][row] == volume + 500
+        assert snapshot.columns["high"][row] == 1000
+
+        next_day = last_day + timedelta(days=3)
+        snapshot.update_bars([{
+            "symbol": "AAPL", "timestamp": f"{next_day}T14:30:00Z",
+            "open": 61, "high": 62, "low": 59, "close": 61.5, "volume": 700,
+        }])
+        assert snapshot.columns["prev_close"][row] == 60
+        assert snapshot.columns["volume"][row] == 700
+        assert snapshot.columns["change"][row] == pytest.approx(1.5)
+
+    def test_streamed_bar_for_new_symbol_adds_row(self, snapshot):
+        snapshot.update_bars([{
+            "symbol": "NEW", "timestamp": "2024-03-29T15:00:00Z",
+            "open": 10, "high": 11, "low": 9, "close": 10.5, "volume": 100,
+        }])
+        record = snapshot.records([snapshot._rows["NEW"]])[0]
+        assert record["price"] == 10.5
+        assert record["rsi"] is None
+        assert len(snapshot) == 5
+
+
+class TestScreener:
+    @pytest.mark.asyncio
+    async def test_filters_and_sorting(self, screener, snapshot):
+        results = await screener.screen_stocks(sectors=["Technology"], sort_by="price")
+        assert [r["symbol"] for r in results] == sorted(
+            ["AAPL", "MSFT"], key=lambda s: -snapshot.columns["price"][snapshot._rows[s]]
+        )
+        assert results[0]["sector"] == "Technology"
+
+        results = await screener.screen_stocks(min_market_cap=1e12)
+        assert {r["symbol"] for r in results} == {"AAPL", "MSFT"}
+
+        results = await screener.screen_stocks(exchanges=["NYSE"], min_rsi=0, max_rsi=100)
+        assert [r["symbol"] for r in results] == ["JPM"]
+
+        results = await screener.screen_stocks(limit=2)
+        volumes = [r["volume"] for r in results]
+        assert len(results) == 2 and volumes == sorted(volumes, reverse=True)
+
+    @pytest.mark.asyncio
+    async def test_invalid_screens_are_rejected(self, screener):
+        with pytest.raises(ValueError, match="Cannot sort by 'sector'"):
+            await screener.screen_stocks(sort_by="sector")
+        with pytest.raises(ValueError, match="Cannot sort by 'unknown'"):
+            await screener.screen_stocks(sort_by="unknown")
+        with pytest.raises(ValueError, match="No pe_ratio, dividend_yield data"):
+            await screener.screen_stocks(max_pe_ratio=30, min_dividend_yield=1)
+        with pytest.raises(ValueError, match="No pe_ratio data"):
+            await screener.screen_stocks(sort_by="pe_ratio")
+
+    @pytest.mark.asyncio
+    async def test_gainers_and_losers(self, screener, snapshot):
+        gainers = await screener.get_top_gainers()
+        losers = await screener.get_top_losers()
+        changes = snapshot.columns["change_pct"]
+
+        assert len(gainers) + len(losers) == int((changes != 0).sum())
+        assert all(r["change_pct"] > 0 for r in gainers)
+        assert all(r["change_pct"] < 0 for r in losers)
+        assert [r["change_pct"] for r in gainers] == sorted([r["change_pct"] for r in gainers], reverse=True)
+        assert [r["change_pct"] for r in losers] == sorted([r["change_pct"] for r in losers])
+
+    @pytest.mark.asyncio
+    async def test_large_universe_screen_is_fast(self, monkeypatch):
+        n = 8000
+        rng = np.random.default_rng(1)
+        snapshot = UniverseSnapshot()
+        snapshot._add_symbols([f"S{i:04d}" for i in range(n)])
+        snapshot._closes[:] = 50 + np.cumsum(rng.normal(0, 1, (n, snapshot.window)), axis=1)
+        snapshot._volumes[:] = rng.integers(1_000, 1_000_000, (n, snapshot.window))
+        snapshot._compute()
+        snapshot.refreshed_at = time.monotonic()
+        monkeypatch.setattr("app.services.screener.get_universe_snapshot", lambda: snapshot)
+        screener = ScreenerService(session=None)
+
+        started = time.perf_counter()
+        results = await screener.screen_stocks(min_price=40, max_rsi=70, min_volume=10_000)
+        elapsed = time.perf_counter() - started
+
+        expected = pd.DataFrame({k: snapshot.columns[k] for k in ("price", "rsi", "volume")})
+        expected = expected[(expected.price >= 40) & (expected.rsi <= 70) & (expected.volume >= 10_000)]
+        assert [r["volume"] for r in results] == expected["volume"].nlargest(50).tolist()
+        assert elapsed < 0.05
+
+
+class TestRefreshFromBarCache:
+    @pytest.mark.asyncio
+    async def test_build_then_incremental_refresh(self, db, bars):
+        db.add_all([MarketDataCache(**row) for row in bars.to_dict("records")])
+        await db.flush()
+
+        snapshot = UniverseSnapshot()
+        await snapshot.refresh(db)
+        assert sorted(snapshot.symbols) == ["AAPL", "JPM", "MSFT", "XOM"]
+        closes = bars[bars.symbol == "JPM"]["close"]
+        assert snapshot.columns["sma_50"][snapshot._rows["JPM"]] == pytest.approx(closes.tail(50).mean())
+
+        next_day = bars["date"].max() + timedelta(days=3)
+        db.add(MarketDataCache(symbol="JPM", date=next_day, open=1, high=2, low=1, close=2, volume=10))
+        await db.flush()
+        await snapshot.refresh(db)
+
+        row = snapshot._rows["JPM"]
+        assert snapshot._cache_through == next_day
+        assert snapshot.columns["price"][row] == 2
+        assert snapshot.columns["prev_close"][row] == pytest.approx(closes.iloc[-1])
+        assert snapshot.columns["sma_20"][row] == pytest.approx(pd.concat([closes, pd.Series([2.0])]).tail(20).mean())
+
+    @pytest.mark.asyncio
+    async def test_reads_only_the_configured_source(self, db, bars, monkeypatch):
+        db.add_all([MarketDataCache(**row, source="alpaca") for row in bars.to_dict("records")])
+        db.add_all([
+            MarketDataCache(**{**row, "close": row["close"] + 1000}, source="synthetic")
+            for row in bars.to_dict("records")
+        ])
+        await db.flush()
+        closes = bars[bars.symbol == "JPM"]["close"]
+
+        snapshot = UniverseSnapshot(source="alpaca")
+        await snapshot.refresh(db)
+        assert len(snapshot) == 4
+        assert snapshot.columns["price"][snapshot._rows["JPM"]] == pytest.approx(closes.iloc[-1])
+        assert snapshot.columns["sma_50"][snapshot._rows["JPM"]] == pytest.approx(closes.tail(50).mean())
+
+        monkeypatch.setattr(
+            "app.services.universe_snapshot.get_market_data_service",
+            lambda: type("Provider", (), {"source_name": "synthetic"})(),
+        )
+        snapshot = UniverseSnapshot()
+        await snapshot.refresh(db)
+        assert snapshot.source == "synthetic"
+        assert snapshot.columns["price"][snapshot._rows["JPM"]] == pytest.approx(closes.iloc[-1] + 1000)
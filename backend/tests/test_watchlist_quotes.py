@@ -0,0 +1,217 @@
+"""
+Tests for batched watchlist quotes and streamed price alerts.
+"""
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from sqlalchemy import select
+
+from app.models.notification import Notification
+from app.models.watchlist import PriceAlert, Watchlist, WatchlistItem
+from app.services.watchlist_quotes import AlertIndex, PriceAlertEvaluator, WatchlistQuoteService
+
+
+def snapshot(symbol, price, prev_close=100.0, volume=1000):
+    return {
+        "symbol": symbol,
+        "latest_trade": {"price": price, "size": 10, "timestamp": "2024-03-29T15:00:00+00:00"},
+        "latest_quote": None,
+        "minute_bar": None,
+        "daily_bar": {"open": prev_close, "high": price, "low": prev_close, "close": price,
+                      "volume": volume, "timestamp": "2024-03-29T00:00:00+00:00"},
+        "prev_daily_bar": {"open": prev_close, "high": prev_close, "low": prev_close, "close": prev_close,
+                           "volume": volume, "timestamp": "2024-03-28T00:00:00+00:00"},
+    }
+
+
+@pytest.fixture
+def market_data():
+    market_data = MagicMock()
+    market_data.get_snapshots = AsyncMock(
+        side_effect=lambda symbols: {s: snapshot(s, 100.0 + i) for i, s in enumerate(symbols)}
+    )
+    return market_data
+
+
+class TestAlertIndex:
+
+    def test_only_crossed_targets_trigger(self):
+        index = AlertIndex()
+        index.upsert("a1", "AAPL", "u1", "above", 180.0)
+        index.upsert("a2", "AAPL", "u1", "above", 170.0)
+        index.upsert("a3", "AAPL", "u2", "below", 140.0, "Buy the dip")
+        index.upsert("a4", "MSFT", "u1", "below", 300.0)
+
+        assert index.on_price("AAPL", 160.0) == []
+        assert index.on_price("TSLA", 1.0) == []
+
+        triggers = index.on_price("AAPL", 175.0)
+        assert [(t.alert_id, t.condition, t.target_price) for t in triggers] == [("a2", "above", 170.0)]
+
+        triggers = index.on_price("AAPL", 139.0)
+        assert [(t.alert_id, t.user_id, t.message) for t in triggers] == [("a3", "u2", "Buy the dip")]
+        assert triggers[0].price == 139.0
+        assert sorted(index.symbols()) == ["AAPL", "MSFT"]
+        assert len(index) == 2
+
+    def test_updates_replace_targets(self):
+        index = AlertIndex()
+        index.upsert("a1", "AAPL", "u1", "above", 180.0)
+        index.upsert("a1", "AAPL", "u1", "below", 150.0)
+        assert index.on_price("AAPL", 190.0) == []
+        assert [t.alert_id for t in index.on_price("AAPL", 150.0)] == ["a1"]
+
+        index.upsert("a2", "AAPL", "u1", "above", 180.0)
+        index.remove("a2")
+        assert index.on_price("AAPL", 200.0) == []
+        assert len(index) == 0
+
+
+class TestWatchlistQuoteService:
+
+    @pytest.mark.asyncio
+    async def test_symbols_are_quoted_with_one_snapshot_request(self, market_data):
+        service = WatchlistQuoteService(market_data=market_data)
+        symbols = [f"SYM{i}" for i in range(50)]
+
+        quotes = await service.get_quotes(symbols + symbols[:5])
+        assert market_data.get_snapshots.await_count == 1
+        assert market_data.get_snapshots.await_args.args[0] == symbols
+        assert list(quotes) == symbols
+        assert quotes["SYM1"]["price"] == 101.0
+        assert quotes["SYM1"]["change_percent"] == pytest.approx(1.0)
+
+        # Cached symbols are not requested again
+        await service.get_quotes(symbols[:10] + ["NEW"])
+        assert market_data.get_snapshots.await_count == 2
+        assert market_data.get_snapshots.await_args.args[0] == ["NEW"]
+        assert service.snapshot_requests == 2
+
+    @pytest.mark.asyncio
+    async def test_streamed_trades_update_cached_quotes(self, market_data):
+        stream_client = MagicMock()
+        stream_client.is_connected = True
+        subscriptions = set()
+        stream_client.get_subscriptions.side_effect = lambda: {"trades": list(subscriptions)}
+        stream_client.subscribe_trades = AsyncMock(side_effect=subscriptions.update)
+
+        service = WatchlistQuoteService(market_data=market_data, ttl=0.0)
+        await service.start(stream_client)
+        await service.get_quotes(["AAPL"])
+        assert subscriptions == {"AAPL"}
+
+        await service.on_trade({"symbol": "AAPL", "price": 110.0, "size": 5})
+        await service.on_trade({"symbol": "MSFT", "price": 1.0, "size": 5})
+        quotes = await service.get_quotes(["AAPL"])
+
+        # Served from the streamed cache despite the zero snapshot TTL
+        assert market_data.get_snapshots.await_count == 1
+        assert quotes["AAPL"]["price"] == 110.0
+        assert quotes["AAPL"]["change"] == pytest.approx(10.0)
+        assert quotes["AAPL"]["volume"] == 1005
+        await service.stop()
+
+    @pytest.mark.asyncio
+    async def test_failed_snapshot_request_returns_no_quotes(self):
+        market_data = MagicMock()
+        market_data.get_snapshots = AsyncMock(side_effect=RuntimeError("down"))
+        service = WatchlistQuoteService(market_data=market_data)
+        assert await service.get_quotes(["AAPL"]) == {}
+
+
+@pytest.fixture
+def evaluator(db):
+    @asynccontextmanager
+    async def session_factory():
+        yield db
+
+    return PriceAlertEvaluator(index=AlertIndex(), session_factory=session_factory)
+
+
+@pytest.mark.asyncio
+async def test_ticks_trigger_alerts_in_one_batch(db, committed_test_user, evaluator):
+    user_id = committed_test_user.id
+    alerts = [
+        PriceAlert(user_id=user_id, symbol="AAPL", condition="above", target_price=180.0),
+        PriceAlert(user_id=user_id, symbol="AAPL", condition="below", target_price=140.0, message="Buy"),
+        PriceAlert(user_id=user_id, symbol="MSFT", condition="above", target_price=400.0),
+        PriceAlert(user_id=user_id, symbol="MSFT", condition="below", target_price=1.0, is_active=False),
+    ]
+    db.add_all(alerts)
+    await db.flush()
+    await evaluator.load()
+    assert len(evaluator.index) == 3
+
+    await evaluator.on_trade({"symbol": "AAPL", "price": 185.0})
+    await evaluator.on_trade({"symbol": "AAPL", "price": 139.0})
+    await evaluator.on_trade({"symbol": "MSFT", "price": 0.5})
+    triggers = await evaluator.flush()
+
+    assert [(t.symbol, t.condition) for t in triggers] == [("AAPL", "above"), ("AAPL", "below")]
+    active = (await db.execute(select(PriceAlert).where(PriceAlert.is_active == True))).scalars().all()
+    assert [a.symbol for a in active] == ["MSFT"]
+    assert all(a.triggered_at is not None for a in alerts[:2])
+
+    notifications = (await db.execute(select(Notification))).scalars().all()
+    assert sorted(n.message for n in notifications) == ["AAPL traded at 185.00", "Buy"]
+    assert await evaluator.flush() == []
+
+
+@pytest.mark.asyncio
+async def test_alerts_changed_since_indexed_are_rechecked(db, committed_test_user, evaluator):
+    user_id = committed_test_user.id
+    retargeted = PriceAlert(user_id=user_id, symbol="AAPL", condition="above", target_price=180.0)
+    flipped = PriceAlert(user_id=user_id, symbol="AAPL", condition="below", target_price=140.0)
+    db.add_all([retargeted, flipped])
+    await db.flush()
+    await evaluator.load()
+
+    await evaluator.on_trade({"symbol": "AAPL", "price": 185.0})
+    await evaluator.on_trade({"symbol": "AAPL", "price": 139.0})
+    # Changed in the database by another worker before the flush
+    retargeted.target_price = 190.0
+    flipped.condition = "above"
+    await db.flush()
+
+    assert await evaluator.flush() == []
+    assert retargeted.is_active and flipped.is_active
+    assert (await db.execute(select(Notification))).scalars().all() == []
+
+
+@pytest.mark.asyncio
+async def test_watchlist_endpoints_include_quotes(client, auth_headers, committed_test_user, db, market_data):
+    await db.refresh(committed_test_user)
+    for name, symbols in [("Tech", ["AAPL", "MSFT"]), ("Banks", ["JPM", "AAPL"])]:
+        watchlist = Watchlist(user_id=committed_test_user.id, name=name)
+        watchlist.items = [WatchlistItem(symbol=symbol) for symbol in symbols]
+        db.add(watchlist)
+    await db.flush()
+
+    service = WatchlistQuoteService(market_data=market_data)
+    index = AlertIndex()
+    with patch("app.api.v1.watchlist.get_watchlist_quote_service", return_value=service), \
+            patch("app.api.v1.watchlist.get_alert_index", return_value=index):
+        response = await client.get("/api/v1/watchlists", headers=auth_headers)
+        assert response.status_code == 200
+        items = [item for w in response.json()["watchlists"] for item in w["items"]]
+        assert len(items) == 4
+        assert all(item["current_price"] is not None for item in items)
+        assert market_data.get_snapshots.await_count == 1
+
+        response = await client.post(
+            "/api/v1/watchlists/alerts", headers=auth_headers,
+            json={"symbol": "AAPL", "condition": "above", "target_price": 200.0},
+        )
+        assert response.status_code == 201
+        assert response.json()["id"] in index
+
+        response = await client.get("/api/v1/watchlists/alerts", headers=auth_headers)
+        alert = response.json()[0]
+        assert alert["current_price"] == 100.0
+        assert alert["distance_to_target"] == pytest.approx(100.0)
+        assert alert["distance_percent"] == pytest.approx(100.0)
+
+        response = await client.delete(f"/api/v1/watchlists/alerts/{alert['id']}", headers=auth_headers)
+        assert response.status_code == 204
+        assert len(index) == 0
@@ -0,0 +1,6 @@
+"""
+Performance benchmarks for strategies, indicators, scheduler evaluation
+paths and the backtest engine.
+
+Run with ``python -m benchmarks.run_benchmarks --help``.
+"""
@@ -0,0 +1,270 @@
+"""
+Benchmark Cases
+
+Defines the benchmark cases:
+
+- ``strategy.<Class>``: ``generate_signals`` for every BaseStrategy
+  subclass in ``src/strategies``
+- ``indicator.<name>``: every ``TechnicalIndicators.calculate_*`` method
+- ``scheduler.executor.<type>``: the StrategyExecutor evaluation used by
+  the APScheduler-based scheduler (bars list -> signal -> validation)
+- ``scheduler.signal_monitor.<type>``: the SignalMonitor evaluation used
+  by the live-trading StrategyScheduler (DataFrame -> bars -> signal)
+- ``backtest.engine``: ``BacktestEngine.run`` on preloaded data
+- ``startup.<target>``: cold import of an entry point in a fresh
+  interpreter (see importtime); independent of the bar count
+"""
+
+import asyncio
+import contextlib
+import importlib
+import io
+import inspect
+import logging
+import os
+import pkgutil
+import subprocess
+import sys
+import tempfile
+from types import SimpleNamespace
+from typing import Dict, List
+
+from benchmarks.harness import Benchmark, synthetic_ohlcv
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BACKEND_ROOT = os.path.join(REPO_ROOT, 'backend')
+
+# Live evaluation works on a rolling window, and both scheduler paths
+# build per-bar Python dicts, so they are not run at 1M bars
+SCHEDULER_MAX_BARS = 100_000
+
+# Model training dominates and grows superlinearly with the data
+ML_TRAINING_MAX_BARS = 10_000
+
+# Constructor overrides so strategies run offline and without side effects
+STRATEGY_KWARGS = {
+    'AdaptiveMLStrategy': lambda: {
+        'use_sentiment': False,
+        'model_path': os.path.join(tempfile.mkdtemp(prefix='bench-'), 'model.pkl'),
+    },
+}
+
+STRATEGY_MAX_BARS = {
+    'AdaptiveMLStrategy': ML_TRAINING_MAX_BARS,
+}
+
+SCHEDULER_STRATEGY_TYPES = [
+    'RSI',
+    'MACD',
+    'SMA_CROSSOVER',
+    'BOLLINGER_BANDS',
+    'MEAN_REVERSION',
+    'STOCHASTIC',
+    'KELTNER_CHANNEL',
+    'ATR_TRAILING_STOP',
+    'DONCHIAN_CHANNEL',
+    'ICHIMOKU_CLOUD',
+]
+
+_data_cache: Dict[int, object] = {}
+
+
+def get_data(n_bars: int):
+    """Synthetic bars for a size, generated once per process."""
+    if n_bars not in _data_cache:
+        _data_cache[n_bars] = synthetic_ohlcv(n_bars)
+    return _data_cache[n_bars]
+
+
+def _quiet():
+    """Silence per-bar logging from the code under test."""
+    logging.disable(logging.CRITICAL)
+
+
+def _ensure_paths():
+    if REPO_ROOT not in sys.path:
+        sys.path.insert(0, REPO_ROOT)
+    if BACKEND_ROOT not in sys.path:
+        sys.path.insert(0, BACKEND_ROOT)
+
+    # Backend settings are required at import time; nothing here connects
+    os.environ.setdefault('ENVIRONMENT', 'test')
+    os.environ.setdefault('DATABASE_URL', 'sqlite+aiosqlite:///:memory:')
+    os.environ.setdefault('REDIS_URL', 'redis://localhost:6379')
+    os.environ.setdefault('SECRET_KEY', 'benchmark-secret-key-at-least-32-characters')
+    os.environ.setdefault('ALPACA_API_KEY', 'benchmark')
+    os.environ.setdefault('ALPACA_SECRET_KEY', 'benchmark')
+
+
+def discover_strategies() -> List[type]:
+    """Find every concrete BaseStrategy subclass in src/strategies."""
+    _ensure_paths()
+    import src.strategies as package
+    from src.strategies.base_strategy import BaseStrategy
+
+    classes = {}
+    for module_info in pkgutil.iter_modules(package.__path__):
+        module = importlib.import_module(f"src.strategies.{module_info.name}")
+        for _, obj in inspect.getmembers(module, inspect.isclass):
+            if (
+                issubclass(obj, BaseStrategy)
+                and obj is not BaseStrategy
+                and not inspect.isabstract(obj)
+                and obj.__module__ == module.__name__
+            ):
+                classes[obj.__name__] = obj
+    return [classes[name] for name in sorted(classes)]
+
+
+def _strategy_case(cls: type) -> Benchmark:
+    def setup(n_bars: int):
+        data = get_data(n_bars)
+        kwargs = STRATEGY_KWARGS.get(cls.__name__, dict)()
+        strategy = cls(**kwargs)
+
+        def run():
+            # Some strategies print training progress
+            with contextlib.redirect_stdout(io.StringIO()):
+                strategy.generate_signals(data)
+
+        return run
+
+    return Benchmark(
+        name=f"strategy.{cls.__name__}",
+        group='strategy',
+        setup=setup,
+        max_bars=STRATEGY_MAX_BARS.get(cls.__name__)
+    )
+
+
+def _indicator_cases() -> List[Benchmark]:
+    _ensure_paths()
+    from app.strategies.indicators import TechnicalIndicators
+
+    cases = []
+    for name, func in inspect.getmembers(TechnicalIndicators, inspect.isfunction):
+        if not name.startswith('calculate_') or name == 'calculate_all_for_strategy':
+            continue
+
+        def setup(n_bars: int, func=func):
+            data = get_data(n_bars)
+            return lambda: func(data)
+
+        cases.append(Benchmark(
+            name=f"indicator.{name[len('calculate_'):]}",
+            group='indicator',
+            setup=setup
+        ))
+    return cases
+
+
+def _as_bars(data) -> List[Dict]:
+    """Bars in the list-of-dicts form returned by the market data client."""
+    frame = data.reset_index(names='timestamp')
+    return frame.to_dict('records')
+
+
+def _executor_case(strategy_type: str) -> Benchmark:
+    _ensure_paths()
+    from app.strategies.signal_generator import SignalGenerator
+
+    def setup(n_bars: int):
+        bars = _as_bars(get_data(n_bars))
+        generator = SignalGenerator()
+
+        def run():
+            signal_type, _, _, _ = generator.generate_signal(strategy_type, {}, bars, False)
+            generator.validate_signal(signal_type, False, 0, 10, 0.0, 1000.0, 0, 3)
+
+        return run
+
+    return Benchmark(
+        name=f"scheduler.executor.{strategy_type.lower()}",
+        group='scheduler',
+        setup=setup,
+        max_bars=SCHEDULER_MAX_BARS
+    )
+
+
+def _signal_monitor_case(strategy_type: str) -> Benchmark:
+    _ensure_paths()
+    from unittest.mock import MagicMock
+    from app.services.signal_monitor import SignalMonitor
+
+    def setup(n_bars: int):
+        data = get_data(n_bars)
+        monitor = SignalMonitor(MagicMock())
+
+        async def get_market_data(symbol, days=60):
+            return data
+
+        async def has_open_position(live_strategy, symbol):
+            return False
+
+        monitor._get_market_data = get_market_data
+        monitor._has_open_position = has_open_position
+
+        strategy = SimpleNamespace(
+            name=strategy_type.replace('_', ' ').title(),
+            parameters={}
+        )
+
+        def run():
+            live_strategy = SimpleNamespace(state={})
+            asyncio.run(monitor._check_symbol_signal(live_strategy, strategy, 'BENCH'))
+
+        return run
+
+    return Benchmark(
+        name=f"scheduler.signal_monitor.{strategy_type.lower()}",
+        group='scheduler',
+        setup=setup,
+        max_bars=SCHEDULER_MAX_BARS
+    )
+
+
+def _backtest_case() -> Benchmark:
+    _ensure_paths()
+    from src.backtesting.backtest_engine import BacktestEngine
+    from src.strategies.sma_crossover import SMACrossoverStrategy
+
+    def setup(n_bars: int):
+        data = get_data(n_bars)
+        engine = BacktestEngine(
+            strategy=SMACrossoverStrategy(short_window=20, long_window=50),
+            symbol='BENCH',
+            start_date=str(data.index[0].date()),
+            end_date=str(data.index[-1].date())
+        )
+        return lambda: engine.run(data)
+
+    return Benchmark(name='backtest.engine', group='backtest', setup=setup)
+
+
+def _startup_case(target: str) -> Benchmark:
+    from benchmarks.importtime import STARTUP_TARGETS, startup_env
+
+    cwd, module = STARTUP_TARGETS[target]
+
+    def setup(n_bars: int):
+        command = [sys.executable, '-c', f'import {module}']
+        env = startup_env()
+        return lambda: subprocess.run(command, cwd=cwd, env=env, check=True,
+                                      capture_output=True)
+
+    # Only run at the smallest size; the data size does not matter
+    return Benchmark(name=f"startup.{target}", group='startup', setup=setup, max_bars=1_000)
+
+
+def build_cases() -> List[Benchmark]:
+    """Build every benchmark case."""
+    _quiet()
+    cases = [_strategy_case(cls) for cls in discover_strategies()]
+    cases.extend(_indicator_cases())
+    cases.extend(_executor_case(t) for t in SCHEDULER_STRATEGY_TYPES)
+    cases.extend(_signal_monitor_case(t) for t in SCHEDULER_STRATEGY_TYPES)
+    cases.append(_backtest_case())
+
+    from benchmarks.importtime import STARTUP_TARGETS
+    cases.extend(_startup_case(t) for t in STARTUP_TARGETS)
+    return cases
@@ -0,0 +1,210 @@
+"""
+Benchmark Harness
+
+Timing, peak-memory measurement and baseline comparison for the benchmark
+suite. Results are keyed as ``<case>@<bars>`` and stored in a JSON baseline
+so later runs can be checked for regressions.
+"""
+
+import gc
+import json
+import os
+import platform
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass
+class Benchmark:
+    """A benchmark case run at several data sizes."""
+
+    name: str
+    group: str
+    # Called with the bar count; returns the zero-argument function to time
+    setup: Callable[[int], Callable[[], object]]
+    # Largest size the case is run at (None = no limit)
+    max_bars: Optional[int] = None
+
+
+@dataclass
+class BenchmarkResult:
+    """Measurement of one case at one size."""
+
+    name: str
+    bars: int
+    seconds: float
+    peak_mb: float
+    repeats: int
+    timings: List[float] = field(default_factory=list)
+
+    @property
+    def key(self) -> str:
+        return result_key(self.name, self.bars)
+
+    def to_dict(self) -> Dict:
+        return {
+            'seconds': round(self.seconds, 6),
+            'peak_mb': round(self.peak_mb, 3),
+            'repeats': self.repeats,
+        }
+
+
+@dataclass
+class Regression:
+    """A case that ran slower than its baseline."""
+
+    key: str
+    baseline_seconds: float
+    seconds: float
+
+    @property
+    def ratio(self) -> float:
+        return self.seconds / self.baseline_seconds if self.baseline_seconds else float('inf')
+
+
+def result_key(name: str, bars: int) -> str:
+    return f"{name}@{bars}"
+
+
+def synthetic_ohlcv(n_bars: int, seed: int = 42, freq: str = 'min') -> pd.DataFrame:
+    """
+    Generate deterministic OHLCV bars from a geometric random walk.
+
+    Minute spacing keeps 1M-bar frames inside the pandas timestamp range.
+
+    Args:
+        n_bars: Number of bars
+        seed: Random seed
+        freq: Bar spacing
+
+    Returns:
+        DataFrame with open, high, low, close and volume columns
+    """
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(0.0002, 0.01, n_bars)
+    close = 100 * np.exp(np.cumsum(returns))
+
+    open_prices = np.empty(n_bars)
+    open_prices[0] = close[0]
+    open_prices[1:] = close[:-1]
+
+    spread = np.abs(rng.normal(0, 0.005, (2, n_bars)))
+    high = np.maximum(open_prices, close) * (1 + spread[0])
+    low = np.minimum(open_prices, close) * (1 - spread[1])
+    volume = rng.integers(1_000_000, 5_000_000, n_bars).astype(float)
+
+    index = pd.date_range('2000-01-03', periods=n_bars, freq=freq)
+    return pd.DataFrame({
+        'open': open_prices,
+        'high': high,
+        'low': low,
+        'close': close,
+        'volume': volume
+    }, index=index)
+
+
+def measure(benchmark: Benchmark, bars: int, repeats: int = 3) -> BenchmarkResult:
+    """
+    Time a case and record its peak traced memory.
+
+    Timing uses the best of ``repeats`` runs without tracing; peak memory
+    comes from one extra run under tracemalloc, which is slower and would
+    distort the timings.
+    """
+    timings = []
+    for _ in range(repeats):
+        func = benchmark.setup(bars)
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    func = benchmark.setup(bars)
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return BenchmarkResult(
+        name=benchmark.name,
+        bars=bars,
+        seconds=min(timings),
+        peak_mb=peak / 1024 / 1024,
+        repeats=repeats,
+        timings=timings
+    )
+
+
+def load_baseline(path: str) -> Dict[str, Dict]:
+    """Load stored results keyed by ``<case>@<bars>`` (empty if missing)."""
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f).get('results', {})
+
+
+def save_baseline(path: str, results: List[BenchmarkResult], merge: bool = True):
+    """
+    Write results to a JSON baseline.
+
+    With ``merge`` the new results replace matching keys and other stored
+    results are kept, so a partial run does not drop the rest.
+    """
+    stored = load_baseline(path) if merge else {}
+    stored.update({r.key: r.to_dict() for r in results})
+
+    payload = {
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'results': dict(sorted(stored.items())),
+    }
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, 'w') as f:
+        json.dump(payload, f, indent=2)
+
+
+def compare(
+    results: List[BenchmarkResult],
+    baseline: Dict[str, Dict],
+    threshold: float = 0.25,
+    min_seconds: float = 0.001
+) -> List[Regression]:
+    """
+    Find cases slower than the baseline by more than ``threshold``.
+
+    Args:
+        results: Current results
+        baseline: Stored results from load_baseline
+        threshold: Allowed slowdown as a fraction (0.25 = 25% slower)
+        min_seconds: Ignore cases whose baseline is below this, where
+            timer noise dominates
+
+    Returns:
+        List of regressions (empty when everything is within threshold)
+    """
+    regressions = []
+    for result in results:
+        stored = baseline.get(result.key)
+        if not stored:
+            continue
+        baseline_seconds = stored['seconds']
+        if baseline_seconds < min_seconds:
+            continue
+        if result.seconds > baseline_seconds * (1 + threshold):
+            regressions.append(Regression(result.key, baseline_seconds, result.seconds))
+    return regressions
@@ -0,0 +1,168 @@
+"""
+Startup Import Report
+
+Imports each entry point in a fresh interpreter under ``-X importtime`` and
+summarizes where the cold-start time goes, so a new module-level import of
+a heavy dependency shows up before it reaches every worker and CLI run.
+
+Usage:
+    # Summary for every entry point
+    python -m benchmarks.importtime
+
+    # Only the API, with the 20 heaviest packages
+    python -m benchmarks.importtime --target api --top 20
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BACKEND_ROOT = os.path.join(REPO_ROOT, 'backend')
+
+# Target name -> (working directory, module imported at startup)
+STARTUP_TARGETS: Dict[str, Tuple[str, str]] = {
+    'cli': (REPO_ROOT, 'main'),
+    'api': (BACKEND_ROOT, 'app.main'),
+    'data_fetcher': (REPO_ROOT, 'src.data.data_fetcher'),
+    'backtest_runner': (BACKEND_ROOT, 'app.backtesting.runner'),
+}
+
+# Backend settings are required at import time; nothing here connects
+BACKEND_ENV = {
+    'ENVIRONMENT': 'test',
+    'DATABASE_URL': 'sqlite+aiosqlite:///:memory:',
+    'REDIS_URL': 'redis://localhost:6379',
+    'SECRET_KEY': 'benchmark-secret-key-at-least-32-characters',
+    'ALPACA_API_KEY': 'benchmark',
+    'ALPACA_SECRET_KEY': 'benchmark',
+}
+
+
+@dataclass
+class ImportRecord:
+    """One line of ``-X importtime`` output."""
+
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+    @property
+    def package(self) -> str:
+        return self.module.split('.')[0]
+
+
+@dataclass
+class StartupReport:
+    """Import cost of one entry point."""
+
+    target: str
+    module: str
+    seconds: float
+    packages: List[Tuple[str, float]]
+    error: Optional[str] = None
+
+
+def parse_importtime(stderr: str) -> List[ImportRecord]:
+    """
+    Parse ``-X importtime`` lines from a process's stderr.
+
+    Lines look like ``import time:       123 |        456 |   pkg.mod``,
+    where the indentation of the module name is its nesting depth. Other
+    stderr output is ignored.
+    """
+    records = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        parts = line[len('import time:'):].split('|')
+        if len(parts) != 3 or not parts[0].strip().isdigit():
+            continue  # header line
+        name = parts[2].rstrip()
+        stripped = name.lstrip()
+        records.append(ImportRecord(
+            module=stripped,
+            self_us=int(parts[0]),
+            cumulative_us=int(parts[1]),
+            depth=(len(name) - len(stripped) - 1) // 2,
+        ))
+    return records
+
+
+def summarize(records: List[ImportRecord], top: int = 10) -> Tuple[float, List[Tuple[str, float]]]:
+    """
+    Total import time and the heaviest top-level packages.
+
+    Package time is the sum of self time over all of its modules, so a
+    package is charged for its own code but not for the dependencies it
+    pulls in (those are charged to themselves).
+
+    Returns:
+        (total seconds, [(package, seconds), ...] heaviest first)
+    """
+    total = sum(r.cumulative_us for r in records if r.depth == 0)
+    by_package: Dict[str, int] = defaultdict(int)
+    for record in records:
+        by_package[record.package] += record.self_us
+    heaviest = sorted(by_package.items(), key=lambda item: item[1], reverse=True)[:top]
+    return total / 1e6, [(name, us / 1e6) for name, us in heaviest]
+
+
+def import_command(module: str) -> List[str]:
+    return [sys.executable, '-X', 'importtime', '-c', f'import {module}']
+
+
+def startup_env() -> Dict[str, str]:
+    """Environment for the child interpreter (backend defaults filled in)."""
+    env = dict(os.environ)
+    for key, value in BACKEND_ENV.items():
+        env.setdefault(key, value)
+    return env
+
+
+def profile_startup(target: str, top: int = 10, timeout: float = 120) -> StartupReport:
+    """Import a target in a fresh interpreter and summarize the cost."""
+    cwd, module = STARTUP_TARGETS[target]
+    process = subprocess.run(
+        import_command(module),
+        cwd=cwd,
+        env=startup_env(),
+        capture_output=True,
+        text=True,
+        timeout=timeout,
+    )
+    seconds, packages = summarize(parse_importtime(process.stderr), top)
+    error = None
+    if process.returncode != 0:
+        error = process.stderr.strip().splitlines()[-1] if process.stderr.strip() else 'failed'
+    return StartupReport(target, module, seconds, packages, error)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Report cold-start import time')
+    parser.add_argument('--target', nargs='+', choices=list(STARTUP_TARGETS),
+                        help='Only report these entry points')
+    parser.add_argument('--top', type=int, default=10,
+                        help='Heaviest packages to list per target')
+    args = parser.parse_args(argv)
+
+    failed = False
+    for target in args.target or STARTUP_TARGETS:
+        report = profile_startup(target, args.top)
+        print(f"{report.target} (import {report.module}): {report.seconds:.3f}s")
+        if report.error:
+            failed = True
+            print(f"  FAILED: {report.error}")
+        for package, seconds in report.packages:
+            print(f"  {package:<30} {seconds:>8.3f}s")
+        print()
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,119 @@
+"""
+Benchmark Runner
+
+Runs the benchmark suite on deterministic synthetic OHLCV data and compares
+the timings against a stored JSON baseline.
+
+Usage:
+    # Record a baseline on this machine
+    python -m benchmarks.run_benchmarks --save
+
+    # Check for regressions (exit code 1 if any case fails or is >25% slower)
+    python -m benchmarks.run_benchmarks --threshold 0.25
+
+    # Only strategies and indicators, small sizes
+    python -m benchmarks.run_benchmarks --group strategy indicator --sizes 1000 10000
+
+    # Cold-start import time of the CLI and API (see benchmarks.importtime)
+    python -m benchmarks.run_benchmarks --group startup --sizes 1000
+"""
+
+import argparse
+import fnmatch
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.cases import build_cases
+from benchmarks.harness import compare, load_baseline, measure, result_key, save_baseline
+
+DEFAULT_SIZES = [1_000, 10_000, 1_000_000]
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baseline.json')
+
+# Sizes at or above this are timed once; a single run already takes seconds
+LARGE_SIZE = 1_000_000
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Run performance benchmarks')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES,
+                        help='Bar counts to run each case at')
+    parser.add_argument('--group', nargs='+',
+                        choices=['strategy', 'indicator', 'scheduler', 'backtest', 'startup'],
+                        help='Only run these groups')
+    parser.add_argument('--filter', default='*',
+                        help='Glob on case names, e.g. "strategy.*"')
+    parser.add_argument('--repeats', type=int, default=3,
+                        help='Timed runs per case (best is kept)')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE,
+                        help='Baseline JSON path')
+    parser.add_argument('--save', action='store_true',
+                        help='Store results in the baseline instead of failing on regressions')
+    parser.add_argument('--threshold', type=float, default=0.25,
+                        help='Allowed slowdown vs baseline as a fraction')
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+
+    cases = [
+        case for case in build_cases()
+        if (not args.group or case.group in args.group)
+        and fnmatch.fnmatch(case.name, args.filter)
+    ]
+    baseline = load_baseline(args.baseline)
+
+    print(f"{'case':<45} {'bars':>9} {'seconds':>10} {'peak MB':>9} {'vs base':>8}")
+    print('-' * 85)
+
+    results = []
+    failures = []
+    for bars in sorted(args.sizes):
+        for case in cases:
+            if case.max_bars is not None and bars > case.max_bars:
+                continue
+
+            repeats = 1 if bars >= LARGE_SIZE else args.repeats
+            try:
+                result = measure(case, bars, repeats)
+            except Exception as e:
+                print(f"{case.name:<45} {bars:>9} FAILED: {e}")
+                failures.append(result_key(case.name, bars))
+                continue
+            results.append(result)
+
+            stored = baseline.get(result_key(case.name, bars))
+            delta = (
+                f"{(result.seconds / stored['seconds'] - 1) * 100:+.0f}%"
+                if stored and stored['seconds'] else ''
+            )
+            print(f"{case.name:<45} {bars:>9} {result.seconds:>10.4f} "
+                  f"{result.peak_mb:>9.1f} {delta:>8}")
+
+    status = 0
+    if args.save:
+        save_baseline(args.baseline, results)
+        print(f"\nSaved {len(results)} results to {args.baseline}")
+    elif not baseline:
+        print(f"\nNo baseline at {args.baseline}; run with --save to record one")
+    else:
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) above {args.threshold:.0%}:")
+            for regression in regressions:
+                print(f"  {regression.key}: {regression.baseline_seconds:.4f}s -> "
+                      f"{regression.seconds:.4f}s ({regression.ratio:.2f}x)")
+            status = 1
+        else:
+            print(f"\nNo regressions above {args.threshold:.0%}")
+
+    if failures:
+        print(f"\n{len(failures)} case(s) failed: {', '.join(failures)}")
+        status = 1
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
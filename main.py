@@ -13,12 +13,10 @@ from datetime import datetime, timedelta
 # Add src to path
 sys.path.append('.')
 
-from src.strategies.sma_crossover import SMACrossoverStrategy
-from src.strategies.rsi_strategy import RSIStrategy
-from src.strategies.macd_strategy import MACDStrategy
-from src.backtesting.backtest_engine import BacktestEngine
-from src.trading.trader import LiveTrader
-from src.utils.visualizer import Visualizer
+# Strategies, the backtest engine, the live trader and the plotting code are
+# imported inside the command that needs them, so `--help` and argument
+# errors do not pay for pandas, matplotlib or the broker SDK.
+from src.strategies.registry import create_strategy
 
 
 def setup_logging(level: str = 'INFO'):
@@ -39,24 +37,29 @@ def setup_logging(level: str = 'INFO'):
 
 def backtest_command(args):
     """Run backtesting."""
+    from src.backtesting.backtest_engine import BacktestEngine
+
     print("\n" + "="*60)
     print("BACKTESTING MODE")
     print("="*60)
     
     # Select strategy
     if args.strategy == 'sma':
-        strategy = SMACrossoverStrategy(
+        strategy = create_strategy(
+            'sma_crossover',
             short_window=args.short_window,
             long_window=args.long_window
         )
     elif args.strategy == 'rsi':
-        strategy = RSIStrategy(
+        strategy = create_strategy(
+            'rsi',
             period=args.rsi_period,
             oversold=args.oversold,
             overbought=args.overbought
         )
     elif args.strategy == 'macd':
-        strategy = MACDStrategy(
+        strategy = create_strategy(
+            'macd',
             fast_period=args.macd_fast,
             slow_period=args.macd_slow,
             signal_period=args.macd_signal
@@ -98,18 +101,22 @@ def backtest_command(args):
 
 def live_trade_command(args):
     """Run live trading."""
+    from src.trading.trader import LiveTrader
+
     print("\n" + "="*60)
     print("LIVE TRADING MODE")
     print("="*60)
     
     # Select strategy
     if args.strategy == 'sma':
-        strategy = SMACrossoverStrategy(
+        strategy = create_strategy(
+            'sma_crossover',
             short_window=args.short_window,
             long_window=args.long_window
         )
     elif args.strategy == 'rsi':
-        strategy = RSIStrategy(
+        strategy = create_strategy(
+            'rsi',
             period=args.rsi_period,
             oversold=args.oversold,
             overbought=args.overbought
@@ -155,16 +162,18 @@ def live_trade_command(args):
 
 def compare_command(args):
     """Compare multiple strategies."""
+    from src.backtesting.backtest_engine import BacktestEngine
+
     print("\n" + "="*60)
     print("STRATEGY COMPARISON")
     print("="*60)
     
     # Define strategies to compare
     strategies = {
-        'SMA(50,200)': SMACrossoverStrategy(short_window=50, long_window=200),
-        'SMA(20,50)': SMACrossoverStrategy(short_window=20, long_window=50),
-        'RSI(14)': RSIStrategy(period=14, oversold=30, overbought=70),
-        'MACD(12,26,9)': MACDStrategy(fast_period=12, slow_period=26, signal_period=9)
+        'SMA(50,200)': create_strategy('sma_crossover', short_window=50, long_window=200),
+        'SMA(20,50)': create_strategy('sma_crossover', short_window=20, long_window=50),
+        'RSI(14)': create_strategy('rsi', period=14, oversold=30, overbought=70),
+        'MACD(12,26,9)': create_strategy('macd', fast_period=12, slow_period=26, signal_period=9)
     }
     
     print(f"Symbol: {args.symbol}")
@@ -200,6 +209,7 @@ def compare_command(args):
     # Plot comparison
     if args.plot:
         try:
+            from src.utils.visualizer import Visualizer
             viz = Visualizer()
             viz.plot_strategy_comparison(results, title=f"Strategy Comparison - {args.symbol}")
         except Exception as e:
@@ -30,6 +30,7 @@ from src.strategies.ml_strategy import MLStrategy
 from src.strategies.adaptive_ml_strategy import AdaptiveMLStrategy
 from src.backtesting.backtest_engine import BacktestEngine
 from src.data.data_fetcher import DataFetcher
+from src.data.feature_store import get_feature_store
 from src.utils.visualizer import Visualizer
 
 # Page configuration
@@ -212,7 +213,8 @@ def create_strategy(strategy_name, show_params=True):
             ml_threshold = st.sidebar.slider("Confidence Threshold", 0.3, 0.9, 0.6, 0.1)
         else:
             ml_short, ml_long, ml_threshold = 10, 30, 0.6
-        return MLStrategy(short_period=ml_short, long_period=ml_long, threshold=ml_threshold)
+        return MLStrategy(short_period=ml_short, long_period=ml_long, threshold=ml_threshold,
+                          feature_store=get_feature_store())
     
     elif strategy_name == "Adaptive ML":
         if show_params:
@@ -221,7 +223,10 @@ def create_strategy(strategy_name, show_params=True):
                 help="Enable sentiment analysis (requires API keys in config/sentiment_config.py)")
         else:
             ada_confidence, ada_sentiment = 0.6, False
-        return AdaptiveMLStrategy(confidence_threshold=ada_confidence, use_sentiment=ada_sentiment)
+        # With a feature store the backtest sets the symbol, which would also
+        # turn on sentiment features
+        return AdaptiveMLStrategy(confidence_threshold=ada_confidence, use_sentiment=ada_sentiment,
+                                  feature_store=None if ada_sentiment else get_feature_store())
 
 if mode == "Single Strategy":
     strategy = create_strategy(strategy_type, show_params=True)
@@ -17,7 +17,7 @@ import subprocess
 import os
 import signal
 
-from src.trading.state_manager import StateManager
+from src.trading.state_manager import get_state_manager
 
 # Page configuration
 st.set_page_config(
@@ -30,8 +30,8 @@ st.title("🤖 Automated Live Trading (V2)")
 st.markdown("### Continuous Background Trading with Persistent State")
 st.markdown("---")
 
-# Initialize state manager
-state_manager = StateManager()
+# Shared across reruns, so its connections and cache persist
+state_manager = get_state_manager()
 
 # Sidebar Configuration
 st.sidebar.header("⚙️ Trading Configuration")
@@ -6,27 +6,83 @@ Analyzes market sentiment from multiple sources:
 - Social media (Twitter/Reddit)
 - Financial news sentiment
 - Market mood indicators
+
+Upstream requests share a pooled HTTP session with timeouts, batches are
+fetched concurrently with a bounded number of workers, and results are
+cached on disk per symbol and day:
+
+    <cache_dir>/<SYMBOL>.json   daily sentiment and recent snapshots
+    <cache_dir>/quota.json      upstream calls per provider and day
+
+Days that had ended when they were fetched never expire; today's sentiment
+and snapshots expire after ``cache_ttl`` seconds.
 """
 
+import os
+import json
+import importlib.util
+import threading
 import pandas as pd
 import numpy as np
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
 from typing import Dict, List, Optional
 import logging
 
-try:
-    from textblob import TextBlob
-    TEXTBLOB_AVAILABLE = True
-except ImportError:
-    TEXTBLOB_AVAILABLE = False
+# TextBlob (and NLTK behind it) is slow to import; it is imported when
+# text is first scored
+TEXTBLOB_AVAILABLE = importlib.util.find_spec('textblob') is not None
 
 try:
     import requests
+    from requests.adapters import HTTPAdapter
     REQUESTS_AVAILABLE = True
 except ImportError:
     REQUESTS_AVAILABLE = False
 
 
+# Columns of the daily sentiment series
+SENTIMENT_COLUMNS = (
+    'overall_sentiment', 'news_sentiment', 'headline_sentiment',
+    'sentiment_change', 'news_volume', 'positive_ratio',
+)
+
+# Free tier requests per day
+DEFAULT_DAILY_QUOTAS = {
+    'alpha_vantage': 25,
+    'newsapi': 100,
+}
+
+NEUTRAL_DAY = {
+    'overall_sentiment': 0.0,
+    'news_sentiment': 0.0,
+    'headline_sentiment': 0.0,
+    'sentiment_change': 0.0,
+    'news_volume': 0,
+    'positive_ratio': 0.5,
+}
+
+
+# Most articles a provider returns per request
+MAX_PAGE_SIZES = {
+    'alpha_vantage': 1000,
+    'newsapi': 100,
+}
+
+# Articles requested per sentiment history request
+HISTORY_PAGE_SIZE = 1000
+
+# Score above which an article counts as positive, by provider
+POSITIVE_THRESHOLDS = {
+    'alpha_vantage': 0.05,
+    'newsapi': 0.1,
+}
+
+
+class QuotaExceeded(Exception):
+    """Raised when a provider's daily request quota is used up."""
+
+
 class SentimentAnalyzer:
     """
     Analyze sentiment from multiple sources to enhance trading predictions.
@@ -35,7 +91,13 @@ class SentimentAnalyzer:
     def __init__(
         self,
         news_api_key: Optional[str] = None,
-        alpha_vantage_key: Optional[str] = None
+        alpha_vantage_key: Optional[str] = None,
+        cache_dir: str = 'data/sentiment',
+        cache_ttl: int = 3600,
+        max_concurrency: int = 8,
+        timeout: float = 10.0,
+        daily_quotas: Optional[Dict[str, int]] = None,
+        max_history_days: int = 90
     ):
         """
         Initialize Sentiment Analyzer.
@@ -43,16 +105,41 @@ class SentimentAnalyzer:
         Args:
             news_api_key: API key for NewsAPI (get free at newsapi.org)
             alpha_vantage_key: API key for Alpha Vantage sentiment
+            cache_dir: Directory of the on-disk sentiment cache
+            cache_ttl: Seconds before today's cached sentiment is refetched
+            max_concurrency: Symbols fetched at once by get_batch_sentiment
+            timeout: Upstream request timeout in seconds
+            daily_quotas: Requests per day by provider ('alpha_vantage', 'newsapi')
+            max_history_days: Oldest day (before today) fetched for sentiment history
         """
         self.logger = logging.getLogger(__name__)
         self.news_api_key = news_api_key
         self.alpha_vantage_key = alpha_vantage_key
+        self.cache_dir = cache_dir
+        self.cache_ttl = cache_ttl
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.daily_quotas = {**DEFAULT_DAILY_QUOTAS, **(daily_quotas or {})}
+        self.max_history_days = max_history_days
+        os.makedirs(self.cache_dir, exist_ok=True)
         
         if not TEXTBLOB_AVAILABLE:
             self.logger.warning("TextBlob not available. Install: pip install textblob")
         
+        # Pooled connections shared by all fetches
+        self.session = None
+        if REQUESTS_AVAILABLE:
+            self.session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max_concurrency)
+            self.session.mount('https://', adapter)
+        
         # Cache sentiment data
         self.sentiment_cache = {}
+        self._symbol_cache: Dict[str, Dict] = {}
+        self._symbol_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._quota_file = os.path.join(self.cache_dir, 'quota.json')
+        self._quota_usage = self._load_json(self._quota_file)
     
     def get_stock_sentiment(
         self,
@@ -69,6 +156,10 @@ class SentimentAnalyzer:
         Returns:
             Dictionary with sentiment scores
         """
+        cached = self._get_snapshot(symbol, days_back)
+        if cached is not None:
+            return cached
+
         sentiments = {
             'news_sentiment': 0.0,
             'headline_sentiment': 0.0,
@@ -102,6 +193,7 @@ class SentimentAnalyzer:
                 'sentiments': sentiments,
                 'timestamp': datetime.now()
             }
+            self._save_snapshot(symbol, days_back, sentiments)
             
         except Exception as e:
             self.logger.error(f"Error getting sentiment for {symbol}: {e}")
@@ -123,126 +215,143 @@ class SentimentAnalyzer:
         Returns:
             Dict with sentiment scores
         """
-        # Try Alpha Vantage first (includes sentiment)
+        # Try Alpha Vantage first (includes sentiment), then NewsAPI with
+        # TextBlob analysis
+        end = datetime.now()
+        articles = self._fetch_articles(symbol, end - timedelta(days=days_back), end, limit=50)
+        if articles is not None:
+            provider, items = articles
+            return self._summarize_articles(items, POSITIVE_THRESHOLDS[provider])
+        
+        # If no APIs available, use simulated sentiment
+        return self._get_simulated_sentiment(symbol)
+
+    def _fetch_articles(self, symbol: str, start: datetime, end: datetime, limit: int, newest_first: bool = False):
+        """
+        Fetch scored articles from the first provider that answers.
+
+        Returns:
+            (provider, articles) or None if no provider is available
+        """
         if self.alpha_vantage_key:
             try:
-                return self._get_alpha_vantage_sentiment(symbol)
+                return 'alpha_vantage', self._get_alpha_vantage_articles(symbol, start, end, limit)
             except Exception as e:
                 self.logger.error(f"Alpha Vantage sentiment failed: {e}")
         
-        # Fallback to NewsAPI with TextBlob analysis
         if self.news_api_key and TEXTBLOB_AVAILABLE and REQUESTS_AVAILABLE:
             try:
-                return self._get_newsapi_sentiment(symbol, days_back)
+                return 'newsapi', self._get_newsapi_articles(symbol, start, end, limit, newest_first)
             except Exception as e:
                 self.logger.error(f"NewsAPI sentiment failed: {e}")
         
-        # If no APIs available, use simulated sentiment
-        return self._get_simulated_sentiment(symbol)
+        return None
     
-    def _get_alpha_vantage_sentiment(self, symbol: str) -> Dict[str, float]:
-        """Get sentiment from Alpha Vantage News Sentiment API."""
-        url = f"https://www.alphavantage.co/query"
+    def _get_alpha_vantage_articles(
+        self,
+        symbol: str,
+        start: datetime,
+        end: datetime,
+        limit: int = 50
+    ) -> List[Dict]:
+        """Get scored articles from Alpha Vantage News Sentiment API (newest first)."""
+        url = "https://www.alphavantage.co/query"
         params = {
             'function': 'NEWS_SENTIMENT',
             'tickers': symbol,
+            'time_from': start.strftime('%Y%m%dT%H%M'),
+            'time_to': end.strftime('%Y%m%dT%H%M'),
+            'sort': 'LATEST',
             'apikey': self.alpha_vantage_key,
-            'limit': 50
+            'limit': min(limit, MAX_PAGE_SIZES['alpha_vantage'])
         }
         
-        response = requests.get(url, params=params)
-        data = response.json()
+        data = self._request('alpha_vantage', url, params)
         
         if 'feed' not in data:
+            # Rate limit replies carry a note instead of a feed
+            if 'Note' in data or 'Information' in data:
+                self._exhaust_quota('alpha_vantage')
             raise ValueError("No news data in response")
         
-        sentiments = []
-        headlines = []
-        
+        articles = []
         for article in data['feed']:
             # Get ticker-specific sentiment
-            for ticker_sent in article.get('ticker_sentiment', []):
-                if ticker_sent.get('ticker') == symbol:
-                    sent_score = float(ticker_sent.get('ticker_sentiment_score', 0))
-                    sentiments.append(sent_score)
-            
-            # Analyze headline
-            headline = article.get('title', '')
-            if headline:
-                headlines.append(headline)
-        
-        # Calculate scores
-        news_sentiment = np.mean(sentiments) if sentiments else 0.0
-        headline_sentiment = self._analyze_headlines(headlines)
-        
-        positive_count = sum(1 for s in sentiments if s > 0.05)
-        negative_count = sum(1 for s in sentiments if s < -0.05)
-        total = len(sentiments)
-        
-        return {
-            'news_sentiment': news_sentiment,
-            'headline_sentiment': headline_sentiment,
-            'news_volume': total,
-            'positive_ratio': positive_count / total if total > 0 else 0.5,
-            'sentiment_change': self._calculate_sentiment_trend(sentiments)
-        }
+            scores = [
+                float(ticker_sent.get('ticker_sentiment_score', 0))
+                for ticker_sent in article.get('ticker_sentiment', [])
+                if ticker_sent.get('ticker') == symbol
+            ]
+            articles.append({
+                'published': pd.to_datetime(article.get('time_published'), format='%Y%m%dT%H%M%S', errors='coerce'),
+                'scores': scores,
+                'headline': article.get('title', ''),
+            })
+        return articles
     
-    def _get_newsapi_sentiment(
+    def _get_newsapi_articles(
         self,
         symbol: str,
-        days_back: int
-    ) -> Dict[str, float]:
-        """Get news and analyze sentiment using TextBlob."""
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=days_back)
-        
+        start: datetime,
+        end: datetime,
+        limit: int = 50,
+        newest_first: bool = False
+    ) -> List[Dict]:
+        """Get news and score it using TextBlob (most relevant first unless newest_first)."""
         url = "https://newsapi.org/v2/everything"
         params = {
             'q': f"{symbol} stock",
-            'from': start_date.strftime('%Y-%m-%d'),
-            'to': end_date.strftime('%Y-%m-%d'),
+            'from': start.strftime('%Y-%m-%d'),
+            'to': end.strftime('%Y-%m-%d'),
             'language': 'en',
-            'sortBy': 'relevancy',
+            'sortBy': 'publishedAt' if newest_first else 'relevancy',
             'apiKey': self.news_api_key,
-            'pageSize': 50
+            'pageSize': min(limit, MAX_PAGE_SIZES['newsapi'])
         }
         
-        response = requests.get(url, params=params)
-        data = response.json()
+        data = self._request('newsapi', url, params)
         
         if data.get('status') != 'ok':
+            if data.get('code') == 'rateLimited':
+                self._exhaust_quota('newsapi')
             raise ValueError(f"NewsAPI error: {data.get('message')}")
         
-        articles = data.get('articles', [])
-        headlines = [art.get('title', '') for art in articles]
-        descriptions = [art.get('description', '') for art in articles]
-        
-        # Analyze sentiment
-        headline_scores = []
-        description_scores = []
-        
-        for headline in headlines:
-            if headline:
-                blob = TextBlob(headline)
-                headline_scores.append(blob.sentiment.polarity)
-        
-        for desc in descriptions:
-            if desc:
-                blob = TextBlob(desc)
-                description_scores.append(blob.sentiment.polarity)
-        
-        news_sentiment = np.mean(description_scores) if description_scores else 0.0
-        headline_sentiment = np.mean(headline_scores) if headline_scores else 0.0
+        from textblob import TextBlob
+        
+        articles = []
+        for art in data.get('articles', []):
+            description = art.get('description') or ''
+            published = pd.to_datetime(art.get('publishedAt'), errors='coerce', utc=True)
+            articles.append({
+                'published': pd.NaT if pd.isna(published) else published.tz_localize(None),
+                'scores': [TextBlob(description).sentiment.polarity] if description else [],
+                'headline': art.get('title') or '',
+            })
+        return articles
+
+    def _request(self, provider: str, url: str, params: Dict) -> Dict:
+        """GET a JSON resource through the pooled session, counting quota."""
+        if self.session is None:
+            raise ImportError("requests required. Install: pip install requests")
+        self._use_quota(provider)
+        response = self.session.get(url, params=params, timeout=self.timeout)
+        response.raise_for_status()
+        return response.json()
+
+    def _summarize_articles(self, articles: List[Dict], positive_threshold: float) -> Dict[str, float]:
+        """Aggregate scored articles into sentiment features."""
+        sentiments = [score for article in articles for score in article['scores']]
+        headlines = [article['headline'] for article in articles if article['headline']]
         
-        positive_count = sum(1 for s in description_scores if s > 0.1)
-        total = len(description_scores)
+        positive_count = sum(1 for s in sentiments if s > positive_threshold)
+        total = len(sentiments)
         
         return {
-            'news_sentiment': news_sentiment,
-            'headline_sentiment': headline_sentiment,
+            'news_sentiment': float(np.mean(sentiments)) if sentiments else 0.0,
+            'headline_sentiment': float(self._analyze_headlines(headlines)),
             'news_volume': total,
             'positive_ratio': positive_count / total if total > 0 else 0.5,
-            'sentiment_change': self._calculate_sentiment_trend(description_scores)
+            'sentiment_change': float(self._calculate_sentiment_trend(sentiments))
         }
     
     def _analyze_headlines(self, headlines: List[str]) -> float:
@@ -250,6 +359,8 @@ class SentimentAnalyzer:
         if not TEXTBLOB_AVAILABLE or not headlines:
             return 0.0
         
+        from textblob import TextBlob
+        
         scores = []
         for headline in headlines:
             if headline:
@@ -315,6 +426,8 @@ class SentimentAnalyzer:
     ) -> Dict[str, Dict[str, float]]:
         """
         Get sentiment for multiple symbols.
+
+        Up to ``max_concurrency`` symbols are fetched at once.
         
         Args:
             symbols: List of stock symbols
@@ -323,13 +436,175 @@ class SentimentAnalyzer:
         Returns:
             Dict mapping symbols to sentiment scores
         """
-        results = {}
-        
-        for symbol in symbols:
-            self.logger.info(f"Analyzing sentiment for {symbol}")
-            results[symbol] = self.get_stock_sentiment(symbol, days_back)
-        
-        return results
+        self.logger.info(f"Analyzing sentiment for {len(symbols)} symbols")
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_concurrency, len(symbols)))) as pool:
+            results = pool.map(lambda symbol: self.get_stock_sentiment(symbol, days_back), symbols)
+            return dict(zip(symbols, results))
+
+    def get_sentiment_history(self, symbol: str, start, end) -> pd.DataFrame:
+        """
+        Daily sentiment series for a symbol.
+
+        Days missing from the cache (back to ``max_history_days`` ago) are
+        fetched with as few upstream requests as the providers' page sizes
+        allow and cached. Older days and days that could not be fetched
+        completely are neutral and not cached.
+
+        Args:
+            symbol: Stock symbol
+            start: First day
+            end: Last day (inclusive)
+
+        Returns:
+            DataFrame of SENTIMENT_COLUMNS indexed by day
+        """
+        days = pd.date_range(pd.Timestamp(start).normalize(), pd.Timestamp(end).normalize(), freq='D')
+        if days.tz is not None:
+            days = days.tz_localize(None)
+        today = pd.Timestamp(date.today())
+        oldest = today - pd.Timedelta(days=self.max_history_days)
+
+        with self._symbol_lock(symbol):
+            cache = self._load_symbol_cache(symbol)
+            daily = cache.setdefault('daily', {})
+            missing = [
+                day for day in days
+                if oldest <= day <= today and not self._is_fresh(daily.get(day.strftime('%Y-%m-%d')), day)
+            ]
+            if missing:
+                fetched = self._fetch_daily_sentiment(symbol, missing[0], missing[-1])
+                if fetched:
+                    fetched_at = datetime.now().isoformat()
+                    for key, summary in fetched.items():
+                        daily[key] = {**summary, 'fetched_at': fetched_at}
+                    self._save_symbol_cache(symbol, cache)
+
+        rows = [daily.get(day.strftime('%Y-%m-%d'), NEUTRAL_DAY) for day in days]
+        return pd.DataFrame(
+            {column: [row[column] for row in rows] for column in SENTIMENT_COLUMNS},
+            index=days
+        )
+
+    def _fetch_daily_sentiment(self, symbol: str, first: pd.Timestamp, last: pd.Timestamp) -> Dict[str, Dict]:
+        """
+        Fetch articles for a day range and aggregate them per day.
+
+        Articles are requested newest first. A response that fills its page
+        only covers the days after its oldest article completely, so the
+        rest of the range is requested again until it is covered or a
+        request fails.
+
+        Returns:
+            Sentiment of each completely covered day (neutral without articles)
+        """
+        daily = {}
+        while first <= last:
+            end = last + pd.Timedelta(days=1) - pd.Timedelta(minutes=1)
+            articles = self._fetch_articles(
+                symbol, first.to_pydatetime(), end.to_pydatetime(), limit=HISTORY_PAGE_SIZE, newest_first=True
+            )
+            if articles is None:
+                break
+
+            provider, items = articles
+            dated = [article for article in items if not pd.isna(article['published'])]
+            covered_from = first
+            if len(items) >= min(HISTORY_PAGE_SIZE, MAX_PAGE_SIZES[provider]):
+                # Truncated: the oldest returned day may be missing articles
+                if not dated:
+                    break
+                covered_from = max(first, min(a['published'] for a in dated).normalize() + pd.Timedelta(days=1))
+
+            by_day: Dict[str, List[Dict]] = {}
+            for article in dated:
+                by_day.setdefault(article['published'].strftime('%Y-%m-%d'), []).append(article)
+            for day in pd.date_range(covered_from, last, freq='D'):
+                key = day.strftime('%Y-%m-%d')
+                if key not in by_day:
+                    daily[key] = dict(NEUTRAL_DAY)
+                    continue
+                summary = self._summarize_articles(by_day[key], POSITIVE_THRESHOLDS[provider])
+                summary['overall_sentiment'] = summary['news_sentiment'] * 0.5 + summary['headline_sentiment'] * 0.3
+                daily[key] = summary
+
+            # Done, or the newest day alone fills a page
+            if covered_from <= first or covered_from > last:
+                break
+            last = covered_from - pd.Timedelta(days=1)
+        return daily
+
+    def _is_fresh(self, entry: Optional[Dict], day: Optional[pd.Timestamp] = None) -> bool:
+        """Check whether a cached entry can be served."""
+        if entry is None:
+            return False
+        fetched_at = datetime.fromisoformat(entry['fetched_at'])
+        # A day's sentiment is final once it was fetched after the day ended
+        if day is not None and fetched_at.date() > day.date():
+            return True
+        return (datetime.now() - fetched_at).total_seconds() < self.cache_ttl
+
+    def _get_snapshot(self, symbol: str, days_back: int) -> Optional[Dict[str, float]]:
+        with self._symbol_lock(symbol):
+            entry = self._load_symbol_cache(symbol).get('snapshots', {}).get(str(days_back))
+        if not self._is_fresh(entry):
+            return None
+        return {key: value for key, value in entry.items() if key != 'fetched_at'}
+
+    def _save_snapshot(self, symbol: str, days_back: int, sentiments: Dict[str, float]):
+        with self._symbol_lock(symbol):
+            cache = self._load_symbol_cache(symbol)
+            cache.setdefault('snapshots', {})[str(days_back)] = {
+                **sentiments,
+                'fetched_at': datetime.now().isoformat()
+            }
+            self._save_symbol_cache(symbol, cache)
+
+    def _symbol_lock(self, symbol: str) -> threading.Lock:
+        with self._lock:
+            return self._symbol_locks.setdefault(symbol.upper(), threading.Lock())
+
+    def _load_symbol_cache(self, symbol: str) -> Dict:
+        symbol = symbol.upper()
+        if symbol not in self._symbol_cache:
+            self._symbol_cache[symbol] = self._load_json(os.path.join(self.cache_dir, f"{symbol}.json"))
+        return self._symbol_cache[symbol]
+
+    def _save_symbol_cache(self, symbol: str, cache: Dict):
+        self._write_json(os.path.join(self.cache_dir, f"{symbol.upper()}.json"), cache)
+
+    def _load_json(self, path: str) -> Dict:
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_json(self, path: str, payload: Dict):
+        tmp_path = f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"
+        with open(tmp_path, 'w') as f:
+            json.dump(payload, f, default=float)
+        os.replace(tmp_path, path)
+
+    def remaining_quota(self, provider: str) -> int:
+        """Upstream requests left today for a provider."""
+        used = self._quota_usage.get(provider, {}).get(date.today().isoformat(), 0)
+        return max(0, self.daily_quotas.get(provider, 0) - used)
+
+    def _use_quota(self, provider: str):
+        """Count an upstream request, raising QuotaExceeded when none are left."""
+        with self._lock:
+            if self.remaining_quota(provider) <= 0:
+                raise QuotaExceeded(f"Daily {provider} quota of {self.daily_quotas.get(provider, 0)} used up")
+            today = date.today().isoformat()
+            # Only today's count is kept
+            self._quota_usage[provider] = {today: self._quota_usage.get(provider, {}).get(today, 0) + 1}
+            self._write_json(self._quota_file, self._quota_usage)
+
+    def _exhaust_quota(self, provider: str):
+        """Mark a provider's quota as used up for today (it reported a rate limit)."""
+        with self._lock:
+            self._quota_usage[provider] = {date.today().isoformat(): self.daily_quotas.get(provider, 0)}
+            self._write_json(self._quota_file, self._quota_usage)
     
     def get_market_mood(self) -> str:
         """
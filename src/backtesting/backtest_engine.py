@@ -58,10 +58,23 @@ class BacktestEngine:
         self.portfolio_history = None
         self.metrics = {}
         
-    def run(self) -> Dict:
+    def load_data(self) -> pd.DataFrame:
+        """Fetch historical data for the backtest period."""
+        fetcher = DataFetcher()
+        return fetcher.fetch_historical_data(
+            self.symbol,
+            self.start_date,
+            self.end_date
+        )
+    
+    def run(self, data: Optional[pd.DataFrame] = None) -> Dict:
         """
         Run backtest simulation.
         
+        Args:
+            data: Optional pre-loaded OHLCV data. When omitted, data is
+                fetched with load_data().
+        
         Returns:
             Dictionary with backtest results
         """
@@ -70,12 +83,8 @@ class BacktestEngine:
         self.logger.info(f"Strategy: {self.strategy}")
         
         # Fetch historical data
-        fetcher = DataFetcher()
-        data = fetcher.fetch_historical_data(
-            self.symbol,
-            self.start_date,
-            self.end_date
-        )
+        if data is None:
+            data = self.load_data()
         
         if data is None or data.empty:
             self.logger.error("No data available for backtesting")
@@ -83,6 +92,10 @@ class BacktestEngine:
         
         self.logger.info(f"Loaded {len(data)} data points")
         
+        # Strategies with a feature store key their stored features by symbol
+        if getattr(self.strategy, 'feature_store', None) is not None:
+            self.strategy.set_symbol(self.symbol)
+        
         # Generate signals
         signals = self.strategy.generate_signals(data)
         
@@ -0,0 +1,258 @@
+"""
+Incremental Strategy Evaluation
+
+Keeps the simulation state and metric accumulators of a BacktestEngine run
+so the evaluation can be advanced over newly arrived bars instead of
+re-running the whole history. The first evaluation of a (strategy, symbol)
+pair simulates every bar and reports the same metrics as BacktestEngine;
+later ones only simulate the new bars, generating their signals on a
+warmup window of preceding history.
+"""
+
+import math
+from dataclasses import asdict, dataclass
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.strategies.base_strategy import BaseStrategy
+
+
+# History prepended to new bars when generating their signals; covers the
+# longest indicator windows used by the built-in strategies
+WARMUP_BARS = 400
+
+
+@dataclass
+class EvaluationState:
+    """Simulation state and metric accumulators of one (strategy, symbol)."""
+
+    cash: float
+    position: int = 0
+    entry_price: Optional[float] = None
+
+    # Last simulated bar (ISO timestamp) and its close
+    last_bar: Optional[str] = None
+    last_close: Optional[float] = None
+    bars: int = 0
+
+    # Equity curve
+    first_equity: Optional[float] = None
+    last_equity: Optional[float] = None
+    peak_equity: Optional[float] = None
+    max_drawdown: float = 0.0
+
+    # Bar-to-bar returns (Welford running mean and sum of squares)
+    returns_count: int = 0
+    returns_mean: float = 0.0
+    returns_m2: float = 0.0
+
+    # Closed trades
+    trades: int = 0
+    wins: int = 0
+    losses: int = 0
+    gross_profit: float = 0.0
+    gross_loss: float = 0.0
+
+    def to_dict(self) -> Dict:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> 'EvaluationState':
+        return cls(**data)
+
+
+class IncrementalEvaluator:
+    """Advance strategy backtests over new bars."""
+
+    def __init__(
+        self,
+        initial_capital: float = 100000,
+        commission: float = 0.001,
+        slippage: float = 0.0005,
+        warmup_bars: int = WARMUP_BARS,
+        risk_free_rate: float = 0.02
+    ):
+        """
+        Initialize incremental evaluator.
+
+        Args:
+            initial_capital: Starting capital
+            commission: Commission rate per trade
+            slippage: Slippage rate per trade
+            warmup_bars: History bars used to generate signals for new bars
+            risk_free_rate: Annual risk-free rate for the Sharpe ratio
+        """
+        self.initial_capital = initial_capital
+        self.commission = commission
+        self.slippage = slippage
+        self.warmup_bars = warmup_bars
+        self.risk_free_rate = risk_free_rate
+
+    def new_state(self) -> EvaluationState:
+        """State before the first bar."""
+        return EvaluationState(cash=self.initial_capital)
+
+    def evaluate(
+        self,
+        strategy: BaseStrategy,
+        data: pd.DataFrame,
+        state: Optional[EvaluationState] = None
+    ) -> Tuple[EvaluationState, Dict]:
+        """
+        Bring an evaluation up to date with the data.
+
+        Args:
+            strategy: Strategy to evaluate
+            data: OHLCV bars; with a state, must include the warmup history
+                before the first new bar
+            state: State from a previous evaluation (None = start fresh)
+
+        Returns:
+            (updated state, metrics in BacktestEngine form; empty without trades)
+        """
+        if state is None:
+            state = self.new_state()
+            window = data
+        else:
+            new_bars = data.index > pd.Timestamp(state.last_bar) if state.last_bar else np.ones(len(data), bool)
+            if not new_bars.any():
+                return state, self.metrics(state)
+            first_new = int(np.argmax(new_bars))
+            window = data.iloc[max(0, first_new - self.warmup_bars):]
+
+        if not window.empty:
+            self.advance(state, window, strategy.generate_signals(window))
+        return state, self.metrics(state)
+
+    def advance(self, state: EvaluationState, data: pd.DataFrame, signals: pd.Series) -> int:
+        """
+        Simulate the bars after state.last_bar, as BacktestEngine does.
+
+        Returns:
+            Number of bars simulated
+        """
+        if not signals.index.equals(data.index):
+            signals = signals.reindex(data.index).fillna(0)
+
+        start = 0
+        if state.last_bar is not None:
+            start = int(data.index.searchsorted(pd.Timestamp(state.last_bar), side='right'))
+        if start >= len(data):
+            return 0
+
+        closes = data['close'].to_numpy(dtype=float)
+        values = signals.to_numpy()
+        buy_cost = 1 + self.commission + self.slippage
+        sell_yield = 1 - self.commission - self.slippage
+
+        for i in range(start, len(data)):
+            signal = values[i]
+            price = closes[i]
+
+            if signal == 1 and state.position == 0:
+                shares = int(state.cash / (price * buy_cost))
+                if shares > 0:
+                    cost = shares * price * buy_cost
+                    if cost <= state.cash:
+                        state.position = shares
+                        state.cash -= cost
+                        state.entry_price = price
+
+            elif signal == -1 and state.position > 0:
+                proceeds = state.position * price * sell_yield
+                self._record_trade(state, proceeds - state.position * state.entry_price * buy_cost)
+                state.cash += proceeds
+                state.position = 0
+                state.entry_price = None
+
+            self._record_equity(state, state.cash + state.position * price)
+
+        state.last_bar = data.index[-1].isoformat()
+        state.last_close = float(closes[-1])
+        state.bars += len(data) - start
+        return len(data) - start
+
+    def _record_trade(self, state: EvaluationState, profit: float):
+        state.trades += 1
+        if profit > 0:
+            state.wins += 1
+            state.gross_profit += profit
+        elif profit < 0:
+            state.losses += 1
+            state.gross_loss -= profit
+
+    def _record_equity(self, state: EvaluationState, equity: float):
+        if state.first_equity is None:
+            state.first_equity = state.peak_equity = equity
+        else:
+            if state.last_equity:
+                state.returns_count += 1
+                delta = equity / state.last_equity - 1 - state.returns_mean
+                state.returns_mean += delta / state.returns_count
+                state.returns_m2 += delta * (equity / state.last_equity - 1 - state.returns_mean)
+            state.peak_equity = max(state.peak_equity, equity)
+            if state.peak_equity:
+                state.max_drawdown = max(state.max_drawdown, (state.peak_equity - equity) / state.peak_equity)
+        state.last_equity = equity
+
+    def metrics(self, state: EvaluationState) -> Dict:
+        """
+        Metrics as reported by BacktestEngine for the bars simulated so far.
+
+        An open position is closed at the last close for the report only,
+        as BacktestEngine does at the end of a run.
+        """
+        trades, wins, losses = state.trades, state.wins, state.losses
+        gross_profit, gross_loss = state.gross_profit, state.gross_loss
+
+        if state.position > 0:
+            profit = (
+                state.position * state.last_close * (1 - self.commission - self.slippage)
+                - state.position * state.entry_price * (1 + self.commission + self.slippage)
+            )
+            trades += 1
+            if profit > 0:
+                wins += 1
+                gross_profit += profit
+            elif profit < 0:
+                losses += 1
+                gross_loss -= profit
+
+        if trades == 0 or state.first_equity is None:
+            return {}
+
+        n = state.returns_count
+        std = math.sqrt(state.returns_m2 / (n - 1)) if n > 1 else float('nan')
+        if std == 0:
+            sharpe = 0.0
+        else:
+            sharpe = math.sqrt(252) * (state.returns_mean - self.risk_free_rate / 252) / std
+
+        if gross_loss == 0:
+            profit_factor = float('inf') if gross_profit > 0 else 0.0
+        else:
+            profit_factor = gross_profit / gross_loss
+
+        total_return = state.last_equity / state.first_equity - 1
+        win_rate = wins / trades
+
+        return {
+            'total_return': total_return,
+            'total_return_pct': total_return * 100,
+            'sharpe_ratio': sharpe,
+            'max_drawdown': state.max_drawdown,
+            'max_drawdown_pct': state.max_drawdown * 100,
+            'win_rate': win_rate,
+            'win_rate_pct': win_rate * 100,
+            'profit_factor': profit_factor,
+            'total_trades': trades,
+            'winning_trades': wins,
+            'losing_trades': losses,
+            'avg_profit': (gross_profit - gross_loss) / trades,
+            'avg_win': gross_profit / wins if wins else 0,
+            'avg_loss': -gross_loss / losses if losses else 0,
+            'final_value': state.last_equity,
+            'initial_capital': self.initial_capital
+        }
@@ -0,0 +1,319 @@
+"""
+Intraday Backtesting Engine
+
+Backtests a strategy on minute (or other intraday) bars read from the
+memory-mapped BarStore. Bars are processed one calendar month at a time so
+memory stays bounded regardless of the backtest length, and each chunk is
+simulated with array operations instead of a per-bar loop.
+"""
+
+import pandas as pd
+import numpy as np
+import logging
+from typing import Dict, List, Optional
+
+import sys
+sys.path.append('../..')
+
+from src.strategies.base_strategy import BaseStrategy, StrategyMetrics
+from src.data.bar_store import BarStore
+
+
+MARKET_TZ = 'America/New_York'
+REGULAR_OPEN_MINUTE = 9 * 60 + 30   # 09:30 ET
+REGULAR_CLOSE_MINUTE = 16 * 60      # 16:00 ET
+
+
+class IntradayBacktestEngine:
+    """Backtest trading strategies on intraday bars."""
+
+    def __init__(
+        self,
+        strategy: BaseStrategy,
+        symbol: str,
+        start_date: str,
+        end_date: str,
+        timeframe: str = '1Min',
+        initial_capital: float = 100000,
+        commission: float = 0.001,
+        slippage: float = 0.0005,
+        flatten_at_close: bool = True,
+        regular_hours_only: bool = True,
+        warmup_bars: int = 500,
+        store: Optional[BarStore] = None,
+        fetch_missing: bool = True
+    ):
+        """
+        Initialize intraday backtesting engine.
+
+        Args:
+            strategy: Trading strategy to backtest
+            symbol: Stock symbol
+            start_date: Start date (YYYY-MM-DD)
+            end_date: End date (YYYY-MM-DD), exclusive
+            timeframe: Bar timeframe ('1Min', '5Min', '15Min', '1H')
+            initial_capital: Starting capital
+            commission: Commission rate per trade
+            slippage: Slippage rate per trade
+            flatten_at_close: Close any open position on the last bar of
+                each session (no overnight carry)
+            regular_hours_only: Ignore pre- and post-market bars
+            warmup_bars: Bars from the previous chunk prepended to each
+                chunk so indicators are warmed up at chunk boundaries
+            store: Bar store to read from (defaults to data/bars)
+            fetch_missing: Fetch and store bars when the store has none
+        """
+        self.strategy = strategy
+        self.symbol = symbol
+        self.start_date = start_date
+        self.end_date = end_date
+        self.timeframe = timeframe
+        self.initial_capital = initial_capital
+        self.commission = commission
+        self.slippage = slippage
+        self.flatten_at_close = flatten_at_close
+        self.regular_hours_only = regular_hours_only
+        self.warmup_bars = warmup_bars
+        self.store = store or BarStore()
+        self.fetch_missing = fetch_missing
+
+        self.logger = logging.getLogger(__name__)
+
+        # Results storage
+        self.trades = []
+        self.equity_curve = None
+        self.metrics = {}
+
+        # Simulation state carried between chunks
+        self._cash = initial_capital
+        self._shares = 0
+        self._entry_price = None
+        self._entry_date = None
+
+    def run(self) -> Dict:
+        """
+        Run intraday backtest simulation.
+
+        Returns:
+            Dictionary with backtest results
+        """
+        self.logger.info(f"Starting {self.timeframe} backtest for {self.symbol}")
+        self.logger.info(f"Period: {self.start_date} to {self.end_date}")
+        self.logger.info(f"Strategy: {self.strategy}")
+
+        if self.fetch_missing and self.store.last_timestamp(self.symbol, self.timeframe) is None:
+            self._load_into_store()
+
+        equity_chunks: List[pd.Series] = []
+        warmup = None
+        total_bars = 0
+
+        for _, bars in self.store.iter_ranges(
+            self.symbol, self.start_date, self.end_date, self.timeframe, tz=MARKET_TZ
+        ):
+            df = BarStore.to_frame(bars)
+            local = df.index.tz_convert(MARKET_TZ)
+
+            if self.regular_hours_only:
+                minute = local.hour * 60 + local.minute
+                in_session = (minute >= REGULAR_OPEN_MINUTE) & (minute < REGULAR_CLOSE_MINUTE)
+                df, local = df[in_session], local[in_session]
+                if df.empty:
+                    continue
+
+            # Generate signals with warmup history from the previous chunk
+            history = df if warmup is None else pd.concat([warmup, df])
+            signals = self.strategy.generate_signals(history).iloc[-len(df):]
+
+            session = local.normalize().asi8
+            equity_chunks.append(self._simulate_chunk(df, signals.to_numpy(), session))
+
+            warmup = df.iloc[-self.warmup_bars:] if self.warmup_bars else None
+            total_bars += len(df)
+
+        if not equity_chunks:
+            self.logger.error("No data available for backtesting")
+            return {}
+
+        self.logger.info(f"Processed {total_bars} bars")
+
+        self._close_open_position(equity_chunks[-1])
+        self.equity_curve = pd.concat(equity_chunks)
+
+        self.logger.info(f"Final portfolio value: ${self._cash:,.2f}")
+        self.logger.info(f"Total trades: {len(self.trades)}")
+
+        self._calculate_metrics()
+
+        self.logger.info("Backtest completed")
+
+        return self.get_results()
+
+    def _load_into_store(self):
+        """Fetch bars for the backtest period and write them to the store."""
+        from src.data.data_fetcher import DataFetcher
+
+        fetcher = DataFetcher()
+        data = fetcher.fetch_historical_data(
+            self.symbol,
+            self.start_date,
+            self.end_date,
+            timeframe=self.timeframe,
+            use_cache=False
+        )
+        self.store.write(self.symbol, data, self.timeframe)
+
+    def _simulate_chunk(
+        self,
+        df: pd.DataFrame,
+        signals: np.ndarray,
+        session: np.ndarray
+    ) -> pd.Series:
+        """
+        Simulate one chunk of bars.
+
+        The long/flat position state is derived from the signals with a
+        forward fill; only the bars where the state changes are visited to
+        size and record trades.
+
+        Returns:
+            Equity curve for the chunk
+        """
+        n = len(df)
+        close = df['close'].to_numpy(dtype=float)
+
+        buy_cost = 1 + self.commission + self.slippage
+        start_cash = self._cash
+
+        # Desired state: 1 after a BUY, 0 after a SELL, unchanged otherwise
+        target = np.full(n, np.nan)
+        target[signals == 1] = 1
+        target[signals == -1] = 0
+
+        if self.flatten_at_close:
+            session_end = np.empty(n, dtype=bool)
+            session_end[:-1] = session[1:] != session[:-1]
+            session_end[-1] = True
+            target[session_end] = 0
+
+        initial_state = 1 if self._shares > 0 else 0
+        state = pd.Series(target).ffill().fillna(initial_state).to_numpy()
+
+        previous = np.empty(n)
+        previous[0] = initial_state
+        previous[1:] = state[:-1]
+        changes = np.flatnonzero(state != previous)
+
+        held = np.zeros(n)
+        cash_after = np.full(n, np.nan)
+        holding_from = 0 if self._shares > 0 else None
+
+        for i in changes:
+            price = close[i]
+            if state[i] == 1 and self._shares == 0:
+                qty = int(self._cash / (price * buy_cost))
+                if qty > 0:
+                    self._shares = qty
+                    self._cash -= qty * price * buy_cost
+                    self._entry_price = price
+                    self._entry_date = df.index[i]
+                    holding_from = i
+            elif state[i] == 0 and self._shares > 0:
+                held[holding_from:i] = self._shares
+                self._record_exit(df.index[i], price)
+                holding_from = None
+            cash_after[i] = self._cash
+
+        if holding_from is not None:
+            held[holding_from:] = self._shares
+
+        cash = pd.Series(cash_after).ffill().fillna(start_cash).to_numpy()
+        self._last_close = close[-1]
+
+        return pd.Series(cash + held * close, index=df.index)
+
+    def _record_exit(self, date, price: float):
+        """Close the open position and record the trade."""
+        buy_cost = 1 + self.commission + self.slippage
+        sell_net = 1 - self.commission - self.slippage
+
+        proceeds = self._shares * price * sell_net
+        profit = proceeds - (self._shares * self._entry_price * buy_cost)
+
+        self.trades.append({
+            'entry_date': self._entry_date,
+            'exit_date': date,
+            'entry_price': self._entry_price,
+            'exit_price': price,
+            'shares': self._shares,
+            'profit': profit,
+            'profit_pct': (profit / (self._shares * self._entry_price)) * 100,
+            'duration': (date - self._entry_date).days
+        })
+
+        self._cash += proceeds
+        self._shares = 0
+        self._entry_price = None
+        self._entry_date = None
+
+    def _close_open_position(self, last_chunk: pd.Series):
+        """Close a position still open at the end of the backtest."""
+        if self._shares > 0:
+            self._record_exit(last_chunk.index[-1], self._last_close)
+
+    def _calculate_metrics(self):
+        """Calculate performance metrics."""
+
+        if self.equity_curve is None or len(self.trades) == 0:
+            self.logger.warning("No trades to analyze")
+            return
+
+        total_return = StrategyMetrics.calculate_returns(self.equity_curve)
+
+        # Annualize on session returns rather than bar returns
+        sessions = self.equity_curve.index.tz_convert(MARKET_TZ).normalize()
+        daily_equity = self.equity_curve.groupby(sessions).last()
+        daily_returns = daily_equity.pct_change().dropna()
+
+        sharpe = StrategyMetrics.calculate_sharpe_ratio(daily_returns)
+        max_dd = StrategyMetrics.calculate_max_drawdown(self.equity_curve)
+        win_rate = StrategyMetrics.calculate_win_rate(self.trades)
+        profit_factor = StrategyMetrics.calculate_profit_factor(self.trades)
+
+        profits = [t['profit'] for t in self.trades]
+        avg_profit = np.mean(profits)
+        avg_win = np.mean([p for p in profits if p > 0]) if any(p > 0 for p in profits) else 0
+        avg_loss = np.mean([p for p in profits if p < 0]) if any(p < 0 for p in profits) else 0
+
+        self.metrics = {
+            'total_return': total_return,
+            'total_return_pct': total_return * 100,
+            'sharpe_ratio': sharpe,
+            'max_drawdown': max_dd,
+            'max_drawdown_pct': max_dd * 100,
+            'win_rate': win_rate,
+            'win_rate_pct': win_rate * 100,
+            'profit_factor': profit_factor,
+            'total_trades': len(self.trades),
+            'winning_trades': sum(1 for p in profits if p > 0),
+            'losing_trades': sum(1 for p in profits if p < 0),
+            'avg_profit': avg_profit,
+            'avg_win': avg_win,
+            'avg_loss': avg_loss,
+            'total_bars': len(self.equity_curve),
+            'sessions': len(daily_equity),
+            'final_value': self._cash,
+            'initial_capital': self.initial_capital
+        }
+
+    def get_results(self) -> Dict:
+        """Get backtest results."""
+        return {
+            'metrics': self.metrics,
+            'trades': self.trades,
+            'equity_curve': self.equity_curve,
+            'strategy': str(self.strategy),
+            'symbol': self.symbol,
+            'timeframe': self.timeframe,
+            'period': f"{self.start_date} to {self.end_date}"
+        }
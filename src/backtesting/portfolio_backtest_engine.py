@@ -0,0 +1,393 @@
+"""
+Portfolio Backtesting Engine
+
+Simulates a set of per-symbol strategies against one shared pool of capital.
+All symbols are stepped on a single aligned time index, and every step is
+evaluated with array operations across the whole universe, so large
+universes (100+ symbols over 10 years) run in seconds.
+"""
+
+import pandas as pd
+import numpy as np
+import logging
+from typing import Dict, List, Optional, Union
+
+import sys
+sys.path.append('../..')
+
+from src.strategies.base_strategy import BaseStrategy, StrategyMetrics
+from src.risk.risk_manager import RiskManager
+from src.data.data_fetcher import DataFetcher
+
+
+class PortfolioBacktestEngine:
+    """Backtest a multi-symbol portfolio with shared cash and risk limits."""
+
+    def __init__(
+        self,
+        strategies: Union[BaseStrategy, Dict[str, BaseStrategy]],
+        symbols: List[str],
+        start_date: str,
+        end_date: str,
+        initial_capital: float = 100000,
+        commission: float = 0.001,
+        slippage: float = 0.0005,
+        risk_manager: Optional[RiskManager] = None,
+        allocations: Optional[Dict[str, float]] = None,
+        use_stop_loss: bool = False
+    ):
+        """
+        Initialize portfolio backtesting engine.
+
+        Args:
+            strategies: One strategy used for every symbol, or a mapping of
+                symbol -> strategy
+            symbols: Stock symbols that make up the portfolio
+            start_date: Start date (YYYY-MM-DD)
+            end_date: End date (YYYY-MM-DD)
+            initial_capital: Starting capital shared by all positions
+            commission: Commission rate per trade
+            slippage: Slippage rate per trade
+            risk_manager: RiskManager whose sizing parameters and
+                max_positions limit are applied (defaults to RiskManager())
+            allocations: Optional symbol -> fraction of equity that caps the
+                position size for that symbol (e.g. per-ticker allocations
+                from live_trading_strategy_recommendations.json)
+            use_stop_loss: Exit positions that close below the risk
+                manager's stop loss
+        """
+        if isinstance(strategies, BaseStrategy):
+            strategies = {symbol: strategies for symbol in symbols}
+
+        missing = [s for s in symbols if s not in strategies]
+        if missing:
+            raise ValueError(f"No strategy provided for: {', '.join(missing)}")
+
+        self.strategies = strategies
+        self.symbols = list(symbols)
+        self.start_date = start_date
+        self.end_date = end_date
+        self.initial_capital = initial_capital
+        self.commission = commission
+        self.slippage = slippage
+        self.risk_manager = risk_manager or RiskManager(initial_capital=initial_capital)
+        self.allocations = allocations or {}
+        self.use_stop_loss = use_stop_loss
+
+        self.logger = logging.getLogger(__name__)
+
+        # Results storage
+        self.trades = []
+        self.equity_curve = None
+        self.positions = None
+        self.metrics = {}
+
+    def run(self, data: Optional[Dict[str, pd.DataFrame]] = None) -> Dict:
+        """
+        Run portfolio backtest simulation.
+
+        Args:
+            data: Optional pre-loaded mapping of symbol -> OHLCV DataFrame.
+                When omitted, data is fetched with DataFetcher.
+
+        Returns:
+            Dictionary with backtest results
+        """
+        self.logger.info(f"Starting portfolio backtest for {len(self.symbols)} symbols")
+        self.logger.info(f"Period: {self.start_date} to {self.end_date}")
+
+        if data is None:
+            fetcher = DataFetcher()
+            data = fetcher.fetch_multiple_symbols(
+                self.symbols,
+                self.start_date,
+                self.end_date
+            )
+
+        data = {s: df for s, df in data.items() if s in self.strategies and df is not None and not df.empty}
+        if not data:
+            self.logger.error("No data available for backtesting")
+            return {}
+
+        # Generate signals per symbol (each strategy is vectorized over time)
+        signals = {}
+        for symbol, df in data.items():
+            signals[symbol] = self.strategies[symbol].generate_signals(df)
+
+        index, symbols, close, signal_matrix = self._align(data, signals)
+        self.logger.info(f"Aligned {len(symbols)} symbols on {len(index)} bars")
+
+        self._simulate_portfolio(index, symbols, close, signal_matrix)
+        self._calculate_metrics()
+
+        self.logger.info("Portfolio backtest completed")
+
+        return self.get_results()
+
+    def _align(
+        self,
+        data: Dict[str, pd.DataFrame],
+        signals: Dict[str, pd.Series]
+    ):
+        """
+        Align closes and signals of all symbols on the union time index.
+
+        Returns:
+            Tuple of (index, symbols, close matrix, signal matrix). Close is
+            NaN where a symbol has no bar; signals are 0 there.
+        """
+        symbols = [s for s in self.symbols if s in data]
+
+        close = pd.concat(
+            {s: data[s]['close'][~data[s].index.duplicated(keep='last')] for s in symbols},
+            axis=1
+        ).sort_index()
+
+        signal_frame = pd.concat(
+            {s: signals[s][~signals[s].index.duplicated(keep='last')] for s in symbols},
+            axis=1
+        ).reindex(close.index).fillna(0)
+
+        return (
+            close.index,
+            symbols,
+            close[symbols].to_numpy(dtype=float),
+            signal_frame[symbols].to_numpy(dtype=np.int8)
+        )
+
+    def _target_position_values(self, equity: float, size_fractions: np.ndarray) -> np.ndarray:
+        """Position value per symbol using RiskManager-style sizing."""
+        rm = self.risk_manager
+
+        # Fixed fraction of portfolio (per symbol when allocations are given)
+        by_size = equity * size_fractions
+
+        # Risk-based sizing: lose at most max_portfolio_risk if the stop is hit
+        by_risk = equity * rm.max_portfolio_risk / rm.stop_loss_pct
+
+        return np.minimum(np.minimum(by_size, by_risk), equity * 0.95)
+
+    def _simulate_portfolio(
+        self,
+        index: pd.Index,
+        symbols: List[str],
+        close: np.ndarray,
+        signals: np.ndarray
+    ):
+        """Simulate trading across all symbols with a shared cash balance."""
+        n_bars, n_symbols = close.shape
+        size_fractions = np.array([
+            self.allocations.get(s, self.risk_manager.max_position_size) for s in symbols
+        ])
+
+        buy_cost = 1 + self.commission + self.slippage
+        sell_net = 1 - self.commission - self.slippage
+
+        tradable = ~np.isnan(close)
+        # Carry the last known price forward for valuation between bars
+        prices = pd.DataFrame(close).ffill().fillna(0.0).to_numpy()
+
+        cash = float(self.initial_capital)
+        shares = np.zeros(n_symbols)
+        entry_price = np.zeros(n_symbols)
+        entry_bar = np.full(n_symbols, -1)
+
+        equity = np.empty(n_bars)
+        holdings = np.empty((n_bars, n_symbols))
+
+        max_positions = self.risk_manager.max_positions
+        stop_loss_pct = self.risk_manager.stop_loss_pct
+
+        for t in range(n_bars):
+            price = prices[t]
+            open_mask = shares > 0
+
+            # Exits: SELL signals (and stop losses) on held, tradable symbols
+            exit_mask = open_mask & tradable[t] & (signals[t] == -1)
+            if self.use_stop_loss:
+                exit_mask |= open_mask & tradable[t] & (price <= entry_price * (1 - stop_loss_pct))
+
+            if exit_mask.any():
+                exits = np.flatnonzero(exit_mask)
+                cash += float(np.sum(shares[exits] * price[exits]) * sell_net)
+                self._record_trades(index, symbols, exits, t, shares, entry_price, entry_bar, price)
+                shares[exits] = 0
+                entry_price[exits] = 0
+                entry_bar[exits] = -1
+
+            # Entries: BUY signals on flat, tradable symbols, up to free slots
+            entry_mask = (shares == 0) & tradable[t] & (signals[t] == 1)
+            free_slots = max_positions - int(np.count_nonzero(shares))
+
+            if free_slots > 0 and entry_mask.any():
+                candidates = np.flatnonzero(entry_mask)
+                portfolio_value = cash + float(np.dot(shares, price))
+                target = self._target_position_values(portfolio_value, size_fractions[candidates])
+
+                qty = np.floor(np.minimum(target, cash) / (price[candidates] * buy_cost))
+                sized = qty > 0
+                candidates, qty = candidates[sized], qty[sized]
+
+                # Allocate cash in symbol order until it runs out
+                cost = qty * price[candidates] * buy_cost
+                affordable = np.cumsum(cost) <= cash
+                candidates, qty, cost = (
+                    candidates[affordable][:free_slots],
+                    qty[affordable][:free_slots],
+                    cost[affordable][:free_slots]
+                )
+
+                if len(candidates):
+                    shares[candidates] = qty
+                    entry_price[candidates] = price[candidates]
+                    entry_bar[candidates] = t
+                    cash -= float(cost.sum())
+
+            holdings[t] = shares
+            equity[t] = cash + float(np.dot(shares, price))
+
+        # Close any open positions at the end
+        still_open = np.flatnonzero(shares > 0)
+        if len(still_open):
+            final_price = prices[-1]
+            cash += float(np.sum(shares[still_open] * final_price[still_open]) * sell_net)
+            self._record_trades(index, symbols, still_open, n_bars - 1, shares, entry_price, entry_bar, final_price)
+            shares[still_open] = 0
+
+        self.equity_curve = pd.Series(equity, index=index)
+        self.positions = pd.DataFrame(holdings, index=index, columns=symbols)
+
+        self.logger.info(f"Final portfolio value: ${cash:,.2f}")
+        self.logger.info(f"Total return: {((cash / self.initial_capital) - 1) * 100:.2f}%")
+        self.logger.info(f"Total trades: {len(self.trades)}")
+
+    def _record_trades(
+        self,
+        index: pd.Index,
+        symbols: List[str],
+        exits: np.ndarray,
+        t: int,
+        shares: np.ndarray,
+        entry_price: np.ndarray,
+        entry_bar: np.ndarray,
+        price: np.ndarray
+    ):
+        """Append closed trades in the same format as BacktestEngine."""
+        buy_cost = 1 + self.commission + self.slippage
+        sell_net = 1 - self.commission - self.slippage
+
+        exit_date = index[t]
+        for i in exits:
+            qty = shares[i]
+            profit = qty * price[i] * sell_net - qty * entry_price[i] * buy_cost
+            entry_date = index[entry_bar[i]]
+            self.trades.append({
+                'symbol': symbols[i],
+                'entry_date': entry_date,
+                'exit_date': exit_date,
+                'entry_price': entry_price[i],
+                'exit_price': price[i],
+                'shares': int(qty),
+                'profit': profit,
+                'profit_pct': (profit / (qty * entry_price[i])) * 100,
+                'duration': (exit_date - entry_date).days
+            })
+
+    def _calculate_metrics(self):
+        """Calculate portfolio performance metrics."""
+
+        if self.equity_curve is None or len(self.trades) == 0:
+            self.logger.warning("No trades to analyze")
+            return
+
+        daily_returns = self.equity_curve.pct_change().dropna()
+        profits = [t['profit'] for t in self.trades]
+
+        exposure = self.positions.gt(0).sum(axis=1)
+
+        profit_by_symbol = {}
+        for trade in self.trades:
+            profit_by_symbol[trade['symbol']] = profit_by_symbol.get(trade['symbol'], 0) + trade['profit']
+
+        total_return = StrategyMetrics.calculate_returns(self.equity_curve)
+        max_dd = StrategyMetrics.calculate_max_drawdown(self.equity_curve)
+        win_rate = StrategyMetrics.calculate_win_rate(self.trades)
+
+        self.metrics = {
+            'total_return': total_return,
+            'total_return_pct': total_return * 100,
+            'sharpe_ratio': StrategyMetrics.calculate_sharpe_ratio(daily_returns),
+            'max_drawdown': max_dd,
+            'max_drawdown_pct': max_dd * 100,
+            'win_rate': win_rate,
+            'win_rate_pct': win_rate * 100,
+            'profit_factor': StrategyMetrics.calculate_profit_factor(self.trades),
+            'total_trades': len(self.trades),
+            'winning_trades': sum(1 for p in profits if p > 0),
+            'losing_trades': sum(1 for p in profits if p < 0),
+            'avg_profit': np.mean(profits),
+            'avg_positions': float(exposure.mean()),
+            'max_concurrent_positions': int(exposure.max()),
+            'profit_by_symbol': profit_by_symbol,
+            'final_value': self.equity_curve.iloc[-1],
+            'initial_capital': self.initial_capital
+        }
+
+    def get_results(self) -> Dict:
+        """Get backtest results."""
+        return {
+            'metrics': self.metrics,
+            'trades': self.trades,
+            'equity_curve': self.equity_curve,
+            'positions': self.positions,
+            'symbols': self.symbols,
+            'period': f"{self.start_date} to {self.end_date}"
+        }
+
+    def print_results(self):
+        """Print portfolio backtest results."""
+        print("\n" + "="*60)
+        print("PORTFOLIO BACKTEST RESULTS")
+        print("="*60)
+        print(f"Symbols: {', '.join(self.symbols)}")
+        print(f"Period: {self.start_date} to {self.end_date}")
+
+        if not self.metrics:
+            print("\n⚠️  No results available. Backtest may have failed.")
+            print("="*60 + "\n")
+            return
+
+        print("\nPerformance Metrics:")
+        print(f"  Initial Capital:    ${self.metrics['initial_capital']:,.2f}")
+        print(f"  Final Value:        ${self.metrics['final_value']:,.2f}")
+        print(f"  Total Return:       {self.metrics['total_return_pct']:.2f}%")
+        print(f"  Sharpe Ratio:       {self.metrics['sharpe_ratio']:.3f}")
+        print(f"  Max Drawdown:       {self.metrics['max_drawdown_pct']:.2f}%")
+        print("\nTrade Statistics:")
+        print(f"  Total Trades:       {self.metrics['total_trades']}")
+        print(f"  Win Rate:           {self.metrics['win_rate_pct']:.2f}%")
+        print(f"  Profit Factor:      {self.metrics['profit_factor']:.2f}")
+        print(f"  Avg Positions Held: {self.metrics['avg_positions']:.2f}")
+        print("\nProfit by Symbol:")
+        for symbol, profit in sorted(self.metrics['profit_by_symbol'].items(), key=lambda x: -x[1]):
+            print(f"  {symbol:<8} ${profit:,.2f}")
+        print("="*60 + "\n")
+
+
+if __name__ == "__main__":
+    # Example usage
+    logging.basicConfig(level=logging.INFO)
+
+    from src.strategies.momentum_strategy import MomentumStrategy
+
+    engine = PortfolioBacktestEngine(
+        strategies=MomentumStrategy(),
+        symbols=['AAPL', 'AMD', 'NVDA', 'SPY', 'TSLA', 'MSFT'],
+        start_date='2023-01-01',
+        end_date='2024-01-01',
+        initial_capital=100000,
+        risk_manager=RiskManager(initial_capital=100000, max_positions=5)
+    )
+
+    engine.run()
+    engine.print_results()
@@ -0,0 +1,252 @@
+"""
+Bar Store Module
+
+On-disk store for intraday OHLCV bars backed by memory-mapped NumPy files.
+
+Bars are partitioned per symbol, timeframe and calendar year:
+
+    <root>/<timeframe>/<SYMBOL>/<year>.npy
+
+Each partition is a structured array sorted by timestamp (nanoseconds since
+epoch, UTC). Reads map the files instead of loading them, so scanning years
+of minute bars only touches the pages that are actually used.
+"""
+
+import os
+import logging
+from typing import Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+BAR_DTYPE = np.dtype([
+    ('ts', 'i8'),
+    ('open', 'f8'),
+    ('high', 'f8'),
+    ('low', 'f8'),
+    ('close', 'f8'),
+    ('volume', 'f8'),
+])
+
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+
+
+def _to_ns(value) -> int:
+    """Convert a date string/datetime to UTC nanoseconds since epoch."""
+    ts = pd.Timestamp(value)
+    if ts.tz is None:
+        ts = ts.tz_localize('UTC')
+    return ts.value
+
+
+class BarStore:
+    """Memory-mapped, year-partitioned store of OHLCV bars."""
+
+    def __init__(self, root: str = 'data/bars'):
+        """
+        Initialize bar store.
+
+        Args:
+            root: Directory holding the partition files
+        """
+        self.root = root
+        self.logger = logging.getLogger(__name__)
+        os.makedirs(self.root, exist_ok=True)
+
+    def _symbol_dir(self, symbol: str, timeframe: str) -> str:
+        return os.path.join(self.root, timeframe, symbol.upper())
+
+    def _partition_path(self, symbol: str, timeframe: str, year: int) -> str:
+        return os.path.join(self._symbol_dir(symbol, timeframe), f"{year}.npy")
+
+    def years(self, symbol: str, timeframe: str = '1Min') -> List[int]:
+        """List stored partition years for a symbol."""
+        directory = self._symbol_dir(symbol, timeframe)
+        if not os.path.isdir(directory):
+            return []
+        return sorted(
+            int(name[:-4]) for name in os.listdir(directory)
+            if name.endswith('.npy') and name[:-4].isdigit()
+        )
+
+    def _load_partition(self, symbol: str, timeframe: str, year: int) -> np.ndarray:
+        return np.load(self._partition_path(symbol, timeframe, year), mmap_mode='r')
+
+    def write(self, symbol: str, bars: pd.DataFrame, timeframe: str = '1Min'):
+        """
+        Write bars, merging with stored partitions.
+
+        Bars with a timestamp that is already stored replace the stored bar,
+        so re-writing corrected data is safe.
+
+        Args:
+            symbol: Stock symbol
+            bars: DataFrame with a DatetimeIndex and OHLCV columns
+            timeframe: Bar timeframe ('1Min', '5Min', '15Min', '1H')
+        """
+        if bars is None or bars.empty:
+            return
+
+        index = bars.index
+        if index.tz is None:
+            index = index.tz_localize('UTC')
+        ts = index.tz_convert('UTC').as_unit('ns').asi8
+
+        records = np.empty(len(bars), dtype=BAR_DTYPE)
+        records['ts'] = ts
+        for column in OHLCV_COLUMNS:
+            records[column] = bars[column].to_numpy(dtype=float)
+
+        os.makedirs(self._symbol_dir(symbol, timeframe), exist_ok=True)
+
+        years = index.tz_convert('UTC').year.to_numpy()
+        for year in np.unique(years):
+            new = records[years == year]
+            path = self._partition_path(symbol, timeframe, int(year))
+
+            if os.path.exists(path):
+                existing = np.load(path)
+                merged = np.concatenate([existing, new])
+            else:
+                merged = new
+
+            # Keep the last written bar per timestamp, sorted by time
+            order = np.argsort(merged['ts'], kind='stable')
+            merged = merged[order]
+            keep = np.ones(len(merged), dtype=bool)
+            keep[:-1] = merged['ts'][1:] != merged['ts'][:-1]
+            merged = merged[keep]
+
+            tmp_path = path + '.tmp.npy'
+            np.save(tmp_path, merged)
+            os.replace(tmp_path, path)
+
+        self.logger.info(f"Stored {len(records)} {timeframe} bars for {symbol}")
+
+    def read_range(
+        self,
+        symbol: str,
+        start,
+        end,
+        timeframe: str = '1Min'
+    ) -> np.ndarray:
+        """
+        Read bars in [start, end) as a structured array.
+
+        When the range falls inside one partition the result is a view on
+        the memory map; spanning several partitions concatenates them.
+
+        Args:
+            symbol: Stock symbol
+            start: Range start (date string, datetime or UTC nanoseconds)
+            end: Range end, exclusive
+            timeframe: Bar timeframe
+
+        Returns:
+            Structured array with BAR_DTYPE fields
+        """
+        start_ns = start if isinstance(start, (int, np.integer)) else _to_ns(start)
+        end_ns = end if isinstance(end, (int, np.integer)) else _to_ns(end)
+
+        start_year = pd.Timestamp(start_ns, tz='UTC').year
+        end_year = pd.Timestamp(end_ns, tz='UTC').year
+
+        parts = []
+        for year in self.years(symbol, timeframe):
+            if year < start_year or year > end_year:
+                continue
+            partition = self._load_partition(symbol, timeframe, year)
+            ts = partition['ts']
+            lo = np.searchsorted(ts, start_ns, side='left')
+            hi = np.searchsorted(ts, end_ns, side='left')
+            if hi > lo:
+                parts.append(partition[lo:hi])
+
+        if not parts:
+            return np.empty(0, dtype=BAR_DTYPE)
+        if len(parts) == 1:
+            return parts[0]
+        return np.concatenate(parts)
+
+    def read(
+        self,
+        symbol: str,
+        start,
+        end,
+        timeframe: str = '1Min'
+    ) -> pd.DataFrame:
+        """Read bars in [start, end) as an OHLCV DataFrame with a UTC index."""
+        return self.to_frame(self.read_range(symbol, start, end, timeframe))
+
+    def iter_ranges(
+        self,
+        symbol: str,
+        start,
+        end,
+        timeframe: str = '1Min',
+        freq: str = 'MS',
+        tz: str = 'America/New_York'
+    ) -> Iterator[Tuple[pd.Timestamp, np.ndarray]]:
+        """
+        Iterate over stored bars in calendar chunks.
+
+        Chunk boundaries fall on local midnight in ``tz`` so a trading
+        session is never split between chunks.
+
+        Yields:
+            Tuples of (chunk start, structured array of bars)
+        """
+        start_ts = pd.Timestamp(start)
+        end_ts = pd.Timestamp(end)
+        start_ts = start_ts.tz_localize(tz) if start_ts.tz is None else start_ts.tz_convert(tz)
+        end_ts = end_ts.tz_localize(tz) if end_ts.tz is None else end_ts.tz_convert(tz)
+
+        edges = pd.date_range(start_ts.normalize(), end_ts, freq=freq, tz=tz)
+        edges = [start_ts] + [e for e in edges if start_ts < e < end_ts] + [end_ts]
+
+        for chunk_start, chunk_end in zip(edges[:-1], edges[1:]):
+            bars = self.read_range(symbol, chunk_start.value, chunk_end.value, timeframe)
+            if len(bars):
+                yield chunk_start, bars
+
+    def first_timestamp(self, symbol: str, timeframe: str = '1Min') -> Optional[pd.Timestamp]:
+        """Timestamp of the first stored bar, or None."""
+        years = self.years(symbol, timeframe)
+        if not years:
+            return None
+        partition = self._load_partition(symbol, timeframe, years[0])
+        return pd.Timestamp(int(partition['ts'][0]), tz='UTC') if len(partition) else None
+
+    def last_timestamp(self, symbol: str, timeframe: str = '1Min') -> Optional[pd.Timestamp]:
+        """Timestamp of the last stored bar, or None."""
+        years = self.years(symbol, timeframe)
+        if not years:
+            return None
+        partition = self._load_partition(symbol, timeframe, years[-1])
+        return pd.Timestamp(int(partition['ts'][-1]), tz='UTC') if len(partition) else None
+
+    def clear(self, symbol: Optional[str] = None, timeframe: str = '1Min'):
+        """Delete stored partitions for a symbol (or every symbol)."""
+        base = os.path.join(self.root, timeframe)
+        if not os.path.isdir(base):
+            return
+        symbols = [symbol.upper()] if symbol else os.listdir(base)
+        for sym in symbols:
+            directory = os.path.join(base, sym)
+            if not os.path.isdir(directory):
+                continue
+            for name in os.listdir(directory):
+                os.remove(os.path.join(directory, name))
+            os.rmdir(directory)
+            self.logger.info(f"Cleared {timeframe} bars for {sym}")
+
+    @staticmethod
+    def to_frame(bars: np.ndarray) -> pd.DataFrame:
+        """Convert a structured bar array to an OHLCV DataFrame."""
+        ts = np.array(bars['ts'], dtype='i8').view('M8[ns]')
+        index = pd.DatetimeIndex(ts).tz_localize('UTC')
+        return pd.DataFrame(
+            {column: np.asarray(bars[column]) for column in OHLCV_COLUMNS},
+            index=index
+        )
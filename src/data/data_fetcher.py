@@ -7,50 +7,94 @@ Fetches historical and real-time market data from various sources.
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
+import importlib.util
 import os
+import sys
 import logging
-from typing import Optional, List
-import yfinance as yf
+from functools import lru_cache
+from typing import Optional, List, Tuple
 
-try:
-    from alpaca.data.historical import StockHistoricalDataClient
-    from alpaca.data.requests import StockBarsRequest
-    from alpaca.data.timeframe import TimeFrame
-    ALPACA_AVAILABLE = True
-except ImportError:
-    ALPACA_AVAILABLE = False
-    logging.warning("Alpaca SDK not installed. Install with: pip install alpaca-py")
+from src.data.synthetic_data import SyntheticMarketData
 
-# Handle both local and Streamlit Cloud deployments
-try:
-    import streamlit as st
-    # Try Streamlit secrets first (for cloud deployment)
-    if hasattr(st, 'secrets'):
-        ALPACA_API_KEY = st.secrets.get("ALPACA_API_KEY", "")
-        ALPACA_SECRET_KEY = st.secrets.get("ALPACA_SECRET_KEY", "")
-    else:
-        raise ImportError("Streamlit secrets not available")
-except (ImportError, FileNotFoundError):
-    # Fall back to config file (for local deployment)
+# The Alpaca SDK, yfinance and Streamlit are slow to import, so they are
+# imported when a provider first needs them rather than with this module
+ALPACA_AVAILABLE = importlib.util.find_spec('alpaca') is not None
+
+# Timeframes cached in the memory-mapped bar store and their bar intervals
+# (daily bars use StateManager)
+INTRADAY_TIMEFRAMES = {
+    '1Min': timedelta(minutes=1),
+    '5Min': timedelta(minutes=5),
+    '15Min': timedelta(minutes=15),
+    '1H': timedelta(hours=1),
+}
+
+
+def last_expected_bar(end_date: str, timeframe: str) -> pd.Timestamp:
+    """
+    Timestamp of the last regular-session bar due by the end of end_date.
+
+    That is the bar opening one interval before the 16:00 New York close of
+    end_date (or of the weekday before it), or one interval before now while
+    that session is still in progress. Holidays and early closes are not
+    known, so a range ending on one is refetched.
+    """
+    day = pd.offsets.BDay().rollback(pd.Timestamp(end_date))
+    close = pd.Timestamp(f"{day:%Y-%m-%d} 16:00", tz='America/New_York').tz_convert('UTC')
+    return min(close, pd.Timestamp.now(tz='UTC')) - INTRADAY_TIMEFRAMES[timeframe]
+
+
+@lru_cache(maxsize=1)
+def load_alpaca_credentials() -> Tuple[str, str]:
+    """
+    Alpaca API key and secret.
+    
+    Inside a Streamlit app (Streamlit Cloud) they come from Streamlit
+    secrets; otherwise from config/alpaca_config.py, then the
+    ALPACA_API_KEY / ALPACA_SECRET_KEY environment variables.
+    
+    Returns:
+        (api_key, secret_key), empty strings if none are configured
+    """
+    # Only a running Streamlit app has already imported streamlit
+    st = sys.modules.get('streamlit')
+    if st is not None:
+        try:
+            if st.secrets.get("ALPACA_API_KEY"):
+                return st.secrets.get("ALPACA_API_KEY", ""), st.secrets.get("ALPACA_SECRET_KEY", "")
+        except Exception:
+            pass
+    
     try:
         from config.alpaca_config import ALPACA_API_KEY, ALPACA_SECRET_KEY
+        return ALPACA_API_KEY, ALPACA_SECRET_KEY
     except ImportError:
-        # If neither works, use empty strings (will use Yahoo Finance)
-        ALPACA_API_KEY = ""
-        ALPACA_SECRET_KEY = ""
+        pass
+    
+    api_key = os.environ.get("ALPACA_API_KEY", "")
+    if not api_key:
+        # If nothing is configured, Yahoo Finance is used
         logging.warning("No Alpaca credentials found. Using Yahoo Finance only.")
+    return api_key, os.environ.get("ALPACA_SECRET_KEY", "")
 
 
 class DataFetcher:
     """Fetch market data from multiple sources."""
     
-    def __init__(self, data_provider: str = 'alpaca', cache_dir: str = 'data'):
+    def __init__(
+        self,
+        data_provider: str = 'alpaca',
+        cache_dir: str = 'data',
+        synthetic: Optional[SyntheticMarketData] = None
+    ):
         """
         Initialize DataFetcher.
         
         Args:
-            data_provider: 'alpaca' or 'yahoo'
+            data_provider: 'alpaca', 'yahoo' or 'synthetic'
             cache_dir: Directory to cache data
+            synthetic: Generator used by the 'synthetic' provider
+                (defaults to SyntheticMarketData())
         """
         self.data_provider = data_provider.lower()
         self.cache_dir = cache_dir
@@ -59,20 +103,23 @@ class DataFetcher:
         # Create cache directory
         os.makedirs(self.cache_dir, exist_ok=True)
         
+        if self.data_provider == 'synthetic':
+            # Offline generated data; nothing to fetch or cache
+            self.synthetic = synthetic or SyntheticMarketData()
+        
         # Initialize Alpaca client if available
-        if self.data_provider == 'alpaca' and ALPACA_AVAILABLE:
+        elif self.data_provider == 'alpaca' and ALPACA_AVAILABLE:
             try:
-                self.alpaca_client = StockHistoricalDataClient(
-                    ALPACA_API_KEY, 
-                    ALPACA_SECRET_KEY
-                )
+                from alpaca.data.historical import StockHistoricalDataClient
+                
+                self.alpaca_client = StockHistoricalDataClient(*load_alpaca_credentials())
                 self.logger.info("Alpaca client initialized successfully")
             except Exception as e:
                 self.logger.error(f"Failed to initialize Alpaca client: {e}")
                 self.data_provider = 'yahoo'
                 self.logger.info("Falling back to Yahoo Finance")
         elif self.data_provider == 'alpaca' and not ALPACA_AVAILABLE:
-            self.logger.warning("Alpaca not available, using Yahoo Finance")
+            self.logger.warning("Alpaca SDK not installed (pip install alpaca-py), using Yahoo Finance")
             self.data_provider = 'yahoo'
     
     def fetch_historical_data(
@@ -99,12 +146,16 @@ class DataFetcher:
         Note: Uses database cache to store historical data. Only fetches new data
         since the last cached date, making subsequent fetches much faster.
         """
-        from src.trading.state_manager import StateManager
+        from src.trading.state_manager import get_state_manager
         from datetime import datetime, timedelta
         
+        if self.data_provider == 'synthetic':
+            # Generated data is deterministic, so caching it gains nothing
+            return self._fetch_from_provider(symbol, start_date, end_date, timeframe)
+        
         # Only use database cache for daily data
         if use_cache and timeframe == '1D':
-            state_manager = StateManager()
+            state_manager = get_state_manager()
             
             # Check if we have cached data
             last_cached_date = state_manager.get_last_cached_date(symbol)
@@ -129,30 +180,21 @@ class DataFetcher:
                 # Fetch all data directly (this handles historical backtests when cache has recent data)
                 if end_datetime < last_date:
                     self.logger.info(f"Requested date range ({start_date} to {end_date}) is before cached data ({last_cached_date}), fetching fresh historical data")
-                    if self.data_provider == 'alpaca':
-                        df = self._fetch_alpaca_data(symbol, start_date, end_date, timeframe)
-                    else:
-                        df = self._fetch_yahoo_data(symbol, start_date, end_date)
+                    df = self._fetch_from_provider(symbol, start_date, end_date, timeframe)
                     return df
                 
                 # If requested start date is after last cached date, cache is not useful
                 # Fetch all data directly
                 if start_datetime > last_date:
                     self.logger.info(f"Requested date range is after cached data, fetching fresh data")
-                    if self.data_provider == 'alpaca':
-                        df = self._fetch_alpaca_data(symbol, start_date, end_date, timeframe)
-                    else:
-                        df = self._fetch_yahoo_data(symbol, start_date, end_date)
+                    df = self._fetch_from_provider(symbol, start_date, end_date, timeframe)
                     return df
                 
                 # Fetch only new data since last cached date
                 fetch_start = (last_date + timedelta(days=1)).strftime('%Y-%m-%d')
                 self.logger.info(f"Fetching new data for {symbol} from {fetch_start} to {end_date}")
                 
-                if self.data_provider == 'alpaca':
-                    new_df = self._fetch_alpaca_data(symbol, fetch_start, end_date, timeframe)
-                else:
-                    new_df = self._fetch_yahoo_data(symbol, fetch_start, end_date)
+                new_df = self._fetch_from_provider(symbol, fetch_start, end_date, timeframe)
                 
                 # Save new data to cache
                 if new_df is not None and not new_df.empty:
@@ -175,10 +217,7 @@ class DataFetcher:
                 # No cache, fetch all data
                 self.logger.info(f"No cache found for {symbol}, fetching all historical data")
                 
-                if self.data_provider == 'alpaca':
-                    df = self._fetch_alpaca_data(symbol, start_date, end_date, timeframe)
-                else:
-                    df = self._fetch_yahoo_data(symbol, start_date, end_date)
+                df = self._fetch_from_provider(symbol, start_date, end_date, timeframe)
                 
                 # Save to cache
                 if df is not None and not df.empty:
@@ -187,17 +226,69 @@ class DataFetcher:
                 
                 return df
         
+        elif use_cache and timeframe in INTRADAY_TIMEFRAMES and self.data_provider == 'alpaca':
+            # Intraday bars are cached in the memory-mapped bar store
+            return self._fetch_intraday_data(symbol, start_date, end_date, timeframe)
+        
         else:
             # Not using cache or not daily data, fetch directly
             self.logger.info(f"Fetching {symbol} data from {start_date} to {end_date} (no cache)")
             
-            if self.data_provider == 'alpaca':
-                df = self._fetch_alpaca_data(symbol, start_date, end_date, timeframe)
-            else:
-                df = self._fetch_yahoo_data(symbol, start_date, end_date)
+            df = self._fetch_from_provider(symbol, start_date, end_date, timeframe)
             
             return df
     
+    def _fetch_from_provider(
+        self,
+        symbol: str,
+        start_date: str,
+        end_date: str,
+        timeframe: str
+    ) -> pd.DataFrame:
+        """Fetch data from the configured provider."""
+        if self.data_provider == 'synthetic':
+            return self.synthetic.get_bars(symbol, start_date, end_date, timeframe)
+        if self.data_provider == 'alpaca':
+            return self._fetch_alpaca_data(symbol, start_date, end_date, timeframe)
+        return self._fetch_yahoo_data(symbol, start_date, end_date)
+    
+    def _fetch_intraday_data(
+        self,
+        symbol: str,
+        start_date: str,
+        end_date: str,
+        timeframe: str
+    ) -> pd.DataFrame:
+        """
+        Fetch intraday bars through the on-disk bar store.
+        
+        Only bars after the last stored timestamp are requested from Alpaca;
+        a request that starts before the stored history refetches the range.
+        The end date's bars are included, so the store is only up to date
+        once it holds that day's closing bar (see ``last_expected_bar``).
+        """
+        from src.data.bar_store import BarStore
+        
+        store = BarStore(os.path.join(self.cache_dir, 'bars'))
+        first = store.first_timestamp(symbol, timeframe)
+        last = store.last_timestamp(symbol, timeframe)
+        
+        start_ts = pd.Timestamp(start_date, tz='UTC')
+        end_ts = pd.Timestamp(end_date, tz='UTC') + timedelta(days=1)
+        fetch_end = end_ts.strftime('%Y-%m-%d')
+        
+        if first is None or start_ts < first.normalize():
+            self.logger.info(f"Fetching {timeframe} bars for {symbol} from {start_date} to {end_date}")
+            store.write(symbol, self._fetch_alpaca_data(symbol, start_date, fetch_end, timeframe), timeframe)
+        elif last < last_expected_bar(end_date, timeframe):
+            fetch_start = last.strftime('%Y-%m-%d')
+            self.logger.info(f"Fetching new {timeframe} bars for {symbol} from {fetch_start} to {end_date}")
+            store.write(symbol, self._fetch_alpaca_data(symbol, fetch_start, fetch_end, timeframe), timeframe)
+        else:
+            self.logger.info(f"Bar store is up to date for {symbol} ({timeframe})")
+        
+        return store.read(symbol, start_ts, end_ts, timeframe)
+    
     def _fetch_alpaca_data(
         self,
         symbol: str,
@@ -212,6 +303,9 @@ class DataFetcher:
         This ensures prices are adjusted for splits (like NVDA's 10-for-1 split).
         """
         try:
+            from alpaca.data.requests import StockBarsRequest
+            from alpaca.data.timeframe import TimeFrame
+            
             # Map timeframe string to Alpaca TimeFrame
             timeframe_map = {
                 '1Min': TimeFrame.Minute,
@@ -271,6 +365,8 @@ class DataFetcher:
         while 'Open', 'High', 'Low' are also adjusted proportionally.
         """
         try:
+            import yfinance as yf
+            
             ticker = yf.Ticker(symbol)
             # auto_adjust=True ensures we get adjusted prices (default behavior)
             # This handles stock splits, dividends, etc. automatically
@@ -0,0 +1,285 @@
+"""
+Feature Store Module
+
+On-disk cache of computed model features, so strategies that train and
+predict on the same history (and backtests that repeat that work) compute
+each feature row once.
+
+Features are stored per feature set version, symbol and calendar year, one
+memory-mapped NumPy file per column:
+
+    <root>/<feature set>-v<version>/<SYMBOL>/<year>/ts.npy
+    <root>/<feature set>-v<version>/<SYMBOL>/<year>/<column>.npy
+
+Rows are sorted by bar timestamp (nanoseconds since epoch, UTC). When new
+bars arrive only the rows from the last stored timestamp on are computed,
+from those bars plus a warm-up tail of older bars for the rolling windows.
+The last stored row is recomputed because its bar may still have been
+forming (e.g. today's daily bar) when it was stored.
+Changing how a feature set is computed must bump its version.
+"""
+
+import os
+import shutil
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass(frozen=True)
+class FeatureSet:
+    """
+    A versioned set of feature columns computed from OHLCV bars.
+
+    Attributes:
+        name: Feature set name, including any parameters the features depend on
+        version: Bumped whenever the computation changes
+        columns: Feature columns that are stored
+        compute: Function from an OHLCV DataFrame to a DataFrame with the columns
+        warmup: Bars of history needed before a row's features are final
+    """
+    name: str
+    version: int
+    columns: Tuple[str, ...]
+    compute: Callable[[pd.DataFrame], pd.DataFrame]
+    warmup: int = 250
+
+    @property
+    def key(self) -> str:
+        return f"{self.name}-v{self.version}"
+
+
+def _index_ns(index: pd.DatetimeIndex) -> np.ndarray:
+    """UTC nanoseconds of a DatetimeIndex (naive timestamps are taken as UTC)."""
+    if index.tz is None:
+        index = index.tz_localize('UTC')
+    return index.tz_convert('UTC').as_unit('ns').asi8
+
+
+class FeatureStore:
+    """Columnar, year-partitioned store of computed features."""
+
+    def __init__(self, root: str = 'data/features'):
+        """
+        Initialize feature store.
+
+        Args:
+            root: Directory holding the feature files
+        """
+        self.root = root
+        self.logger = logging.getLogger(__name__)
+        os.makedirs(self.root, exist_ok=True)
+        self.rows_computed = 0
+        self.rows_served = 0
+
+    def _symbol_dir(self, symbol: str, feature_set: FeatureSet) -> str:
+        return os.path.join(self.root, feature_set.key, symbol.upper())
+
+    def years(self, symbol: str, feature_set: FeatureSet) -> List[int]:
+        """List stored partition years for a symbol."""
+        directory = self._symbol_dir(symbol, feature_set)
+        if not os.path.isdir(directory):
+            return []
+        return sorted(int(name) for name in os.listdir(directory) if name.isdigit())
+
+    def _load_partition(self, symbol: str, feature_set: FeatureSet, year: int, column: str) -> np.ndarray:
+        path = os.path.join(self._symbol_dir(symbol, feature_set), str(year), f"{column}.npy")
+        return np.load(path, mmap_mode='r')
+
+    def write(self, symbol: str, feature_set: FeatureSet, features: pd.DataFrame):
+        """
+        Write feature rows, merging with stored partitions.
+
+        Rows with a timestamp that is already stored replace the stored row.
+
+        Args:
+            symbol: Stock symbol
+            feature_set: Feature set the rows belong to
+            features: DataFrame with a DatetimeIndex and the feature set's columns
+        """
+        if features is None or features.empty:
+            return
+
+        ts = _index_ns(features.index)
+        years = pd.DatetimeIndex(ts.view('M8[ns]')).year.to_numpy()
+        columns = list(feature_set.columns)
+        values = {column: features[column].to_numpy(dtype=float) for column in columns}
+
+        for year in np.unique(years):
+            mask = years == year
+            directory = os.path.join(self._symbol_dir(symbol, feature_set), str(int(year)))
+            merged_ts = ts[mask]
+            merged = {column: values[column][mask] for column in columns}
+
+            if os.path.exists(os.path.join(directory, 'ts.npy')):
+                merged_ts = np.concatenate([np.load(os.path.join(directory, 'ts.npy')), merged_ts])
+                for column in columns:
+                    existing = np.load(os.path.join(directory, f"{column}.npy"))
+                    merged[column] = np.concatenate([existing, merged[column]])
+
+            # Keep the last written row per timestamp, sorted by time
+            order = np.argsort(merged_ts, kind='stable')
+            merged_ts = merged_ts[order]
+            keep = np.ones(len(merged_ts), dtype=bool)
+            keep[:-1] = merged_ts[1:] != merged_ts[:-1]
+
+            # Write into a fresh directory and swap it in, so readers never
+            # see columns of different lengths
+            tmp_dir = directory + '.tmp'
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            os.makedirs(tmp_dir)
+            np.save(os.path.join(tmp_dir, 'ts.npy'), merged_ts[keep])
+            for column in columns:
+                np.save(os.path.join(tmp_dir, f"{column}.npy"), merged[column][order][keep])
+            old_dir = directory + '.old'
+            if os.path.isdir(directory):
+                os.replace(directory, old_dir)
+            os.replace(tmp_dir, directory)
+            shutil.rmtree(old_dir, ignore_errors=True)
+
+        self.logger.info(f"Stored {len(features)} {feature_set.key} feature rows for {symbol}")
+
+    def read(self, symbol: str, feature_set: FeatureSet, start=None, end=None) -> pd.DataFrame:
+        """
+        Read stored features in [start, end].
+
+        Args:
+            symbol: Stock symbol
+            feature_set: Feature set to read
+            start: Range start (None for the first stored row)
+            end: Range end, inclusive (None for the last stored row)
+
+        Returns:
+            DataFrame of feature columns with a UTC index
+        """
+        start_ns = _index_ns(pd.DatetimeIndex([start]))[0] if start is not None else None
+        end_ns = _index_ns(pd.DatetimeIndex([end]))[0] if end is not None else None
+        start_year = pd.Timestamp(start_ns, tz='UTC').year if start_ns is not None else None
+        end_year = pd.Timestamp(end_ns, tz='UTC').year if end_ns is not None else None
+
+        ts_parts, column_parts = [], {column: [] for column in feature_set.columns}
+        for year in self.years(symbol, feature_set):
+            if (start_year is not None and year < start_year) or (end_year is not None and year > end_year):
+                continue
+            ts = self._load_partition(symbol, feature_set, year, 'ts')
+            lo = np.searchsorted(ts, start_ns, side='left') if start_ns is not None else 0
+            hi = np.searchsorted(ts, end_ns, side='right') if end_ns is not None else len(ts)
+            if hi <= lo:
+                continue
+            ts_parts.append(ts[lo:hi])
+            for column in feature_set.columns:
+                column_parts[column].append(self._load_partition(symbol, feature_set, year, column)[lo:hi])
+
+        ts = np.concatenate(ts_parts) if ts_parts else np.empty(0, dtype='i8')
+        index = pd.DatetimeIndex(np.asarray(ts, dtype='i8').view('M8[ns]')).tz_localize('UTC')
+        return pd.DataFrame(
+            {
+                column: np.concatenate(parts) if parts else np.empty(0)
+                for column, parts in column_parts.items()
+            },
+            index=index
+        )
+
+    def first_timestamp(self, symbol: str, feature_set: FeatureSet) -> Optional[pd.Timestamp]:
+        """Timestamp of the first stored row, or None."""
+        years = self.years(symbol, feature_set)
+        if not years:
+            return None
+        ts = self._load_partition(symbol, feature_set, years[0], 'ts')
+        return pd.Timestamp(int(ts[0]), tz='UTC') if len(ts) else None
+
+    def last_timestamp(self, symbol: str, feature_set: FeatureSet) -> Optional[pd.Timestamp]:
+        """Timestamp of the last stored row, or None."""
+        years = self.years(symbol, feature_set)
+        if not years:
+            return None
+        ts = self._load_partition(symbol, feature_set, years[-1], 'ts')
+        return pd.Timestamp(int(ts[-1]), tz='UTC') if len(ts) else None
+
+    def get(self, symbol: str, feature_set: FeatureSet, bars: pd.DataFrame) -> pd.DataFrame:
+        """
+        Get features for every bar, computing only rows not stored yet.
+
+        Bars from the last stored row on are computed together with
+        ``feature_set.warmup`` earlier bars and merged into the store; the
+        last stored row is recomputed in case its bar was still forming
+        when it was stored. If the bars reach
+        back before the stored rows or fill gaps in them, the features are
+        recomputed over all the bars and merged into the store.
+
+        Args:
+            symbol: Stock symbol
+            feature_set: Feature set to serve
+            bars: OHLCV DataFrame with a DatetimeIndex, sorted by time
+
+        Returns:
+            DataFrame of feature columns indexed like ``bars``
+        """
+        if bars.empty:
+            return pd.DataFrame(columns=list(feature_set.columns), index=bars.index, dtype=float)
+
+        bars_ns = _index_ns(bars.index)
+        first = self.first_timestamp(symbol, feature_set)
+        last = self.last_timestamp(symbol, feature_set)
+
+        if last is not None and bars_ns[0] >= first.value:
+            new_from = int(np.searchsorted(bars_ns, last.value, side='left'))
+            if new_from < len(bars):
+                warm_from = max(0, new_from - feature_set.warmup)
+                computed = feature_set.compute(bars.iloc[warm_from:])
+                self._store_computed(symbol, feature_set, computed.iloc[new_from - warm_from:])
+
+            stored = self.read(symbol, feature_set, bars.index[0], bars.index[-1])
+            positions = np.searchsorted(_index_ns(stored.index), bars_ns)
+            positions = np.minimum(positions, max(len(stored) - 1, 0))
+            if len(stored) and np.array_equal(_index_ns(stored.index)[positions], bars_ns):
+                self.rows_served += len(bars)
+                result = stored.iloc[positions]
+                result.index = bars.index
+                return result
+
+        computed = feature_set.compute(bars)
+        self._store_computed(symbol, feature_set, computed)
+        self.rows_served += len(bars)
+        return computed[list(feature_set.columns)]
+
+    def _store_computed(self, symbol: str, feature_set: FeatureSet, computed: pd.DataFrame):
+        self.rows_computed += len(computed)
+        self.write(symbol, feature_set, computed[list(feature_set.columns)])
+
+    def clear(self, symbol: Optional[str] = None, feature_set: Optional[FeatureSet] = None):
+        """Delete stored features for a symbol and/or feature set (or everything)."""
+        feature_dirs = [feature_set.key] if feature_set else os.listdir(self.root)
+        for feature_dir in feature_dirs:
+            base = os.path.join(self.root, feature_dir)
+            if not os.path.isdir(base):
+                continue
+            symbols = [symbol.upper()] if symbol else os.listdir(base)
+            for sym in symbols:
+                shutil.rmtree(os.path.join(base, sym), ignore_errors=True)
+            self.logger.info(f"Cleared {feature_dir} features for {symbol or 'all symbols'}")
+
+
+_stores: Dict[str, FeatureStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_feature_store(root: str = 'data/features') -> FeatureStore:
+    """
+    Get the process-wide feature store for a directory.
+
+    Args:
+        root: Directory holding the feature files
+
+    Returns:
+        FeatureStore instance
+    """
+    with _stores_lock:
+        store = _stores.get(root)
+        if store is None:
+            store = _stores[root] = FeatureStore(root)
+        return store
@@ -0,0 +1,467 @@
+"""
+Synthetic Market Data Module
+
+Generates realistic OHLCV bars offline for backtests, load tests and
+benchmarks.
+
+Prices follow a geometric Brownian motion, optionally with market-wide
+regime switching (bull / bear / crisis). Returns of different symbols are
+correlated through a shared market factor, overnight gaps are added as
+random jumps between the previous close and the open, and stock splits
+happen whenever the raw price climbs past a threshold.
+
+Every path is generated from a fixed epoch with random streams seeded by
+(seed, symbol, component), so the same symbol always gets the same bars no
+matter which date range or which other symbols are requested. Incremental
+fetches and caches therefore line up with earlier results.
+"""
+
+import logging
+import zlib
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+EPOCH = '1990-01-01'
+TRADING_DAYS_PER_YEAR = 252
+SESSION_MINUTES = 390  # 09:30 - 16:00 ET
+MARKET_TZ = 'America/New_York'
+
+TIMEFRAME_MINUTES = {
+    '1Min': 1,
+    '5Min': 5,
+    '15Min': 15,
+    '1H': 60,
+}
+
+# Annual drift, volatility multiplier and mean duration in trading days
+REGIMES = {
+    'bull': (0.15, 0.8, 500),
+    'bear': (-0.20, 1.4, 150),
+    'crisis': (-0.60, 2.5, 30),
+}
+
+# Probability of moving to each regime when the current one ends
+REGIME_TRANSITIONS = {
+    'bull': {'bear': 0.8, 'crisis': 0.2},
+    'bear': {'bull': 0.7, 'crisis': 0.3},
+    'crisis': {'bull': 0.3, 'bear': 0.7},
+}
+
+SPLIT_RATIOS = (2, 3, 4, 5, 10, 20)
+
+# Random stream ids per symbol, kept fixed so paths stay reproducible
+_PARAMS, _IDIO, _GAPS, _RANGE, _VOLUME = range(5)
+
+
+def _symbol_key(symbol: str) -> int:
+    return zlib.crc32(symbol.upper().encode())
+
+
+class SyntheticMarketData:
+    """Deterministic generator of correlated OHLCV price paths."""
+
+    def __init__(
+        self,
+        seed: int = 42,
+        model: str = 'gbm',
+        annual_drift: float = 0.07,
+        annual_volatility: float = 0.25,
+        correlation: float = 0.3,
+        gap_probability: float = 0.02,
+        gap_size: float = 0.03,
+        split_threshold: Optional[float] = 500.0,
+        epoch: str = EPOCH
+    ):
+        """
+        Initialize synthetic data generator.
+
+        Args:
+            seed: Base random seed
+            model: 'gbm' for constant drift/volatility or 'regime' for
+                market-wide regime switching
+            annual_drift: Annual drift used by the 'gbm' model
+            annual_volatility: Annual volatility of an average symbol
+            correlation: Pairwise correlation of daily returns between symbols
+            gap_probability: Chance per bar of an overnight gap
+            gap_size: Standard deviation of gap log-returns
+            split_threshold: Raw price that triggers a stock split
+                (None disables splits)
+            epoch: First date of every generated path
+        """
+        if model not in ('gbm', 'regime'):
+            raise ValueError(f"Unknown model: {model}. Use 'gbm' or 'regime'")
+        if not 0 <= correlation < 1:
+            raise ValueError("correlation must be in [0, 1)")
+
+        self.seed = seed
+        self.model = model
+        self.annual_drift = annual_drift
+        self.annual_volatility = annual_volatility
+        self.correlation = correlation
+        self.gap_probability = gap_probability
+        self.gap_size = gap_size
+        self.split_threshold = split_threshold
+        self.epoch = pd.Timestamp(epoch)
+
+        self.logger = logging.getLogger(__name__)
+
+        # Trading calendar, extended on demand
+        self._calendar = pd.DatetimeIndex([], tz='UTC')
+        self._calendar_end = None
+
+        # Market-wide series, extended on demand
+        self._market_factor = np.empty(0)
+        self._regime_drift = np.empty(0)
+        self._regime_vol = np.empty(0)
+
+    def _rng(self, *key: int) -> np.random.Generator:
+        return np.random.default_rng(np.random.SeedSequence([self.seed, *key]))
+
+    # ------------------------------------------------------------------
+    # Market-wide series
+    # ------------------------------------------------------------------
+
+    def _ensure_market(self, n_days: int):
+        """Generate the shared market factor and regimes for n_days."""
+        if len(self._market_factor) >= n_days:
+            return
+
+        self._market_factor = self._rng(0, 0).standard_normal(n_days)
+
+        if self.model == 'gbm':
+            self._regime_drift = np.full(n_days, self.annual_drift)
+            self._regime_vol = np.ones(n_days)
+            return
+
+        # Regime durations are geometric; draws happen in a fixed order so
+        # a longer horizon extends the same sequence
+        rng = self._rng(0, 1)
+        drift = np.empty(n_days)
+        vol = np.empty(n_days)
+        regime = 'bull'
+        position = 0
+        while position < n_days:
+            annual_drift, vol_mult, mean_duration = REGIMES[regime]
+            duration = int(rng.geometric(1 / mean_duration))
+            end = min(position + duration, n_days)
+            drift[position:end] = annual_drift
+            vol[position:end] = vol_mult
+            position = end
+
+            choices = REGIME_TRANSITIONS[regime]
+            regime = str(rng.choice(list(choices), p=list(choices.values())))
+
+        self._regime_drift = drift
+        self._regime_vol = vol
+
+    def regimes(self, start_date, end_date) -> pd.Series:
+        """Market regime label per trading day ('gbm' for the GBM model)."""
+        days = self._trading_days(end_date)
+        self._ensure_market(len(days))
+        first = days.searchsorted(self._utc(start_date).normalize())
+
+        if self.model == 'gbm':
+            return pd.Series('gbm', index=days[first:])
+
+        labels = {drift: name for name, (drift, _, _) in REGIMES.items()}
+        drift = pd.Series(self._regime_drift[:len(days)], index=days)
+        return drift.iloc[first:].map(labels)
+
+    # ------------------------------------------------------------------
+    # Daily paths
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _utc(value) -> pd.Timestamp:
+        ts = pd.Timestamp(value)
+        return ts.tz_localize('UTC') if ts.tz is None else ts.tz_convert('UTC')
+
+    def _trading_days(self, end_date) -> pd.DatetimeIndex:
+        """Business days from the epoch through end_date (UTC midnight)."""
+        end = self._utc(end_date).normalize()
+        if self._calendar_end is None or end > self._calendar_end:
+            days = np.arange(
+                np.datetime64(self.epoch.date(), 'D'),
+                np.datetime64(end.date(), 'D') + 1
+            )
+            days = days[np.is_busday(days)].astype('M8[ns]')
+            self._calendar = pd.DatetimeIndex(days).tz_localize('UTC')
+            self._calendar_end = end
+        return self._calendar[:self._calendar.searchsorted(end, side='right')]
+
+    def _daily_path(self, symbol: str, n_days: int) -> Dict[str, np.ndarray]:
+        """
+        Generate epoch-anchored daily bars for one symbol.
+
+        Prices are continuous (unadjusted for splits); 'split_factor' holds
+        the cumulative split ratio in effect on each day.
+        """
+        self._ensure_market(n_days)
+        key = _symbol_key(symbol)
+
+        params = self._rng(key, _PARAMS)
+        vol_mult = params.uniform(0.6, 1.6)
+        start_price = float(np.exp(params.uniform(np.log(10), np.log(200))))
+        base_volume = float(10 ** params.uniform(5.5, 7.5))
+
+        daily_vol = self.annual_volatility / np.sqrt(TRADING_DAYS_PER_YEAR)
+        sigma = daily_vol * vol_mult * self._regime_vol[:n_days]
+        mu = self._regime_drift[:n_days] / TRADING_DAYS_PER_YEAR
+
+        rho = self.correlation
+        shock = (
+            np.sqrt(rho) * self._market_factor[:n_days]
+            + np.sqrt(1 - rho) * self._rng(key, _IDIO).standard_normal(n_days)
+        )
+        returns = mu - 0.5 * sigma ** 2 + sigma * shock
+
+        gap_hit = self._rng(key, _GAPS, 0).random(n_days) < self.gap_probability
+        gap_size = self._rng(key, _GAPS, 1).normal(0, self.gap_size, n_days)
+        gaps = np.where(gap_hit, gap_size, 0.0)
+        gaps[0] = 0.0
+
+        # Part of each day's move happens overnight, plus any gap
+        overnight = 0.2 * returns + gaps
+        log_close = np.log(start_price) + np.cumsum(returns + gaps)
+        log_open = np.empty(n_days)
+        log_open[0] = np.log(start_price)
+        log_open[1:] = log_close[:-1] + overnight[1:]
+
+        close = np.exp(log_close)
+        open_ = np.exp(log_open)
+
+        # Draws are laid out day-major so longer paths extend shorter ones
+        extension = np.abs(self._rng(key, _RANGE).normal(0, 0.5, (n_days, 2))) * sigma[:, None]
+        high = np.maximum(open_, close) * np.exp(extension[:, 0])
+        low = np.minimum(open_, close) * np.exp(-extension[:, 1])
+
+        # Volume rises with the size of the move and on gap days
+        move = np.abs(returns + gaps) / (daily_vol * vol_mult)
+        noise = self._rng(key, _VOLUME).lognormal(0, 0.3, n_days)
+        volume = base_volume * noise * (1 + 0.5 * move) * np.where(gap_hit, 2.0, 1.0)
+
+        return {
+            'open': open_,
+            'high': high,
+            'low': low,
+            'close': close,
+            'volume': volume,
+            'split_factor': self._split_factors(close),
+        }
+
+    def _split_factors(self, close: np.ndarray) -> np.ndarray:
+        """Cumulative split ratio per day, splitting when raw price is too high."""
+        factor = np.ones(len(close))
+        if not self.split_threshold:
+            return factor
+
+        target = self.split_threshold / 5
+        cumulative = 1.0
+        position = 0
+        while position < len(close):
+            raw = close[position:] / cumulative
+            above = np.flatnonzero(raw > self.split_threshold)
+            if len(above) == 0:
+                break
+            day = position + int(above[0])
+            desired = close[day] / cumulative / target
+            ratio = min(SPLIT_RATIOS, key=lambda r: abs(r - desired))
+            # The split takes effect from the next session
+            cumulative *= ratio
+            factor[day + 1:] = cumulative
+            position = day + 1
+
+        return factor
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def get_bars(
+        self,
+        symbol: str,
+        start_date,
+        end_date,
+        timeframe: str = '1D',
+        adjustment: str = 'split'
+    ) -> pd.DataFrame:
+        """
+        Generate bars for one symbol.
+
+        Args:
+            symbol: Stock symbol (any string; it seeds the path)
+            start_date: First date (inclusive)
+            end_date: Last date (inclusive)
+            timeframe: '1D' or an intraday timeframe ('1Min', '5Min',
+                '15Min', '1H')
+            adjustment: 'split' for split-adjusted prices and volumes
+                (like Alpaca's adjustment='split') or 'raw'
+
+        Returns:
+            DataFrame with OHLCV columns and a UTC DatetimeIndex
+        """
+        if adjustment not in ('split', 'raw'):
+            raise ValueError(f"Unknown adjustment: {adjustment}")
+
+        days = self._trading_days(end_date)
+        if len(days) == 0:
+            return pd.DataFrame(columns=['open', 'high', 'low', 'close', 'volume'])
+
+        path = self._daily_path(symbol, len(days))
+
+        first = int(days.searchsorted(self._utc(start_date).normalize()))
+        window = slice(first, len(days))
+
+        factor = path['split_factor'][window]
+        if len(factor) == 0:
+            return pd.DataFrame(columns=['open', 'high', 'low', 'close', 'volume'])
+
+        # Split-adjusted data is expressed in the share count at the end of
+        # the window; raw data uses the share count of each day
+        scale = np.full(len(factor), factor[-1]) if adjustment == 'split' else factor
+
+        if timeframe in ('1D', '1Day'):
+            df = pd.DataFrame({
+                column: path[column][window] / scale
+                for column in ('open', 'high', 'low', 'close')
+            }, index=days[window])
+            df['volume'] = np.round(path['volume'][window] * scale)
+            return df
+
+        if timeframe not in TIMEFRAME_MINUTES:
+            raise ValueError(f"Unsupported timeframe: {timeframe}")
+
+        return self._intraday_bars(symbol, path, days, window, scale, timeframe)
+
+    def _intraday_bars(
+        self,
+        symbol: str,
+        path: Dict[str, np.ndarray],
+        days: pd.DatetimeIndex,
+        window: slice,
+        scale: np.ndarray,
+        timeframe: str
+    ) -> pd.DataFrame:
+        """
+        Split each daily bar into intraday bars.
+
+        The intraday log-price is a Brownian bridge from the day's open to
+        its close. Sessions of one calendar year share a random stream, so
+        a session's bars do not depend on the requested range.
+        """
+        minutes = TIMEFRAME_MINUTES[timeframe]
+        per_session = int(np.ceil(SESSION_MINUTES / minutes))
+        key = _symbol_key(symbol)
+
+        session_days = days[window]
+        years = session_days.year.to_numpy()
+        frames = []
+
+        for year in np.unique(years):
+            in_year = np.flatnonzero(years == year)
+            # Index of each session within its calendar year
+            year_start = int(days.searchsorted(pd.Timestamp(f"{year}-01-01", tz='UTC')))
+            offset = window.start + in_year[0] - year_start
+            n_year_days = offset + len(in_year)
+
+            stream = (key, 100 + int(year), minutes)
+            z = self._rng(*stream, _IDIO).standard_normal((n_year_days, per_session))[offset:]
+            wick = np.abs(
+                self._rng(*stream, _RANGE).normal(0, 0.5, (n_year_days, 2, per_session))
+            )[offset:]
+            volume_noise = self._rng(*stream, _VOLUME).lognormal(0, 0.4, (n_year_days, per_session))[offset:]
+
+            idx = window.start + in_year
+            log_open = np.log(path['open'][idx])[:, None]
+            log_close = np.log(path['close'][idx])[:, None]
+            day_range = np.log(path['high'][idx] / path['low'][idx])[:, None]
+            step_vol = np.maximum(day_range, 1e-4) / np.sqrt(per_session) / 2
+
+            walk = np.concatenate([np.zeros((len(idx), 1)), np.cumsum(z, axis=1)], axis=1) * step_vol
+            fraction = np.linspace(0, 1, per_session + 1)[None, :]
+            bridge = walk - fraction * walk[:, -1:]
+            log_path = log_open + fraction * (log_close - log_open) + bridge
+
+            open_ = np.exp(log_path[:, :-1])
+            close = np.exp(log_path[:, 1:])
+            high = np.maximum(open_, close) * np.exp(wick[:, 0] * step_vol)
+            low = np.minimum(open_, close) * np.exp(-wick[:, 1] * step_vol)
+
+            # U-shaped intraday volume profile
+            t = (np.arange(per_session) + 0.5) / per_session
+            profile = 1 + 2 * (2 * t - 1) ** 2
+            profile = profile / profile.sum()
+            volume = path['volume'][idx][:, None] * profile[None, :] * volume_noise
+
+            day_scale = scale[in_year][:, None]
+            local_days = session_days[in_year].tz_localize(None)
+            stamps = (
+                np.repeat(local_days.values, per_session)
+                + np.tile(
+                    (np.timedelta64(570, 'm') + np.arange(per_session) * np.timedelta64(minutes, 'm')),
+                    len(idx)
+                )
+            )
+            index = pd.DatetimeIndex(stamps).tz_localize(MARKET_TZ).tz_convert('UTC')
+
+            frames.append(pd.DataFrame({
+                'open': (open_ / day_scale).ravel(),
+                'high': (high / day_scale).ravel(),
+                'low': (low / day_scale).ravel(),
+                'close': (close / day_scale).ravel(),
+                'volume': np.round(volume * day_scale).ravel(),
+            }, index=index))
+
+        return pd.concat(frames)
+
+    def iter_bars(
+        self,
+        symbols: Iterable[str],
+        start_date,
+        end_date,
+        timeframe: str = '1D',
+        adjustment: str = 'split'
+    ) -> Iterator[Tuple[str, pd.DataFrame]]:
+        """
+        Generate bars symbol by symbol.
+
+        Memory stays bounded to one symbol at a time, which is the way to
+        stream thousands of symbols over decades.
+        """
+        for symbol in symbols:
+            yield symbol, self.get_bars(symbol, start_date, end_date, timeframe, adjustment)
+
+    def generate(
+        self,
+        symbols: Iterable[str],
+        start_date,
+        end_date,
+        timeframe: str = '1D',
+        adjustment: str = 'split'
+    ) -> Dict[str, pd.DataFrame]:
+        """Generate bars for several symbols as {symbol: DataFrame}."""
+        return dict(self.iter_bars(symbols, start_date, end_date, timeframe, adjustment))
+
+    def get_splits(self, symbol: str, start_date, end_date) -> List[Dict]:
+        """
+        List stock splits of a symbol in a date range.
+
+        Returns:
+            List of {'date': Timestamp, 'ratio': int}, the date being the
+            first session trading at the split-adjusted price
+        """
+        days = self._trading_days(end_date)
+        if len(days) == 0:
+            return []
+        factor = self._daily_path(symbol, len(days))['split_factor']
+
+        start = self._utc(start_date).normalize()
+        changes = np.flatnonzero(factor[1:] != factor[:-1]) + 1
+        return [
+            {'date': days[i], 'ratio': int(round(factor[i] / factor[i - 1]))}
+            for i in changes
+            if days[i] >= start
+        ]
@@ -14,22 +14,25 @@ How it works:
 
 import pandas as pd
 import numpy as np
-from typing import Optional, Dict, List
+from typing import TYPE_CHECKING, Optional, Dict, List
 import pickle
+import importlib.util
 import os
 from datetime import datetime
 import sys
 sys.path.append('../..')
 
-try:
-    from sklearn.ensemble import RandomForestClassifier
-    from sklearn.preprocessing import StandardScaler
-    from sklearn.model_selection import train_test_split
-    SKLEARN_AVAILABLE = True
-except ImportError:
-    SKLEARN_AVAILABLE = False
+# scikit-learn is slow to import; it is imported when a model is trained
+SKLEARN_AVAILABLE = importlib.util.find_spec('sklearn') is not None
 
 from .base_strategy import BaseStrategy, Signal
+from src.data.feature_store import FeatureSet, FeatureStore
+from src.strategies.model_registry import (
+    ModelKey, ModelRegistry, RegisteredModel, get_model_registry, training_window_hash
+)
+
+if TYPE_CHECKING:
+    from src.strategies.retraining import ModelRetrainer
 
 try:
     from src.analysis.sentiment_analyzer import SentimentAnalyzer
@@ -38,6 +41,17 @@ except ImportError:
     SENTIMENT_AVAILABLE = False
 
 
+# Columns added by the technical feature calculation (cached by a FeatureStore)
+TECHNICAL_FEATURES = (
+    'returns', 'log_returns',
+    'sma_5', 'price_to_sma_5', 'sma_10', 'price_to_sma_10',
+    'sma_20', 'price_to_sma_20', 'sma_50', 'price_to_sma_50',
+    'ema_12', 'ema_26', 'macd', 'macd_signal', 'rsi',
+    'bb_middle', 'bb_std', 'bb_upper', 'bb_lower', 'bb_width', 'bb_position',
+    'volatility', 'atr', 'volume_sma', 'volume_ratio', 'momentum', 'roc',
+)
+
+
 class AdaptiveMLStrategy(BaseStrategy):
     """
     Adaptive Machine Learning strategy using Random Forest.
@@ -55,10 +69,14 @@ class AdaptiveMLStrategy(BaseStrategy):
         lookback_period: int = 30,
         confidence_threshold: float = 0.45,  # Lower threshold = more trades
         retrain_interval: int = 100,
-        model_path: str = "models/adaptive_ml_model.pkl",
+        model_path: Optional[str] = None,
         use_sentiment: bool = True,
         news_api_key: Optional[str] = None,
         alpha_vantage_key: Optional[str] = None,
+        feature_store: Optional[FeatureStore] = None,
+        model_registry: Optional[ModelRegistry] = None,
+        retrainer: Optional['ModelRetrainer'] = None,
+        n_jobs: int = -1,
         name: str = "Adaptive ML"
     ):
         """
@@ -68,7 +86,16 @@ class AdaptiveMLStrategy(BaseStrategy):
             lookback_period: Days of history for feature calculation
             confidence_threshold: Minimum prediction confidence (0-1)
             retrain_interval: Retrain model every N trades
-            model_path: Path to save/load trained model
+            model_path: Path of a single model file to save/load instead of
+                using a model registry
+            feature_store: Store that caches technical features per symbol
+                (used once a symbol is set with set_symbol)
+            model_registry: Registry that stores and shares trained models
+                (defaults to the process-wide registry unless model_path is set)
+            retrainer: Background retraining service. When set the strategy
+                only runs inference with the registry's active model and
+                hands all training to the retrainer
+            n_jobs: Cores used to fit the random forest (-1 for all)
             name: Strategy name
         """
         super().__init__(name)
@@ -80,7 +107,16 @@ class AdaptiveMLStrategy(BaseStrategy):
         self.confidence_threshold = confidence_threshold
         self.retrain_interval = retrain_interval
         self.model_path = model_path
+        self.retrainer = retrainer
+        self.n_jobs = n_jobs
+        if model_registry is None and retrainer is not None:
+            model_registry = get_model_registry(retrainer.registry_root)
+        elif model_registry is None and model_path is None:
+            model_registry = get_model_registry()
+        self.model_registry = model_registry
+        self.model_key: Optional[ModelKey] = None
         self.use_sentiment = use_sentiment and SENTIMENT_AVAILABLE
+        self.feature_store = feature_store
         
         # Initialize sentiment analyzer if enabled
         self.sentiment_analyzer = None
@@ -102,19 +138,64 @@ class AdaptiveMLStrategy(BaseStrategy):
         self.trade_history = []
         self.trades_since_retrain = 0
         
-        # Try to load existing model
-        self._load_model()
+        # Try to load existing model (registry models load when training data is known)
+        if self.model_registry is None:
+            self._load_model()
     
-    def calculate_features(self, data: pd.DataFrame) -> pd.DataFrame:
+    def calculate_features(self, data: pd.DataFrame, tail: Optional[int] = None) -> pd.DataFrame:
         """
         Calculate technical indicators to use as ML features.
+
+        With a feature store and a current symbol, stored features are
+        reused and only rows for new bars are computed.
         
         Args:
             data: DataFrame with OHLCV data
+            tail: Only compute the last N rows (from those bars plus a
+                warm-up window), e.g. for live inference
             
         Returns:
             DataFrame with feature columns
         """
+        if tail is not None:
+            data = data.iloc[-(tail + self.feature_set.warmup):]
+
+        if self.feature_store is not None and getattr(self, 'current_symbol', None):
+            df = data.copy()
+            features = self.feature_store.get(self.current_symbol, self.feature_set, data)
+            for column in features.columns:
+                df[column] = features[column].to_numpy()
+        else:
+            df = self._technical_features(data)
+        
+        # Add sentiment features if available
+        if self.use_sentiment and hasattr(self, 'current_symbol'):
+            df = self._add_sentiment_features(df, self.current_symbol)
+        
+        # Target variable (for training): next day's return
+        df['target'] = df['close'].shift(-1) / df['close'] - 1
+        
+        # Convert target to classes: 1 (buy), -1 (sell), 0 (hold)
+        df['target_class'] = 0
+        df.loc[df['target'] > 0.005, 'target_class'] = 1  # >0.5% gain
+        df.loc[df['target'] < -0.005, 'target_class'] = -1  # >0.5% loss
+        
+        if tail is not None:
+            df = df.iloc[-tail:]
+        return df
+    
+    @property
+    def feature_set(self) -> FeatureSet:
+        """Technical features as a versioned feature set for the feature store."""
+        return FeatureSet(
+            name='adaptive_ml',
+            version=1,
+            columns=TECHNICAL_FEATURES,
+            compute=self._technical_features,
+        )
+
+    def _technical_features(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Add the technical indicator columns (TECHNICAL_FEATURES) to the bars."""
         df = data.copy()
         
         # Price-based features
@@ -158,21 +239,9 @@ class AdaptiveMLStrategy(BaseStrategy):
         # Momentum
         df['momentum'] = df['close'] - df['close'].shift(10)
         df['roc'] = df['close'].pct_change(periods=10) * 100
-        
-        # Add sentiment features if available
-        if self.use_sentiment and hasattr(self, 'current_symbol'):
-            df = self._add_sentiment_features(df, self.current_symbol)
-        
-        # Target variable (for training): next day's return
-        df['target'] = df['close'].shift(-1) / df['close'] - 1
-        
-        # Convert target to classes: 1 (buy), -1 (sell), 0 (hold)
-        df['target_class'] = 0
-        df.loc[df['target'] > 0.005, 'target_class'] = 1  # >0.5% gain
-        df.loc[df['target'] < -0.005, 'target_class'] = -1  # >0.5% loss
-        
+
         return df
-    
+
     def _calculate_atr(self, df: pd.DataFrame, period: int = 14) -> pd.Series:
         """Calculate Average True Range."""
         high_low = df['high'] - df['low']
@@ -193,24 +262,17 @@ class AdaptiveMLStrategy(BaseStrategy):
             data: DataFrame with OHLCV data
             test_size: Fraction of data for testing
         """
+        # Reuse a model already trained on the same window
+        if self.model_registry is not None:
+            key = self.get_model_key(data, test_size)
+            registered = self.model_registry.get(key)
+            if registered is not None:
+                self._use_model(registered)
+                return
+
         # Calculate features
         df = self.calculate_features(data)
-        
-        # Select feature columns
-        feature_cols = [
-            'returns', 'price_to_sma_5', 'price_to_sma_10', 'price_to_sma_20', 'price_to_sma_50',
-            'macd', 'macd_signal', 'rsi', 'bb_width', 'bb_position',
-            'volatility', 'atr', 'volume_ratio', 'momentum', 'roc'
-        ]
-        
-        # Add sentiment features if available
-        if self.use_sentiment:
-            sentiment_cols = [
-                'sentiment_overall', 'sentiment_news', 'sentiment_headline',
-                'sentiment_change', 'news_volume_norm', 'positive_ratio'
-            ]
-            # Only include sentiment columns that exist in the data
-            feature_cols.extend([col for col in sentiment_cols if col in df.columns])
+        feature_cols = self._feature_columns(df)
         
         # Remove NaN rows
         df_clean = df.dropna()
@@ -222,6 +284,10 @@ class AdaptiveMLStrategy(BaseStrategy):
         X = df_clean[feature_cols]
         y = df_clean['target_class']
         
+        from sklearn.ensemble import RandomForestClassifier
+        from sklearn.model_selection import train_test_split
+        from sklearn.preprocessing import StandardScaler
+        
         # Split data
         X_train, X_test, y_train, y_test = train_test_split(
             X, y, test_size=test_size, shuffle=False
@@ -241,7 +307,7 @@ class AdaptiveMLStrategy(BaseStrategy):
             max_features='sqrt',  # Better feature selection
             random_state=42,
             class_weight='balanced',  # Handle imbalanced classes
-            n_jobs=-1  # Use all CPU cores for faster training
+            n_jobs=self.n_jobs
         )
         
         self.model.fit(X_train_scaled, y_train)
@@ -255,7 +321,116 @@ class AdaptiveMLStrategy(BaseStrategy):
         print(f"Model trained - Train accuracy: {train_score:.3f}, Test accuracy: {test_score:.3f}")
         
         # Save model
-        self._save_model()
+        if self.model_registry is not None:
+            self.model_key = key
+            self.model_registry.save(key, self.model, self.scaler, {
+                'feature_columns': feature_cols,
+                'train_score': train_score,
+                'test_score': test_score,
+                'samples': len(df_clean),
+            })
+        else:
+            self._save_model()
+
+    def _feature_columns(self, df: pd.DataFrame) -> List[str]:
+        """Model input columns (sentiment columns only if present in df)."""
+        feature_cols = [
+            'returns', 'price_to_sma_5', 'price_to_sma_10', 'price_to_sma_20', 'price_to_sma_50',
+            'macd', 'macd_signal', 'rsi', 'bb_width', 'bb_position',
+            'volatility', 'atr', 'volume_ratio', 'momentum', 'roc'
+        ]
+        
+        # Add sentiment features if available
+        if self.use_sentiment:
+            sentiment_cols = [
+                'sentiment_overall', 'sentiment_news', 'sentiment_headline',
+                'sentiment_change', 'news_volume_norm', 'positive_ratio'
+            ]
+            feature_cols.extend([col for col in sentiment_cols if col in df.columns])
+        return feature_cols
+
+    @property
+    def model_symbol(self) -> str:
+        """Symbol models are registered under."""
+        return getattr(self, 'current_symbol', None) or 'ANY'
+
+    @property
+    def feature_version(self) -> str:
+        """Feature version models are registered under."""
+        feature_version = self.feature_set.key
+        if self.use_sentiment:
+            feature_version += '+sentiment-v2'
+        return feature_version
+
+    def get_model_key(self, data: pd.DataFrame, test_size: float = 0.2) -> ModelKey:
+        """Registry key of the model trained on data."""
+        return ModelKey(
+            symbol=self.model_symbol,
+            feature_version=self.feature_version,
+            window_hash=training_window_hash(data, {'test_size': test_size, 'model': 'rf-200-d15'}),
+        )
+
+    def latest_features(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Model input row for the newest bar, for batched inference.
+
+        Only the last ``lookback_period`` rows of features are computed.
+
+        Args:
+            data: DataFrame with OHLCV data
+
+        Returns:
+            Single-row DataFrame of feature columns
+        """
+        df = self.calculate_features(data, tail=self.lookback_period)
+        return df[self._feature_columns(df)].ffill().fillna(0).iloc[-1:]
+
+    def signals_from_probabilities(self, probabilities: np.ndarray, classes: np.ndarray) -> np.ndarray:
+        """
+        Turn class probabilities into signals.
+
+        Args:
+            probabilities: predict_proba output, one row per bar
+            classes: Model classes in probability column order
+
+        Returns:
+            Array of signals (the predicted class where confident, else 0)
+        """
+        predictions = classes[np.argmax(probabilities, axis=1)]
+        max_probs = np.max(probabilities, axis=1)
+        return np.where(max_probs >= self.confidence_threshold, predictions, 0)
+
+    def evaluate_model(self, data: pd.DataFrame, since=None) -> float:
+        """
+        Accuracy of the model's class predictions.
+
+        Args:
+            data: DataFrame with OHLCV data (including history for the features)
+            since: Only score bars from this timestamp on (e.g. a holdout period)
+
+        Returns:
+            Fraction of bars whose next-day class was predicted correctly
+        """
+        df = self.calculate_features(data).dropna()
+        if since is not None:
+            df = df[df.index >= since]
+        if df.empty:
+            raise ValueError("No bars to evaluate")
+        X_scaled = self.scaler.transform(df[self._feature_columns(df)])
+        return float(self.model.score(X_scaled, df['target_class']))
+
+    def _refresh_active_model(self):
+        """Switch to the registry's active model if a newer one was promoted."""
+        registered = self.model_registry.active(self.model_symbol, self.feature_version)
+        if registered is not None and registered.key != self.model_key:
+            self._use_model(registered)
+
+    def _use_model(self, registered: RegisteredModel):
+        """Use a registry model (shared with other instances, never mutated)."""
+        self.model = registered.model
+        self.scaler = registered.scaler
+        self.model_key = registered.key
+        self.is_trained = True
     
     def calculate_indicators(self, data: pd.DataFrame) -> pd.DataFrame:
         """Calculate features for prediction."""
@@ -271,8 +446,16 @@ class AdaptiveMLStrategy(BaseStrategy):
         Returns:
             Series with signals (1=BUY, -1=SELL, 0=HOLD)
         """
+        if self.retrainer is not None:
+            # Inference only: models are trained and promoted by the retrainer
+            self._refresh_active_model()
+            if not self.is_trained:
+                if len(data) >= 100:
+                    self.retrainer.submit(self.model_symbol, data)
+                print(f"No active model for {self.model_symbol} yet, retraining in background. Returning HOLD.")
+                return pd.Series(0, index=data.index)
         # Train if not trained and have enough data
-        if not self.is_trained:
+        elif not self.is_trained:
             if len(data) < 100:
                 # Not enough data to train, return HOLD signals
                 print(f"Warning: Only {len(data)} samples, need 100+ for training. Returning HOLD.")
@@ -282,41 +465,18 @@ class AdaptiveMLStrategy(BaseStrategy):
         
         # Calculate features
         df = self.calculate_features(data)
-        
-        # Feature columns  
-        feature_cols = [
-            'returns', 'price_to_sma_5', 'price_to_sma_10', 'price_to_sma_20', 'price_to_sma_50',
-            'macd', 'macd_signal', 'rsi', 'bb_width', 'bb_position',
-            'volatility', 'atr', 'volume_ratio', 'momentum', 'roc'
-        ]
-        
-        # Add sentiment features if available
-        if self.use_sentiment:
-            sentiment_cols = [
-                'sentiment_overall', 'sentiment_news', 'sentiment_headline',
-                'sentiment_change', 'news_volume_norm', 'positive_ratio'
-            ]
-            feature_cols.extend([col for col in sentiment_cols if col in df.columns])
+        feature_cols = self._feature_columns(df)
         
         # Prepare features
         X = df[feature_cols].ffill().fillna(0)
         X_scaled = self.scaler.transform(X)
         
-        # Get predictions and probabilities
-        predictions = self.model.predict(X_scaled)
-        probabilities = self.model.predict_proba(X_scaled)
-        
-        # Get max probability for each prediction
-        max_probs = np.max(probabilities, axis=1)
-        
-        # Create signals with confidence threshold
-        signals = pd.Series(0, index=df.index)
-        
         # Only trade when confidence exceeds threshold
-        high_confidence = max_probs >= self.confidence_threshold
-        signals[high_confidence] = predictions[high_confidence]
-        
-        return signals
+        probabilities = self.model.predict_proba(X_scaled)
+        return pd.Series(
+            self.signals_from_probabilities(probabilities, self.model.classes_),
+            index=df.index
+        )
     
     def add_trade_result(self, entry_price: float, exit_price: float, shares: int):
         """
@@ -349,9 +509,18 @@ class AdaptiveMLStrategy(BaseStrategy):
         """
         Retrain model incorporating recent trading results.
         
+        With a retrainer the model is retrained in the background and
+        picked up once it is promoted.
+        
         Args:
             data: Updated historical data including recent trades
         """
+        if self.retrainer is not None:
+            self.retrainer.submit(self.model_symbol, data)
+            self.trades_since_retrain = 0
+            print(f"Queued background retraining for {self.model_symbol}")
+            return
+
         print(f"Retraining model with {len(self.trade_history)} recent trades...")
         self.train_model(data)
         self.trades_since_retrain = 0
@@ -394,7 +563,10 @@ class AdaptiveMLStrategy(BaseStrategy):
     
     def _add_sentiment_features(self, df: pd.DataFrame, symbol: str) -> pd.DataFrame:
         """
-        Add sentiment analysis features to the dataframe.
+        Add daily sentiment features to the dataframe.
+
+        Each bar gets the sentiment of the previous calendar day, so
+        training never sees news published after the bar.
         
         Args:
             df: DataFrame with OHLCV data
@@ -406,16 +578,20 @@ class AdaptiveMLStrategy(BaseStrategy):
         if not self.sentiment_analyzer:
             return df
         
-        # Get sentiment data for the symbol
-        sentiment = self.sentiment_analyzer.get_stock_sentiment(symbol, days_back=7)
-        
-        # Add sentiment features (constant for all rows since we have one sentiment per symbol)
-        df['sentiment_overall'] = sentiment['overall_sentiment']
-        df['sentiment_news'] = sentiment['news_sentiment']
-        df['sentiment_headline'] = sentiment['headline_sentiment']
-        df['sentiment_change'] = sentiment['sentiment_change']
-        df['news_volume_norm'] = min(sentiment['news_volume'] / 50, 1.0)  # Normalize to 0-1
-        df['positive_ratio'] = sentiment['positive_ratio']
+        # Daily sentiment, as known before each bar's day (no lookahead)
+        index = pd.DatetimeIndex(df.index)
+        days = (index.tz_convert('UTC').tz_localize(None) if index.tz is not None else index).normalize()
+        history = self.sentiment_analyzer.get_sentiment_history(
+            symbol, days[0] - pd.Timedelta(days=1), days[-1]
+        )
+        known = history.shift(1).reindex(days)
+        
+        df['sentiment_overall'] = known['overall_sentiment'].fillna(0.0).to_numpy()
+        df['sentiment_news'] = known['news_sentiment'].fillna(0.0).to_numpy()
+        df['sentiment_headline'] = known['headline_sentiment'].fillna(0.0).to_numpy()
+        df['sentiment_change'] = known['sentiment_change'].fillna(0.0).to_numpy()
+        df['news_volume_norm'] = (known['news_volume'].fillna(0) / 50).clip(upper=1.0).to_numpy()  # Normalize to 0-1
+        df['positive_ratio'] = known['positive_ratio'].fillna(0.5).to_numpy()
         
         return df
     
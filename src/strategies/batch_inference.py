@@ -0,0 +1,83 @@
+"""
+Batch Inference Module
+
+Cross-symbol inference for ML strategies in live trading.
+
+Live trading only needs the signal for the newest bar of each symbol. The
+latest feature row of every symbol is computed (tail-only), rows that use
+the same model are stacked, and each model is called once per cycle with
+a single vectorized ``predict_proba``. The resulting signals are then
+fanned back out per symbol.
+"""
+
+import logging
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from src.strategies.adaptive_ml_strategy import AdaptiveMLStrategy
+from src.strategies.base_strategy import BaseStrategy
+
+
+def supports_batch_inference(strategy: BaseStrategy) -> bool:
+    """Check whether a strategy's signals can be computed in a batch."""
+    return isinstance(strategy, AdaptiveMLStrategy)
+
+
+class BatchInference:
+    """Latest-bar signals for many symbols with one model call per model."""
+
+    def __init__(self):
+        """Initialize batch inference."""
+        self.logger = logging.getLogger(__name__)
+        self.model_calls = 0
+
+    def latest_signals(self, jobs: Dict[str, Tuple[AdaptiveMLStrategy, pd.DataFrame]]) -> Dict[str, int]:
+        """
+        Signals for the newest bar of each symbol.
+
+        Strategies that have no model yet fall back to generate_signals
+        (which trains or queues training as configured).
+
+        Args:
+            jobs: Symbol -> (strategy, OHLCV bars)
+
+        Returns:
+            Dictionary mapping symbol to signal (1=buy, -1=sell, 0=hold)
+        """
+        signals = {}
+        batches: Dict[Tuple, List] = {}
+
+        for symbol, (strategy, data) in jobs.items():
+            try:
+                strategy.set_symbol(symbol)
+                if strategy.retrainer is not None:
+                    strategy._refresh_active_model()
+                if not strategy.is_trained:
+                    signals[symbol] = int(strategy.generate_signals(data).iloc[-1])
+                    continue
+
+                row = strategy.latest_features(data)
+                # The model and scaler are captured now, since a strategy
+                # shared between symbols may switch models per symbol
+                batch_key = (id(strategy.model), id(strategy.scaler), tuple(row.columns))
+                batch = batches.setdefault(batch_key, [strategy.model, strategy.scaler, []])
+                batch[2].append((symbol, strategy, row))
+            except Exception as e:
+                self.logger.error(f"Error preparing features for {symbol}: {e}")
+
+        for model, scaler, rows in batches.values():
+            try:
+                X = pd.concat([row for _, _, row in rows])
+                probabilities = model.predict_proba(scaler.transform(X))
+                self.model_calls += 1
+            except Exception as e:
+                self.logger.error(f"Batched prediction failed for {len(rows)} symbols: {e}")
+                continue
+
+            for (symbol, strategy, _), proba in zip(rows, probabilities):
+                signal = strategy.signals_from_probabilities(proba[np.newaxis, :], model.classes_)[0]
+                signals[symbol] = int(signal)
+
+        return signals
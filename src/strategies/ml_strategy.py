@@ -13,7 +13,18 @@ How it works:
 
 import pandas as pd
 import numpy as np
+from typing import Optional
 from .base_strategy import BaseStrategy, Signal
+from src.data.feature_store import FeatureSet, FeatureStore
+
+
+# Columns added by calculate_indicators (cached by a FeatureStore)
+INDICATOR_COLUMNS = (
+    'SMA_Short', 'SMA_Long', 'Trend_Signal', 'ROC', 'Momentum_Signal',
+    'RSI', 'RSI_Signal', 'BB_Middle', 'BB_Std', 'BB_Upper', 'BB_Lower', 'BB_Signal',
+    'Volume_MA', 'Volume_Signal', 'Price_Change', 'Price_Signal',
+    'Prediction', 'Confidence',
+)
 
 
 class MLStrategy(BaseStrategy):
@@ -24,6 +35,7 @@ class MLStrategy(BaseStrategy):
         short_period: int = 10,
         long_period: int = 30,
         threshold: float = 0.6,
+        feature_store: Optional[FeatureStore] = None,
         name: str = "ML Strategy"
     ):
         """
@@ -33,16 +45,37 @@ class MLStrategy(BaseStrategy):
             short_period: Short-term period for indicators (default: 10)
             long_period: Long-term period for indicators (default: 30)
             threshold: Confidence threshold for signals (default: 0.6)
+            feature_store: Store that caches indicators per symbol
+                (used once a symbol is set with set_symbol)
             name: Strategy name
         """
         super().__init__(name)
         self.short_period = short_period
         self.long_period = long_period
         self.threshold = threshold
+        self.feature_store = feature_store
+        self.current_symbol: Optional[str] = None
+
+    def set_symbol(self, symbol: str):
+        """Set the symbol whose bars are analyzed (for the feature store)."""
+        self.current_symbol = symbol
+
+    @property
+    def feature_set(self) -> FeatureSet:
+        """Indicators as a versioned feature set for the feature store."""
+        return FeatureSet(
+            name=f"ml_ensemble_{self.short_period}_{self.long_period}",
+            version=1,
+            columns=INDICATOR_COLUMNS,
+            compute=self._compute_indicators,
+        )
         
     def calculate_indicators(self, data: pd.DataFrame) -> pd.DataFrame:
         """
         Calculate multiple technical indicators as ML features.
+
+        With a feature store and a current symbol, stored indicators are
+        reused and only rows for new bars are computed.
         
         Args:
             data: DataFrame with OHLCV data
@@ -50,6 +83,16 @@ class MLStrategy(BaseStrategy):
         Returns:
             DataFrame with indicator features
         """
+        if self.feature_store is None or not self.current_symbol:
+            return self._compute_indicators(data)
+
+        df = data.copy()
+        features = self.feature_store.get(self.current_symbol, self.feature_set, data)
+        for column in features.columns:
+            df[column] = features[column].to_numpy()
+        return df
+
+    def _compute_indicators(self, data: pd.DataFrame) -> pd.DataFrame:
         df = data.copy()
         
         # Trend indicators
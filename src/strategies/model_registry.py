@@ -0,0 +1,305 @@
+"""
+Model Registry Module
+
+Versioned on-disk store of trained models, shared by every strategy
+instance in a process.
+
+Models are keyed by symbol, feature set version and a hash of the training
+window (the bars and training parameters), so a model is trained once for
+a given history and reused by later backtests and strategy instances:
+
+    <root>/<SYMBOL>/<feature version>/<window hash>/model.joblib
+    <root>/<SYMBOL>/<feature version>/<window hash>/meta.json
+    <root>/<SYMBOL>/<feature version>/active.json
+
+``active.json`` points at the model that live strategies should use. It is
+only changed by ``promote`` (after a retrained model passed validation) and
+is replaced atomically, so readers see either the old or the new model.
+
+Models are written with joblib. Each model is loaded lazily the first
+time it is requested and then kept for the life of the process, so strategy
+instances in a process share one copy; each process loads its own.
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import logging
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Sequence
+
+import joblib
+import numpy as np
+import pandas as pd
+
+
+OHLCV_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+
+@dataclass(frozen=True)
+class ModelKey:
+    """Identity of a trained model."""
+    symbol: str
+    feature_version: str
+    window_hash: str
+
+    @property
+    def path(self) -> str:
+        return os.path.join(self.symbol.upper(), self.feature_version, self.window_hash)
+
+
+@dataclass
+class RegisteredModel:
+    """A loaded model with its scaler and training metadata."""
+    key: ModelKey
+    model: Any
+    scaler: Any = None
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+def training_window_hash(
+    data: pd.DataFrame,
+    params: Optional[Dict[str, Any]] = None,
+    columns: Sequence[str] = OHLCV_COLUMNS
+) -> str:
+    """
+    Hash a training window.
+
+    Args:
+        data: Training bars
+        params: Training parameters that change the fitted model
+        columns: Bar columns that are hashed
+
+    Returns:
+        Short hex digest
+    """
+    digest = hashlib.sha256()
+    index = data.index
+    if isinstance(index, pd.DatetimeIndex):
+        digest.update(index.as_unit('ns').asi8.tobytes())
+    else:
+        digest.update(np.asarray(index).tobytes())
+    for column in columns:
+        if column in data.columns:
+            digest.update(np.ascontiguousarray(data[column].to_numpy(dtype=float)).tobytes())
+    if params:
+        digest.update(json.dumps(params, sort_keys=True, default=str).encode())
+    return digest.hexdigest()[:16]
+
+
+class ModelRegistry:
+    """Versioned model store with a per-process cache of loaded models."""
+
+    def __init__(self, root: str = 'models/registry'):
+        """
+        Initialize model registry.
+
+        Args:
+            root: Directory holding the models
+        """
+        self.root = root
+        self.logger = logging.getLogger(__name__)
+        self._loaded: Dict[ModelKey, RegisteredModel] = {}
+        self._key_locks: Dict[ModelKey, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._active: Dict[str, tuple] = {}
+        self.loads = 0
+        os.makedirs(self.root, exist_ok=True)
+
+    def _dir(self, key: ModelKey) -> str:
+        return os.path.join(self.root, key.path)
+
+    def _key_lock(self, key: ModelKey) -> threading.Lock:
+        with self._lock:
+            return self._key_locks.setdefault(key, threading.Lock())
+
+    def exists(self, key: ModelKey) -> bool:
+        """Check whether a model is stored."""
+        return key in self._loaded or os.path.exists(os.path.join(self._dir(key), 'model.joblib'))
+
+    def get(self, key: ModelKey) -> Optional[RegisteredModel]:
+        """
+        Get a model, loading it on first use.
+
+        Concurrent callers wait for a single load and share the result.
+
+        Args:
+            key: Model key
+
+        Returns:
+            RegisteredModel, or None if no model is stored for the key
+        """
+        entry = self._loaded.get(key)
+        if entry is not None:
+            return entry
+
+        with self._key_lock(key):
+            entry = self._loaded.get(key)
+            if entry is not None:
+                return entry
+
+            directory = self._dir(key)
+            model_file = os.path.join(directory, 'model.joblib')
+            if not os.path.exists(model_file):
+                return None
+
+            payload = joblib.load(model_file)
+            metadata = {}
+            meta_file = os.path.join(directory, 'meta.json')
+            if os.path.exists(meta_file):
+                with open(meta_file) as f:
+                    metadata = json.load(f)
+
+            entry = RegisteredModel(key, payload['model'], payload.get('scaler'), metadata)
+            self._loaded[key] = entry
+            self.loads += 1
+            self.logger.info(f"Loaded model {key.path}")
+            return entry
+
+    def save(
+        self,
+        key: ModelKey,
+        model: Any,
+        scaler: Any = None,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> RegisteredModel:
+        """
+        Store a model and make it the shared instance for its key.
+
+        Args:
+            key: Model key
+            model: Fitted model
+            scaler: Fitted feature scaler, if any
+            metadata: JSON-serializable training details
+
+        Returns:
+            RegisteredModel
+        """
+        metadata = {
+            'symbol': key.symbol,
+            'feature_version': key.feature_version,
+            'window_hash': key.window_hash,
+            'trained_at': datetime.now().isoformat(),
+            **(metadata or {}),
+        }
+        directory = self._dir(key)
+        tmp_dir = f"{directory}.tmp-{os.getpid()}-{threading.get_ident()}"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+        joblib.dump({'model': model, 'scaler': scaler}, os.path.join(tmp_dir, 'model.joblib'))
+        with open(os.path.join(tmp_dir, 'meta.json'), 'w') as f:
+            json.dump(metadata, f, indent=2, default=str)
+
+        # Swap the finished directory in; a concurrent writer of the same
+        # key produced an equivalent model, so losing the race is fine
+        shutil.rmtree(directory, ignore_errors=True)
+        try:
+            os.replace(tmp_dir, directory)
+        except OSError:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+
+        entry = RegisteredModel(key, model, scaler, metadata)
+        self._loaded[key] = entry
+        self.logger.info(f"Saved model {key.path}")
+        return entry
+
+    def versions(self, symbol: str, feature_version: str) -> List[Dict[str, Any]]:
+        """Metadata of the stored models for a symbol, oldest first."""
+        base = os.path.join(self.root, symbol.upper(), feature_version)
+        if not os.path.isdir(base):
+            return []
+        versions = []
+        for window_hash in os.listdir(base):
+            meta_file = os.path.join(base, window_hash, 'meta.json')
+            if os.path.exists(meta_file):
+                with open(meta_file) as f:
+                    versions.append(json.load(f))
+        return sorted(versions, key=lambda meta: meta.get('trained_at', ''))
+
+    def latest(self, symbol: str, feature_version: str) -> Optional[RegisteredModel]:
+        """The most recently trained model for a symbol and feature version."""
+        versions = self.versions(symbol, feature_version)
+        if not versions:
+            return None
+        return self.get(ModelKey(symbol, feature_version, versions[-1]['window_hash']))
+
+    def _active_file(self, symbol: str, feature_version: str) -> str:
+        return os.path.join(self.root, symbol.upper(), feature_version, 'active.json')
+
+    def promote(self, key: ModelKey):
+        """
+        Make a stored model the active model for its symbol and feature version.
+
+        Args:
+            key: Key of a stored model
+        """
+        if not self.exists(key):
+            raise ValueError(f"No stored model {key.path}")
+        path = self._active_file(key.symbol, key.feature_version)
+        tmp_path = f"{path}.tmp-{os.getpid()}-{threading.get_ident()}"
+        with open(tmp_path, 'w') as f:
+            json.dump({
+                'window_hash': key.window_hash,
+                'promoted_at': datetime.now().isoformat(),
+            }, f)
+        os.replace(tmp_path, path)
+        self.logger.info(f"Promoted model {key.path}")
+
+    def active_key(self, symbol: str, feature_version: str) -> Optional[ModelKey]:
+        """Key of the active model, or None if none was promoted."""
+        path = self._active_file(symbol, feature_version)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+
+        # Re-read the pointer only when it was replaced (by any process)
+        version = (stat.st_ino, stat.st_mtime_ns)
+        cached = self._active.get(path)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        with open(path) as f:
+            key = ModelKey(symbol, feature_version, json.load(f)['window_hash'])
+        self._active[path] = (version, key)
+        return key
+
+    def active(self, symbol: str, feature_version: str) -> Optional[RegisteredModel]:
+        """The active model for a symbol and feature version."""
+        key = self.active_key(symbol, feature_version)
+        return self.get(key) if key is not None else None
+
+    def evict(self, key: Optional[ModelKey] = None):
+        """Drop a loaded model (or all of them) from the process cache."""
+        if key is None:
+            self._loaded.clear()
+        else:
+            self._loaded.pop(key, None)
+
+    def delete(self, key: ModelKey):
+        """Delete a stored model."""
+        self.evict(key)
+        shutil.rmtree(self._dir(key), ignore_errors=True)
+
+
+_registries: Dict[str, ModelRegistry] = {}
+_registries_lock = threading.Lock()
+
+
+def get_model_registry(root: str = 'models/registry') -> ModelRegistry:
+    """
+    Get the process-wide registry for a directory.
+
+    Args:
+        root: Directory holding the models
+
+    Returns:
+        ModelRegistry instance
+    """
+    with _registries_lock:
+        registry = _registries.get(root)
+        if registry is None:
+            registry = _registries[root] = ModelRegistry(root)
+        return registry
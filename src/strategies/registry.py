@@ -0,0 +1,97 @@
+"""
+Strategy Registry
+
+Maps strategy type names to their classes without importing them.
+
+Strategy modules (and the heavy dependencies some of them pull in, such as
+scikit-learn for the ML strategies) are only imported the first time a
+strategy of that type is requested, so entry points that use one strategy
+do not pay for all of them at startup.
+
+Type names are matched case-insensitively and ignoring underscores, so
+``'sma_crossover'``, ``'SMA_CROSSOVER'`` and ``'smacrossover'`` are the
+same type.
+"""
+
+import importlib
+from typing import Dict, List, Tuple, Type
+
+from src.strategies.base_strategy import BaseStrategy
+
+
+# Type name -> (module, class name)
+STRATEGIES: Dict[str, Tuple[str, str]] = {
+    'sma_crossover': ('src.strategies.sma_crossover', 'SMACrossoverStrategy'),
+    'rsi': ('src.strategies.rsi_strategy', 'RSIStrategy'),
+    'macd': ('src.strategies.macd_strategy', 'MACDStrategy'),
+    'bollinger_bands': ('src.strategies.bollinger_bands', 'BollingerBandsStrategy'),
+    'vwap': ('src.strategies.vwap_strategy', 'VWAPStrategy'),
+    'momentum': ('src.strategies.momentum_strategy', 'MomentumStrategy'),
+    'mean_reversion': ('src.strategies.mean_reversion', 'MeanReversionStrategy'),
+    'breakout': ('src.strategies.breakout_strategy', 'BreakoutStrategy'),
+    'keltner_channel': ('src.strategies.keltner_channel', 'KeltnerChannelStrategy'),
+    'donchian_channel': ('src.strategies.donchian_channel', 'DonchianChannelStrategy'),
+    'ichimoku_cloud': ('src.strategies.ichimoku_cloud', 'IchimokuCloudStrategy'),
+    'atr_trailing_stop': ('src.strategies.atr_trailing_stop', 'ATRTrailingStopStrategy'),
+    'stochastic': ('src.strategies.stochastic_strategy', 'StochasticStrategy'),
+    'pairs_trading': ('src.strategies.pairs_trading', 'PairsTradingStrategy'),
+    'ml': ('src.strategies.ml_strategy', 'MLStrategy'),
+    'adaptive_ml': ('src.strategies.adaptive_ml_strategy', 'AdaptiveMLStrategy'),
+}
+
+_classes: Dict[str, Type[BaseStrategy]] = {}
+
+
+def normalize_strategy_type(strategy_type: str) -> str:
+    """Canonical form of a type name (lowercase, no underscores)."""
+    return strategy_type.lower().replace('_', '')
+
+
+_BY_NORMALIZED = {normalize_strategy_type(name): name for name in STRATEGIES}
+
+
+def available_strategies() -> List[str]:
+    """Registered type names."""
+    return list(STRATEGIES)
+
+
+def get_strategy_class(strategy_type: str) -> Type[BaseStrategy]:
+    """
+    Get a strategy class, importing its module on first use.
+
+    Args:
+        strategy_type: Strategy type name (e.g. 'sma_crossover')
+
+    Returns:
+        Strategy class
+
+    Raises:
+        ValueError: If the type is not registered
+        ImportError: If the strategy module or one of its dependencies
+            cannot be imported
+    """
+    name = _BY_NORMALIZED.get(normalize_strategy_type(strategy_type))
+    if name is None:
+        raise ValueError(
+            f"Unknown strategy type '{strategy_type}'. "
+            f"Supported types: {', '.join(STRATEGIES)}"
+        )
+
+    if name not in _classes:
+        module_name, class_name = STRATEGIES[name]
+        _classes[name] = getattr(importlib.import_module(module_name), class_name)
+    return _classes[name]
+
+
+def create_strategy(strategy_type: str, **params) -> BaseStrategy:
+    """
+    Create a strategy by type name.
+
+    Args:
+        strategy_type: Strategy type name
+        **params: Constructor arguments
+
+    Returns:
+        Strategy instance
+    """
+    return get_strategy_class(strategy_type)(**params)
@@ -0,0 +1,261 @@
+"""
+Model Retraining Module
+
+Retrains Adaptive ML models out of band, so live signal generation only
+runs inference.
+
+Each retraining job runs in a worker process: it trains a model on all but
+the most recent bars, scores it on that holdout together with the currently
+active model, and promotes it in the model registry only if it is at least
+as accurate. Strategies created with a retrainer pick up promoted models on
+their next call to ``generate_signals``.
+
+Jobs are submitted directly (e.g. when ``should_retrain`` triggers) or on a
+schedule for a list of symbols.
+"""
+
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+import pandas as pd
+
+from src.data.feature_store import get_feature_store
+from src.strategies.adaptive_ml_strategy import AdaptiveMLStrategy
+from src.strategies.model_registry import ModelRegistry
+
+
+@dataclass
+class RetrainResult:
+    """Outcome of a retraining job."""
+    symbol: str
+    window_hash: Optional[str] = None
+    holdout_score: Optional[float] = None
+    baseline_score: Optional[float] = None
+    promoted: bool = False
+    error: Optional[str] = None
+
+
+def retrain_symbol(
+    registry_root: str,
+    symbol: str,
+    data: pd.DataFrame,
+    holdout_fraction: float = 0.2,
+    min_improvement: float = 0.0,
+    strategy_params: Optional[Dict[str, Any]] = None,
+    feature_store_root: Optional[str] = None
+) -> RetrainResult:
+    """
+    Train, validate and (if good enough) promote a model for one symbol.
+
+    Runs in a worker process, so it only takes picklable arguments.
+
+    Args:
+        registry_root: Directory of the model registry
+        symbol: Stock symbol
+        data: OHLCV bars to train and validate on
+        holdout_fraction: Fraction of the most recent bars held out for validation
+        min_improvement: Holdout accuracy the new model must gain over the active one
+        strategy_params: AdaptiveMLStrategy arguments (must match the live
+            strategies; sentiment features are off unless enabled here)
+        feature_store_root: Directory of a feature store to read and add
+            technical features to (None computes them without one)
+
+    Returns:
+        RetrainResult
+    """
+    try:
+        registry = ModelRegistry(root=registry_root)
+        params = {'use_sentiment': False, 'n_jobs': 1, **(strategy_params or {})}
+        if feature_store_root is not None:
+            params['feature_store'] = get_feature_store(feature_store_root)
+        strategy = AdaptiveMLStrategy(model_registry=registry, **params)
+        strategy.set_symbol(symbol)
+
+        split = int(len(data) * (1 - holdout_fraction))
+        if split >= len(data):
+            raise ValueError("Holdout is empty")
+        holdout_start = data.index[split]
+
+        strategy.train_model(data.iloc[:split])
+        candidate = strategy.model_key
+        result = RetrainResult(symbol, window_hash=candidate.window_hash)
+        result.holdout_score = strategy.evaluate_model(data, since=holdout_start)
+
+        active = registry.active(candidate.symbol, candidate.feature_version)
+        if active is not None and active.key != candidate:
+            strategy._use_model(active)
+            result.baseline_score = strategy.evaluate_model(data, since=holdout_start)
+
+        if result.baseline_score is None or result.holdout_score >= result.baseline_score + min_improvement:
+            registry.promote(candidate)
+            result.promoted = True
+        return result
+    except Exception as e:
+        return RetrainResult(symbol, error=str(e))
+
+
+class ModelRetrainer:
+    """Retrains models across symbols in a pool of worker processes."""
+
+    def __init__(
+        self,
+        registry_root: str = 'models/registry',
+        max_workers: Optional[int] = None,
+        holdout_fraction: float = 0.2,
+        min_improvement: float = 0.0,
+        strategy_params: Optional[Dict[str, Any]] = None,
+        feature_store_root: Optional[str] = None,
+        executor: Optional[Executor] = None
+    ):
+        """
+        Initialize model retrainer.
+
+        Args:
+            registry_root: Directory of the model registry
+            max_workers: Worker processes (default: one per CPU)
+            holdout_fraction: Fraction of the most recent bars held out for validation
+            min_improvement: Holdout accuracy a new model must gain over the active one
+            strategy_params: AdaptiveMLStrategy arguments of the live strategies
+            feature_store_root: Directory of the feature store shared with
+                the live strategies
+            executor: Executor to run jobs on instead of a process pool
+        """
+        self.registry_root = registry_root
+        self.holdout_fraction = holdout_fraction
+        self.min_improvement = min_improvement
+        self.strategy_params = strategy_params or {}
+        self.feature_store_root = feature_store_root
+        self.logger = logging.getLogger(__name__)
+
+        # Spawned workers do not inherit the parent's threads or locks
+        self._executor = executor or ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context('spawn')
+        )
+        self._pending: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self.results: Dict[str, RetrainResult] = {}
+
+        self._stop = threading.Event()
+        self._scheduler: Optional[threading.Thread] = None
+
+    def submit(self, symbol: str, data: pd.DataFrame) -> Future:
+        """
+        Queue a retraining job for a symbol.
+
+        A symbol has at most one job in flight; submitting again while it
+        runs returns the running job.
+
+        Args:
+            symbol: Stock symbol
+            data: OHLCV bars to train and validate on
+
+        Returns:
+            Future resolving to a RetrainResult
+        """
+        with self._lock:
+            future = self._pending.get(symbol)
+            if future is not None and not future.done():
+                return future
+
+            future = self._executor.submit(
+                retrain_symbol,
+                self.registry_root,
+                symbol,
+                data,
+                self.holdout_fraction,
+                self.min_improvement,
+                self.strategy_params,
+                self.feature_store_root,
+            )
+            self._pending[symbol] = future
+        future.add_done_callback(lambda f, symbol=symbol: self._record(symbol, f))
+        self.logger.info(f"Queued retraining for {symbol} ({len(data)} bars)")
+        return future
+
+    def _record(self, symbol: str, future: Future):
+        try:
+            result = future.result()
+        except Exception as e:
+            result = RetrainResult(symbol, error=str(e))
+        self.results[symbol] = result
+
+        if result.error:
+            self.logger.error(f"Retraining {symbol} failed: {result.error}")
+        elif result.promoted:
+            self.logger.info(f"Promoted new {symbol} model (holdout accuracy {result.holdout_score:.3f})")
+        else:
+            self.logger.info(
+                f"Kept active {symbol} model (holdout accuracy {result.baseline_score:.3f} "
+                f"vs {result.holdout_score:.3f})"
+            )
+
+    def retrain(self, datasets: Dict[str, pd.DataFrame]) -> Dict[str, RetrainResult]:
+        """
+        Retrain several symbols in parallel and wait for the results.
+
+        Args:
+            datasets: Bars by symbol
+
+        Returns:
+            RetrainResult by symbol
+        """
+        futures = {symbol: self.submit(symbol, data) for symbol, data in datasets.items()}
+        return {symbol: future.result() for symbol, future in futures.items()}
+
+    def maybe_retrain(self, strategy: AdaptiveMLStrategy, data: pd.DataFrame) -> Optional[Future]:
+        """
+        Queue a retraining job if the strategy's should_retrain triggers.
+
+        Args:
+            strategy: Live strategy
+            data: Recent OHLCV bars for its symbol
+
+        Returns:
+            Future of the job, or None if no retraining is due
+        """
+        if not strategy.should_retrain():
+            return None
+        strategy.trades_since_retrain = 0
+        return self.submit(strategy.model_symbol, data)
+
+    def start(self, symbols: List[str], load_data: Callable[[str], pd.DataFrame], interval: float):
+        """
+        Retrain symbols on a schedule in a background thread.
+
+        Args:
+            symbols: Symbols to retrain
+            load_data: Function returning the latest bars for a symbol
+            interval: Seconds between retraining rounds
+        """
+        if self._scheduler is not None and self._scheduler.is_alive():
+            return
+        self._stop.clear()
+        self._scheduler = threading.Thread(
+            target=self._run_schedule,
+            args=(list(symbols), load_data, interval),
+            daemon=True
+        )
+        self._scheduler.start()
+        self.logger.info(f"Scheduled retraining of {len(symbols)} symbols every {interval}s")
+
+    def _run_schedule(self, symbols: List[str], load_data: Callable[[str], pd.DataFrame], interval: float):
+        while not self._stop.is_set():
+            for symbol in symbols:
+                try:
+                    self.submit(symbol, load_data(symbol))
+                except Exception as e:
+                    self.logger.error(f"Could not load data to retrain {symbol}: {e}")
+            self._stop.wait(interval)
+
+    def stop(self, wait: bool = True):
+        """Stop the schedule and shut down the workers."""
+        self._stop.set()
+        if self._scheduler is not None:
+            self._scheduler.join()
+            self._scheduler = None
+        self._executor.shutdown(wait=wait)
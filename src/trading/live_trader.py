@@ -25,8 +25,14 @@ except ImportError:
     logging.warning("Alpaca SDK not installed for trading")
 
 from src.backtesting.backtest_engine import BacktestEngine
+from src.backtesting.incremental_evaluator import EvaluationState, IncrementalEvaluator
 from src.data.data_fetcher import DataFetcher
+from src.data.feature_store import FeatureStore
+from src.strategies.adaptive_ml_strategy import AdaptiveMLStrategy
 from src.strategies.base_strategy import BaseStrategy
+from src.strategies.batch_inference import BatchInference, supports_batch_inference
+from src.strategies.ml_strategy import MLStrategy
+from src.strategies.retraining import ModelRetrainer
 
 # Handle both local and Streamlit Cloud deployments
 try:
@@ -58,7 +64,9 @@ class LiveTrader:
         initial_capital: float = 10000,
         paper_trading: bool = True,
         risk_per_trade: float = 0.02,
-        max_positions: int = 5
+        max_positions: int = 5,
+        retrainer: Optional[ModelRetrainer] = None,
+        feature_store: Optional[FeatureStore] = None
     ):
         """
         Initialize Live Trader.
@@ -70,6 +78,10 @@ class LiveTrader:
             paper_trading: Use paper trading (True) or live (False)
             risk_per_trade: Max % of capital to risk per trade
             max_positions: Maximum concurrent positions
+            retrainer: Background retraining service; Adaptive ML strategies
+                traded live then only run inference (see create_live_strategy)
+            feature_store: Store that caches the features of ML strategies,
+                in backtests and live
         """
         self.strategy_templates = strategies  # Store as templates to clone
         self.symbols = symbols
@@ -77,6 +89,8 @@ class LiveTrader:
         self.paper_trading = paper_trading
         self.risk_per_trade = risk_per_trade
         self.max_positions = max_positions
+        self.retrainer = retrainer
+        self.feature_store = feature_store
         
         self.logger = logging.getLogger(__name__)
         
@@ -91,6 +105,8 @@ class LiveTrader:
         )
         
         self.data_fetcher = DataFetcher()
+        self.batch_inference = BatchInference()
+        self.evaluator = IncrementalEvaluator(initial_capital=initial_capital)
         
         # Store best strategy for each symbol
         self.best_strategies = {}
@@ -103,19 +119,31 @@ class LiveTrader:
     def evaluate_strategies(
         self,
         lookback_days: int = None,
-        metric: str = 'sharpe_ratio'
+        metric: str = 'sharpe_ratio',
+        symbols: Optional[List[str]] = None,
+        evaluation_states: Optional[Dict[str, Dict[str, Dict]]] = None
     ) -> Dict[str, Dict]:
         """
         Run backtests to find best strategy for each symbol.
         
+        With evaluation_states (and no lookback), each (strategy, symbol)
+        backtest is resumed from its stored state and only advanced over
+        bars that arrived since, instead of being re-run over the whole
+        history (see IncrementalEvaluator). Pairs without a state are
+        evaluated in full.
+        
         Args:
             lookback_days: Days of historical data for backtest (None = use all available data)
             metric: Metric to optimize ('sharpe_ratio', 'total_return_pct', 'profit_factor')
+            symbols: Symbols to evaluate (default: all traded symbols)
+            evaluation_states: Symbol -> strategy name -> EvaluationState dict;
+                updated in place with the advanced states
         
         Returns:
             Dictionary with best strategy for each symbol
         """
-        self.logger.info(f"Evaluating {len(self.strategy_templates)} strategies on {len(self.symbols)} symbols")
+        symbols = symbols or self.symbols
+        self.logger.info(f"Evaluating {len(self.strategy_templates)} strategies on {len(symbols)} symbols")
         
         end_date = datetime.now()
         
@@ -127,35 +155,70 @@ class LiveTrader:
             start_date = end_date - timedelta(days=lookback_days)
             self.logger.info(f"Using {lookback_days} days of historical data")
         
+        # A rolling lookback window drops old bars, which accumulators cannot
+        incremental = evaluation_states is not None and lookback_days is None
+        
         results = {}
         
-        for symbol in self.symbols:
+        for symbol in symbols:
             self.logger.info(f"Evaluating strategies for {symbol}")
             
             strategy_results = {}
             best_score = -float('inf')
             best_strategy_name = None
             
+            states = evaluation_states.setdefault(symbol, {}) if incremental else {}
+            
+            # Fetch once for all strategies; when every strategy has a state,
+            # only the bars since the oldest one plus warmup history are needed
+            symbol_start = start_date
+            if incremental and all(states.get(name, {}).get('last_bar') for name in self.strategy_templates):
+                oldest = min(pd.Timestamp(states[name]['last_bar']) for name in self.strategy_templates)
+                symbol_start = oldest.tz_localize(None) - timedelta(days=2 * self.evaluator.warmup_bars)
+            
+            try:
+                data = self.data_fetcher.fetch_historical_data(
+                    symbol,
+                    symbol_start.strftime('%Y-%m-%d'),
+                    end_date.strftime('%Y-%m-%d')
+                )
+            except Exception as e:
+                self.logger.error(f"Error fetching data for {symbol}: {e}")
+                continue
+            
+            if data is None or data.empty:
+                self.logger.warning(f"No data for {symbol}")
+                continue
+            
             for strategy_name, strategy_template in self.strategy_templates.items():
                 try:
                     # Create fresh strategy instance for this backtest
                     # This prevents state pollution between backtests
                     # Simply create a new instance with default parameters
-                    strategy = strategy_template.__class__()
-                    
-                    # Run backtest
-                    engine = BacktestEngine(
-                        strategy=strategy,
-                        symbol=symbol,
-                        start_date=start_date.strftime('%Y-%m-%d'),
-                        end_date=end_date.strftime('%Y-%m-%d'),
-                        initial_capital=self.initial_capital
-                    )
+                    strategy = self._create_backtest_strategy(strategy_template.__class__, symbol)
                     
-                    backtest_results = engine.run()
+                    if incremental:
+                        state = states.get(strategy_name)
+                        state, metrics = self.evaluator.evaluate(
+                            strategy,
+                            data,
+                            EvaluationState.from_dict(state) if state else None
+                        )
+                        states[strategy_name] = state.to_dict()
+                    else:
+                        # Run backtest
+                        engine = BacktestEngine(
+                            strategy=strategy,
+                            symbol=symbol,
+                            start_date=start_date.strftime('%Y-%m-%d'),
+                            end_date=end_date.strftime('%Y-%m-%d'),
+                            initial_capital=self.initial_capital
+                        )
+                        
+                        backtest_results = engine.run(data)
+                        metrics = backtest_results.get('metrics') if backtest_results else None
                     
-                    if backtest_results and backtest_results.get('metrics'):
-                        metrics = backtest_results['metrics']
+                    if metrics:
                         score = metrics.get(metric, -float('inf'))
                         
                         strategy_results[strategy_name] = {
@@ -178,7 +241,9 @@ class LiveTrader:
                     'best_score': best_score,
                     'all_results': strategy_results
                 }
-                self.best_strategies[symbol] = self.strategy_templates[best_strategy_name]
+                self.best_strategies[symbol] = self.create_live_strategy(
+                    self.strategy_templates[best_strategy_name].__class__, symbol
+                )
                 self.logger.info(f"✓ Best for {symbol}: {best_strategy_name} ({metric}={best_score:.3f})")
                 
                 # Log all strategy scores for debugging
@@ -190,14 +255,56 @@ class LiveTrader:
         
         return results
     
+    def create_live_strategy(self, strategy_class, symbol: Optional[str] = None) -> BaseStrategy:
+        """
+        Create a strategy instance to trade live.
+        
+        With a retrainer, Adaptive ML strategies are created with it and
+        with its strategy parameters, so they run inference on the models
+        it promotes and never train in the signal path. ML strategies share
+        the trader's feature store.
+        
+        Args:
+            strategy_class: Strategy class
+            symbol: Symbol the strategy trades (keys its stored features)
+        
+        Returns:
+            Strategy instance
+        """
+        params = {}
+        if self.feature_store is not None and issubclass(strategy_class, (AdaptiveMLStrategy, MLStrategy)):
+            params['feature_store'] = self.feature_store
+        if self.retrainer is not None and issubclass(strategy_class, AdaptiveMLStrategy):
+            params.update({'use_sentiment': False, **self.retrainer.strategy_params})
+            params['retrainer'] = self.retrainer
+        strategy = strategy_class(**params)
+        if symbol is not None and 'feature_store' in params:
+            strategy.set_symbol(symbol)
+        return strategy
+    
+    def _create_backtest_strategy(self, strategy_class, symbol: str) -> BaseStrategy:
+        """Create a strategy instance to evaluate on a symbol's history."""
+        if self.feature_store is None or not issubclass(strategy_class, (AdaptiveMLStrategy, MLStrategy)):
+            return strategy_class()
+        # Sentiment features need a symbol, which backtests never set before
+        # the feature store; keep them off so scores do not change
+        params = {'use_sentiment': False} if issubclass(strategy_class, AdaptiveMLStrategy) else {}
+        strategy = strategy_class(feature_store=self.feature_store, **params)
+        strategy.set_symbol(symbol)
+        return strategy
+    
     def get_current_signals(self) -> Dict[str, int]:
         """
         Get current trading signals for all symbols.
+
+        Symbols traded with ML strategies are predicted together, one
+        model call per model (see BatchInference).
         
         Returns:
             Dictionary mapping symbol to signal (1=buy, -1=sell, 0=hold)
         """
         signals = {}
+        batch_jobs = {}
         
         # Fetch recent data for signal generation
         # Need more data for Adaptive ML (requires 100+ samples after NaN removal)
@@ -222,6 +329,9 @@ class LiveTrader:
                 
                 # Generate signals
                 strategy = self.best_strategies[symbol]
+                if supports_batch_inference(strategy):
+                    batch_jobs[symbol] = (strategy, data)
+                    continue
                 strategy_signals = strategy.generate_signals(data)
                 
                 # Get latest signal
@@ -234,6 +344,9 @@ class LiveTrader:
             except Exception as e:
                 self.logger.error(f"Error generating signal for {symbol}: {e}")
         
+        if batch_jobs:
+            signals.update(self.batch_inference.latest_signals(batch_jobs))
+        
         return signals
     
     def execute_trades(self, signals: Dict[str, int]) -> List[Dict]:
@@ -2,41 +2,178 @@
 State Management Module
 
 Handles persistent storage of:
-- Strategy evaluation results
+- Strategy evaluation results and incremental evaluation state
 - Trading state (active/inactive)
 - Trading configuration
 - Trade history
+
+The database runs in WAL mode, so the daemon and the Streamlit pages can read
+while the other writes. Each StateManager keeps one writer connection and a
+small pool of reader connections open for its lifetime, which also lets
+sqlite3 reuse its per-connection prepared statement cache. Hot reads (trading
+config, trading state, best strategy per ticker) are served from memory
+until this or another process commits a change.
 """
 
+import copy
+import queue
 import sqlite3
 import json
 import logging
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, Iterable, List, Optional, Any
 from pathlib import Path
 import threading
 
 
+_INSERT_EVALUATION = """
+    INSERT OR REPLACE INTO strategy_evaluations
+    (ticker, strategy_name, evaluation_date, metrics, score, metric_name)
+    VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+_INSERT_EVALUATION_STATE = """
+    INSERT OR REPLACE INTO evaluation_state
+    (ticker, strategy_name, last_bar, state, updated_at)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+_INSERT_TRADE = """
+    INSERT INTO trade_history
+    (ticker, strategy_name, action, quantity, price, timestamp, order_id, signal)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_INSERT_PRICE = """
+    INSERT OR REPLACE INTO price_data_cache
+    (ticker, date, open, high, low, close, volume)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+
+def _now() -> str:
+    """Current time in the format sqlite3 used to store datetimes."""
+    return datetime.now().isoformat(sep=' ')
+
+
 class StateManager:
     """Manage persistent state for trading system."""
-    
-    def __init__(self, db_path: str = "data/trading_state.db"):
-        """Initialize state manager with SQLite database."""
+
+    def __init__(self, db_path: str = "data/trading_state.db", pool_size: int = 4):
+        """
+        Initialize state manager with SQLite database.
+
+        Args:
+            db_path: Database file
+            pool_size: Maximum number of open reader connections
+        """
         self.db_path = db_path
+        self.pool_size = pool_size
         self.logger = logging.getLogger(__name__)
+
+        # Serializes writes on the writer connection (SQLite allows one writer)
         self._lock = threading.Lock()
-        
+
+        # Reader connections, opened on demand up to pool_size
+        self._readers: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._readers_opened = 0
+        self._readers_lock = threading.Lock()
+
+        # Read-through cache, dropped when another connection commits.
+        # The generation guards against storing a value loaded before a write.
+        self._cache: Dict[Any, Any] = {}
+        self._generation = 0
+        self._data_version = None
+
         # Ensure data directory exists
         Path(db_path).parent.mkdir(parents=True, exist_ok=True)
-        
+
+        self._writer = self._connect()
+        self._writer.execute("PRAGMA journal_mode=WAL")
+
         # Initialize database
         self._init_database()
-    
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open a connection configured for concurrent use."""
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=30,
+            check_same_thread=False,
+            cached_statements=256
+        )
+        # Durable at checkpoints; safe with WAL and much cheaper per commit
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @contextmanager
+    def _read(self):
+        """Borrow a reader connection from the pool."""
+        try:
+            conn = self._readers.get_nowait()
+        except queue.Empty:
+            with self._readers_lock:
+                can_open = self._readers_opened < self.pool_size
+                if can_open:
+                    self._readers_opened += 1
+            conn = self._connect() if can_open else self._readers.get()
+        try:
+            yield conn
+        finally:
+            self._readers.put(conn)
+
+    @contextmanager
+    def _write(self, *invalidate):
+        """
+        Run writes in one transaction on the writer connection.
+
+        Args:
+            *invalidate: Cache keys the writes make stale (None clears all)
+        """
+        with self._lock:
+            with self._writer:
+                yield self._writer.cursor()
+            if None in invalidate:
+                self._cache.clear()
+            else:
+                for key in invalidate:
+                    self._cache.pop(key, None)
+            self._generation += 1
+
+    def _cached(self, key: Any, load: Callable[[], Any]) -> Any:
+        """Return a cached read, loading it on a miss."""
+        with self._lock:
+            # data_version on the writer connection only changes when some
+            # other connection (e.g. another process) commits
+            version = self._writer.execute("PRAGMA data_version").fetchone()[0]
+            if version != self._data_version:
+                self._cache.clear()
+                self._data_version = version
+                self._generation += 1
+            if key in self._cache:
+                return copy.deepcopy(self._cache[key])
+            generation = self._generation
+
+        value = load()
+        with self._lock:
+            if generation == self._generation:
+                self._cache[key] = value
+        return copy.deepcopy(value)
+
+    def close(self):
+        """Close all connections."""
+        with self._lock:
+            self._writer.close()
+        while True:
+            try:
+                self._readers.get_nowait().close()
+            except queue.Empty:
+                break
+
     def _init_database(self):
         """Create database tables if they don't exist."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
+        with self._write(None) as cursor:
             # Strategy evaluations table
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS strategy_evaluations (
@@ -50,7 +187,7 @@ class StateManager:
                     UNIQUE(ticker, strategy_name)
                 )
             """)
-            
+
             # Best strategies table
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS best_strategies (
@@ -61,7 +198,19 @@ class StateManager:
                     metric_name TEXT NOT NULL
                 )
             """)
-            
+
+            # Incremental evaluation state (see IncrementalEvaluator)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS evaluation_state (
+                    ticker TEXT NOT NULL,
+                    strategy_name TEXT NOT NULL,
+                    last_bar TEXT,
+                    state TEXT NOT NULL,
+                    updated_at TIMESTAMP NOT NULL,
+                    PRIMARY KEY (ticker, strategy_name)
+                )
+            """)
+
             # Trading configuration table
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS trading_config (
@@ -75,7 +224,7 @@ class StateManager:
                     last_updated TIMESTAMP NOT NULL
                 )
             """)
-            
+
             # Trading state table
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS trading_state (
@@ -86,13 +235,13 @@ class StateManager:
                     last_check TIMESTAMP
                 )
             """)
-            
+
             # Initialize default trading state if not exists
             cursor.execute("""
                 INSERT OR IGNORE INTO trading_state (id, is_active)
                 VALUES (1, 0)
             """)
-            
+
             # Trade history table
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS trade_history (
@@ -107,7 +256,7 @@ class StateManager:
                     signal INTEGER NOT NULL
                 )
             """)
-            
+
             # Historical price data cache table
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS price_data_cache (
@@ -122,16 +271,15 @@ class StateManager:
                     UNIQUE(ticker, date)
                 )
             """)
-            
+
             # Create index for faster queries
             cursor.execute("""
-                CREATE INDEX IF NOT EXISTS idx_price_cache_ticker_date 
+                CREATE INDEX IF NOT EXISTS idx_price_cache_ticker_date
                 ON price_data_cache(ticker, date)
             """)
-            
-            conn.commit()
-            self.logger.info("Database initialized")
-    
+
+        self.logger.info("Database initialized")
+
     def save_strategy_evaluation(
         self,
         ticker: str,
@@ -141,23 +289,40 @@ class StateManager:
         metric_name: str
     ):
         """Save strategy evaluation results."""
-        with self._lock:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    INSERT OR REPLACE INTO strategy_evaluations
-                    (ticker, strategy_name, evaluation_date, metrics, score, metric_name)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                """, (
+        self.save_strategy_evaluations(
+            ticker,
+            {strategy_name: {'metrics': metrics, 'score': score}},
+            metric_name
+        )
+
+    def save_strategy_evaluations(
+        self,
+        ticker: str,
+        results: Dict[str, Dict],
+        metric_name: str
+    ):
+        """
+        Save the evaluations of several strategies in one transaction.
+
+        Args:
+            ticker: Stock symbol
+            results: Strategy name -> {'metrics': ..., 'score': ...}
+            metric_name: Metric the scores are based on
+        """
+        evaluation_date = _now()
+        with self._write() as cursor:
+            cursor.executemany(_INSERT_EVALUATION, [
+                (
                     ticker,
                     strategy_name,
-                    datetime.now(),
-                    json.dumps(metrics),
-                    score,
+                    evaluation_date,
+                    json.dumps(result['metrics']),
+                    result['score'],
                     metric_name
-                ))
-                conn.commit()
-    
+                )
+                for strategy_name, result in results.items()
+            ])
+
     def save_best_strategy(
         self,
         ticker: str,
@@ -166,33 +331,29 @@ class StateManager:
         metric_name: str
     ):
         """Save best strategy for a ticker."""
-        with self._lock:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    INSERT OR REPLACE INTO best_strategies
-                    (ticker, strategy_name, score, evaluation_date, metric_name)
-                    VALUES (?, ?, ?, ?, ?)
-                """, (
-                    ticker,
-                    strategy_name,
-                    score,
-                    datetime.now(),
-                    metric_name
-                ))
-                conn.commit()
-    
+        with self._write(('best', ticker)) as cursor:
+            cursor.execute("""
+                INSERT OR REPLACE INTO best_strategies
+                (ticker, strategy_name, score, evaluation_date, metric_name)
+                VALUES (?, ?, ?, ?, ?)
+            """, (
+                ticker,
+                strategy_name,
+                score,
+                _now(),
+                metric_name
+            ))
+
     def get_best_strategy(self, ticker: str) -> Optional[Dict]:
         """Get best strategy for a ticker."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT strategy_name, score, evaluation_date, metric_name
-                FROM best_strategies
-                WHERE ticker = ?
-            """, (ticker,))
-            
-            row = cursor.fetchone()
+        def load():
+            with self._read() as conn:
+                row = conn.execute("""
+                    SELECT strategy_name, score, evaluation_date, metric_name
+                    FROM best_strategies
+                    WHERE ticker = ?
+                """, (ticker,)).fetchone()
+
             if row:
                 return {
                     'strategy_name': row[0],
@@ -201,29 +362,59 @@ class StateManager:
                     'metric_name': row[3]
                 }
             return None
-    
+
+        return self._cached(('best', ticker), load)
+
     def get_all_evaluations(self, ticker: str) -> List[Dict]:
         """Get all strategy evaluations for a ticker."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
+        with self._read() as conn:
+            rows = conn.execute("""
                 SELECT strategy_name, metrics, score, evaluation_date, metric_name
                 FROM strategy_evaluations
                 WHERE ticker = ?
                 ORDER BY score DESC
-            """, (ticker,))
-            
-            results = []
-            for row in cursor.fetchall():
-                results.append({
-                    'strategy_name': row[0],
-                    'metrics': json.loads(row[1]),
-                    'score': row[2],
-                    'evaluation_date': row[3],
-                    'metric_name': row[4]
-                })
-            return results
-    
+            """, (ticker,)).fetchall()
+
+        return [
+            {
+                'strategy_name': row[0],
+                'metrics': json.loads(row[1]),
+                'score': row[2],
+                'evaluation_date': row[3],
+                'metric_name': row[4]
+            }
+            for row in rows
+        ]
+
+    def save_evaluation_states(self, ticker: str, states: Dict[str, Dict]):
+        """
+        Save incremental evaluation states of a ticker in one transaction.
+
+        Args:
+            ticker: Stock symbol
+            states: Strategy name -> EvaluationState.to_dict()
+        """
+        if not states:
+            return
+
+        updated_at = _now()
+        with self._write() as cursor:
+            cursor.executemany(_INSERT_EVALUATION_STATE, [
+                (ticker, strategy_name, state.get('last_bar'), json.dumps(state), updated_at)
+                for strategy_name, state in states.items()
+            ])
+
+    def get_evaluation_states(self, ticker: str) -> Dict[str, Dict]:
+        """Get incremental evaluation states of a ticker by strategy name."""
+        with self._read() as conn:
+            rows = conn.execute("""
+                SELECT strategy_name, state
+                FROM evaluation_state
+                WHERE ticker = ?
+            """, (ticker,)).fetchall()
+
+        return {row[0]: json.loads(row[1]) for row in rows}
+
     def save_trading_config(
         self,
         tickers: List[str],
@@ -234,37 +425,33 @@ class StateManager:
         check_interval: int
     ):
         """Save trading configuration."""
-        with self._lock:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    INSERT OR REPLACE INTO trading_config
-                    (id, tickers, paper_trading, initial_capital, risk_per_trade,
-                     max_positions, check_interval, last_updated)
-                    VALUES (1, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    json.dumps(tickers),
-                    1 if paper_trading else 0,
-                    initial_capital,
-                    risk_per_trade,
-                    max_positions,
-                    check_interval,
-                    datetime.now()
-                ))
-                conn.commit()
-    
+        with self._write('config') as cursor:
+            cursor.execute("""
+                INSERT OR REPLACE INTO trading_config
+                (id, tickers, paper_trading, initial_capital, risk_per_trade,
+                 max_positions, check_interval, last_updated)
+                VALUES (1, ?, ?, ?, ?, ?, ?, ?)
+            """, (
+                json.dumps(tickers),
+                1 if paper_trading else 0,
+                initial_capital,
+                risk_per_trade,
+                max_positions,
+                check_interval,
+                _now()
+            ))
+
     def get_trading_config(self) -> Optional[Dict]:
         """Get current trading configuration."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT tickers, paper_trading, initial_capital, risk_per_trade,
-                       max_positions, check_interval, last_updated
-                FROM trading_config
-                WHERE id = 1
-            """)
-            
-            row = cursor.fetchone()
+        def load():
+            with self._read() as conn:
+                row = conn.execute("""
+                    SELECT tickers, paper_trading, initial_capital, risk_per_trade,
+                           max_positions, check_interval, last_updated
+                    FROM trading_config
+                    WHERE id = 1
+                """).fetchone()
+
             if row:
                 return {
                     'tickers': json.loads(row[0]),
@@ -276,47 +463,39 @@ class StateManager:
                     'last_updated': row[6]
                 }
             return None
-    
+
+        return self._cached('config', load)
+
     def set_trading_active(self, active: bool):
         """Set trading state to active or inactive."""
-        with self._lock:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                if active:
-                    cursor.execute("""
-                        UPDATE trading_state
-                        SET is_active = 1, started_at = ?, stopped_at = NULL
-                        WHERE id = 1
-                    """, (datetime.now(),))
-                else:
-                    cursor.execute("""
-                        UPDATE trading_state
-                        SET is_active = 0, stopped_at = ?
-                        WHERE id = 1
-                    """, (datetime.now(),))
-                
-                conn.commit()
-    
+        with self._write('state') as cursor:
+            if active:
+                cursor.execute("""
+                    UPDATE trading_state
+                    SET is_active = 1, started_at = ?, stopped_at = NULL
+                    WHERE id = 1
+                """, (_now(),))
+            else:
+                cursor.execute("""
+                    UPDATE trading_state
+                    SET is_active = 0, stopped_at = ?
+                    WHERE id = 1
+                """, (_now(),))
+
     def is_trading_active(self) -> bool:
         """Check if trading is currently active."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("SELECT is_active FROM trading_state WHERE id = 1")
-            row = cursor.fetchone()
-            return bool(row[0]) if row else False
-    
+        return self.get_trading_state()['is_active']
+
     def get_trading_state(self) -> Dict:
         """Get full trading state."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
-                SELECT is_active, started_at, stopped_at, last_check
-                FROM trading_state
-                WHERE id = 1
-            """)
-            
-            row = cursor.fetchone()
+        def load():
+            with self._read() as conn:
+                row = conn.execute("""
+                    SELECT is_active, started_at, stopped_at, last_check
+                    FROM trading_state
+                    WHERE id = 1
+                """).fetchone()
+
             if row:
                 return {
                     'is_active': bool(row[0]),
@@ -325,19 +504,18 @@ class StateManager:
                     'last_check': row[3]
                 }
             return {'is_active': False}
-    
+
+        return self._cached('state', load)
+
     def update_last_check(self):
         """Update last check timestamp."""
-        with self._lock:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    UPDATE trading_state
-                    SET last_check = ?
-                    WHERE id = 1
-                """, (datetime.now(),))
-                conn.commit()
-    
+        with self._write('state') as cursor:
+            cursor.execute("""
+                UPDATE trading_state
+                SET last_check = ?
+                WHERE id = 1
+            """, (_now(),))
+
     def record_trade(
         self,
         ticker: str,
@@ -349,177 +527,203 @@ class StateManager:
         order_id: Optional[str] = None
     ):
         """Record a trade in history."""
-        with self._lock:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute("""
-                    INSERT INTO trade_history
-                    (ticker, strategy_name, action, quantity, price, timestamp, order_id, signal)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                """, (
-                    str(ticker),
-                    str(strategy_name),
-                    str(action),
-                    int(quantity),
-                    float(price),
-                    datetime.now().isoformat(),
-                    str(order_id) if order_id is not None else None,
-                    int(signal)
-                ))
-                conn.commit()
-    
+        self.record_trades([{
+            'ticker': ticker,
+            'strategy_name': strategy_name,
+            'action': action,
+            'quantity': quantity,
+            'price': price,
+            'signal': signal,
+            'order_id': order_id
+        }])
+
+    def record_trades(self, trades: Iterable[Dict]):
+        """
+        Record several trades in one transaction.
+
+        Args:
+            trades: Dicts with the record_trade arguments as keys
+        """
+        timestamp = datetime.now().isoformat()
+        rows = [
+            (
+                str(trade['ticker']),
+                str(trade['strategy_name']),
+                str(trade['action']),
+                int(trade['quantity']),
+                float(trade['price']),
+                timestamp,
+                str(trade['order_id']) if trade.get('order_id') is not None else None,
+                int(trade['signal'])
+            )
+            for trade in trades
+        ]
+        if not rows:
+            return
+
+        with self._write() as cursor:
+            cursor.executemany(_INSERT_TRADE, rows)
+
     def get_trade_history(
         self,
         ticker: Optional[str] = None,
         limit: int = 100
     ) -> List[Dict]:
         """Get trade history."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            
+        with self._read() as conn:
             if ticker:
-                cursor.execute("""
+                rows = conn.execute("""
                     SELECT ticker, strategy_name, action, quantity, price,
                            timestamp, order_id, signal
                     FROM trade_history
                     WHERE ticker = ?
                     ORDER BY timestamp DESC
                     LIMIT ?
-                """, (ticker, limit))
+                """, (ticker, limit)).fetchall()
             else:
-                cursor.execute("""
+                rows = conn.execute("""
                     SELECT ticker, strategy_name, action, quantity, price,
                            timestamp, order_id, signal
                     FROM trade_history
                     ORDER BY timestamp DESC
                     LIMIT ?
-                """, (limit,))
-            
-            results = []
-            for row in cursor.fetchall():
-                results.append({
-                    'ticker': row[0],
-                    'strategy_name': row[1],
-                    'action': row[2],
-                    'quantity': row[3],
-                    'price': row[4],
-                    'timestamp': row[5],
-                    'order_id': row[6],
-                    'signal': row[7]
-                })
-            return results
-    
+                """, (limit,)).fetchall()
+
+        return [
+            {
+                'ticker': row[0],
+                'strategy_name': row[1],
+                'action': row[2],
+                'quantity': row[3],
+                'price': row[4],
+                'timestamp': row[5],
+                'order_id': row[6],
+                'signal': row[7]
+            }
+            for row in rows
+        ]
+
     def clear_evaluations(self, ticker: Optional[str] = None):
         """Clear strategy evaluations."""
-        with self._lock:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                if ticker:
-                    cursor.execute("DELETE FROM strategy_evaluations WHERE ticker = ?", (ticker,))
-                    cursor.execute("DELETE FROM best_strategies WHERE ticker = ?", (ticker,))
-                else:
-                    cursor.execute("DELETE FROM strategy_evaluations")
-                    cursor.execute("DELETE FROM best_strategies")
-                
-                conn.commit()
-    
+        with self._write(None) as cursor:
+            if ticker:
+                cursor.execute("DELETE FROM strategy_evaluations WHERE ticker = ?", (ticker,))
+                cursor.execute("DELETE FROM best_strategies WHERE ticker = ?", (ticker,))
+                cursor.execute("DELETE FROM evaluation_state WHERE ticker = ?", (ticker,))
+            else:
+                cursor.execute("DELETE FROM strategy_evaluations")
+                cursor.execute("DELETE FROM best_strategies")
+                cursor.execute("DELETE FROM evaluation_state")
+
     def save_price_data(self, ticker: str, price_data: Any):
         """
         Save historical price data to cache.
-        
+
         Args:
             ticker: Stock symbol
             price_data: DataFrame with date index and OHLCV columns
         """
         import pandas as pd
-        
-        with self._lock:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                for date, row in price_data.iterrows():
-                    date_str = date.strftime('%Y-%m-%d') if isinstance(date, pd.Timestamp) else str(date)
-                    
-                    cursor.execute("""
-                        INSERT OR REPLACE INTO price_data_cache
-                        (ticker, date, open, high, low, close, volume)
-                        VALUES (?, ?, ?, ?, ?, ?, ?)
-                    """, (
-                        str(ticker),
-                        date_str,
-                        float(row['open']),
-                        float(row['high']),
-                        float(row['low']),
-                        float(row['close']),
-                        int(row['volume'])
-                    ))
-                
-                conn.commit()
-                self.logger.info(f"Cached {len(price_data)} rows for {ticker}")
-    
+
+        if isinstance(price_data.index, pd.DatetimeIndex):
+            dates = price_data.index.strftime('%Y-%m-%d')
+        else:
+            dates = [d.strftime('%Y-%m-%d') if isinstance(d, pd.Timestamp) else str(d)
+                     for d in price_data.index]
+
+        rows = zip(
+            [str(ticker)] * len(price_data),
+            dates,
+            price_data['open'].astype(float).tolist(),
+            price_data['high'].astype(float).tolist(),
+            price_data['low'].astype(float).tolist(),
+            price_data['close'].astype(float).tolist(),
+            price_data['volume'].astype('int64').tolist()
+        )
+
+        with self._write() as cursor:
+            cursor.executemany(_INSERT_PRICE, rows)
+        self.logger.info(f"Cached {len(price_data)} rows for {ticker}")
+
     def get_cached_price_data(self, ticker: str, start_date: str = None, end_date: str = None) -> Optional[Any]:
         """
         Get cached price data for a ticker.
-        
+
         Args:
             ticker: Stock symbol
             start_date: Start date (YYYY-MM-DD), optional
             end_date: End date (YYYY-MM-DD), optional
-            
+
         Returns:
             DataFrame with price data or None if no data
         """
         import pandas as pd
-        
-        with sqlite3.connect(self.db_path) as conn:
-            query = "SELECT date, open, high, low, close, volume FROM price_data_cache WHERE ticker = ?"
-            params = [ticker]
-            
-            if start_date:
-                query += " AND date >= ?"
-                params.append(start_date)
-            
-            if end_date:
-                query += " AND date <= ?"
-                params.append(end_date)
-            
-            query += " ORDER BY date"
-            
+
+        query = "SELECT date, open, high, low, close, volume FROM price_data_cache WHERE ticker = ?"
+        params = [ticker]
+
+        if start_date:
+            query += " AND date >= ?"
+            params.append(start_date)
+
+        if end_date:
+            query += " AND date <= ?"
+            params.append(end_date)
+
+        query += " ORDER BY date"
+
+        with self._read() as conn:
             df = pd.read_sql_query(query, conn, params=params)
-            
-            if df.empty:
-                return None
-            
-            # Convert date column to datetime and set as index
-            df['date'] = pd.to_datetime(df['date'])
-            df.set_index('date', inplace=True)
-            
-            self.logger.info(f"Retrieved {len(df)} cached rows for {ticker}")
-            return df
-    
+
+        if df.empty:
+            return None
+
+        # Convert date column to datetime and set as index
+        df['date'] = pd.to_datetime(df['date'])
+        df.set_index('date', inplace=True)
+
+        self.logger.info(f"Retrieved {len(df)} cached rows for {ticker}")
+        return df
+
     def get_last_cached_date(self, ticker: str) -> Optional[str]:
         """Get the last date for which we have cached data."""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute("""
+        with self._read() as conn:
+            row = conn.execute("""
                 SELECT MAX(date) FROM price_data_cache WHERE ticker = ?
-            """, (ticker,))
-            
-            row = cursor.fetchone()
-            return row[0] if row and row[0] else None
-    
+            """, (ticker,)).fetchone()
+
+        return row[0] if row and row[0] else None
+
     def clear_price_cache(self, ticker: Optional[str] = None):
         """Clear cached price data."""
-        with self._lock:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                
-                if ticker:
-                    cursor.execute("DELETE FROM price_data_cache WHERE ticker = ?", (ticker,))
-                    self.logger.info(f"Cleared price cache for {ticker}")
-                else:
-                    cursor.execute("DELETE FROM price_data_cache")
-                    self.logger.info("Cleared all price cache")
-                
-                conn.commit()
+        with self._write() as cursor:
+            if ticker:
+                cursor.execute("DELETE FROM price_data_cache WHERE ticker = ?", (ticker,))
+            else:
+                cursor.execute("DELETE FROM price_data_cache")
+
+        if ticker:
+            self.logger.info(f"Cleared price cache for {ticker}")
+        else:
+            self.logger.info("Cleared all price cache")
+
+
+_managers: Dict[str, StateManager] = {}
+_managers_lock = threading.Lock()
+
+
+def get_state_manager(db_path: str = "data/trading_state.db") -> StateManager:
+    """
+    Get the process-wide state manager for a database.
+
+    Args:
+        db_path: Database file
+
+    Returns:
+        StateManager instance
+    """
+    with _managers_lock:
+        manager = _managers.get(db_path)
+        if manager is None:
+            manager = _managers[db_path] = StateManager(db_path)
+        return manager
@@ -68,6 +68,9 @@ class LiveTrader:
         self.positions = {}
         self.orders = []
         
+        # Rolling window of recent bars per symbol, extended with new bars
+        self._bars: Dict[str, pd.DataFrame] = {}
+        
         # Initialize Alpaca client
         if ALPACA_AVAILABLE:
             try:
@@ -175,19 +178,47 @@ class LiveTrader:
         except Exception as e:
             self.logger.error(f"Error updating positions: {e}")
     
+    def _recent_data(self, symbol: str) -> pd.DataFrame:
+        """
+        Last year of bars for a symbol.
+        
+        The year is fetched once; later calls only fetch from the last held
+        bar onwards (which replaces it, as the current bar is still forming)
+        and drop bars that left the window.
+        """
+        now = datetime.now()
+        window_start = now - timedelta(days=365)
+        held = self._bars.get(symbol)
+        
+        if held is None or held.empty:
+            start_date = window_start
+        else:
+            start_date = held.index[-1].to_pydatetime().replace(tzinfo=None)
+        
+        data = self.data_fetcher.fetch_historical_data(
+            symbol,
+            start_date.strftime('%Y-%m-%d'),
+            now.strftime('%Y-%m-%d'),
+            use_cache=False
+        )
+        
+        if held is not None and not held.empty and data is not None and not data.empty:
+            data = pd.concat([held[held.index < data.index[0]], data])
+            cutoff = pd.Timestamp(window_start)
+            if data.index.tz is not None:
+                cutoff = cutoff.tz_localize(data.index.tz)
+            data = data[data.index >= cutoff]
+        elif data is None or data.empty:
+            data = held if held is not None else pd.DataFrame()
+        
+        self._bars[symbol] = data
+        return data
+    
     def _process_symbol(self, symbol: str):
         """Process trading signals for a symbol."""
         try:
-            # Fetch recent data
-            end_date = datetime.now().strftime('%Y-%m-%d')
-            start_date = (datetime.now() - timedelta(days=365)).strftime('%Y-%m-%d')
-            
-            data = self.data_fetcher.fetch_historical_data(
-                symbol,
-                start_date,
-                end_date,
-                use_cache=False
-            )
+            # Recent data, only new bars are fetched after the first loop
+            data = self._recent_data(symbol)
             
             if data.empty or len(data) < 200:
                 self.logger.warning(f"Insufficient data for {symbol}")
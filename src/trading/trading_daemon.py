@@ -16,8 +16,9 @@ from datetime import datetime, timedelta
 from typing import Dict
 import traceback
 
-from src.trading.state_manager import StateManager
+from src.trading.state_manager import get_state_manager
 from src.trading.live_trader import LiveTrader
+from src.data.feature_store import get_feature_store
 from src.strategies.sma_crossover import SMACrossoverStrategy
 from src.strategies.rsi_strategy import RSIStrategy
 from src.strategies.macd_strategy import MACDStrategy
@@ -29,6 +30,7 @@ from src.strategies.vwap_strategy import VWAPStrategy
 from src.strategies.pairs_trading import PairsTradingStrategy
 from src.strategies.ml_strategy import MLStrategy
 from src.strategies.adaptive_ml_strategy import AdaptiveMLStrategy
+from src.strategies.retraining import ModelRetrainer
 
 
 # Configure logging
@@ -48,8 +50,9 @@ class TradingDaemon:
     def __init__(self):
         """Initialize trading daemon."""
         self.logger = logging.getLogger(__name__)
-        self.state_manager = StateManager()
+        self.state_manager = get_state_manager()
         self.trader = None
+        self.retrainer = None
         self.running = False
         
         # All available strategies
@@ -87,6 +90,12 @@ class TradingDaemon:
         # Get all strategy instances
         strategies = self._get_strategy_instances()
         
+        # Adaptive ML models are trained in worker processes, not in the trading
+        # loop; both read features from the same store
+        feature_store = get_feature_store()
+        if self.retrainer is None:
+            self.retrainer = ModelRetrainer(feature_store_root=feature_store.root)
+        
         # Create trader
         self.trader = LiveTrader(
             strategies=strategies,
@@ -94,50 +103,76 @@ class TradingDaemon:
             initial_capital=config['initial_capital'],
             paper_trading=config['paper_trading'],
             risk_per_trade=config['risk_per_trade'],
-            max_positions=config['max_positions']
+            max_positions=config['max_positions'],
+            retrainer=self.retrainer,
+            feature_store=feature_store
         )
         
         self.logger.info(f"Trader created with {len(config['tickers'])} tickers")
     
     def _ensure_strategies_evaluated(self, config: Dict, metric: str = 'sharpe_ratio'):
-        """Ensure all strategies have been evaluated for all tickers."""
+        """
+        Ensure all strategies have been evaluated for all tickers.
+        
+        Tickers without a best strategy are evaluated in full; tickers last
+        ranked before today are re-ranked incrementally over the bars that
+        arrived since.
+        """
         need_evaluation = []
+        need_reranking = []
+        today = datetime.now().date().isoformat()
         
         for ticker in config['tickers']:
             best_strategy = self.state_manager.get_best_strategy(ticker)
             if not best_strategy:
                 need_evaluation.append(ticker)
+            elif str(best_strategy['evaluation_date'])[:10] < today:
+                need_reranking.append(ticker)
         
         if need_evaluation:
             self.logger.info(f"Need to evaluate strategies for: {', '.join(need_evaluation)}")
-            self._evaluate_strategies(need_evaluation, config, metric)
+        if need_reranking:
+            self.logger.info(f"Re-ranking strategies for: {', '.join(need_reranking)}")
+        
+        if need_evaluation or need_reranking:
+            self._evaluate_strategies(need_evaluation + need_reranking, config, metric)
         else:
             self.logger.info("All tickers have strategy evaluations")
-            # Load best strategies into trader
-            self._load_best_strategies(config['tickers'])
+        
+        # Load best strategies into trader
+        self._load_best_strategies(config['tickers'])
     
     def _evaluate_strategies(self, tickers: list, config: Dict, metric: str):
-        """Evaluate all strategies for given tickers using ALL available historical data."""
+        """
+        Evaluate all strategies for given tickers using ALL available historical data.
+        
+        Backtests resume from the evaluation states stored for each
+        (strategy, ticker), so after the first run only new bars are simulated.
+        """
         self.logger.info(f"Evaluating {len(self.all_strategies)} strategies on {len(tickers)} tickers...")
         self.logger.info("Using ALL available historical data (up to 20 years)")
         
+        states = {ticker: self.state_manager.get_evaluation_states(ticker) for ticker in tickers}
+        
         # Pass None to use all available data
         results = self.trader.evaluate_strategies(
             lookback_days=None,
-            metric=metric
+            metric=metric,
+            symbols=tickers,
+            evaluation_states=states
         )
         
+        for ticker, ticker_states in states.items():
+            self.state_manager.save_evaluation_states(ticker, ticker_states)
+        
         # Save results to state manager
         for ticker, data in results.items():
             # Save all strategy results
-            for strategy_name, strategy_result in data['all_results'].items():
-                self.state_manager.save_strategy_evaluation(
-                    ticker=ticker,
-                    strategy_name=strategy_name,
-                    metrics=strategy_result['metrics'],
-                    score=strategy_result['score'],
-                    metric_name=metric
-                )
+            self.state_manager.save_strategy_evaluations(
+                ticker=ticker,
+                results=data['all_results'],
+                metric_name=metric
+            )
             
             # Save best strategy
             self.state_manager.save_best_strategy(
@@ -157,7 +192,7 @@ class TradingDaemon:
                 strategy_name = best_strategy_info['strategy_name']
                 strategy_class = self.all_strategies.get(strategy_name)
                 if strategy_class:
-                    self.trader.best_strategies[ticker] = strategy_class()
+                    self.trader.best_strategies[ticker] = self.trader.create_live_strategy(strategy_class, ticker)
                     self.logger.info(f"Loaded {strategy_name} for {ticker}")
     
     def _execute_trading_cycle(self, config: Dict):
@@ -180,22 +215,25 @@ class TradingDaemon:
             trades = self.trader.execute_trades(signals)
             
             # Record trades in state manager
+            records = []
             for trade in trades:
                 strategy_info = self.state_manager.get_best_strategy(trade['symbol'])
                 strategy_name = strategy_info['strategy_name'] if strategy_info else "Unknown"
                 
-                self.state_manager.record_trade(
-                    ticker=trade['symbol'],
-                    strategy_name=strategy_name,
-                    action=trade['action'],
-                    quantity=trade['qty'],
-                    price=trade['price'],
-                    signal=signals.get(trade['symbol'], 0),
-                    order_id=trade.get('order_id')
-                )
+                records.append({
+                    'ticker': trade['symbol'],
+                    'strategy_name': strategy_name,
+                    'action': trade['action'],
+                    'quantity': trade['qty'],
+                    'price': trade['price'],
+                    'signal': signals.get(trade['symbol'], 0),
+                    'order_id': trade.get('order_id')
+                })
                 
                 self.logger.info(f"✓ Executed: {trade['action']} {trade['qty']} {trade['symbol']} @ ${trade['price']:.2f}")
             
+            self.state_manager.record_trades(records)
+            
             if not trades:
                 self.logger.info("No trades executed (all HOLD or positions full)")
             
@@ -256,6 +294,8 @@ class TradingDaemon:
                 self.logger.error(traceback.format_exc())
                 time.sleep(60)  # Wait a bit before retrying
         
+        if self.retrainer is not None:
+            self.retrainer.stop(wait=False)
         self.logger.info("Trading Daemon stopped")
 
 
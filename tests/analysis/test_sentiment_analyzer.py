@@ -0,0 +1,168 @@
+"""Tests for cached, concurrent sentiment fetching."""
+
+import threading
+from datetime import date, timedelta
+
+import pandas as pd
+import pytest
+
+from src.analysis import sentiment_analyzer
+from src.analysis.sentiment_analyzer import SentimentAnalyzer
+from src.strategies.adaptive_ml_strategy import AdaptiveMLStrategy
+
+
+class FakeResponse:
+    def __init__(self, payload):
+        self.payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.payload
+
+
+class FakeSession:
+    """Alpha Vantage stand-in returning one scored article per day, newest first."""
+
+    def __init__(self, days, payload=None):
+        self.days = days
+        self.payload = payload
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def get(self, url, params=None, timeout=None):
+        with self.lock:
+            self.calls.append(params)
+        if self.payload is not None:
+            return FakeResponse(self.payload)
+        symbol = params['tickers']
+        end = pd.Timestamp(params['time_to'])
+        feed = [
+            {
+                'title': f"{symbol} update",
+                'time_published': day.strftime('%Y%m%dT120000'),
+                'ticker_sentiment': [{'ticker': symbol, 'ticker_sentiment_score': str(score)}],
+            }
+            for day, score in sorted(self.days.items(), reverse=True)
+            if day <= end
+        ]
+        return FakeResponse({'feed': feed[:params['limit']]})
+
+
+@pytest.fixture
+def days():
+    today = pd.Timestamp(date.today())
+    return {today - pd.Timedelta(days=offset): round(0.1 * (offset % 5) - 0.2, 2) for offset in range(1, 11)}
+
+
+@pytest.fixture
+def make_analyzer(tmp_path, days):
+    def make(**kwargs):
+        analyzer = SentimentAnalyzer(alpha_vantage_key='demo', cache_dir=str(tmp_path / 'sentiment'), **kwargs)
+        analyzer.session = FakeSession(days)
+        return analyzer
+    return make
+
+
+class TestSentimentCache:
+    """Tests for batching, caching and quotas."""
+
+    def test_batch_is_cached_on_disk(self, make_analyzer):
+        symbols = ['AAPL', 'MSFT', 'NVDA', 'AMZN']
+        analyzer = make_analyzer(max_concurrency=4)
+        results = analyzer.get_batch_sentiment(symbols)
+
+        assert list(results) == symbols
+        assert len(analyzer.session.calls) == len(symbols)
+        assert results['AAPL']['news_volume'] == 10
+
+        # A restarted analyzer serves the same results from disk
+        restarted = make_analyzer()
+        assert restarted.get_batch_sentiment(symbols) == results
+        assert restarted.session.calls == []
+
+    def test_quota_is_tracked(self, make_analyzer):
+        analyzer = make_analyzer(daily_quotas={'alpha_vantage': 2})
+        analyzer.get_batch_sentiment(['AAPL', 'MSFT', 'NVDA'])
+
+        assert len(analyzer.session.calls) == 2
+        assert analyzer.remaining_quota('alpha_vantage') == 0
+        assert make_analyzer(daily_quotas={'alpha_vantage': 2}).remaining_quota('alpha_vantage') == 0
+
+    def test_rate_limit_reply_exhausts_quota(self, make_analyzer):
+        analyzer = make_analyzer()
+        analyzer.session.payload = {'Information': 'rate limit reached'}
+        sentiment = analyzer.get_stock_sentiment('AAPL')
+
+        assert sentiment['news_sentiment'] == 0.0
+        assert analyzer.remaining_quota('alpha_vantage') == 0
+
+
+class TestSentimentHistory:
+    """Tests for the daily sentiment series."""
+
+    def test_daily_series_is_fetched_once(self, make_analyzer, days):
+        first, last = min(days), max(days)
+        analyzer = make_analyzer()
+        history = analyzer.get_sentiment_history('AAPL', first - timedelta(days=2), last)
+
+        assert len(analyzer.session.calls) == 1
+        assert history.loc[first - timedelta(days=2), 'news_volume'] == 0
+        for day, score in days.items():
+            assert history.loc[day, 'news_sentiment'] == pytest.approx(score)
+            assert history.loc[day, 'news_volume'] == 1
+
+        # Finished days never expire, even with no TTL
+        restarted = make_analyzer(cache_ttl=0)
+        pd.testing.assert_frame_equal(restarted.get_sentiment_history('AAPL', first, last), history.loc[first:])
+        assert restarted.session.calls == []
+
+    def test_truncated_responses_are_paged(self, make_analyzer, days, monkeypatch):
+        monkeypatch.setattr(sentiment_analyzer, 'HISTORY_PAGE_SIZE', 4)
+        first, last = min(days), max(days)
+        analyzer = make_analyzer()
+        history = analyzer.get_sentiment_history('AAPL', first, last)
+
+        # Each full page only covers the days after its oldest article
+        assert len(analyzer.session.calls) == 4
+        for day, score in days.items():
+            assert history.loc[day, 'news_sentiment'] == pytest.approx(score)
+            assert history.loc[day, 'news_volume'] == 1
+
+    def test_uncovered_days_are_not_cached(self, make_analyzer, days, monkeypatch):
+        monkeypatch.setattr(sentiment_analyzer, 'HISTORY_PAGE_SIZE', 4)
+        first, last = min(days), max(days)
+        analyzer = make_analyzer(daily_quotas={'alpha_vantage': 1})
+        history = analyzer.get_sentiment_history('AAPL', first, last)
+
+        newest = sorted(days)[-3:]
+        assert (history.loc[newest, 'news_volume'] == 1).all()
+        assert (history.drop(newest)['news_volume'] == 0).all()
+
+        # The days the truncated response could not cover are fetched later
+        restarted = make_analyzer()
+        history = restarted.get_sentiment_history('AAPL', first, last)
+        assert all(call['time_to'] < newest[0].strftime('%Y%m%d') for call in restarted.session.calls)
+        assert (history['news_volume'] == 1).all()
+
+    def test_days_beyond_history_limit_are_neutral(self, make_analyzer):
+        analyzer = make_analyzer(max_history_days=30)
+        history = analyzer.get_sentiment_history('AAPL', '2020-01-01', '2020-01-31')
+
+        assert analyzer.session.calls == []
+        assert (history['news_volume'] == 0).all()
+
+    def test_strategy_features_follow_daily_sentiment(self, make_analyzer, days):
+        strategy = AdaptiveMLStrategy(use_sentiment=True, model_path='unused.pkl')
+        strategy.sentiment_analyzer = make_analyzer()
+        strategy.set_symbol('AAPL')
+
+        index = pd.date_range(min(days), max(days) + timedelta(days=1), freq='D', tz='UTC')
+        bars = pd.DataFrame({'open': 1.0, 'high': 1.0, 'low': 1.0, 'close': 1.0, 'volume': 1.0}, index=index)
+        features = strategy._add_sentiment_features(bars.copy(), 'AAPL')
+
+        # Each bar sees the previous day's sentiment
+        expected = [0.0] + [days[day] for day in sorted(days)]
+        assert features['sentiment_news'].tolist() == pytest.approx(expected)
+        assert features['sentiment_news'].nunique() > 1
@@ -0,0 +1 @@
+"""Backtesting tests package."""
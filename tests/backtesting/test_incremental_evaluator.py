@@ -0,0 +1,113 @@
+"""
+Unit tests for incremental strategy evaluation.
+
+Tests cover:
+- Parity with BacktestEngine metrics on a full run
+- Advancing over new bars only, with results matching a full re-run
+- State serialization
+"""
+
+import json
+import logging
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.backtesting.backtest_engine import BacktestEngine
+from src.backtesting.incremental_evaluator import EvaluationState, IncrementalEvaluator
+from src.strategies.rsi_strategy import RSIStrategy
+from src.strategies.sma_crossover import SMACrossoverStrategy
+
+
+def make_data(n_bars, seed=3):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.015, n_bars)))
+    index = pd.date_range('2015-01-01', periods=n_bars, freq='B')
+    return pd.DataFrame({
+        'open': close,
+        'high': close * 1.01,
+        'low': close * 0.99,
+        'close': close,
+        'volume': rng.integers(1_000, 10_000, n_bars).astype(float)
+    }, index=index)
+
+
+class CountingStrategy(SMACrossoverStrategy):
+    """SMA crossover that records how many bars it was asked to process."""
+
+    def __init__(self):
+        super().__init__(short_window=10, long_window=30)
+        self.bars_seen = []
+
+    def generate_signals(self, data):
+        self.bars_seen.append(len(data))
+        return super().generate_signals(data)
+
+
+@pytest.fixture(autouse=True)
+def quiet():
+    logging.disable(logging.CRITICAL)
+    yield
+    logging.disable(logging.NOTSET)
+
+
+@pytest.mark.parametrize('strategy_factory', [
+    lambda: SMACrossoverStrategy(short_window=10, long_window=30),
+    lambda: RSIStrategy(period=14, oversold=30, overbought=70),
+])
+def test_full_run_matches_backtest_engine(strategy_factory):
+    """A fresh evaluation reports the same metrics as BacktestEngine."""
+    data = make_data(1500)
+    engine = BacktestEngine(strategy_factory(), 'TEST', '2015-01-01', '2021-01-01', initial_capital=10000)
+    expected = engine.run(data)['metrics']
+
+    _, metrics = IncrementalEvaluator(initial_capital=10000).evaluate(strategy_factory(), data)
+
+    assert set(metrics) == set(expected)
+    for key, value in expected.items():
+        assert metrics[key] == pytest.approx(value, rel=1e-9), key
+
+
+def test_new_bars_only_are_simulated():
+    """Advancing matches a full re-run and only touches the new bars."""
+    data = make_data(2000)
+    evaluator = IncrementalEvaluator(initial_capital=10000, warmup_bars=100)
+
+    state, _ = evaluator.evaluate(CountingStrategy(), data.iloc[:1800])
+    assert state.bars == 1800
+
+    strategy = CountingStrategy()
+    state, metrics = evaluator.evaluate(strategy, data, state)
+    assert state.bars == 2000
+    assert strategy.bars_seen == [300]
+    assert state.last_bar == data.index[-1].isoformat()
+
+    _, full = evaluator.evaluate(CountingStrategy(), data)
+    for key, value in full.items():
+        assert metrics[key] == pytest.approx(value, rel=1e-9), key
+
+    # Nothing new: no signals are generated
+    strategy = CountingStrategy()
+    _, again = evaluator.evaluate(strategy, data, state)
+    assert strategy.bars_seen == []
+    assert again == metrics
+
+
+def test_no_trades_gives_empty_metrics():
+    """Like BacktestEngine, a run without trades has no metrics."""
+    data = make_data(20)
+    _, metrics = IncrementalEvaluator().evaluate(SMACrossoverStrategy(short_window=10, long_window=30), data)
+    assert metrics == {}
+
+
+def test_state_round_trips_through_json():
+    """States are stored as JSON between evaluations."""
+    data = make_data(500)
+    evaluator = IncrementalEvaluator()
+    state, metrics = evaluator.evaluate(SMACrossoverStrategy(short_window=10, long_window=30), data)
+
+    restored = EvaluationState.from_dict(json.loads(json.dumps(state.to_dict())))
+
+    assert restored == state
+    assert evaluator.metrics(restored) == metrics
@@ -0,0 +1,137 @@
+"""
+Unit tests for the memory-mapped bar store and intraday backtesting engine.
+
+Tests cover:
+- Partitioned writes, overwrites of corrected bars and range reads
+- Session flattening (no overnight carry) and overnight carry
+- Regular-hours filtering
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+from src.data.bar_store import BarStore
+from src.backtesting.intraday_backtest_engine import IntradayBacktestEngine
+from src.strategies.base_strategy import BaseStrategy
+
+
+class ScriptedStrategy(BaseStrategy):
+    """Strategy that replays a fixed signal series."""
+
+    def __init__(self, signals: pd.Series):
+        super().__init__(name="Scripted")
+        self.scripted = signals
+
+    def calculate_indicators(self, data: pd.DataFrame) -> pd.DataFrame:
+        return data
+
+    def generate_signals(self, data: pd.DataFrame) -> pd.Series:
+        return self.scripted.reindex(data.index).fillna(0)
+
+
+def session_bars(day: str, closes, start='09:30'):
+    """Minute bars for one session starting at ``start`` New York time."""
+    index = pd.date_range(f"{day} {start}", periods=len(closes), freq='min',
+                          tz='America/New_York').tz_convert('UTC')
+    close = np.asarray(closes, dtype=float)
+    return pd.DataFrame({
+        'open': close, 'high': close, 'low': close, 'close': close,
+        'volume': np.full(len(close), 100.0)
+    }, index=index)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return BarStore(str(tmp_path / 'bars'))
+
+
+class TestBarStore:
+    """Test memory-mapped bar storage."""
+
+    def test_write_and_read_across_years(self, store):
+        bars = pd.concat([
+            session_bars('2023-12-29', [1, 2, 3]),
+            session_bars('2024-01-02', [4, 5]),
+        ])
+        store.write('AAPL', bars)
+
+        assert store.years('AAPL') == [2023, 2024]
+        df = store.read('AAPL', '2023-01-01', '2025-01-01')
+        assert df['close'].tolist() == [1, 2, 3, 4, 5]
+        assert store.last_timestamp('AAPL') == bars.index[-1]
+
+    def test_range_read_is_memory_mapped(self, store):
+        store.write('AAPL', session_bars('2024-01-02', [1, 2, 3, 4]))
+        bars = store.read_range('AAPL', '2024-01-02', '2024-01-03')
+        assert isinstance(bars.base, np.memmap) or isinstance(bars, np.memmap)
+
+    def test_rewrite_replaces_corrected_bars(self, store):
+        store.write('AAPL', session_bars('2024-01-02', [1, 2, 3]))
+        store.write('AAPL', session_bars('2024-01-02', [9], start='09:31'))
+
+        df = store.read('AAPL', '2024-01-02', '2024-01-03')
+        assert df['close'].tolist() == [1, 9, 3]
+
+    def test_clear(self, store):
+        store.write('AAPL', session_bars('2024-01-02', [1]))
+        store.clear('AAPL')
+        assert store.years('AAPL') == []
+
+
+class TestIntradayBacktestEngine:
+    """Test intraday simulation."""
+
+    def make_engine(self, store, signals, **kwargs):
+        return IntradayBacktestEngine(
+            strategy=ScriptedStrategy(signals),
+            symbol='AAPL',
+            start_date='2024-01-01',
+            end_date='2024-03-01',
+            initial_capital=1000,
+            commission=0.0,
+            slippage=0.0,
+            store=store,
+            fetch_missing=False,
+            **kwargs
+        )
+
+    def two_sessions(self, store):
+        bars = pd.concat([
+            session_bars('2024-01-31', [10, 10, 11, 12]),
+            session_bars('2024-02-01', [12, 13, 14, 15]),
+        ])
+        store.write('AAPL', bars)
+        signals = pd.Series(0, index=bars.index)
+        signals.iloc[1] = 1
+        return bars, signals
+
+    def test_flatten_at_session_close(self, store):
+        bars, signals = self.two_sessions(store)
+        results = self.make_engine(store, signals).run()
+
+        # Bought 100 @ 10, flattened at 12 on the last bar of the session
+        assert len(results['trades']) == 1
+        trade = results['trades'][0]
+        assert trade['exit_date'] == bars.index[3]
+        assert trade['profit'] == pytest.approx(200)
+        assert results['metrics']['final_value'] == pytest.approx(1200)
+
+    def test_overnight_carry(self, store):
+        bars, signals = self.two_sessions(store)
+        results = self.make_engine(store, signals, flatten_at_close=False).run()
+
+        # Position carried across the month boundary and closed at the end
+        assert len(results['trades']) == 1
+        assert results['trades'][0]['exit_price'] == 15
+        assert results['equity_curve'].iloc[-1] == pytest.approx(1500)
+
+    def test_regular_hours_only(self, store):
+        store.write('AAPL', session_bars('2024-01-31', [50, 60], start='08:00'))
+        store.write('AAPL', session_bars('2024-01-31', [10, 11]))
+        results = self.make_engine(store, pd.Series(dtype=float)).run()
+
+        assert results['metrics'] == {}
+        assert results['equity_curve'].index.min() == session_bars('2024-01-31', [10]).index[0]
+
+    def test_no_data(self, store):
+        assert self.make_engine(store, pd.Series(dtype=float)).run() == {}
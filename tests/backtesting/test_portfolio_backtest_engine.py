@@ -0,0 +1,144 @@
+"""
+Unit tests for the portfolio backtesting engine.
+
+Tests cover:
+- Alignment of symbols with different trading calendars
+- Shared cash and max-position limits
+- RiskManager-style position sizing and per-symbol allocations
+- Combined equity curve and trade records
+"""
+
+import pytest
+import pandas as pd
+import numpy as np
+from src.backtesting.portfolio_backtest_engine import PortfolioBacktestEngine
+from src.strategies.base_strategy import BaseStrategy
+from src.risk.risk_manager import RiskManager
+
+
+class ScriptedStrategy(BaseStrategy):
+    """Strategy that replays a fixed signal series."""
+
+    def __init__(self, signals: pd.Series):
+        super().__init__(name="Scripted")
+        self.scripted = signals
+
+    def calculate_indicators(self, data: pd.DataFrame) -> pd.DataFrame:
+        return data
+
+    def generate_signals(self, data: pd.DataFrame) -> pd.Series:
+        return self.scripted.reindex(data.index).fillna(0)
+
+
+def make_data(prices, start='2024-01-01'):
+    """Build OHLCV frame from a list of closes."""
+    close = np.asarray(prices, dtype=float)
+    index = pd.date_range(start=start, periods=len(close), freq='D')
+    return pd.DataFrame({
+        'open': close,
+        'high': close * 1.01,
+        'low': close * 0.99,
+        'close': close,
+        'volume': np.full(len(close), 1_000_000)
+    }, index=index)
+
+
+def make_engine(strategies, symbols, **kwargs):
+    return PortfolioBacktestEngine(
+        strategies=strategies,
+        symbols=symbols,
+        start_date='2024-01-01',
+        end_date='2024-12-31',
+        commission=0.0,
+        slippage=0.0,
+        **kwargs
+    )
+
+
+class TestPortfolioBacktestEngine:
+    """Test shared-capital portfolio simulation."""
+
+    def test_missing_strategy_raises(self):
+        with pytest.raises(ValueError):
+            PortfolioBacktestEngine(
+                strategies={'AAPL': ScriptedStrategy(pd.Series(dtype=float))},
+                symbols=['AAPL', 'MSFT'],
+                start_date='2024-01-01',
+                end_date='2024-12-31'
+            )
+
+    def test_shared_cash_and_position_sizing(self):
+        data = {s: make_data([100, 100, 110, 110]) for s in ['A', 'B']}
+        index = data['A'].index
+        signals = pd.Series([1, 0, -1, 0], index=index)
+
+        rm = RiskManager(initial_capital=10000, max_position_size=0.2,
+                         max_portfolio_risk=1.0, max_positions=5)
+        engine = make_engine(ScriptedStrategy(signals), ['A', 'B'], risk_manager=rm,
+                             initial_capital=10000)
+        results = engine.run(data=data)
+
+        # Each position sized at 20% of equity -> 20 shares at $100
+        assert results['positions'].iloc[0].tolist() == [20, 20]
+        assert len(results['trades']) == 2
+        assert all(t['profit'] == pytest.approx(200) for t in results['trades'])
+        assert results['equity_curve'].iloc[-1] == pytest.approx(10400)
+
+    def test_max_positions_limit(self):
+        symbols = ['A', 'B', 'C']
+        data = {s: make_data([50, 50, 50]) for s in symbols}
+        signals = pd.Series([1, 0, 0], index=data['A'].index)
+
+        rm = RiskManager(initial_capital=10000, max_position_size=0.1,
+                         max_portfolio_risk=1.0, max_positions=2)
+        engine = make_engine(ScriptedStrategy(signals), symbols, risk_manager=rm,
+                             initial_capital=10000)
+        results = engine.run(data=data)
+
+        assert results['metrics']['max_concurrent_positions'] == 2
+        assert results['positions'].iloc[0]['C'] == 0
+
+    def test_allocations_override_position_size(self):
+        data = {s: make_data([100, 100]) for s in ['A', 'B']}
+        signals = pd.Series([1, 0], index=data['A'].index)
+
+        rm = RiskManager(initial_capital=10000, max_position_size=0.2, max_portfolio_risk=1.0)
+        engine = make_engine(ScriptedStrategy(signals), ['A', 'B'], risk_manager=rm,
+                             initial_capital=10000, allocations={'B': 0.5})
+        results = engine.run(data=data)
+
+        assert results['positions'].iloc[0].tolist() == [20, 50]
+
+    def test_unaligned_calendars(self):
+        data = {
+            'A': make_data([100, 101, 102, 103, 104]),
+            'B': make_data([50, 51, 52], start='2024-01-03'),
+        }
+        strategies = {
+            'A': ScriptedStrategy(pd.Series(0, index=data['A'].index)),
+            'B': ScriptedStrategy(pd.Series([1, 0, -1], index=data['B'].index)),
+        }
+
+        rm = RiskManager(initial_capital=10000, max_portfolio_risk=1.0)
+        engine = make_engine(strategies, ['A', 'B'], risk_manager=rm, initial_capital=10000)
+        results = engine.run(data=data)
+
+        assert len(results['equity_curve']) == 5
+        assert results['trades'][0]['symbol'] == 'B'
+        assert results['trades'][0]['entry_date'] == pd.Timestamp('2024-01-03')
+
+    def test_stop_loss_exit(self):
+        data = {'A': make_data([100, 90, 95])}
+        signals = pd.Series([1, 0, 0], index=data['A'].index)
+
+        rm = RiskManager(initial_capital=10000, stop_loss_pct=0.05, max_portfolio_risk=1.0)
+        engine = make_engine(ScriptedStrategy(signals), ['A'], risk_manager=rm,
+                             initial_capital=10000, use_stop_loss=True)
+        results = engine.run(data=data)
+
+        assert results['trades'][0]['exit_price'] == 90
+        assert results['positions']['A'].iloc[-1] == 0
+
+    def test_no_data_returns_empty(self):
+        engine = make_engine(ScriptedStrategy(pd.Series(dtype=float)), ['A'])
+        assert engine.run(data={'A': pd.DataFrame()}) == {}
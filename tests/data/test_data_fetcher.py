@@ -0,0 +1,60 @@
+"""Tests for intraday bars served through the bar store."""
+
+import pandas as pd
+
+from src.data.data_fetcher import DataFetcher, last_expected_bar
+
+
+def minute_bars(start, end):
+    index = pd.date_range(start, end, freq='1min', tz='UTC', inclusive='left')
+    return pd.DataFrame(
+        {'open': 1.0, 'high': 1.0, 'low': 1.0, 'close': 1.0, 'volume': 100.0},
+        index=index,
+    )
+
+
+class TestIntradayBarStore:
+    """Tests for incremental intraday fetching."""
+
+    def test_partial_end_day_is_refetched(self, tmp_path, monkeypatch):
+        """A store holding part of the end date is not up to date."""
+        fetcher = DataFetcher(data_provider='synthetic', cache_dir=str(tmp_path))
+        calls = []
+        responses = [
+            minute_bars('2024-03-04 14:30', '2024-03-05 15:00'),
+            minute_bars('2024-03-05 15:00', '2024-03-05 21:00'),
+        ]
+
+        def fetch(symbol, start_date, end_date, timeframe):
+            calls.append((start_date, end_date))
+            return responses[len(calls) - 1]
+
+        monkeypatch.setattr(fetcher, '_fetch_alpaca_data', fetch)
+
+        fetcher._fetch_intraday_data('AAPL', '2024-03-04', '2024-03-05', '1Min')
+        bars = fetcher._fetch_intraday_data('AAPL', '2024-03-04', '2024-03-05', '1Min')
+
+        assert calls == [('2024-03-04', '2024-03-06'), ('2024-03-05', '2024-03-06')]
+        assert bars.index[-1] == pd.Timestamp('2024-03-05 20:59', tz='UTC')
+
+    def test_complete_past_range_is_not_refetched(self, tmp_path, monkeypatch):
+        """A second identical call for a completed range is served from the store."""
+        fetcher = DataFetcher(data_provider='synthetic', cache_dir=str(tmp_path))
+        calls = []
+
+        def fetch(symbol, start_date, end_date, timeframe):
+            calls.append((start_date, end_date))
+            return minute_bars('2024-03-04 14:30', '2024-03-05 21:00')
+
+        monkeypatch.setattr(fetcher, '_fetch_alpaca_data', fetch)
+
+        first = fetcher._fetch_intraday_data('AAPL', '2024-03-04', '2024-03-05', '1Min')
+        second = fetcher._fetch_intraday_data('AAPL', '2024-03-04', '2024-03-05', '1Min')
+
+        assert calls == [('2024-03-04', '2024-03-06')]
+        assert second.equals(first)
+
+    def test_last_expected_bar(self):
+        """The closing bar of end_date, or of the Friday before a weekend."""
+        assert last_expected_bar('2024-03-05', '1Min') == pd.Timestamp('2024-03-05 20:59', tz='UTC')
+        assert last_expected_bar('2024-07-14', '1H') == pd.Timestamp('2024-07-12 19:00', tz='UTC')
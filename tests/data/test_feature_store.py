@@ -0,0 +1,132 @@
+"""Tests for the on-disk feature store."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.feature_store import FeatureSet, FeatureStore
+from src.data.synthetic_data import SyntheticMarketData
+from src.strategies.adaptive_ml_strategy import AdaptiveMLStrategy
+from src.strategies.ml_strategy import MLStrategy
+
+
+@pytest.fixture
+def bars():
+    return SyntheticMarketData(seed=3).get_bars('AAPL', '2019-06-01', '2021-06-30')
+
+
+@pytest.fixture
+def store(tmp_path):
+    return FeatureStore(root=str(tmp_path / 'features'))
+
+
+class TestFeatureStore:
+    """Tests for storing and serving feature rows."""
+
+    def test_appends_only_new_rows(self, store, bars):
+        """New bars compute only their own rows, matching a full recomputation."""
+        strategy = MLStrategy()
+        feature_set = strategy.feature_set
+
+        first = store.get('AAPL', feature_set, bars.iloc[:400])
+        assert store.rows_computed == 400
+
+        # The last stored row is recomputed along with the new ones
+        full = store.get('AAPL', feature_set, bars)
+        assert store.rows_computed == len(bars) + 1
+
+        expected = strategy._compute_indicators(bars)[list(feature_set.columns)]
+        pd.testing.assert_frame_equal(full, expected, check_dtype=False)
+        pd.testing.assert_frame_equal(first, expected.iloc[:400], check_dtype=False)
+
+        # Already known rows are served without computing
+        again = store.get('AAPL', feature_set, bars.iloc[100:300])
+        assert store.rows_computed == len(bars) + 1
+        pd.testing.assert_frame_equal(again, expected.iloc[100:300], check_dtype=False)
+
+    def test_forming_last_bar_is_recomputed(self, store, bars):
+        """A last bar stored while still forming is updated on the next call."""
+        strategy = MLStrategy()
+        feature_set = strategy.feature_set
+        forming = bars.copy()
+        forming.iloc[-1, forming.columns.get_loc('close')] *= 1.05
+        store.get('AAPL', feature_set, forming)
+
+        served = store.get('AAPL', feature_set, bars)
+
+        expected = strategy._compute_indicators(bars)[list(feature_set.columns)]
+        pd.testing.assert_frame_equal(served, expected, check_dtype=False)
+        pd.testing.assert_frame_equal(store.read('AAPL', feature_set), expected, check_dtype=False)
+
+    def test_partitions_span_years(self, store, bars):
+        """Rows are read back across year partitions and date ranges."""
+        feature_set = MLStrategy().feature_set
+        store.get('AAPL', feature_set, bars)
+
+        assert store.years('AAPL', feature_set) == [2019, 2020, 2021]
+        window = store.read('AAPL', feature_set, '2019-12-20', '2020-01-10')
+        assert window.index[0] >= pd.Timestamp('2019-12-20', tz='UTC')
+        assert window.index[-1] <= pd.Timestamp('2020-01-10', tz='UTC')
+        assert store.last_timestamp('AAPL', feature_set) == bars.index[-1]
+
+    def test_earlier_history_is_recomputed(self, store, bars):
+        """Bars reaching back before the stored rows are computed in full."""
+        feature_set = MLStrategy().feature_set
+        store.get('AAPL', feature_set, bars.iloc[200:])
+        computed = store.rows_computed
+
+        result = store.get('AAPL', feature_set, bars)
+
+        assert store.rows_computed == computed + len(bars)
+        assert len(store.read('AAPL', feature_set)) == len(bars)
+        assert result.index.equals(bars.index)
+
+    def test_versions_and_symbols_are_separate(self, store, bars):
+        """Feature set versions and symbols do not share rows."""
+        columns = ('double',)
+        v1 = FeatureSet('toy', 1, columns, lambda df: pd.DataFrame({'double': df['close'] * 2}))
+        v2 = FeatureSet('toy', 2, columns, lambda df: pd.DataFrame({'double': df['close'] * 3}))
+
+        store.get('AAPL', v1, bars.iloc[:50])
+        store.get('MSFT', v1, bars.iloc[:10])
+        served = store.get('AAPL', v2, bars.iloc[:50])
+
+        np.testing.assert_allclose(served['double'], bars['close'].iloc[:50] * 3)
+        assert len(store.read('MSFT', v1)) == 10
+
+        store.clear('AAPL')
+        assert store.last_timestamp('AAPL', v1) is None
+        assert store.last_timestamp('MSFT', v1) is not None
+
+
+class TestStrategyIntegration:
+    """Tests for strategies serving features from the store."""
+
+    def test_ml_strategy_signals_match_without_store(self, store, bars):
+        plain = MLStrategy().generate_signals(bars)
+
+        strategy = MLStrategy(feature_store=store)
+        strategy.set_symbol('AAPL')
+        strategy.generate_signals(bars.iloc[:300])
+        cached = strategy.generate_signals(bars)
+
+        pd.testing.assert_series_equal(cached, plain, check_dtype=False)
+
+    def test_adaptive_ml_features_are_reused_between_train_and_predict(self, store, bars, tmp_path):
+        strategy = AdaptiveMLStrategy(
+            use_sentiment=False,
+            model_path=str(tmp_path / 'model.pkl'),
+            feature_store=store,
+        )
+        strategy.set_symbol('AAPL')
+
+        strategy.train_model(bars)
+        computed = store.rows_computed
+        strategy.generate_signals(bars)
+
+        # Only the last row is recomputed for prediction
+        assert computed == len(bars)
+        assert store.rows_computed == computed + 1
+        expected = strategy._technical_features(bars)
+        features = strategy.calculate_features(bars)
+        pd.testing.assert_frame_equal(features[expected.columns], expected, check_dtype=False)
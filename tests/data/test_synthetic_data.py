@@ -0,0 +1,141 @@
+"""Tests for the synthetic market data generator."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.data_fetcher import DataFetcher
+from src.data.synthetic_data import SyntheticMarketData
+
+
+@pytest.fixture
+def generator():
+    return SyntheticMarketData(seed=7)
+
+
+class TestDailyBars:
+    """Tests for daily bar generation."""
+
+    def test_ohlc_consistency(self, generator):
+        """High/low bound open and close, volume is positive."""
+        df = generator.get_bars('AAPL', '2015-01-01', '2020-12-31')
+
+        assert list(df.columns) == ['open', 'high', 'low', 'close', 'volume']
+        assert (df['high'] >= df[['open', 'close']].max(axis=1)).all()
+        assert (df['low'] <= df[['open', 'close']].min(axis=1)).all()
+        assert (df['volume'] > 0).all()
+        assert str(df.index.tz) == 'UTC'
+        assert (df.index.dayofweek < 5).all()
+
+    def test_deterministic_across_ranges(self, generator):
+        """Overlapping requests return identical bars."""
+        a = generator.get_bars('MSFT', '2018-01-01', '2019-12-31', adjustment='raw')
+        b = generator.get_bars('MSFT', '2019-06-01', '2022-12-31', adjustment='raw')
+        overlap = a.index.intersection(b.index)
+
+        assert len(overlap) > 100
+        pd.testing.assert_frame_equal(a.loc[overlap], b.loc[overlap])
+
+    def test_same_path_regardless_of_other_symbols(self, generator):
+        """A symbol's path does not depend on the batch it is generated in."""
+        alone = generator.get_bars('SPY', '2020-01-01', '2020-12-31')
+        batch = generator.generate(['QQQ', 'SPY', 'IWM'], '2020-01-01', '2020-12-31')
+        pd.testing.assert_frame_equal(alone, batch['SPY'])
+
+    def test_correlation(self):
+        """Daily returns are correlated at roughly the configured level."""
+        generator = SyntheticMarketData(correlation=0.6, gap_probability=0)
+        data = generator.generate(['A', 'B', 'C'], '2000-01-01', '2019-12-31')
+        returns = pd.DataFrame({s: np.log(df['close']).diff() for s, df in data.items()})
+        corr = returns.corr().to_numpy()[np.triu_indices(3, 1)]
+
+        assert np.all(np.abs(corr - 0.6) < 0.08)
+
+    def test_regime_model(self):
+        """The regime model visits more than one regime over decades."""
+        generator = SyntheticMarketData(model='regime')
+        regimes = generator.regimes('1990-01-01', '2020-12-31')
+        assert set(regimes.unique()) >= {'bull', 'bear'}
+
+    def test_invalid_model(self):
+        """Unknown models are rejected."""
+        with pytest.raises(ValueError):
+            SyntheticMarketData(model='random')
+
+
+class TestSplitsAndGaps:
+    """Tests for splits and overnight gaps."""
+
+    def _split_symbol(self, generator):
+        for i in range(200):
+            symbol = f"S{i}"
+            splits = generator.get_splits(symbol, '1990-01-01', '2020-12-31')
+            if splits:
+                return symbol, splits[0]
+        pytest.fail("No split generated")
+
+    def test_split_raw_and_adjusted(self, generator):
+        """Raw prices drop by the split ratio; adjusted prices stay continuous."""
+        symbol, split = self._split_symbol(generator)
+        raw = generator.get_bars(symbol, '1990-01-01', '2020-12-31', adjustment='raw')
+        adjusted = generator.get_bars(symbol, '1990-01-01', '2020-12-31')
+
+        i = raw.index.get_loc(split['date'])
+        raw_jump = raw['open'].iloc[i] / raw['close'].iloc[i - 1]
+        adjusted_jump = adjusted['open'].iloc[i] / adjusted['close'].iloc[i - 1]
+
+        assert raw_jump == pytest.approx(adjusted_jump / split['ratio'])
+        assert raw['close'].max() <= generator.split_threshold * 1.5
+
+    def test_gaps(self):
+        """Gaps make some opens differ sharply from the previous close."""
+        generator = SyntheticMarketData(gap_probability=0.1, gap_size=0.05)
+        df = generator.get_bars('GAP', '2015-01-01', '2020-12-31')
+        overnight = np.log(df['open'] / df['close'].shift()).dropna()
+        assert (overnight.abs() > 0.05).sum() > 10
+
+
+class TestIntradayBars:
+    """Tests for intraday bar generation."""
+
+    def test_session_bars(self, generator):
+        """Minute bars cover the regular session and match the daily move."""
+        bars = generator.get_bars('SPY', '2024-03-04', '2024-03-04', timeframe='1Min')
+        daily = generator.get_bars('SPY', '2024-03-04', '2024-03-04')
+
+        local = bars.index.tz_convert('America/New_York')
+        assert len(bars) == 390
+        assert local[0].strftime('%H:%M') == '09:30'
+        assert local[-1].strftime('%H:%M') == '15:59'
+        assert bars['open'].iloc[0] == pytest.approx(daily['open'].iloc[0])
+        assert bars['close'].iloc[-1] == pytest.approx(daily['close'].iloc[0])
+        assert (bars['high'] >= bars[['open', 'close']].max(axis=1)).all()
+
+    def test_intraday_deterministic_across_ranges(self, generator):
+        """Overlapping intraday requests agree."""
+        a = generator.get_bars('SPY', '2024-03-01', '2024-03-05', timeframe='5Min')
+        b = generator.get_bars('SPY', '2024-03-04', '2024-03-08', timeframe='5Min')
+        overlap = a.index.intersection(b.index)
+
+        assert len(overlap) == 2 * 78
+        np.testing.assert_allclose(a.loc[overlap, 'close'], b.loc[overlap, 'close'])
+
+
+class TestDataFetcherProvider:
+    """Tests for the synthetic DataFetcher provider."""
+
+    def test_fetch_historical_data(self, tmp_path):
+        """DataFetcher serves generated bars without network access."""
+        fetcher = DataFetcher(data_provider='synthetic', cache_dir=str(tmp_path))
+        df = fetcher.fetch_historical_data('AAPL', '2020-01-01', '2020-12-31')
+
+        assert len(df) == 262
+        pd.testing.assert_frame_equal(
+            df, fetcher.synthetic.get_bars('AAPL', '2020-01-01', '2020-12-31')
+        )
+
+    def test_fetch_multiple_symbols(self, tmp_path):
+        """Multiple symbols come back keyed by symbol."""
+        fetcher = DataFetcher(data_provider='synthetic', cache_dir=str(tmp_path))
+        data = fetcher.fetch_multiple_symbols(['A', 'B'], '2021-01-01', '2021-03-31')
+        assert set(data) == {'A', 'B'}
@@ -0,0 +1,82 @@
+"""Tests for batched cross-symbol ML inference."""
+
+import pandas as pd
+import pytest
+
+from src.data.synthetic_data import SyntheticMarketData
+from src.strategies.adaptive_ml_strategy import AdaptiveMLStrategy
+from src.strategies.batch_inference import BatchInference
+from src.strategies.model_registry import ModelRegistry
+
+
+SYMBOLS = ['AAPL', 'MSFT', 'NVDA', 'AMZN', 'META']
+
+
+@pytest.fixture
+def market():
+    data = SyntheticMarketData(seed=21)
+    return {symbol: data.get_bars(symbol, '2020-01-01', '2021-12-31') for symbol in SYMBOLS}
+
+
+@pytest.fixture
+def strategy(tmp_path, market):
+    strategy = AdaptiveMLStrategy(
+        use_sentiment=False,
+        confidence_threshold=0.0,
+        model_registry=ModelRegistry(root=str(tmp_path / 'registry')),
+    )
+    strategy.train_model(market['AAPL'])
+    return strategy
+
+
+class TestTailFeatures:
+    """Tests for tail-only feature computation."""
+
+    def test_tail_matches_full_history(self, strategy, market):
+        bars = market['MSFT']
+        full = strategy.calculate_features(bars)
+        tail = strategy.calculate_features(bars, tail=10)
+
+        assert tail.index.equals(full.index[-10:])
+        columns = strategy._feature_columns(full)
+        pd.testing.assert_frame_equal(tail[columns], full[columns].iloc[-10:], rtol=1e-6)
+
+
+class TestBatchInference:
+    """Tests for batching the latest-bar predictions."""
+
+    def test_one_model_call_matches_per_symbol_signals(self, strategy, market):
+        expected = {symbol: int(strategy.generate_signals(bars).iloc[-1]) for symbol, bars in market.items()}
+
+        batch = BatchInference()
+        signals = batch.latest_signals({symbol: (strategy, bars) for symbol, bars in market.items()})
+
+        assert signals == expected
+        assert batch.model_calls == 1
+
+    def test_symbols_are_grouped_by_model(self, strategy, market, tmp_path):
+        other = AdaptiveMLStrategy(
+            use_sentiment=False,
+            model_registry=ModelRegistry(root=str(tmp_path / 'other')),
+        )
+        other.train_model(market['NVDA'])
+
+        batch = BatchInference()
+        jobs = {symbol: (strategy if i % 2 else other, bars) for i, (symbol, bars) in enumerate(market.items())}
+        signals = batch.latest_signals(jobs)
+
+        assert set(signals) == set(SYMBOLS)
+        assert batch.model_calls == 2
+        for symbol, (owner, bars) in jobs.items():
+            assert signals[symbol] == int(owner.generate_signals(bars).iloc[-1])
+
+    def test_untrained_strategies_fall_back_to_generate_signals(self, market, tmp_path):
+        untrained = AdaptiveMLStrategy(
+            use_sentiment=False,
+            model_registry=ModelRegistry(root=str(tmp_path / 'registry')),
+        )
+        batch = BatchInference()
+        signals = batch.latest_signals({'AAPL': (untrained, market['AAPL'].iloc[:50])})
+
+        assert signals == {'AAPL': 0}
+        assert batch.model_calls == 0
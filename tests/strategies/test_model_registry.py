@@ -0,0 +1,125 @@
+"""Tests for the ML model registry."""
+
+import threading
+
+import numpy as np
+import pytest
+
+from src.data.synthetic_data import SyntheticMarketData
+from src.strategies.adaptive_ml_strategy import AdaptiveMLStrategy
+from src.strategies.model_registry import ModelKey, ModelRegistry, training_window_hash
+
+
+@pytest.fixture
+def bars():
+    return SyntheticMarketData(seed=5).get_bars('AAPL', '2020-01-01', '2021-12-31')
+
+
+@pytest.fixture
+def registry(tmp_path):
+    return ModelRegistry(root=str(tmp_path / 'registry'))
+
+
+def make_strategy(registry):
+    strategy = AdaptiveMLStrategy(use_sentiment=False, model_registry=registry)
+    strategy.set_symbol('AAPL')
+    return strategy
+
+
+class TestModelRegistry:
+    """Tests for storing and loading models."""
+
+    def test_window_hash_tracks_data_and_params(self, bars):
+        assert training_window_hash(bars) == training_window_hash(bars.copy())
+        assert training_window_hash(bars) != training_window_hash(bars.iloc[1:])
+        assert training_window_hash(bars) != training_window_hash(bars, {'test_size': 0.3})
+
+    def test_models_load_once_per_process(self, registry, tmp_path):
+        from sklearn.ensemble import RandomForestClassifier
+
+        rng = np.random.default_rng(0)
+        X, y = rng.normal(size=(200, 4)), rng.integers(0, 2, 200)
+        model = RandomForestClassifier(n_estimators=10, random_state=0).fit(X, y)
+        key = ModelKey('AAPL', 'toy-v1', 'abc')
+        registry.save(key, model, metadata={'samples': 200})
+
+        fresh = ModelRegistry(root=registry.root)
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(fresh.get(key))) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert fresh.loads == 1
+        assert all(result is results[0] for result in results)
+        np.testing.assert_array_equal(results[0].model.predict_proba(X), model.predict_proba(X))
+        assert results[0].metadata['samples'] == 200
+        assert fresh.get(ModelKey('AAPL', 'toy-v1', 'missing')) is None
+
+    def test_latest_version(self, registry):
+        registry.save(ModelKey('AAPL', 'toy-v1', 'old'), 'old-model')
+        registry.save(ModelKey('AAPL', 'toy-v1', 'new'), 'new-model')
+
+        assert [v['window_hash'] for v in registry.versions('AAPL', 'toy-v1')] == ['old', 'new']
+        assert registry.latest('AAPL', 'toy-v1').model == 'new-model'
+
+        registry.delete(ModelKey('AAPL', 'toy-v1', 'new'))
+        assert registry.latest('AAPL', 'toy-v1').model == 'old-model'
+
+    def test_promote_switches_active_model(self, registry):
+        old, new = ModelKey('AAPL', 'toy-v1', 'old'), ModelKey('AAPL', 'toy-v1', 'new')
+        registry.save(old, 'old-model')
+        registry.save(new, 'new-model')
+        assert registry.active('AAPL', 'toy-v1') is None
+
+        registry.promote(old)
+        # Another process sees the promotion through the pointer file
+        reader = ModelRegistry(root=registry.root)
+        assert reader.active('AAPL', 'toy-v1').model == 'old-model'
+
+        registry.promote(new)
+        assert reader.active_key('AAPL', 'toy-v1') == new
+        assert 'active.json' not in [v['window_hash'] for v in registry.versions('AAPL', 'toy-v1')]
+        with pytest.raises(ValueError):
+            registry.promote(ModelKey('AAPL', 'toy-v1', 'missing'))
+
+
+class TestAdaptiveMLRegistry:
+    """Tests for strategies sharing registry models."""
+
+    def test_instances_share_a_trained_model(self, registry, bars):
+        first = make_strategy(registry)
+        signals = first.generate_signals(bars)
+
+        second = make_strategy(registry)
+        assert not second.is_trained
+        assert (second.generate_signals(bars) == signals).all()
+        assert second.model is first.model
+        assert second.model_key == first.model_key
+
+        # Another process (a fresh registry on the same directory) loads it from disk
+        other_process = make_strategy(ModelRegistry(root=registry.root))
+        other_process.train_model(bars)
+        assert other_process.model_registry.loads == 1
+        assert (other_process.generate_signals(bars) == signals).all()
+
+    def test_different_windows_train_separate_models(self, registry, bars):
+        first = make_strategy(registry)
+        first.train_model(bars)
+        second = make_strategy(registry)
+        second.train_model(bars.iloc[:-20])
+
+        assert second.model is not first.model
+        versions = registry.versions('AAPL', first.model_key.feature_version)
+        assert len(versions) == 2
+        assert versions[0]['feature_columns'][0] == 'returns'
+
+    def test_model_path_keeps_single_file_persistence(self, tmp_path, bars):
+        path = tmp_path / 'model.pkl'
+        strategy = AdaptiveMLStrategy(use_sentiment=False, model_path=str(path))
+        strategy.train_model(bars)
+
+        assert strategy.model_registry is None
+        assert path.exists()
+        assert AdaptiveMLStrategy(use_sentiment=False, model_path=str(path)).is_trained
@@ -0,0 +1,52 @@
+"""Tests for the lazy strategy registry."""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from src.strategies import registry
+from src.strategies.base_strategy import BaseStrategy
+from src.strategies.rsi_strategy import RSIStrategy
+
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class TestLookup:
+    """Tests for type name lookup."""
+
+    def test_names_are_normalized(self):
+        """Case and underscores do not matter."""
+        assert registry.get_strategy_class('rsi') is RSIStrategy
+        assert registry.get_strategy_class('SMA_CROSSOVER') is registry.get_strategy_class('smacrossover')
+
+    def test_unknown_type_raises(self):
+        """Unregistered types raise ValueError listing the supported ones."""
+        with pytest.raises(ValueError, match='sma_crossover'):
+            registry.get_strategy_class('does_not_exist')
+
+    def test_create_strategy_passes_params(self):
+        """create_strategy builds an instance with the given parameters."""
+        strategy = registry.create_strategy('rsi', period=7, oversold=20, overbought=80)
+        assert isinstance(strategy, RSIStrategy)
+        assert strategy.period == 7
+
+    def test_every_registered_class_is_a_strategy(self):
+        """Every entry resolves to a BaseStrategy subclass."""
+        for name in registry.available_strategies():
+            assert issubclass(registry.get_strategy_class(name), BaseStrategy)
+
+
+def test_imports_do_not_load_heavy_dependencies():
+    """The registry and data fetcher defer yfinance, streamlit, alpaca and sklearn."""
+    code = (
+        "import sys\n"
+        "import src.strategies.registry, src.data.data_fetcher\n"
+        "heavy = ('yfinance', 'streamlit', 'alpaca', 'sklearn')\n"
+        "print(sorted(m for m in sys.modules if m.split('.')[0] in heavy))\n"
+    )
+    result = subprocess.run([sys.executable, '-c', code], cwd=REPO_ROOT,
+                            capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == '[]'
@@ -0,0 +1,115 @@
+"""Tests for out-of-band model retraining."""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pytest
+
+from src.data.feature_store import FeatureStore
+from src.data.synthetic_data import SyntheticMarketData
+from src.strategies.adaptive_ml_strategy import AdaptiveMLStrategy
+from src.strategies.model_registry import ModelRegistry
+from src.strategies.retraining import ModelRetrainer, retrain_symbol
+
+
+@pytest.fixture
+def bars():
+    return SyntheticMarketData(seed=11).get_bars('AAPL', '2020-01-01', '2021-12-31')
+
+
+@pytest.fixture
+def registry_root(tmp_path):
+    return str(tmp_path / 'registry')
+
+
+def live_strategy(retrainer, symbol='AAPL'):
+    strategy = AdaptiveMLStrategy(use_sentiment=False, retrainer=retrainer)
+    strategy.set_symbol(symbol)
+    return strategy
+
+
+class TestRetrainSymbol:
+    """Tests for a single retraining job."""
+
+    def test_promotes_only_validated_models(self, registry_root, bars):
+        first = retrain_symbol(registry_root, 'AAPL', bars.iloc[:-60])
+        assert first.error is None
+        assert first.promoted and first.baseline_score is None
+        assert 0.0 <= first.holdout_score <= 1.0
+
+        # A candidate that must beat the active model by more than is possible
+        second = retrain_symbol(registry_root, 'AAPL', bars, min_improvement=1.1)
+        assert second.baseline_score is not None
+        assert not second.promoted
+
+        registry = ModelRegistry(root=registry_root)
+        active = registry.active_key('AAPL', 'adaptive_ml-v1')
+        assert active.window_hash == first.window_hash
+        assert len(registry.versions('AAPL', 'adaptive_ml-v1')) == 2
+
+    def test_features_are_read_from_the_shared_store(self, registry_root, bars, tmp_path):
+        root = str(tmp_path / 'features')
+        result = retrain_symbol(registry_root, 'AAPL', bars, feature_store_root=root)
+        assert result.promoted
+
+        store = FeatureStore(root)
+        feature_set = AdaptiveMLStrategy(use_sentiment=False, model_path='unused.pkl').feature_set
+        assert store.last_timestamp('AAPL', feature_set) == bars.index[-1]
+
+    def test_errors_are_reported(self, registry_root, bars):
+        result = retrain_symbol(registry_root, 'AAPL', bars.iloc[:50])
+        assert not result.promoted
+        assert 'Insufficient data' in result.error
+
+
+class TestModelRetrainer:
+    """Tests for the retraining service and inference-only strategies."""
+
+    def test_retrains_symbols_in_worker_processes(self, registry_root, bars):
+        msft = SyntheticMarketData(seed=12).get_bars('MSFT', '2020-01-01', '2021-12-31')
+        retrainer = ModelRetrainer(registry_root=registry_root, max_workers=2)
+        try:
+            results = retrainer.retrain({'AAPL': bars, 'MSFT': msft})
+        finally:
+            retrainer.stop()
+
+        assert all(result.promoted for result in results.values())
+        assert set(retrainer.results) == {'AAPL', 'MSFT'}
+
+        strategy = live_strategy(retrainer, 'MSFT')
+        signals = strategy.generate_signals(msft)
+        assert strategy.model_key.window_hash == results['MSFT'].window_hash
+        assert len(signals) == len(msft)
+
+    def test_strategy_never_trains_in_signal_path(self, registry_root, bars):
+        retrainer = ModelRetrainer(registry_root=registry_root, executor=ThreadPoolExecutor(1))
+        strategy = live_strategy(retrainer)
+
+        signals = strategy.generate_signals(bars)
+        assert (signals == 0).all()
+        assert not strategy.is_trained
+
+        retrainer.submit('AAPL', bars).result()
+        strategy.generate_signals(bars)
+        first_key = strategy.model_key
+        assert first_key is not None
+
+        # Trade results queue a retrain instead of training inline
+        newer = pd.concat([bars, SyntheticMarketData(seed=11).get_bars('AAPL', '2022-01-01', '2022-03-31')])
+        strategy.trades_since_retrain = strategy.retrain_interval
+        future = retrainer.maybe_retrain(strategy, newer)
+        assert strategy.trades_since_retrain == 0
+        assert strategy.model_key == first_key
+
+        if future.result().promoted:
+            strategy.generate_signals(newer)
+            assert strategy.model_key != first_key
+        retrainer.stop()
+
+    def test_submissions_for_a_symbol_are_coalesced(self, registry_root, bars):
+        retrainer = ModelRetrainer(registry_root=registry_root, executor=ThreadPoolExecutor(1))
+        first = retrainer.submit('AAPL', bars)
+        assert retrainer.submit('AAPL', bars) is first
+        first.result()
+        assert retrainer.submit('AAPL', bars) is not first
+        retrainer.stop()
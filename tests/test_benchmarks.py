@@ -0,0 +1,138 @@
+"""Tests for the benchmark harness."""
+
+import pytest
+
+from benchmarks.harness import (
+    Benchmark,
+    BenchmarkResult,
+    compare,
+    load_baseline,
+    measure,
+    save_baseline,
+    synthetic_ohlcv,
+)
+from benchmarks.importtime import parse_importtime, summarize
+from benchmarks import run_benchmarks
+
+
+def _result(name, bars, seconds):
+    return BenchmarkResult(name=name, bars=bars, seconds=seconds, peak_mb=1.0, repeats=1)
+
+
+class TestSyntheticData:
+    """Tests for the synthetic OHLCV generator."""
+
+    def test_deterministic(self):
+        """Same seed gives identical bars."""
+        a = synthetic_ohlcv(500, seed=7)
+        b = synthetic_ohlcv(500, seed=7)
+        assert a.equals(b)
+
+    def test_consistent_ohlc(self):
+        """High/low bound open and close."""
+        data = synthetic_ohlcv(2000)
+        assert (data['high'] >= data[['open', 'close']].max(axis=1)).all()
+        assert (data['low'] <= data[['open', 'close']].min(axis=1)).all()
+        assert data.index.is_monotonic_increasing
+
+
+class TestBaseline:
+    """Tests for baseline storage and regression detection."""
+
+    def test_round_trip_and_merge(self, tmp_path):
+        """Saving merges with stored results by default."""
+        path = str(tmp_path / 'baseline.json')
+        save_baseline(path, [_result('a', 1000, 0.5), _result('b', 1000, 0.2)])
+        save_baseline(path, [_result('a', 1000, 0.4)])
+
+        stored = load_baseline(path)
+        assert stored['a@1000']['seconds'] == pytest.approx(0.4)
+        assert stored['b@1000']['seconds'] == pytest.approx(0.2)
+
+    def test_missing_baseline_is_empty(self, tmp_path):
+        """A missing baseline file loads as empty."""
+        assert load_baseline(str(tmp_path / 'missing.json')) == {}
+
+    def test_compare_flags_slowdowns_above_threshold(self):
+        """Only cases slower than the threshold are regressions."""
+        baseline = {
+            'fast@1000': {'seconds': 1.0},
+            'slow@1000': {'seconds': 1.0},
+            'tiny@1000': {'seconds': 0.0001},
+        }
+        results = [
+            _result('fast', 1000, 1.2),
+            _result('slow', 1000, 1.5),
+            _result('tiny', 1000, 0.01),
+            _result('new', 1000, 9.0),
+        ]
+
+        regressions = compare(results, baseline, threshold=0.25)
+
+        assert [r.key for r in regressions] == ['slow@1000']
+        assert regressions[0].ratio == pytest.approx(1.5)
+
+    def test_measure_records_time_and_memory(self):
+        """measure keeps the best timing and a peak memory reading."""
+        case = Benchmark(
+            name='alloc',
+            group='test',
+            setup=lambda n: (lambda: bytearray(n))
+        )
+
+        result = measure(case, 1_000_000, repeats=2)
+
+        assert result.key == 'alloc@1000000'
+        assert len(result.timings) == 2
+        assert result.seconds == min(result.timings)
+        assert result.peak_mb >= 0.9
+
+
+class TestRunner:
+    """Tests for the runner's exit code."""
+
+    def test_failed_case_exits_non_zero(self, tmp_path, monkeypatch):
+        """A case that raises fails the run, with or without a baseline."""
+        def broken(n):
+            raise RuntimeError('boom')
+
+        monkeypatch.setattr(run_benchmarks, 'build_cases', lambda: [
+            Benchmark(name='ok', group='test', setup=lambda n: (lambda: None)),
+            Benchmark(name='broken', group='test', setup=broken),
+        ])
+        path = str(tmp_path / 'baseline.json')
+        argv = ['--sizes', '10', '--repeats', '1', '--baseline', path]
+
+        assert run_benchmarks.main(argv + ['--save']) == 1
+        assert list(load_baseline(path)) == ['ok@10']
+        assert run_benchmarks.main(argv) == 1
+
+        monkeypatch.setattr(run_benchmarks, 'build_cases', lambda: [
+            Benchmark(name='ok', group='test', setup=lambda n: (lambda: None)),
+        ])
+        assert run_benchmarks.main(argv) == 0
+
+
+class TestImportTime:
+    """Tests for the startup import report."""
+
+    def test_parse_and_summarize(self):
+        """Nested imports are charged to their own package by self time."""
+        stderr = (
+            "import time: self [us] | cumulative | imported package\n"
+            "import time:       100 |        100 |   _io\n"
+            "import time:       200 |        200 |     numpy.core\n"
+            "import time:       300 |        500 |   numpy\n"
+            "import time:      1000 |       1500 | pandas\n"
+            "Traceback (most recent call last):\n"
+            "import time:        50 |         50 | pandas.io\n"
+        )
+
+        records = parse_importtime(stderr)
+        total, packages = summarize(records, top=2)
+
+        assert [(r.module, r.depth) for r in records] == [
+            ('_io', 1), ('numpy.core', 2), ('numpy', 1), ('pandas', 0), ('pandas.io', 0)
+        ]
+        assert total == pytest.approx(0.00155)
+        assert packages == [('pandas', pytest.approx(0.00105)), ('numpy', pytest.approx(0.0005))]
@@ -0,0 +1 @@
+"""Trading tests package."""
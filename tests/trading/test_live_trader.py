@@ -0,0 +1,113 @@
+"""Tests for strategy evaluation in the daemon's live trader."""
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.feature_store import FeatureStore
+from src.strategies.adaptive_ml_strategy import AdaptiveMLStrategy
+from src.strategies.ml_strategy import MLStrategy
+from src.strategies.retraining import ModelRetrainer
+from src.strategies.rsi_strategy import RSIStrategy
+from src.strategies.sma_crossover import SMACrossoverStrategy
+from src.trading.live_trader import LiveTrader
+
+
+class FakeFetcher:
+    """Serves bars from a fixed frame and records the requested ranges."""
+
+    def __init__(self, data):
+        self.data = data
+        self.requests = []
+
+    def fetch_historical_data(self, symbol, start_date, end_date, timeframe='1D', use_cache=True):
+        self.requests.append(start_date)
+        return self.data.loc[start_date:end_date]
+
+
+def make_data(n_bars, seed=5):
+    rng = np.random.default_rng(seed)
+    close = 100 * np.exp(np.cumsum(rng.normal(0.0003, 0.015, n_bars)))
+    index = pd.bdate_range(end=datetime.now().date(), periods=n_bars)
+    return pd.DataFrame({
+        'open': close, 'high': close * 1.01, 'low': close * 0.99,
+        'close': close, 'volume': np.full(n_bars, 1e4)
+    }, index=index)
+
+
+@pytest.fixture
+def trader():
+    logging.disable(logging.CRITICAL)
+    with patch('src.trading.live_trader.TradingClient'):
+        trader = LiveTrader(
+            strategies={'SMA Crossover': SMACrossoverStrategy(), 'RSI': RSIStrategy()},
+            symbols=['AAPL'],
+            initial_capital=10000
+        )
+    yield trader
+    logging.disable(logging.NOTSET)
+
+
+def test_incremental_evaluation_matches_full_backtests(trader):
+    """Resumed evaluations rank and score like full backtests."""
+    data = make_data(3000)
+    trader.data_fetcher = FakeFetcher(data.iloc[:-20])
+    states = {}
+    trader.evaluate_strategies(evaluation_states=states)
+    assert set(states['AAPL']) == {'SMA Crossover', 'RSI'}
+
+    trader.data_fetcher = FakeFetcher(data)
+    incremental = trader.evaluate_strategies(evaluation_states=states)['AAPL']
+    # Only recent history is fetched once states exist
+    assert pd.Timestamp(trader.data_fetcher.requests[0]) > data.index[1000]
+
+    full = trader.evaluate_strategies()['AAPL']
+    assert incremental['best_strategy'] == full['best_strategy']
+    for name, result in full['all_results'].items():
+        assert incremental['all_results'][name]['score'] == pytest.approx(result['score'], rel=1e-6)
+
+
+def test_live_adaptive_ml_strategies_only_run_inference(trader, tmp_path):
+    """With a retrainer, live signals never train a model in the trading loop."""
+    retrainer = ModelRetrainer(registry_root=str(tmp_path / 'registry'), executor=ThreadPoolExecutor(1))
+    trader.retrainer = retrainer
+    data = make_data(600)
+    trader.data_fetcher = FakeFetcher(data)
+    strategy = trader.create_live_strategy(AdaptiveMLStrategy)
+    trader.best_strategies['AAPL'] = strategy
+    assert strategy.retrainer is retrainer and not strategy.use_sentiment
+
+    with patch.object(strategy, 'train_model', side_effect=AssertionError("trained in the signal path")):
+        assert trader.get_current_signals() == {'AAPL': 0}
+        # The queued job only had the recent bars; retrain on the full history
+        retrainer.submit('AAPL', data).result()
+        assert retrainer.submit('AAPL', data).result().promoted
+        retrainer.stop()
+
+        signals = trader.get_current_signals()
+    assert strategy.is_trained
+    assert signals['AAPL'] in (-1, 0, 1)
+
+
+def test_ml_strategies_share_the_feature_store(trader, tmp_path):
+    """Backtests fill the store that live strategies then read."""
+    store = FeatureStore(str(tmp_path / 'features'))
+    trader.feature_store = store
+    trader.strategy_templates = {'ML Strategy': MLStrategy()}
+    data = make_data(400)
+    trader.data_fetcher = FakeFetcher(data)
+
+    trader.evaluate_strategies()
+    assert store.rows_computed == len(data)
+
+    strategy = trader.create_live_strategy(MLStrategy, 'AAPL')
+    assert strategy.feature_store is store and strategy.current_symbol == 'AAPL'
+    trader.best_strategies['AAPL'] = strategy
+    assert 'AAPL' in trader.get_current_signals()
+    # Only the last stored row is recomputed
+    assert store.rows_computed == len(data) + 1
@@ -0,0 +1,157 @@
+"""Tests for the pooled, WAL-mode state manager."""
+
+import sqlite3
+import threading
+
+import pandas as pd
+import pytest
+
+from src.trading.state_manager import StateManager, get_state_manager
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / 'state.db')
+
+
+@pytest.fixture
+def manager(db_path):
+    manager = StateManager(db_path)
+    yield manager
+    manager.close()
+
+
+def test_database_uses_wal(manager, db_path):
+    """The database is switched to WAL so readers do not block on writers."""
+    with sqlite3.connect(db_path) as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+
+
+class TestCachedReads:
+    """Tests for the read-through cache."""
+
+    def test_own_writes_are_visible(self, manager):
+        """Writes through the manager replace cached values."""
+        assert manager.get_trading_config() is None
+        assert manager.is_trading_active() is False
+
+        manager.save_trading_config(['AAPL'], True, 10000.0, 0.02, 5, 60)
+        manager.set_trading_active(True)
+        manager.save_best_strategy('AAPL', 'RSI', 1.2, 'sharpe_ratio')
+
+        assert manager.get_trading_config()['tickers'] == ['AAPL']
+        assert manager.is_trading_active() is True
+        assert manager.get_best_strategy('AAPL')['strategy_name'] == 'RSI'
+
+        manager.clear_evaluations('AAPL')
+        assert manager.get_best_strategy('AAPL') is None
+
+    def test_hits_do_not_query_and_return_copies(self, manager, monkeypatch):
+        """Repeated reads are served from memory and cannot be mutated."""
+        manager.save_trading_config(['AAPL'], True, 10000.0, 0.02, 5, 60)
+        config = manager.get_trading_config()
+        config['tickers'].append('MSFT')
+
+        def no_reads():
+            raise AssertionError("cache miss")
+
+        monkeypatch.setattr(manager, '_read', no_reads)
+        assert manager.get_trading_config()['tickers'] == ['AAPL']
+
+    def test_other_process_writes_invalidate(self, manager, db_path):
+        """Commits from another connection (e.g. the UI) are picked up."""
+        manager.save_trading_config(['AAPL'], True, 10000.0, 0.02, 5, 60)
+        assert manager.is_trading_active() is False
+        assert manager.get_trading_config()['check_interval'] == 60
+
+        other = StateManager(db_path)
+        other.set_trading_active(True)
+        other.save_trading_config(['AAPL', 'TSLA'], False, 5000.0, 0.01, 3, 300)
+        other.close()
+
+        assert manager.is_trading_active() is True
+        assert manager.get_trading_config()['tickers'] == ['AAPL', 'TSLA']
+
+
+class TestBulkWrites:
+    """Tests for executemany-based writes."""
+
+    def test_evaluations_and_trades(self, manager):
+        """Bulk methods store every row."""
+        manager.save_strategy_evaluations('AAPL', {
+            'RSI': {'metrics': {'sharpe_ratio': 1.0}, 'score': 1.0},
+            'MACD': {'metrics': {'sharpe_ratio': 2.0}, 'score': 2.0},
+        }, 'sharpe_ratio')
+        assert [e['strategy_name'] for e in manager.get_all_evaluations('AAPL')] == ['MACD', 'RSI']
+
+        manager.record_trades([
+            {'ticker': 'AAPL', 'strategy_name': 'RSI', 'action': 'buy',
+             'quantity': 10, 'price': 150.0, 'signal': 1},
+            {'ticker': 'MSFT', 'strategy_name': 'MACD', 'action': 'sell',
+             'quantity': 5, 'price': 300.0, 'signal': -1, 'order_id': 'abc'},
+        ])
+        manager.record_trade('AAPL', 'RSI', 'sell', 10, 155.0, -1)
+        manager.record_trades([])
+
+        assert len(manager.get_trade_history()) == 3
+        assert [t['order_id'] for t in manager.get_trade_history('MSFT')] == ['abc']
+
+    def test_price_cache_round_trip(self, manager):
+        """Price bars are written in one batch and read back by range."""
+        index = pd.date_range('2024-01-01', periods=30, freq='D')
+        data = pd.DataFrame({
+            'open': range(30), 'high': range(1, 31), 'low': range(30),
+            'close': range(30), 'volume': [1000] * 30,
+        }, index=index, dtype=float)
+
+        manager.save_price_data('AAPL', data)
+        manager.save_price_data('AAPL', data.tail(5))
+
+        cached = manager.get_cached_price_data('AAPL', '2024-01-10', '2024-01-19')
+        assert len(cached) == 10
+        assert cached['close'].iloc[0] == 9.0
+        assert manager.get_last_cached_date('AAPL') == '2024-01-30'
+
+        manager.clear_price_cache('AAPL')
+        assert manager.get_cached_price_data('AAPL') is None
+
+    def test_concurrent_writers_and_readers(self, manager):
+        """Threads share the pool without losing writes."""
+        def work(n):
+            for i in range(20):
+                manager.record_trade(f"T{n}", 'RSI', 'buy', 1, 1.0, 1)
+                manager.update_last_check()
+                manager.get_trading_state()
+                manager.get_trade_history(limit=5)
+
+        threads = [threading.Thread(target=work, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(manager.get_trade_history(limit=1000)) == 160
+        assert manager._readers_opened <= manager.pool_size
+
+
+def test_get_state_manager_is_shared_per_path(db_path, tmp_path):
+    """One manager per database file per process."""
+    assert get_state_manager(db_path) is get_state_manager(db_path)
+    assert get_state_manager(str(tmp_path / 'other.db')) is not get_state_manager(db_path)
+
+
+def test_evaluation_states_round_trip(manager):
+    """Incremental evaluation states are stored per (ticker, strategy)."""
+    manager.save_evaluation_states('AAPL', {
+        'RSI': {'cash': 1.0, 'last_bar': '2024-01-02T00:00:00'},
+        'MACD': {'cash': 2.0, 'last_bar': None},
+    })
+    manager.save_evaluation_states('AAPL', {'RSI': {'cash': 3.0, 'last_bar': '2024-01-03T00:00:00'}})
+
+    states = manager.get_evaluation_states('AAPL')
+    assert states['RSI']['cash'] == 3.0
+    assert states['MACD']['last_bar'] is None
+    assert manager.get_evaluation_states('MSFT') == {}
+
+    manager.clear_evaluations('AAPL')
+    assert manager.get_evaluation_states('AAPL') == {}